@@ -0,0 +1,259 @@
+"""
+🔌 Local fake data providers for benchmarks
+
+FakeHTTPProvider is a threaded HTTP server that answers the third-party APIs
+the app calls (Reddit, StockTwits, Twitter, exchange rates) with synthetic
+payloads. While it is active every `requests` call is rerouted to it, so the
+client side (connection, JSON encoding and parsing) is measured for real and
+no request leaves the machine; unknown hosts get a 404.
+
+FakeYahoo replaces yfinance.Ticker: yfinance talks to Yahoo through its own
+HTTP session, so the provider is faked at the Ticker boundary instead.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import requests
+import yfinance
+
+from synthetic import (SEED, history_window, make_info, make_ohlcv, reddit_listing,
+                       stocktwits_stream, twitter_search)
+
+# (host, path pattern, payload builder(match, query))
+Route = Tuple[str, re.Pattern, Callable]
+
+
+class FakeHTTPProvider:
+    """Threaded HTTP server standing in for the external APIs"""
+
+    def __init__(self, latency_ms: float = 0, messages: int = 50, usd_ils_rate: float = 3.71,
+                 seed: int = SEED):
+        """
+        Args:
+            latency_ms: Delay before each response
+            messages: Posts per Reddit / StockTwits / Twitter page
+            usd_ils_rate: Rate served by the exchange-rate API
+            seed: Synthetic data seed
+        """
+        self.latency = latency_ms / 1000
+        self.messages = messages
+        self.usd_ils_rate = usd_ils_rate
+        self.seed = seed
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._payloads: Dict[str, bytes] = {}
+        self._original_send = None
+
+        self.routes: List[Route] = [
+            ('www.reddit.com', re.compile(r'^/r/([^/]+)/search\.json$'), self._reddit),
+            ('api.stocktwits.com', re.compile(r'^/api/2/streams/symbol/([^/]+)\.json$'), self._stocktwits),
+            ('api.twitter.com', re.compile(r'^/2/tweets/search/recent$'), self._twitter),
+            ('api.exchangerate-api.com', re.compile(r'^/v4/latest/USD$'), self._exchange_rate),
+        ]
+
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                provider._respond(self)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                provider._respond(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Serve in the background and reroute requests to this server"""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+        original = self._original_send = requests.adapters.HTTPAdapter.send
+        base = self.url
+
+        def send(adapter, request, **kwargs):
+            parts = urlsplit(request.url)
+            if parts.hostname != '127.0.0.1':
+                # /<original host>/<original path>
+                request.url = f"{base}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+                kwargs['proxies'] = {}
+            return original(adapter, request, **kwargs)
+
+        requests.adapters.HTTPAdapter.send = send
+
+    def stop(self):
+        if self._original_send is not None:
+            requests.adapters.HTTPAdapter.send = self._original_send
+            self._original_send = None
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'FakeHTTPProvider':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def _respond(self, handler: BaseHTTPRequestHandler):
+        parts = urlsplit(handler.path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        path = '/' + path
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        status, body = 404, b'{"error": "not found"}'
+        for route_host, pattern, build in self.routes:
+            match = pattern.match(path) if route_host == host else None
+            if match:
+                # Payloads are generated once per URL; serving them is what is measured
+                key = handler.path
+                with self._lock:
+                    body = self._payloads.get(key)
+                if body is None:
+                    body = json.dumps(build(match, query)).encode()
+                    with self._lock:
+                        self._payloads[key] = body
+                status = 200
+                break
+
+        with self._lock:
+            self.requests[host] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _reddit(self, match, query) -> Dict:
+        symbol = query.get('q', '').split()[-1]
+        return reddit_listing(symbol, match.group(1), min(self.messages, int(query.get('limit', 100))), self.seed)
+
+    def _stocktwits(self, match, query) -> Dict:
+        return stocktwits_stream(match.group(1), self.messages, self.seed)
+
+    def _twitter(self, match, query) -> Dict:
+        symbol = re.search(r'\$(\S+?)\s', query.get('query', '$UNKNOWN ')).group(1)
+        return twitter_search(symbol, min(self.messages, int(query.get('max_results', 100))), self.seed)
+
+    def _exchange_rate(self, match, query) -> Dict:
+        return {'base': 'USD', 'rates': {'ILS': self.usd_ils_rate, 'EUR': 0.92, 'GBP': 0.79}}
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'requests': dict(self.requests), 'cached_payloads': len(self._payloads)}
+
+
+class FakeYahoo:
+    """Replaces yfinance.Ticker with synthetic history and quote info"""
+
+    INTERVAL_MINUTES = {'1m': 1, '2m': 2, '5m': 5, '15m': 15, '30m': 30, '60m': 60, '90m': 90,
+                        '1h': 60, '1d': 390}
+
+    def __init__(self, intraday_days: int = 60, daily_days: int = 500, latency_ms: float = 0,
+                 seed: int = SEED):
+        """
+        Args:
+            intraday_days: Sessions of intraday history per symbol
+            daily_days: Sessions of daily history per symbol
+            latency_ms: Delay per history()/info call
+            seed: Synthetic data seed
+        """
+        self.intraday_days = intraday_days
+        self.daily_days = daily_days
+        self.latency = latency_ms / 1000
+        self.seed = seed
+        self.calls = Counter()
+        self._history: Dict[Tuple[str, int], pd.DataFrame] = {}
+        self._info: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._original = None
+
+    def history_for(self, symbol: str, interval: str = '5m') -> pd.DataFrame:
+        """Full synthetic history of a symbol (generated once)"""
+        minutes = self.INTERVAL_MINUTES[interval]
+        key = (symbol.upper(), minutes)
+        with self._lock:
+            df = self._history.get(key)
+        if df is None:
+            days = self.daily_days if minutes >= 390 else self.intraday_days
+            df = make_ohlcv(key[0], days=days, interval_minutes=minutes, seed=self.seed)
+            if minutes >= 390:
+                df.index = df.index.normalize()
+            with self._lock:
+                self._history[key] = df
+        return df
+
+    def info_for(self, symbol: str) -> Dict:
+        """Synthetic quote info of a symbol (generated once)"""
+        symbol = symbol.upper()
+        with self._lock:
+            info = self._info.get(symbol)
+        if info is None:
+            info = make_info(symbol, self.history_for(symbol, '5m'), self.seed)
+            with self._lock:
+                self._info[symbol] = info
+        return info
+
+    def install(self):
+        self._original = yfinance.Ticker
+        provider = self
+
+        class FakeTicker:
+            def __init__(self, symbol, *args, **kwargs):
+                self.ticker = symbol.upper()
+
+            def history(self, period: Optional[str] = None, interval: str = '1d', start=None, end=None,
+                        **kwargs) -> pd.DataFrame:
+                provider._call('history')
+                df = provider.history_for(self.ticker, interval)
+                return history_window(df, None if start else (period or '1mo'), start).copy()
+
+            @property
+            def info(self) -> Dict:
+                provider._call('info')
+                return dict(provider.info_for(self.ticker))
+
+        yfinance.Ticker = FakeTicker
+
+    def uninstall(self):
+        if self._original is not None:
+            yfinance.Ticker = self._original
+            self._original = None
+
+    def _call(self, kind: str):
+        with self._lock:
+            self.calls[kind] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def __enter__(self) -> 'FakeYahoo':
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
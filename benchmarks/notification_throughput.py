@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+📨 Notification dispatcher throughput benchmark
+Runs a local fake push server with configurable latency and error rate and
+measures enqueue time (what the alert loop pays) and delivery throughput.
+
+Usage: python3 benchmarks/notification_throughput.py [--alerts N] [--recipients N]
+       [--latency-ms N] [--error-rate F] [--workers N] [--coalesce F]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.alerts.notification_dispatcher import NotificationDispatcher, WebhookChannel
+from src.utils.rate_limiter import configure_rate_limit
+
+
+class FakePushServer:
+    """Threaded HTTP server that accepts webhook posts after a delay"""
+
+    def __init__(self, latency_ms=50, error_rate=0.0):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.received = 0
+        self.alerts = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                time.sleep(server.latency)
+
+                if random.random() < server.error_rate:
+                    self.send_response(503)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                payload = json.loads(body)
+                with server._lock:
+                    server.received += 1
+                    server.alerts += len(payload.get('alerts', []))
+
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'{}')
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/push"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+def run(alerts=2000, recipients=5, latency_ms=50, error_rate=0.02, workers=8, coalesce=0.5):
+    server = FakePushServer(latency_ms, error_rate)
+    server.start()
+
+    # Don't let the production webhook limit cap the benchmark
+    configure_rate_limit('webhook', rate=100000, burst=1000)
+
+    dispatcher = NotificationDispatcher(workers=workers, coalesce_seconds=coalesce,
+                                        backoff_seconds=0.05, max_pending=alerts * recipients)
+    dispatcher.add_channel(WebhookChannel([f"{server.url}?r={i}" for i in range(recipients)],
+                                          pool_size=workers))
+    dispatcher.start()
+
+    symbols = ['AAPL', 'TSLA', 'NVDA', 'AMD', 'PLTR', 'SOFI', 'GME', 'AMC']
+    enqueue_times = []
+
+    started = time.perf_counter()
+    for i in range(alerts):
+        alert = {'type': 'BREAKOUT', 'symbol': random.choice(symbols), 'seq': i}
+        t0 = time.perf_counter()
+        dispatcher.dispatch(alert, f"Alert {i}")
+        enqueue_times.append(time.perf_counter() - t0)
+    enqueued = time.perf_counter() - started
+
+    drained = dispatcher.flush(timeout=120)
+    elapsed = time.perf_counter() - started
+    stats = dispatcher.get_stats()
+    dispatcher.stop()
+    server.stop()
+
+    enqueue_times.sort()
+    result = {
+        'alerts': alerts,
+        'recipients': recipients,
+        'server_latency_ms': latency_ms,
+        'server_error_rate': error_rate,
+        'workers': workers,
+        'coalesce_seconds': coalesce,
+        'drained': drained,
+        'enqueue_us_p50': round(enqueue_times[len(enqueue_times) // 2] * 1e6, 1),
+        'enqueue_us_max': round(enqueue_times[-1] * 1e6, 1),
+        'enqueue_total_seconds': round(enqueued, 4),
+        'elapsed_seconds': round(elapsed, 3),
+        'http_requests': server.received,
+        'alerts_delivered': stats['delivered_alerts'],
+        'alerts_per_second': round(stats['delivered_alerts'] / elapsed, 1),
+        'dispatcher': stats
+    }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Notification dispatcher throughput')
+    parser.add_argument('--alerts', type=int, default=2000)
+    parser.add_argument('--recipients', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--coalesce', type=float, default=0.5)
+    args = parser.parse_args()
+
+    result = run(args.alerts, args.recipients, args.latency_ms, args.error_rate,
+                 args.workers, args.coalesce)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+⏱️ Hot-path benchmark suite
+Times scanning, indicators, setup analysis, social sentiment, alert evaluation
+and the main Flask routes at several scales, on deterministic synthetic data
+served by local fake providers (no network, no API keys). Results are written
+as JSON and can be compared against a previous run.
+
+Every database the app opens is redirected to a temporary sandbox. Benchmarks
+whose dependencies are missing are reported as skipped.
+
+Usage: python3 benchmarks/suite.py [--scales small,medium,large] [--only NAME ...]
+       [--repeat N] [--output FILE] [--baseline FILE] [--tolerance F]
+       [--fail-on-regression] [--latency-ms N] [--messages N] [--list]
+"""
+
+import argparse
+import contextlib
+import importlib.metadata
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import synthetic
+from fakes import FakeHTTPProvider, FakeYahoo
+
+SCALES = ('small', 'medium', 'large')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results', 'latest.json')
+
+# Database locations the app reads from the environment at import time
+SANDBOX_PATHS = {
+    'MARKET_DATA_LAKE': 'lake',
+    'ALERT_STATE_DB': 'alerts_state.db',
+    'ALERT_JOURNAL_DB': 'alerts_history.db',
+    'NEWS_DB': 'news.db',
+    'SECTOR_SNAPSHOT_DB': 'sector_snapshots.db',
+    'SWEEP_DB': 'sweep_results.db',
+    'SWEEP_DATASET_DIR': 'sweeps',
+    'INFLUENCER_FEED_DB': 'influencer_feed.db'
+}
+
+
+class Case:
+    """One timed operation: run() is timed, reset() runs untimed before each repeat"""
+
+    def __init__(self, run: Callable, items: int = 1, params: Optional[Dict] = None,
+                 reset: Optional[Callable] = None):
+        self.run = run
+        self.items = items
+        self.params = params or {}
+        self.reset = reset
+
+
+# name -> (factory(size, env) -> {case name: Case}, size per scale)
+BENCHMARKS: Dict[str, Tuple[Callable, Dict[str, int]]] = {}
+
+
+def benchmark(name: str, small: int, medium: int, large: int):
+    """Register a benchmark factory with its size at each scale"""
+    def register(factory):
+        BENCHMARKS[name] = (factory, {'small': small, 'medium': medium, 'large': large})
+        return factory
+    return register
+
+
+class Environment:
+    """Sandbox directories, fake providers and unthrottled rate limits for a suite run"""
+
+    def __init__(self, latency_ms: float = 0, messages: int = 50):
+        self.sandbox = tempfile.mkdtemp(prefix='momentum-bench-')
+        self._saved_env = {var: os.environ.get(var) for var in SANDBOX_PATHS}
+        for var, name in SANDBOX_PATHS.items():
+            os.environ[var] = os.path.join(self.sandbox, name)
+        # Lets the Twitter client run; requests only ever reach the fake server
+        os.environ.setdefault('TWITTER_BEARER_TOKEN', 'benchmark')
+
+        self.yahoo = FakeYahoo(latency_ms=latency_ms)
+        self.http = FakeHTTPProvider(latency_ms=latency_ms, messages=messages)
+        self._app = None
+
+    def __enter__(self) -> 'Environment':
+        self.yahoo.install()
+        self.http.start()
+
+        from src.utils.rate_limiter import PLATFORM_RATE_LIMITS, configure_rate_limit
+        for platform_name in list(PLATFORM_RATE_LIMITS) + ['webhook']:
+            configure_rate_limit(platform_name, rate=1e9, burst=10 ** 9)
+        return self
+
+    def __exit__(self, *exc):
+        if self._app is not None:
+            self._stop_services(self._app)
+        self.http.stop()
+        self.yahoo.uninstall()
+        for var, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+        shutil.rmtree(self.sandbox, ignore_errors=True)
+
+    def path(self, *parts) -> str:
+        return os.path.join(self.sandbox, *parts)
+
+    def flask_app(self):
+        """src.web.app imported inside the sandbox, with its background services stopped"""
+        if self._app is None:
+            # app.py opens ../../config/stocks.json and ../../trades.db from the working directory
+            web_dir = self.path('src', 'web')
+            os.makedirs(web_dir, exist_ok=True)
+            shutil.copytree(os.path.join(ROOT_DIR, 'config'), self.path('config'), dirs_exist_ok=True)
+            cwd = os.getcwd()
+            os.chdir(web_dir)
+            try:
+                with quiet():
+                    import src.web.app as app_module
+            finally:
+                os.chdir(cwd)
+            self._stop_services(app_module)
+            self._app = app_module
+        return self._app
+
+    @staticmethod
+    def _stop_services(app_module):
+        # Background refreshes would compete with the timed requests for CPU
+        with quiet():
+            for name in ('sector_research', 'news_aggregator'):
+                service = getattr(app_module, name, None)
+                if service is not None and hasattr(service, 'stop'):
+                    service.stop()
+            alert_manager = getattr(app_module, 'alert_manager', None)
+            if alert_manager is not None and getattr(alert_manager, 'running', False):
+                alert_manager.stop_monitoring()
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the progress prints of the code under test"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+
+@benchmark('calculate_indicators', small=5, medium=60, large=250)
+def bench_calculate_indicators(days: int, env: Environment) -> Dict[str, Case]:
+    from src.data.market_data import MarketDataFetcher
+
+    fetcher = MarketDataFetcher(use_lake=False)
+    df = synthetic.make_ohlcv('BENCH', days=days)
+    return {'5m': Case(lambda: fetcher.calculate_indicators(df), items=len(df),
+                       params={'sessions': days, 'bars': len(df)})}
+
+
+@benchmark('scan_for_momentum', small=10, medium=50, large=200)
+def bench_scan_for_momentum(symbols: int, env: Environment) -> Dict[str, Case]:
+    from src.data.data_lake import DataLake
+    from src.data.market_data import MarketDataFetcher
+
+    with open(os.path.join(ROOT_DIR, 'config', 'stocks.json'), encoding='utf-8') as f:
+        criteria = json.load(f).get('momentum_criteria', {})
+    universe = synthetic.make_symbols(symbols)
+    params = {'symbols': symbols}
+
+    # Cold: empty data lake, every symbol downloads its full period
+    cold = {'fetcher': None, 'runs': 0}
+
+    def reset_cold():
+        cold['runs'] += 1
+        lake = DataLake(env.path(f'lake-cold-{symbols}-{cold["runs"]}'))
+        cold['fetcher'] = MarketDataFetcher(data_lake=lake)
+
+    # Warm: lake already synced, served from the local store
+    warm = MarketDataFetcher(data_lake=DataLake(env.path(f'lake-warm-{symbols}')))
+
+    return {
+        'cold': Case(lambda: cold['fetcher'].scan_for_momentum(universe, criteria), items=symbols,
+                     params=params, reset=reset_cold),
+        'warm': Case(lambda: warm.scan_for_momentum(universe, criteria), items=symbols, params=params)
+    }
+
+
+@benchmark('analyze_setup', small=100, medium=1000, large=10000)
+def bench_analyze_setup(quotes: int, env: Environment) -> Dict[str, Case]:
+    from src.analysis.ross_cameron_setups import RossCameronAnalyzer
+
+    analyzer = RossCameronAnalyzer()
+    universe = synthetic.make_symbols(20)
+    stream = synthetic.make_quote_stream(universe, quotes)
+    daily = {symbol: env.yahoo.history_for(symbol, '1d').tail(30) for symbol in universe}
+
+    def run():
+        for symbol, quote in stream:
+            analyzer.analyze_setup(quote, daily[symbol])
+
+    return {'with_history': Case(run, items=quotes, params={'quotes': quotes, 'symbols': len(universe)})}
+
+
+@benchmark('get_comprehensive_sentiment', small=1, medium=5, large=20)
+def bench_comprehensive_sentiment(symbols: int, env: Environment) -> Dict[str, Case]:
+    from social_sentiment_analyzer import SocialSentimentAnalyzer
+
+    analyzer = SocialSentimentAnalyzer()
+    universe = synthetic.make_symbols(symbols, israeli_share=0)
+
+    def run():
+        for symbol in universe:
+            analyzer.get_comprehensive_sentiment(symbol)
+
+    return {'reddit_stocktwits_twitter': Case(run, items=symbols,
+                                              params={'symbols': symbols, 'messages_per_page': env.http.messages})}
+
+
+@benchmark('alert_evaluation', small=100, medium=1000, large=10000)
+def bench_alert_evaluation(rules: int, env: Environment) -> Dict[str, Case]:
+    from src.alerts.alert_manager import AlertManager
+
+    universe = synthetic.make_symbols(max(10, rules // 20))
+    stream = synthetic.make_quote_stream(universe, 5000)
+    first_quote = {}
+    for symbol, quote in stream:
+        first_quote.setdefault(symbol, quote)
+
+    rng = synthetic.rng_for('alert-rules', rules)
+    types = [('price_above', 'current_price', 1.01), ('price_below', 'current_price', 0.99),
+             ('rvol_above', 'rvol', 1.5), ('change_above', 'change_percent', None),
+             ('rsi_above', 'rsi', 1.2), ('volume_above', 'volume', 1.5)]
+    specs = []
+    for _ in range(rules):
+        symbol = universe[int(rng.integers(len(universe)))]
+        quote = first_quote.get(symbol, stream[0][1])
+        alert_type, field, factor = types[int(rng.integers(len(types)))]
+        value = 0.5 if factor is None else quote[field] * factor * float(rng.uniform(0.98, 1.02))
+        specs.append((symbol, alert_type, value, bool(rng.random() < 0.5)))
+    # A few setup_detected rules, which run the setup analyzer on every quote of their symbol
+    event_symbols = universe[:max(1, len(universe) // 20)]
+
+    state = {'manager': None}
+
+    def reset():
+        if state['manager'] is not None:
+            state['manager'].executor.shutdown()
+        with quiet():
+            manager = AlertManager(check_interval=3600)
+            for symbol, alert_type, value, repeat in specs:
+                manager.add_alert(symbol, alert_type, value, repeat=repeat)
+            for symbol in event_symbols:
+                manager.add_alert(symbol, 'setup_detected', repeat=True)
+        state['manager'] = manager
+
+    def run():
+        manager = state['manager']
+        for symbol, quote in stream:
+            manager.process_quote(symbol, quote)
+
+    return {'process_quote': Case(run, items=len(stream), reset=reset,
+                                  params={'rules': rules, 'symbols': len(universe), 'quotes': len(stream),
+                                          'setup_rules': len(event_symbols)})}
+
+
+@benchmark('flask_routes', small=10, medium=50, large=200)
+def bench_flask_routes(symbols: int, env: Environment) -> Dict[str, Case]:
+    app_module = env.flask_app()
+    client = app_module.app.test_client()
+
+    universe = synthetic.make_symbols(symbols)
+    app_module.config['israeli_stocks'] = [s for s in universe if s.endswith('.TA')]
+    app_module.config['us_stocks_popular_in_israel'] = [s for s in universe if not s.endswith('.TA')]
+    # Chart history grows with the scale
+    period = {10: '5d', 50: '1mo'}.get(symbols, '2mo')
+
+    def get(url):
+        def run():
+            response = client.get(url)
+            if response.status_code >= 500:
+                raise RuntimeError(f"{url} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return run
+
+    return {
+        'GET /api/scan': Case(get('/api/scan'), items=symbols, params={'symbols': symbols}),
+        'GET /api/chart': Case(get(f'/api/chart/{universe[0]}?period={period}'), params={'period': period}),
+        'GET /api/exchange-rate': Case(get('/api/exchange-rate')),
+        'GET /api/metrics': Case(get('/api/metrics'))
+    }
+
+
+# ----------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------
+
+def measure(case: Case, repeat: int, warmup: int) -> Dict:
+    timings = []
+    for i in range(warmup + repeat):
+        if case.reset:
+            case.reset()
+        with quiet():
+            started = time.perf_counter()
+            case.run()
+            elapsed = time.perf_counter() - started
+        if i >= warmup:
+            timings.append(elapsed)
+
+    median = statistics.median(timings)
+    return {
+        'repeat': repeat,
+        'seconds': {
+            'min': round(min(timings), 6),
+            'median': round(median, 6),
+            'mean': round(statistics.fmean(timings), 6),
+            'stdev': round(statistics.stdev(timings), 6) if len(timings) > 1 else 0.0
+        },
+        'per_item_us': round(median / case.items * 1e6, 2),
+        'items_per_second': round(case.items / median, 1) if median else None
+    }
+
+
+def run_suite(names: List[str], scales: List[str], repeat: int = 5, warmup: int = 1,
+              latency_ms: float = 0, messages: int = 50) -> Dict:
+    """
+    Run benchmarks at the given scales
+
+    Returns:
+        {'meta': ..., 'results': [...]} with one result per benchmark, case and scale
+    """
+    results = []
+    with Environment(latency_ms=latency_ms, messages=messages) as env:
+        for name in names:
+            factory, sizes = BENCHMARKS[name]
+            for scale in scales:
+                base = {'benchmark': name, 'scale': scale, 'size': sizes[scale]}
+                print(f"⏱️  {name} [{scale}]...", file=sys.stderr)
+                try:
+                    with quiet():
+                        cases = factory(sizes[scale], env)
+                except ImportError as e:
+                    results.append({**base, 'case': None, 'status': 'skipped', 'reason': str(e)})
+                    print(f"   ⏭️  skipped: {e}", file=sys.stderr)
+                    break
+                except Exception as e:
+                    results.append({**base, 'case': None, 'status': 'error', 'error': repr(e),
+                                    'traceback': traceback.format_exc()})
+                    print(f"   ❌ setup failed: {e}", file=sys.stderr)
+                    continue
+
+                for case_name, case in cases.items():
+                    result = {**base, 'case': case_name, 'params': case.params, 'items': case.items}
+                    try:
+                        result.update(measure(case, repeat, warmup), status='ok')
+                    except Exception as e:
+                        result.update(status='error', error=repr(e), traceback=traceback.format_exc())
+                        print(f"   ❌ {case_name}: {e}", file=sys.stderr)
+                    results.append(result)
+        providers = {'http': env.http.get_stats(), 'yahoo_calls': dict(env.yahoo.calls)}
+
+    return {'meta': run_metadata(repeat, warmup, latency_ms, messages, providers), 'results': results}
+
+
+def run_metadata(repeat: int, warmup: int, latency_ms: float, messages: int, providers: Dict) -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        commit = None
+
+    packages = {}
+    for package in ('numpy', 'pandas', 'pandas-ta', 'yfinance', 'flask', 'requests'):
+        try:
+            packages[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': packages,
+        'seed': synthetic.SEED,
+        'repeat': repeat,
+        'warmup': warmup,
+        'provider_latency_ms': latency_ms,
+        'messages_per_page': messages,
+        'providers': providers
+    }
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = 0.25) -> List[Dict]:
+    """
+    Annotate results with the baseline median and verdict
+
+    A result is a regression when its median is more than (1 + tolerance)
+    times the baseline's, an improvement when it is less than 1 / (1 + tolerance).
+
+    Returns:
+        The regressed results
+    """
+    previous = {(r['benchmark'], r['case'], r['scale']): r for r in baseline.get('results', [])
+                if r.get('status') == 'ok'}
+    regressions = []
+    for result in report['results']:
+        before = previous.get((result['benchmark'], result['case'], result['scale']))
+        if result.get('status') != 'ok' or before is None:
+            continue
+        ratio = result['seconds']['median'] / before['seconds']['median'] if before['seconds']['median'] else None
+        if ratio is None:
+            verdict = 'unknown'
+        elif ratio > 1 + tolerance:
+            verdict = 'regression'
+        elif ratio < 1 / (1 + tolerance):
+            verdict = 'improvement'
+        else:
+            verdict = 'unchanged'
+        result['baseline'] = {'median': before['seconds']['median'], 'ratio': round(ratio, 3) if ratio else None,
+                              'verdict': verdict, 'commit': baseline.get('meta', {}).get('commit')}
+        if verdict == 'regression':
+            regressions.append(result)
+    return regressions
+
+
+def print_table(report: Dict):
+    print(f"{'benchmark':<30} {'case':<26} {'scale':<7} {'median ms':>10} {'per item us':>12} {'vs baseline':>14}")
+    for r in report['results']:
+        label = f"{r['benchmark']:<30} {str(r['case'] or '-'):<26} {r['scale']:<7}"
+        if r['status'] != 'ok':
+            print(f"{label} {r['status']}: {r.get('reason') or r.get('error')}")
+            continue
+        versus = ''
+        if 'baseline' in r and r['baseline']['ratio'] is not None:
+            versus = f"{r['baseline']['ratio']:.2f}x {'🔴' if r['baseline']['verdict'] == 'regression' else '🟢' if r['baseline']['verdict'] == 'improvement' else ''}"
+        print(f"{label} {r['seconds']['median'] * 1000:>10.2f} {r['per_item_us']:>12.1f} {versus:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hot-path benchmark suite')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Benchmarks to run (default: all)')
+    parser.add_argument('--scales', default='small,medium', help=f"Comma-separated subset of {', '.join(SCALES)}")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Where to write the JSON results')
+    parser.add_argument('--baseline', help='Previous results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown before a regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with status 1 on regressions')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added by the fake providers')
+    parser.add_argument('--messages', type=int, default=50, help='Posts per fake social API page')
+    parser.add_argument('--list', action='store_true', help='List benchmarks and their sizes')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (_, sizes) in BENCHMARKS.items():
+            print(f"{name:<30} " + '  '.join(f"{scale}={size}" for scale, size in sizes.items()))
+        return
+
+    scales = [scale.strip() for scale in args.scales.split(',') if scale.strip()]
+    unknown = set(scales) - set(SCALES)
+    if unknown:
+        parser.error(f"Unknown scales: {', '.join(sorted(unknown))}")
+
+    report = run_suite(args.only or list(BENCHMARKS), scales, args.repeat, args.warmup,
+                       args.latency_ms, args.messages)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print_table(report)
+    print(f"\n📄 Results written to {args.output}")
+    if args.baseline:
+        print(f"📊 {len(regressions)} regression(s) beyond {args.tolerance:.0%} against {args.baseline}")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
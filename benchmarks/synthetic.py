@@ -0,0 +1,229 @@
+"""
+🧪 Deterministic synthetic market and social data for benchmarks
+
+Every generator is seeded from the symbol and a suite-wide seed (crc32, not
+hash(), so values are identical across processes and runs). Timestamps are
+relative to now (bars end in the current session) so freshness checks behave
+as in production; prices, volumes and message texts depend only on the seed.
+"""
+
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SEED = 20240501
+
+BULLISH_PHRASES = ['breakout', 'calls', 'to the moon', 'squeeze', 'gap up', 'buy the dip', 'rally', 'long']
+BEARISH_PHRASES = ['puts', 'dump', 'overvalued', 'bag holder', 'short', 'crash', 'sell', 'tank']
+NEUTRAL_PHRASES = ['earnings', 'watching', 'volume', 'chart', 'levels', 'news', 'premarket', 'float']
+SUBREDDITS = ['wallstreetbets', 'stocks', 'investing', 'StockMarket', 'pennystocks', 'options']
+
+
+def rng_for(*keys, seed: int = SEED) -> np.random.Generator:
+    """Random generator seeded by the given keys"""
+    return np.random.default_rng([seed] + [zlib.crc32(str(key).encode()) for key in keys])
+
+
+def make_symbols(n: int, israeli_share: float = 0.25, seed: int = SEED) -> List[str]:
+    """n distinct tickers, roughly israeli_share of them Tel Aviv (.TA) listings"""
+    rng = rng_for('symbols', seed=seed)
+    letters = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+    symbols, seen = [], set()
+    while len(symbols) < n:
+        symbol = ''.join(rng.choice(letters, rng.integers(2, 5)))
+        if rng.random() < israeli_share:
+            symbol += '.TA'
+        if symbol not in seen:
+            seen.add(symbol)
+            symbols.append(symbol)
+    return symbols
+
+
+def session_index(days: int, interval_minutes: int = 5, end: Optional[datetime] = None,
+                  tz: str = 'America/New_York') -> pd.DatetimeIndex:
+    """Regular-session bar times (9:30-16:00) for the last `days` business days up to end"""
+    end = pd.Timestamp(end or datetime.now(timezone.utc)).tz_convert(tz)
+    sessions = pd.bdate_range(end=end.normalize(), periods=days, tz=tz)
+    bars_per_session = (390 // interval_minutes)
+    offsets = (np.arange(bars_per_session) * interval_minutes + 570) * 60 * 10 ** 9
+    starts = sessions.tz_convert('UTC').as_unit('ns').asi8
+    index = pd.DatetimeIndex((starts[:, None] + offsets[None, :]).ravel(), tz='UTC').tz_convert(tz)
+    # The current session only has the bars that already started
+    return index[index <= end]
+
+
+def make_ohlcv(symbol: str, days: int = 60, interval_minutes: int = 5, end: Optional[datetime] = None,
+               seed: int = SEED) -> pd.DataFrame:
+    """
+    Intraday bars shaped like yfinance history()
+
+    A geometric random walk with per-session gaps, a U-shaped intraday volume
+    curve and occasional momentum days (gap + volume surge), so scans and
+    setup checks find a realistic mix of candidates.
+    """
+    rng = rng_for(symbol, 'ohlcv', interval_minutes, seed=seed)
+    index = session_index(days, interval_minutes, end)
+    n = len(index)
+    bars_per_session = 390 // interval_minutes
+
+    start_price = float(rng.uniform(3, 400)) if not symbol.endswith('.TA') else float(rng.uniform(5, 3000))
+    vol = rng.uniform(0.001, 0.004)
+    returns = rng.normal(0.00002, vol, n)
+
+    session = np.arange(n) // bars_per_session
+    first_bar = np.r_[True, session[1:] != session[:-1]]
+    momentum_day = rng.random(session.max() + 1) < 0.08
+    gaps = np.where(momentum_day, rng.uniform(0.03, 0.15, session.max() + 1),
+                    rng.normal(0, 0.01, session.max() + 1))
+    returns[first_bar] += gaps[session[first_bar]]
+
+    close = start_price * np.exp(np.cumsum(returns))
+    open_ = np.r_[start_price, close[:-1]] * np.exp(rng.normal(0, vol / 4, n))
+    spread = np.abs(rng.normal(0, vol, n)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.maximum(np.minimum(open_, close) - spread, 0.01)
+
+    position = np.arange(n) % bars_per_session / max(bars_per_session - 1, 1)
+    shape = 1.5 + 2.5 * (position - 0.5) ** 2 * 4
+    base_volume = rng.uniform(2e4, 5e5)
+    surge = np.where(momentum_day[session], rng.uniform(3, 8), 1.0)
+    volume = np.round(base_volume * shape * surge * rng.lognormal(0, 0.4, n))
+
+    df = pd.DataFrame({
+        'Open': open_.round(4), 'High': high.round(4), 'Low': low.round(4), 'Close': close.round(4),
+        'Volume': volume, 'Dividends': 0.0, 'Stock Splits': 0.0
+    }, index=index)
+    df.index.name = 'Datetime'
+    return df
+
+
+def make_info(symbol: str, df: pd.DataFrame, seed: int = SEED) -> Dict:
+    """Quote fields shaped like yfinance Ticker.info"""
+    rng = rng_for(symbol, 'info', seed=seed)
+    sessions = df.index.normalize()
+    today = df[sessions == sessions[-1]]
+    previous = df[sessions < sessions[-1]]
+    previous_close = float(previous['Close'].iloc[-1]) if not previous.empty else float(df['Open'].iloc[0])
+    price = float(df['Close'].iloc[-1])
+    return {
+        'symbol': symbol,
+        'currentPrice': round(price, 2),
+        'regularMarketPrice': round(price, 2),
+        'previousClose': round(previous_close, 2),
+        'preMarketPrice': round(float(today['Open'].iloc[0]) * (1 + rng.normal(0, 0.005)), 2),
+        'preMarketVolume': int(rng.integers(0, 500_000)),
+        'marketCap': int(price * rng.integers(5_000_000, 500_000_000)),
+        'floatShares': int(rng.integers(2_000_000, 400_000_000)),
+        'currency': 'ILS' if symbol.endswith('.TA') else 'USD'
+    }
+
+
+def make_messages(symbol: str, n: int, seed: int = SEED) -> List[Dict]:
+    """
+    Social posts about a symbol
+
+    Returns:
+        Dicts with text, sentiment label, user, created (epoch seconds),
+        score, comments and likes
+    """
+    rng = rng_for(symbol, 'messages', seed=seed)
+    bias = rng.normal(0, 0.3)
+    now = datetime.now(timezone.utc).timestamp()
+    weights = np.clip([0.4 + bias, 0.3 - bias, 0.3], 0.05, None)
+    labels = rng.choice(['bullish', 'bearish', 'neutral'], n, p=weights / weights.sum())
+    messages = []
+    for i, label in enumerate(labels.tolist()):
+        phrases = {'bullish': BULLISH_PHRASES, 'bearish': BEARISH_PHRASES}.get(label, NEUTRAL_PHRASES)
+        words = list(rng.choice(phrases, 2)) + list(rng.choice(NEUTRAL_PHRASES, 3))
+        messages.append({
+            'text': f"${symbol.split('.')[0]} " + ' '.join(words),
+            'sentiment': label,
+            'user': f"trader{int(rng.integers(1, 5000))}",
+            'created': now - float(rng.uniform(0, 7 * 86400)),
+            'score': int(rng.integers(0, 2000)),
+            'comments': int(rng.integers(0, 300)),
+            'likes': int(rng.integers(0, 500)),
+            'id': i
+        })
+    return messages
+
+
+def reddit_listing(symbol: str, subreddit: str, n: int, seed: int = SEED) -> Dict:
+    """Reddit search.json response"""
+    posts = make_messages(f"{symbol}:{subreddit}", n, seed)
+    return {'data': {'children': [{'data': {
+        'title': post['text'], 'selftext': '', 'score': post['score'], 'num_comments': post['comments'],
+        'permalink': f"/r/{subreddit}/comments/{post['id']}", 'created_utc': post['created']
+    }} for post in posts]}}
+
+
+def stocktwits_stream(symbol: str, n: int, seed: int = SEED) -> Dict:
+    """StockTwits symbol stream response"""
+    messages = []
+    for post in make_messages(symbol, n, seed):
+        # Unlabelled messages carry no sentiment entity
+        entities = {'sentiment': {'basic': post['sentiment']}} if post['sentiment'] != 'neutral' else {}
+        messages.append({
+            'id': post['id'], 'body': post['text'], 'user': {'username': post['user']},
+            'created_at': datetime.fromtimestamp(post['created'], timezone.utc).isoformat(),
+            'entities': entities
+        })
+    return {'symbol': {'symbol': symbol}, 'messages': messages}
+
+
+def twitter_search(symbol: str, n: int, seed: int = SEED) -> Dict:
+    """Twitter API v2 recent search response"""
+    return {'data': [{
+        'id': str(post['id']), 'text': post['text'],
+        'created_at': datetime.fromtimestamp(post['created'], timezone.utc).isoformat(),
+        'public_metrics': {'like_count': post['likes'], 'retweet_count': post['score'] // 10,
+                           'reply_count': post['comments']}
+    } for post in make_messages(f"{symbol}:twitter", n, seed)]}
+
+
+def make_quote_stream(symbols: List[str], updates: int, seed: int = SEED) -> List[tuple]:
+    """
+    (symbol, quote) updates as MarketDataFetcher.get_current_data would emit them,
+    random-walking around each symbol's starting level
+    """
+    rng = rng_for('quotes', len(symbols), seed=seed)
+    state = {symbol: {'price': float(rng.uniform(3, 400)), 'rvol': float(rng.uniform(0.5, 3))}
+             for symbol in symbols}
+    picks = rng.integers(0, len(symbols), updates)
+    moves = rng.normal(0, 0.004, updates)
+    stream = []
+    for pick, move in zip(picks.tolist(), moves.tolist()):
+        symbol = symbols[pick]
+        s = state[symbol]
+        s['price'] *= 1 + move
+        s['rvol'] = max(0.1, s['rvol'] + move * 50)
+        stream.append((symbol, {
+            'symbol': symbol, 'data_available': True,
+            'current_price': round(s['price'], 2), 'previous_close': round(s['price'] / (1 + move), 2),
+            'change_percent': round(move * 100, 2), 'rvol': round(s['rvol'], 2),
+            'volume': int(s['rvol'] * 1e6), 'avg_volume': 1_000_000,
+            'gap_percent': round(move * 300, 2), 'rsi': round(50 + move * 2000, 2),
+            'vwap': round(s['price'] * 0.995, 2), 'ema_9': round(s['price'] * 0.99, 2),
+            'ema_20': round(s['price'] * 0.98, 2), 'day_high': round(s['price'] * 1.01, 2),
+            'day_low': round(s['price'] * 0.98, 2), 'day_range': round(s['price'] * 0.03, 2),
+            'float_shares': 50_000_000, 'premarket_volume': 100_000
+        }))
+    return stream
+
+
+def history_window(df: pd.DataFrame, period: Optional[str] = None, start: Optional[str] = None) -> pd.DataFrame:
+    """Slice full synthetic history the way Yahoo answers period= or start="""
+    if start is not None:
+        return df[df.index >= pd.Timestamp(start).tz_localize(df.index.tz)]
+    if not period or period == 'max':
+        return df
+    count = int(''.join(filter(str.isdigit, period)) or 1)
+    unit = period.lstrip('0123456789')
+    if unit == 'd':
+        sessions = df.index.normalize().unique()
+        return df[df.index.normalize() >= sessions[-min(count, len(sessions))]]
+    offset = {'wk': timedelta(weeks=count), 'mo': timedelta(days=30 * count), 'y': timedelta(days=365 * count)}[unit]
+    return df[df.index >= df.index[-1] - offset]
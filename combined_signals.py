@@ -5,18 +5,27 @@ Combines influencer recommendations with social media sentiment for stronger sig
 """
 
 from influencers_feed import InfluencersFeed
+from influencer_ingestion import InfluencerIngestionService
+from influencer_index import InfluencerMentionIndex
 from social_sentiment_analyzer import SocialSentimentAnalyzer
 from datetime import datetime
 import json
-import time
+
+from src.utils.watchlist_executor import WatchlistExecutor
 
 class CombinedSignals:
     """Combines multiple data sources for trading signals"""
 
-    def __init__(self):
+    def __init__(self, max_workers=8, influencer_index=None):
         self.influencers = InfluencersFeed()
         self.sentiment_analyzer = SocialSentimentAnalyzer()
 
+        # Influencer mentions are read from the locally ingested feed, never fetched per analysis
+        self.influencer_index = influencer_index or InfluencerMentionIndex(
+            InfluencerIngestionService(feed=self.influencers)
+        )
+        self.executor = WatchlistExecutor(max_workers=max_workers, name='combined-scan')
+
     def analyze_stock(self, symbol):
         """
         Deep analysis of a single stock combining all sources
@@ -46,9 +55,6 @@ class CombinedSignals:
         print()
         print("👥 Step 2/2: Checking influencer recommendations...")
 
-        # For now, we'll use a simple check (you can extend this to call the feed)
-        # In real implementation, you'd call aggregate_feed() and filter for this symbol
-
         results['influencer_signal'] = self._check_influencer_mentions(symbol)
 
         # 3. Combine signals
@@ -57,17 +63,12 @@ class CombinedSignals:
 
         return results
 
-    def _check_influencer_mentions(self, symbol):
+    def _check_influencer_mentions(self, symbol, hours=24):
         """
         Check if influencers mentioned this stock recently
-        Note: This is a placeholder. In production, you'd cache the feed
+        Served from the in-memory ticker index over the ingested feed
         """
-        return {
-            'mentioned': False,
-            'buy_count': 0,
-            'sell_count': 0,
-            'influencers': []
-        }
+        return self.influencer_index.lookup(symbol, hours=hours)
 
     def _calculate_combined_signal(self, results):
         """
@@ -145,22 +146,8 @@ class CombinedSignals:
         print("=" * 70)
         print()
 
-        results = []
-
-        for i, symbol in enumerate(watchlist, 1):
-            print(f"[{i}/{len(watchlist)}] Analyzing ${symbol}...")
-
-            try:
-                analysis = self.analyze_stock(symbol)
-                results.append(analysis)
-
-                # Rate limiting
-                if i < len(watchlist):
-                    time.sleep(3)
-
-            except Exception as e:
-                print(f"   ❌ Error analyzing {symbol}: {e}")
-                continue
+        # Symbols run in parallel; per-platform rate limiters pace the API calls
+        results = self.executor.run(watchlist, self.analyze_stock, WatchlistExecutor.print_progress)
 
         # Sort by confidence
         results.sort(key=lambda x: x['confidence'], reverse=True)
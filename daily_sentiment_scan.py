@@ -7,7 +7,8 @@ Scans watchlist of stocks and identifies hot ones based on social media buzz
 from social_sentiment_analyzer import SocialSentimentAnalyzer
 import json
 from datetime import datetime
-import time
+
+from src.utils.watchlist_executor import WatchlistExecutor
 
 # רשימת מניות לסריקה - ערוך לפי צרכים
 WATCHLIST = [
@@ -36,34 +37,33 @@ def main():
     print("=" * 70)
     print()
 
-    for i, symbol in enumerate(WATCHLIST, 1):
-        try:
-            print(f"[{i}/{len(WATCHLIST)}] Analyzing {symbol}...")
-            results = analyzer.get_comprehensive_sentiment(symbol)
-
-            # שמור רק מניות עם מספר משמעותי של אזכורים
-            if results['total_mentions'] >= 10:  # סף מינימלי
-                hot_stocks.append({
-                    'symbol': symbol,
-                    'sentiment': results['sentiment_score'],
-                    'sentiment_label': results['overall_sentiment'],
-                    'mentions': results['total_mentions'],
-                    'trending': results['trending_score'],
-                    'platforms': {
-                        'reddit': results['platforms'].get('reddit', {}).get('mentions', 0),
-                        'stocktwits': results['platforms'].get('stocktwits', {}).get('total_messages', 0),
-                        'twitter': results['platforms'].get('twitter', {}).get('mentions', 0),
-                    }
-                })
-
-            # המתן בין בקשות (rate limiting)
-            if i < len(WATCHLIST):
-                time.sleep(3)
-
-        except Exception as e:
-            print(f"❌ Error analyzing {symbol}: {e}")
+    # סריקה מקבילית - קצב הבקשות נשלט ע"י מגבלות הפלטפורמות ולא ע"י המתנה קבועה
+    executor = WatchlistExecutor(max_workers=8, name='daily-scan')
+    scan = executor.iter_results(WATCHLIST, analyzer.get_comprehensive_sentiment,
+                                 WatchlistExecutor.print_progress)
+
+    for symbol, results, error in scan:
+        if error is not None:
+            print(f"❌ Error analyzing {symbol}: {error}")
             continue
 
+        # שמור רק מניות עם מספר משמעותי של אזכורים
+        if results['total_mentions'] >= 10:  # סף מינימלי
+            hot_stocks.append({
+                'symbol': symbol,
+                'sentiment': results['sentiment_score'],
+                'sentiment_label': results['overall_sentiment'],
+                'mentions': results['total_mentions'],
+                'trending': results['trending_score'],
+                'platforms': {
+                    'reddit': results['platforms'].get('reddit', {}).get('mentions', 0),
+                    'stocktwits': results['platforms'].get('stocktwits', {}).get('total_messages', 0),
+                    'twitter': results['platforms'].get('twitter', {}).get('mentions', 0),
+                }
+            })
+
+    print(f"⏱️  Scan finished in {executor.last_scan['elapsed_seconds']}s")
+
     # מיין לפי trending score
     hot_stocks.sort(key=lambda x: x['trending'], reverse=True)
 
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+🗂️ Influencer Mention Index
+In-memory inverted index from ticker to ingested influencer items
+"""
+
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from influencers_feed import InfluencersFeed
+
+
+class InfluencerMentionIndex:
+    """
+    Inverted index: ticker -> time bucket -> item IDs.
+
+    Posting lists are split into fixed time buckets (1 hour by default), so a
+    lookup for the last N hours touches at most N/bucket lists and then only
+    the items that actually mention the ticker. Items come from
+    InfluencerIngestionService - either pushed by its listener hook or pulled
+    incrementally from its feed table - so no feed is fetched at analysis time.
+    """
+
+    def __init__(self, service=None, bucket_hours=1, retention_hours=24 * 7, refresh_seconds=60):
+        """
+        Args:
+            service: InfluencerIngestionService to load items from (optional)
+            bucket_hours: Width of a posting-list time bucket
+            retention_hours: Items older than this are pruned
+            refresh_seconds: Minimum time between pulls of new items from the service
+        """
+        self.service = service
+        self.bucket_seconds = int(bucket_hours * 3600)
+        self.retention_seconds = retention_hours * 3600
+        self.refresh_seconds = refresh_seconds
+
+        self._postings = defaultdict(dict)  # ticker -> {bucket: [item_id, ...]}
+        self._items = {}  # item_id -> (influencer, recommendation, epoch)
+        self._extract_tickers = InfluencersFeed()._extract_tickers
+        self._lock = threading.Lock()
+        self._cursor = None  # (ingested_at, item_id) of the newest item seen
+        self._last_refresh = 0.0
+        self._pruned = 0
+
+        if service is not None:
+            since = datetime.fromtimestamp(time.time() - self.retention_seconds, timezone.utc).isoformat()
+            self.add_items(service.get_feed(limit=100000, since=since))
+            self._last_refresh = time.monotonic()
+            service.add_listener(self.add_item)
+
+    def add_item(self, item):
+        """
+        Index one feed item
+
+        Args:
+            item: Feed item with item_id, tickers (or content/title), influencer,
+                  recommendation and created_at
+        """
+        item_id = item.get('item_id') or item.get('url')
+        if not item_id:
+            return
+
+        tickers = item.get('tickers')
+        if tickers is None:
+            tickers = self._extract_tickers(f"{item.get('title', '')} {item.get('content', '')}")
+
+        created = self._to_epoch(item.get('created_at'))
+        bucket = int(created // self.bucket_seconds)
+
+        with self._lock:
+            ingested_at = item.get('ingested_at')
+            if ingested_at:
+                cursor = (ingested_at, item.get('item_id') or '')
+                if self._cursor is None or cursor > self._cursor:
+                    self._cursor = cursor
+
+            # Only items reachable through a posting are kept - prune() walks the postings
+            if item_id in self._items or not tickers:
+                return
+            self._items[item_id] = (item.get('influencer'), item.get('recommendation'), created)
+
+            for ticker in set(tickers):
+                self._postings[ticker.upper()].setdefault(bucket, []).append(item_id)
+
+    def add_items(self, items):
+        """Index many feed items"""
+        for item in items:
+            self.add_item(item)
+
+    def refresh(self):
+        """
+        Pull items the ingestion service stored since the last refresh
+        (picks up items written by a separate ingestion process) and drop
+        items that aged out of the retention window
+        """
+        if self.service is None:
+            self.prune()
+            return 0
+
+        self._last_refresh = time.monotonic()
+        ingested_after, after_id = self._cursor or (None, None)
+        items = self.service.get_new_items(ingested_after, after_id=after_id)
+        self.add_items(items)
+        self.prune()
+        return len(items)
+
+    def lookup(self, symbol, hours=24):
+        """
+        Influencer activity for a ticker
+
+        Args:
+            symbol: Stock ticker symbol
+            hours: Look-back window
+
+        Returns:
+            Dictionary with mentioned flag, buy/sell/hold counts (distinct
+            influencers), influencer names and matching item IDs
+        """
+        if self.service is not None and time.monotonic() - self._last_refresh > self.refresh_seconds:
+            self.refresh()
+
+        now = time.time()
+        since = now - hours * 3600
+        first_bucket = int(since // self.bucket_seconds)
+        last_bucket = int(now // self.bucket_seconds)
+
+        buy, sell, hold = set(), set(), set()
+        influencers = set()
+        item_ids = []
+
+        with self._lock:
+            buckets = self._postings.get(symbol.upper())
+            if buckets:
+                for bucket in range(first_bucket, last_bucket + 1):
+                    for item_id in buckets.get(bucket, ()):
+                        influencer, recommendation, created = self._items[item_id]
+                        if created < since:
+                            continue
+
+                        item_ids.append(item_id)
+                        influencers.add(influencer)
+                        if recommendation == 'BUY':
+                            buy.add(influencer)
+                        elif recommendation == 'SELL':
+                            sell.add(influencer)
+                        elif recommendation == 'HOLD':
+                            hold.add(influencer)
+
+        return {
+            'mentioned': bool(item_ids),
+            'mention_count': len(item_ids),
+            'buy_count': len(buy),
+            'sell_count': len(sell),
+            'hold_count': len(hold),
+            'influencers': sorted(i for i in influencers if i),
+            'item_ids': item_ids
+        }
+
+    def prune(self):
+        """
+        Drop items older than the retention window
+
+        Returns:
+            Number of items removed
+        """
+        cutoff_bucket = int((time.time() - self.retention_seconds) // self.bucket_seconds)
+
+        with self._lock:
+            removed = set()
+            for ticker in list(self._postings):
+                buckets = self._postings[ticker]
+                for bucket in [b for b in buckets if b < cutoff_bucket]:
+                    removed.update(buckets.pop(bucket))
+                if not buckets:
+                    del self._postings[ticker]
+
+            for item_id in removed:
+                self._items.pop(item_id, None)
+            self._pruned += len(removed)
+
+        return len(removed)
+
+    def get_stats(self):
+        """Index sizes for the metrics endpoint"""
+        with self._lock:
+            return {
+                'items': len(self._items),
+                'tickers': len(self._postings),
+                'postings': sum(len(ids) for buckets in self._postings.values() for ids in buckets.values()),
+                'pruned': self._pruned,
+                'last_ingested_at': self._cursor[0] if self._cursor else None
+            }
+
+    @staticmethod
+    def _to_epoch(value):
+        if not value:
+            return time.time()
+        try:
+            return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return time.time()
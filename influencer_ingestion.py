@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+📥 Influencer Feed Ingestion Service
+Polls influencer accounts incrementally and stores items in a local feed table
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from influencers_feed import InfluencersFeed
+
+DEFAULT_DB_PATH = os.getenv(
+    'INFLUENCER_FEED_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'influencer_feed.db')
+)
+
+# Re-resolve handles occasionally in case an account is renamed or recreated
+ACCOUNT_REFRESH_DAYS = 30
+# Handles that failed to resolve are not retried for this long
+ACCOUNT_RETRY_HOURS = 6
+
+
+class InfluencerIngestionService:
+    """
+    Persistent, incremental influencer feed.
+
+    Handle -> user ID and channel -> uploads playlist lookups are cached in the
+    accounts table (failed lookups too, for ACCOUNT_RETRY_HOURS), and each
+    account keeps a cursor (newest tweet ID for Twitter, newest publishedAt for
+    YouTube). A poll pages back to the cursor, so it usually costs one
+    incremental call per account, and reads are served from the items table.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, feed=None, max_per_account=20, max_pages=10):
+        """
+        Args:
+            db_path: SQLite file holding accounts, cursors and items
+            feed: InfluencersFeed used for API calls and item formatting
+            max_per_account: Items requested per API page
+            max_pages: Pages followed back to an account's cursor per poll
+        """
+        self.db_path = db_path
+        self.feed = feed or InfluencersFeed()
+        self.max_per_account = max_per_account
+        self.max_pages = max_pages
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS accounts (
+                    platform TEXT NOT NULL,
+                    handle TEXT NOT NULL,
+                    account_id TEXT,
+                    cursor TEXT,
+                    resolved_at TEXT,
+                    last_polled_at TEXT,
+                    PRIMARY KEY (platform, handle)
+                );
+
+                CREATE TABLE IF NOT EXISTS items (
+                    item_id TEXT PRIMARY KEY,
+                    influencer TEXT NOT NULL,
+                    influencer_en TEXT,
+                    source TEXT NOT NULL,
+                    title TEXT,
+                    content TEXT,
+                    created_at TEXT NOT NULL,
+                    engagement INTEGER DEFAULT 0,
+                    tickers TEXT,
+                    recommendation TEXT,
+                    url TEXT,
+                    thumbnail TEXT,
+                    language TEXT,
+                    focus TEXT,
+                    ingested_at TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_items_created ON items(created_at);
+                CREATE INDEX IF NOT EXISTS idx_items_influencer ON items(influencer, created_at);
+                DROP INDEX IF EXISTS idx_items_ingested;
+                CREATE INDEX IF NOT EXISTS idx_items_ingested_id ON items(ingested_at, item_id);
+            """)
+
+    def add_listener(self, callback):
+        """
+        Register a callback invoked with each newly stored item
+        """
+        self.listeners.append(callback)
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def poll_once(self, focus_israeli=True, focus_global=True):
+        """
+        Run one incremental poll over all influencer accounts
+
+        Returns:
+            Dictionary with poll statistics
+        """
+        started = time.monotonic()
+        stats = {'accounts': 0, 'new_items': 0, 'errors': 0}
+
+        groups = []
+        if focus_israeli:
+            groups.append(self.feed.influencers['israeli'])
+        if focus_global:
+            groups.append(self.feed.influencers['global'])
+
+        for influencers in groups:
+            for influencer in influencers:
+                for platform in ('twitter', 'youtube'):
+                    if platform not in influencer:
+                        continue
+
+                    stats['accounts'] += 1
+                    try:
+                        stats['new_items'] += self._poll_account(influencer, platform)
+                    except Exception as e:
+                        stats['errors'] += 1
+                        print(f"   ❌ Error polling {platform} {influencer[platform]}: {e}")
+
+        stats['elapsed_seconds'] = round(time.monotonic() - started, 2)
+        print(f"📥 Poll finished: {stats['new_items']} new items from {stats['accounts']} accounts "
+              f"({stats['elapsed_seconds']}s)")
+        return stats
+
+    def run_forever(self, interval_minutes=5):
+        """
+        Poll on a fixed interval until stop() is called
+        """
+        print(f"📥 Influencer ingestion running every {interval_minutes} minutes (db: {self.db_path})")
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(interval_minutes * 60)
+
+    def start(self, interval_minutes=5):
+        """
+        Start polling in a background thread
+        """
+        self._stop.clear()
+        thread = threading.Thread(target=self.run_forever, args=(interval_minutes,),
+                                  name='influencer-ingestion', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Stop the background polling loop"""
+        self._stop.set()
+
+    def _poll_account(self, influencer, platform):
+        handle = influencer[platform]
+        account = self._get_account(platform, handle)
+
+        if platform == 'twitter':
+            if not account['account_id']:
+                return 0
+            posts = self.feed.get_twitter_posts(handle, self.max_per_account,
+                                                user_id=account['account_id'],
+                                                since_id=account['cursor'], max_pages=self.max_pages)
+            items = [self.feed.build_twitter_item(influencer, post) for post in posts]
+            # Tweet IDs are snowflakes - compare numerically, newest wins
+            ids = [int(post['id']) for post in posts if post.get('id')]
+            cursor = str(max(ids)) if ids else account['cursor']
+        else:
+            if not account['account_id']:
+                return 0
+            videos = self.feed.get_youtube_videos(handle, self.max_per_account,
+                                                  uploads_playlist=account['account_id'],
+                                                  published_after=account['cursor'],
+                                                  max_pages=self.max_pages)
+            items = [self.feed.build_youtube_item(influencer, video) for video in videos]
+            dates = [video['published_at'] for video in videos if video.get('published_at')]
+            cursor = max(dates + [account['cursor'] or ''])
+
+        new_items = self._store_items(items)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE accounts SET cursor = ?, last_polled_at = ? WHERE platform = ? AND handle = ?",
+                (cursor or None, self._now(), platform, handle)
+            )
+
+        return len(new_items)
+
+    def _get_account(self, platform, handle):
+        """Return the cached account row, resolving the handle only when needed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM accounts WHERE platform = ? AND handle = ?", (platform, handle)
+            ).fetchone()
+
+        now = datetime.now(timezone.utc)
+        stale_before = (now - timedelta(days=ACCOUNT_REFRESH_DAYS)).isoformat()
+        retry_before = (now - timedelta(hours=ACCOUNT_RETRY_HOURS)).isoformat()
+        if row and row['account_id'] and row['resolved_at'] > stale_before:
+            return dict(row)
+        if row and not row['account_id'] and row['resolved_at'] and row['resolved_at'] > retry_before:
+            # Recently failed to resolve - negative result is cached
+            return dict(row)
+
+        if not self.feed.has_credentials(platform):
+            # Nothing was looked up, so there is no result to cache
+            return dict(row) if row else {'platform': platform, 'handle': handle, 'account_id': None,
+                                          'cursor': None}
+
+        if platform == 'twitter':
+            account_id = self.feed.get_twitter_user_id(handle)
+        else:
+            account_id = self.feed.get_youtube_uploads_playlist(handle)
+
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO accounts (platform, handle, account_id, resolved_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(platform, handle) DO UPDATE SET
+                    account_id = COALESCE(excluded.account_id, accounts.account_id),
+                    resolved_at = excluded.resolved_at
+            """, (platform, handle, account_id, self._now()))
+            row = self._conn.execute(
+                "SELECT * FROM accounts WHERE platform = ? AND handle = ?", (platform, handle)
+            ).fetchone()
+
+        return dict(row)
+
+    def _store_items(self, items):
+        """Insert items, returning only the ones that were not stored before"""
+        stored = []
+        now = self._now()
+
+        with self._lock, self._conn:
+            for item in items:
+                item_id = f"{item['source']}:{item.get('source_id') or item['url']}"
+                cursor = self._conn.execute("""
+                    INSERT OR IGNORE INTO items (item_id, influencer, influencer_en, source, title, content,
+                                                 created_at, engagement, tickers, recommendation, url,
+                                                 thumbnail, language, focus, ingested_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    item_id, item['influencer'], item.get('influencer_en'), item['source'],
+                    item.get('title'), item.get('content'), item['created_at'],
+                    item.get('engagement', 0), json.dumps(item.get('tickers', [])),
+                    item.get('recommendation'), item.get('url'), item.get('thumbnail'),
+                    item.get('language'), item.get('focus'), now
+                ))
+                if cursor.rowcount:
+                    item['item_id'] = item_id
+                    stored.append(item)
+
+        for item in stored:
+            for callback in self.listeners:
+                try:
+                    callback(item)
+                except Exception as e:
+                    print(f"   ⚠️  Feed listener failed: {e}")
+
+        return stored
+
+    # ------------------------------------------------------------------
+    # Reads (served from disk, no API calls)
+    # ------------------------------------------------------------------
+
+    def get_feed(self, limit=100, since=None, influencer=None, source=None):
+        """
+        Read stored items, newest first
+
+        Args:
+            limit: Maximum items to return
+            since: Only items created after this ISO timestamp
+            influencer: Filter by influencer name
+            source: Filter by source ('twitter' / 'youtube')
+
+        Returns:
+            List of feed item dictionaries (same shape as aggregate_feed)
+        """
+        query = "SELECT * FROM items WHERE 1=1"
+        params = []
+
+        if since:
+            query += " AND created_at > ?"
+            params.append(since)
+        if influencer:
+            query += " AND influencer = ?"
+            params.append(influencer)
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [self._row_to_item(row) for row in rows]
+
+    def get_new_items(self, ingested_after=None, limit=10000, after_id=None):
+        """
+        Read items stored after a given ingestion time, oldest first
+        Lets other processes follow the feed incrementally
+
+        Args:
+            ingested_after: ISO timestamp of the last item already seen
+            limit: Maximum items to return
+            after_id: item_id of the last item already seen - pages on
+                      (ingested_at, item_id) so items sharing the boundary
+                      timestamp are not skipped
+
+        Returns:
+            List of feed item dictionaries
+        """
+        with self._lock:
+            if after_id is None:
+                rows = self._conn.execute(
+                    "SELECT * FROM items WHERE ingested_at > ? ORDER BY ingested_at, item_id LIMIT ?",
+                    (ingested_after or '', limit)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT * FROM items WHERE ingested_at > ? OR (ingested_at = ? AND item_id > ?) "
+                    "ORDER BY ingested_at, item_id LIMIT ?",
+                    (ingested_after or '', ingested_after or '', after_id, limit)
+                ).fetchall()
+
+        return [self._row_to_item(row) for row in rows]
+
+    def get_stats(self):
+        """Table sizes and poll state"""
+        with self._lock:
+            items = self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            accounts = self._conn.execute(
+                "SELECT COUNT(*), MAX(last_polled_at), SUM(account_id IS NULL) FROM accounts"
+            ).fetchone()
+
+        return {
+            'items': items,
+            'accounts': accounts[0],
+            'unresolved_accounts': accounts[2] or 0,
+            'last_polled_at': accounts[1]
+        }
+
+    def close(self):
+        """Close the database connection"""
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _row_to_item(row):
+        item = dict(row)
+        item['tickers'] = json.loads(item['tickers'] or '[]')
+        return {key: value for key, value in item.items() if value is not None}
+
+    @staticmethod
+    def _now():
+        return datetime.now(timezone.utc).isoformat()
+
+
+def main():
+    """
+    Run the ingestion service
+    Usage: python3 influencer_ingestion.py [--once] [interval_minutes]
+    """
+    args = sys.argv[1:]
+    service = InfluencerIngestionService()
+
+    if '--once' in args:
+        service.poll_once()
+        service.feed.print_feed(service.get_feed(limit=200), show_top=20)
+        return
+
+    interval = int(args[0]) if args else 5
+    try:
+        service.run_forever(interval_minutes=interval)
+    except KeyboardInterrupt:
+        print("\n🛑 Ingestion stopped")
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,10 @@ import requests
 import json
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-import time
 import re
 
+from src.utils.rate_limiter import get_rate_limiter
+
 load_dotenv()
 
 # API Keys
@@ -139,48 +140,88 @@ class InfluencersFeed:
             ]
         }
 
-    def get_twitter_posts(self, username, max_results=10):
+    def has_credentials(self, platform):
         """
-        Get recent tweets from an influencer
+        Whether an API key is configured for 'twitter' or 'youtube'
         """
-        if not TWITTER_BEARER_TOKEN:
-            print(f"⚠️  Twitter API token not found - skipping {username}")
-            return []
+        return bool(TWITTER_BEARER_TOKEN if platform == 'twitter' else YOUTUBE_API_KEY)
 
-        print(f"🐦 Fetching tweets from @{username}...")
+    def get_twitter_user_id(self, username):
+        """
+        Resolve a Twitter username to its numeric user ID
+        """
+        if not TWITTER_BEARER_TOKEN:
+            return None
 
-        # First, get user ID
         user_url = f"https://api.twitter.com/2/users/by/username/{username}"
         headers = {"Authorization": f"Bearer {TWITTER_BEARER_TOKEN}"}
 
         try:
+            get_rate_limiter('twitter').acquire()
             user_response = requests.get(user_url, headers=headers, timeout=10)
             if user_response.status_code != 200:
                 print(f"   ❌ Could not find user @{username}")
-                return []
+                return None
+
+            return user_response.json()['data']['id']
+
+        except Exception as e:
+            print(f"   ❌ Error resolving @{username}: {e}")
 
-            user_id = user_response.json()['data']['id']
+        return None
+
+    def get_twitter_posts(self, username, max_results=10, user_id=None, since_id=None, max_pages=1):
+        """
+        Get recent tweets from an influencer
+
+        Args:
+            username: Twitter handle
+            max_results: Maximum tweets to return (tweets per page when paginating)
+            user_id: Already-resolved user ID (skips the lookup call)
+            since_id: Only return tweets newer than this tweet ID
+            max_pages: With since_id, follow pagination back to it for up to this many pages
+        """
+        if not TWITTER_BEARER_TOKEN:
+            print(f"⚠️  Twitter API token not found - skipping {username}")
+            return []
+
+        print(f"🐦 Fetching tweets from @{username}...")
+
+        headers = {"Authorization": f"Bearer {TWITTER_BEARER_TOKEN}"}
+
+        try:
+            # First, get user ID
+            if not user_id:
+                user_id = self.get_twitter_user_id(username)
+                if not user_id:
+                    return []
 
             # Get user's tweets
             tweets_url = f"https://api.twitter.com/2/users/{user_id}/tweets"
             params = {
-                'max_results': min(max_results, 10),
+                'max_results': min(max(max_results, 5), 100),
                 'tweet.fields': 'created_at,public_metrics,entities',
                 'exclude': 'retweets,replies'
             }
+            if since_id:
+                params['since_id'] = since_id
+
+            posts = []
+            for page in range(max_pages if since_id else 1):
+                get_rate_limiter('twitter').acquire()
+                tweets_response = requests.get(tweets_url, headers=headers, params=params, timeout=10)
+                if tweets_response.status_code != 200:
+                    # A partial page set would move the cursor past the missing tweets
+                    print(f"   ❌ Tweets request failed: {tweets_response.status_code}")
+                    return []
 
-            tweets_response = requests.get(tweets_url, headers=headers, params=params, timeout=10)
-
-            if tweets_response.status_code == 200:
                 data = tweets_response.json()
-                tweets = data.get('data', [])
-
-                posts = []
-                for tweet in tweets:
+                for tweet in data.get('data', []):
                     # Extract stock tickers
                     tickers = self._extract_tickers(tweet.get('text', ''))
 
                     posts.append({
+                        'id': tweet.get('id'),
                         'text': tweet.get('text', ''),
                         'created_at': tweet.get('created_at', ''),
                         'likes': tweet.get('public_metrics', {}).get('like_count', 0),
@@ -189,8 +230,17 @@ class InfluencersFeed:
                         'url': f"https://twitter.com/{username}/status/{tweet.get('id')}"
                     })
 
-                print(f"   ✅ Found {len(posts)} tweets")
-                return posts
+                # With since_id the pages end at the previous cursor
+                next_token = data.get('meta', {}).get('next_token')
+                if not next_token or not since_id:
+                    break
+                if page == max_pages - 1:
+                    print(f"   ⚠️  More than {max_pages} pages of new tweets from @{username} - older ones skipped")
+                    break
+                params['pagination_token'] = next_token
+
+            print(f"   ✅ Found {len(posts)} tweets")
+            return posts if since_id else posts[:max_results]
 
         except Exception as e:
             print(f"   ❌ Error fetching tweets: {e}")
@@ -240,9 +290,48 @@ class InfluencersFeed:
         else:
             return 'NEUTRAL'
 
-    def get_youtube_videos(self, channel_handle, max_results=5):
+    def get_youtube_uploads_playlist(self, channel_handle):
+        """
+        Resolve a YouTube channel handle to its uploads playlist ID
+        (channels.list costs 1 quota unit, search.list costs 100)
+        """
+        if not YOUTUBE_API_KEY:
+            return None
+
+        try:
+            channels_url = "https://www.googleapis.com/youtube/v3/channels"
+            params = {
+                'key': YOUTUBE_API_KEY,
+                'part': 'contentDetails',
+                'forHandle': channel_handle
+            }
+
+            get_rate_limiter('youtube').acquire()
+            response = requests.get(channels_url, params=params, timeout=10)
+
+            if response.status_code == 200:
+                items = response.json().get('items', [])
+                if items:
+                    return items[0]['contentDetails']['relatedPlaylists']['uploads']
+
+            print(f"   ❌ Could not find channel {channel_handle}")
+
+        except Exception as e:
+            print(f"   ❌ Error resolving {channel_handle}: {e}")
+
+        return None
+
+    def get_youtube_videos(self, channel_handle, max_results=5, uploads_playlist=None, published_after=None,
+                           max_pages=1):
         """
         Get recent videos from YouTube channel
+
+        Args:
+            channel_handle: Channel handle (e.g. @MichaStocks)
+            max_results: Maximum videos to return (videos per page when paginating)
+            uploads_playlist: Already-resolved uploads playlist (skips the lookup call)
+            published_after: Only return videos published after this ISO timestamp
+            max_pages: With published_after, follow pagination back to it for up to this many pages
         """
         if not YOUTUBE_API_KEY:
             print(f"⚠️  YouTube API key not found - skipping {channel_handle}")
@@ -251,43 +340,104 @@ class InfluencersFeed:
         print(f"📺 Fetching YouTube videos from {channel_handle}...")
 
         try:
-            # Search for channel
-            search_url = "https://www.googleapis.com/youtube/v3/search"
+            if not uploads_playlist:
+                uploads_playlist = self.get_youtube_uploads_playlist(channel_handle)
+                if not uploads_playlist:
+                    return []
+
+            # Uploads playlist is newest-first
+            playlist_url = "https://www.googleapis.com/youtube/v3/playlistItems"
             params = {
                 'key': YOUTUBE_API_KEY,
                 'part': 'snippet',
-                'q': channel_handle,
-                'type': 'video',
-                'maxResults': max_results,
-                'order': 'date'
+                'playlistId': uploads_playlist,
+                'maxResults': max_results
             }
 
-            response = requests.get(search_url, params=params, timeout=10)
+            videos = []
+            for page in range(max_pages if published_after else 1):
+                get_rate_limiter('youtube').acquire()
+                response = requests.get(playlist_url, params=params, timeout=10)
+                if response.status_code != 200:
+                    # A partial page set would move the cursor past the missing videos
+                    print(f"   ❌ Playlist request failed: {response.status_code}")
+                    return []
 
-            if response.status_code == 200:
                 data = response.json()
-                items = data.get('items', [])
-
-                videos = []
-                for item in items:
+                reached_cursor = False
+                for item in data.get('items', []):
                     snippet = item.get('snippet', {})
+                    published_at = snippet.get('publishedAt', '')
+                    if published_after and published_at <= published_after:
+                        reached_cursor = True
+                        continue
+
+                    video_id = snippet.get('resourceId', {}).get('videoId', '')
                     videos.append({
                         'title': snippet.get('title', ''),
                         'description': snippet.get('description', ''),
-                        'published_at': snippet.get('publishedAt', ''),
+                        'published_at': published_at,
                         'thumbnail': snippet.get('thumbnails', {}).get('medium', {}).get('url', ''),
-                        'video_id': item.get('id', {}).get('videoId', ''),
-                        'url': f"https://www.youtube.com/watch?v={item.get('id', {}).get('videoId', '')}"
+                        'video_id': video_id,
+                        'url': f"https://www.youtube.com/watch?v={video_id}"
                     })
 
-                print(f"   ✅ Found {len(videos)} videos")
-                return videos
+                next_token = data.get('nextPageToken')
+                if reached_cursor or not next_token or not published_after:
+                    break
+                if page == max_pages - 1:
+                    print(f"   ⚠️  More than {max_pages} pages of new videos from {channel_handle} - older ones skipped")
+                    break
+                params['pageToken'] = next_token
+
+            print(f"   ✅ Found {len(videos)} videos")
+            return videos
 
         except Exception as e:
             print(f"   ❌ Error fetching YouTube: {e}")
 
         return []
 
+    def build_twitter_item(self, influencer, tweet):
+        """
+        Convert a tweet into a feed item
+        """
+        return {
+            'influencer': influencer['name'],
+            'influencer_en': influencer.get('name_en', influencer['name']),
+            'source': 'twitter',
+            'source_id': tweet.get('id'),
+            'content': tweet['text'],
+            'created_at': tweet['created_at'],
+            'engagement': tweet['likes'] + tweet['retweets'],
+            'tickers': tweet['tickers'],
+            'recommendation': self._extract_recommendations(tweet['text']),
+            'url': tweet['url'],
+            'language': influencer['language'],
+            'focus': influencer['focus']
+        }
+
+    def build_youtube_item(self, influencer, video):
+        """
+        Convert a YouTube video into a feed item
+        """
+        text = f"{video['title']} {video['description']}"
+        return {
+            'influencer': influencer['name'],
+            'influencer_en': influencer.get('name_en', influencer['name']),
+            'source': 'youtube',
+            'source_id': video.get('video_id'),
+            'title': video['title'],
+            'content': video['description'],
+            'created_at': video['published_at'],
+            'tickers': self._extract_tickers(text),
+            'recommendation': self._extract_recommendations(text),
+            'thumbnail': video['thumbnail'],
+            'url': video['url'],
+            'language': influencer['language'],
+            'focus': influencer['focus']
+        }
+
     def aggregate_feed(self, focus_israeli=True, focus_global=True, max_per_influencer=5):
         """
         Aggregate feed from all influencers
@@ -313,39 +463,15 @@ class InfluencersFeed:
                 if 'twitter' in influencer:
                     tweets = self.get_twitter_posts(influencer['twitter'], max_per_influencer)
                     for tweet in tweets:
-                        items.append({
-                            'influencer': influencer['name'],
-                            'influencer_en': influencer.get('name_en', influencer['name']),
-                            'source': 'twitter',
-                            'content': tweet['text'],
-                            'created_at': tweet['created_at'],
-                            'engagement': tweet['likes'] + tweet['retweets'],
-                            'tickers': tweet['tickers'],
-                            'recommendation': self._extract_recommendations(tweet['text']),
-                            'url': tweet['url'],
-                            'language': influencer['language'],
-                            'focus': influencer['focus']
-                        })
+                        items.append(self.build_twitter_item(influencer, tweet))
 
                 # YouTube
                 if 'youtube' in influencer:
                     videos = self.get_youtube_videos(influencer['youtube'], max_per_influencer)
                     for video in videos:
-                        items.append({
-                            'influencer': influencer['name'],
-                            'influencer_en': influencer.get('name_en', influencer['name']),
-                            'source': 'youtube',
-                            'title': video['title'],
-                            'content': video['description'],
-                            'created_at': video['published_at'],
-                            'thumbnail': video['thumbnail'],
-                            'url': video['url'],
-                            'language': influencer['language'],
-                            'focus': influencer['focus']
-                        })
+                        items.append(self.build_youtube_item(influencer, video))
 
                 all_items.extend(items)
-                time.sleep(2)  # Rate limiting
 
         # Global influencers
         if focus_global:
@@ -360,21 +486,9 @@ class InfluencersFeed:
                 if 'twitter' in influencer:
                     tweets = self.get_twitter_posts(influencer['twitter'], max_per_influencer)
                     for tweet in tweets:
-                        items.append({
-                            'influencer': influencer['name'],
-                            'source': 'twitter',
-                            'content': tweet['text'],
-                            'created_at': tweet['created_at'],
-                            'engagement': tweet['likes'] + tweet['retweets'],
-                            'tickers': tweet['tickers'],
-                            'recommendation': self._extract_recommendations(tweet['text']),
-                            'url': tweet['url'],
-                            'language': influencer['language'],
-                            'focus': influencer['focus']
-                        })
+                        items.append(self.build_twitter_item(influencer, tweet))
 
                 all_items.extend(items)
-                time.sleep(2)  # Rate limiting
 
         # Sort by date (newest first)
         all_items.sort(key=lambda x: x.get('created_at', ''), reverse=True)
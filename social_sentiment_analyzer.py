@@ -11,7 +11,8 @@ import json
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 from dotenv import load_dotenv
-import time
+
+from src.utils.rate_limiter import get_rate_limiter
 
 load_dotenv()
 
@@ -27,6 +28,22 @@ class SocialSentimentAnalyzer:
     def __init__(self):
         self.reddit_token = None
         self.sentiment_scores = {}
+        self.mention_listeners = []
+
+    def add_mention_listener(self, callback):
+        """
+        Register a callback that receives every batch of collected mentions
+        Called as callback(symbol, mentions) - used to feed streaming engines
+        """
+        self.mention_listeners.append(callback)
+
+    def _publish_mentions(self, stock_symbol, mentions):
+        """Hand freshly collected mentions to registered listeners"""
+        for callback in self.mention_listeners:
+            try:
+                callback(stock_symbol, mentions)
+            except Exception as e:
+                print(f"⚠️  Mention listener failed: {e}")
 
     def authenticate_reddit(self):
         """Get Reddit API access token"""
@@ -83,7 +100,8 @@ class SocialSentimentAnalyzer:
                     't': 'week'  # Last week
                 }
 
-                response = requests.get(url, headers=headers, params=params)
+                get_rate_limiter('reddit').acquire()
+                response = requests.get(url, headers=headers, params=params, timeout=10)
 
                 if response.status_code == 200:
                     data = response.json()
@@ -102,8 +120,6 @@ class SocialSentimentAnalyzer:
                             'created': datetime.fromtimestamp(post_data.get('created_utc', 0))
                         })
 
-                time.sleep(2)  # Rate limiting
-
             except Exception as e:
                 print(f"Error fetching from r/{subreddit}: {e}")
 
@@ -123,6 +139,7 @@ class SocialSentimentAnalyzer:
         }
 
         try:
+            get_rate_limiter('stocktwits').acquire()
             response = requests.get(url, headers=headers, timeout=10)
 
             if response.status_code == 200:
@@ -192,7 +209,8 @@ class SocialSentimentAnalyzer:
         }
 
         try:
-            response = requests.get(url, headers=headers, params=params)
+            get_rate_limiter('twitter').acquire()
+            response = requests.get(url, headers=headers, params=params, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -269,6 +287,7 @@ class SocialSentimentAnalyzer:
 
         # Reddit
         reddit_mentions = self.get_reddit_mentions(stock_symbol)
+        self._publish_mentions(stock_symbol, reddit_mentions)
         if reddit_mentions:
             reddit_sentiments = [self.analyze_sentiment(m['title'] + ' ' + m['text'])
                                for m in reddit_mentions]
@@ -284,10 +303,12 @@ class SocialSentimentAnalyzer:
         # StockTwits
         stocktwits_data = self.get_stocktwits_sentiment(stock_symbol)
         if stocktwits_data:
+            self._publish_mentions(stock_symbol, stocktwits_data['mentions'])
             results['platforms']['stocktwits'] = stocktwits_data
 
         # Twitter
         twitter_mentions = self.get_twitter_mentions(stock_symbol)
+        self._publish_mentions(stock_symbol, twitter_mentions)
         if twitter_mentions:
             twitter_sentiments = [self.analyze_sentiment(m['text']) for m in twitter_mentions]
             twitter_score = sum(1 if s == 'bullish' else -1 if s == 'bearish' else 0
@@ -300,7 +321,9 @@ class SocialSentimentAnalyzer:
             }
 
         # Calculate overall metrics
-        total_mentions = sum(p.get('mentions', 0) for p in results['platforms'].values())
+        # StockTwits keeps its messages in 'mentions' and the count in 'total_messages'
+        total_mentions = sum(p['total_messages'] if 'total_messages' in p else p.get('mentions', 0)
+                             for p in results['platforms'].values())
         results['total_mentions'] = total_mentions
 
         # Weighted sentiment score
@@ -0,0 +1,9 @@
+"""
+Alert modules
+"""
+from .alert_manager import AlertManager, Alert
+from .rule_index import RuleIndex
+from .alert_journal import AlertJournal
+from .state_store import AlertStateStore
+
+__all__ = ['AlertManager', 'Alert', 'RuleIndex', 'AlertJournal', 'AlertStateStore']
@@ -0,0 +1,227 @@
+"""
+Event-driven alert engine
+Evaluates alert rules incrementally as bar, quote and sentiment updates arrive
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Set
+
+
+class AlertEngine:
+    """
+    Consumes bar, quote and sentiment update streams and re-evaluates alert
+    rules only for symbols whose inputs actually changed.
+
+    Updates are merged into a per-symbol snapshot. Events that don't change any
+    field are dropped. A burst of events for the same symbol is collapsed into
+    one evaluation of both entry and exit rules. Latency is measured from the
+    moment an update arrived to the moment its alert was dispatched.
+    """
+
+    EVENT_TYPES = ('bar', 'quote', 'sentiment')
+
+    def __init__(self, alert_system, latency_samples: int = 1000):
+        """
+        Args:
+            alert_system: SmartAlertSystem providing rules, watchlist and positions
+            latency_samples: Number of recent latency samples kept for percentiles
+        """
+        self.alert_system = alert_system
+        self._events: 'queue.Queue' = queue.Queue()
+        self._state: Dict[str, Dict] = {}
+        self._latencies = deque(maxlen=latency_samples)
+        self._thread: Optional[threading.Thread] = None
+        self._running = threading.Event()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'events': 0,
+            'unchanged_events': 0,
+            'evaluations': 0,
+            'alerts': 0,
+            'errors': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Streams
+    # ------------------------------------------------------------------
+
+    def publish_bar(self, symbol: str, bar: Dict, received_at: Optional[float] = None):
+        """
+        Publish a new OHLCV bar
+
+        Args:
+            symbol: Stock ticker symbol
+            bar: Dictionary with Open/High/Low/Close/Volume (any case)
+            received_at: time.monotonic() when the bar arrived (default: now)
+        """
+        fields = {
+            'current_price': bar.get('Close', bar.get('close')),
+            # A bar's range is not the day's - day_high/day_low stay with the quote
+            'last_bar_high': bar.get('High', bar.get('high')),
+            'last_bar_low': bar.get('Low', bar.get('low')),
+            'last_bar_volume': bar.get('Volume', bar.get('volume')),
+        }
+        self.publish('bar', symbol, {k: v for k, v in fields.items() if v is not None}, received_at)
+
+    def publish_quote(self, symbol: str, quote: Dict, received_at: Optional[float] = None):
+        """
+        Publish a quote / market snapshot (e.g. MarketDataFetcher.get_current_data output)
+        """
+        self.publish('quote', symbol, quote, received_at)
+
+    def publish_sentiment(self, symbol: str, analysis: Dict, received_at: Optional[float] = None):
+        """
+        Publish a social intelligence update (SocialIntelligence.analyze_stock output)
+        """
+        self.publish('sentiment', symbol, analysis, received_at)
+
+    def publish(self, event_type: str, symbol: str, payload: Dict, received_at: Optional[float] = None):
+        """Queue an update for evaluation"""
+        if event_type not in self.EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+        self._events.put((event_type, symbol.upper(), payload, received_at or time.monotonic()))
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the evaluation thread"""
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name='alert-engine', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the evaluation thread"""
+        self._running.clear()
+        self._events.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+
+    def process_pending(self) -> int:
+        """
+        Evaluate everything queued so far on the calling thread
+
+        Returns:
+            Number of symbols evaluated
+        """
+        dirty: Dict[str, float] = {}
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event is not None:
+                self._apply(event, dirty)
+        self._evaluate(dirty)
+        return len(dirty)
+
+    def _run(self):
+        while self._running.is_set():
+            try:
+                event = self._events.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if event is None:
+                continue
+
+            # Coalesce whatever else is already queued into the same pass
+            dirty: Dict[str, float] = {}
+            self._apply(event, dirty)
+            while True:
+                try:
+                    event = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                if event is not None:
+                    self._apply(event, dirty)
+
+            self._evaluate(dirty)
+
+    # ------------------------------------------------------------------
+    # Incremental evaluation
+    # ------------------------------------------------------------------
+
+    def _apply(self, event, dirty: Dict[str, float]):
+        """Merge an event into the symbol snapshot and mark it dirty if anything changed"""
+        event_type, symbol, payload, received_at = event
+
+        with self._lock:
+            self.stats['events'] += 1
+            state = self._state.setdefault(symbol, {'market': None, 'social': None})
+
+            if event_type == 'sentiment':
+                # Replaced as a whole, but a refresh that only bumps the timestamp is no change
+                current = state['social']
+                changed = current is None or set(current) != set(payload) or self._differs(current, payload)
+                if changed:
+                    state['social'] = payload
+            else:
+                current = state['market'] or {}
+                changed = self._differs(current, payload)
+                if changed:
+                    state['market'] = {**current, **payload}
+
+            if not changed:
+                self.stats['unchanged_events'] += 1
+                return
+
+        # Keep the earliest arrival so latency covers the whole coalesced burst
+        dirty[symbol] = min(dirty.get(symbol, received_at), received_at)
+
+    @staticmethod
+    def _differs(current: Dict, payload: Dict) -> bool:
+        """Whether the payload changes any field of current (timestamps ignored)"""
+        return any(current.get(key) != value for key, value in payload.items() if key != 'timestamp')
+
+    def _evaluate(self, dirty: Dict[str, float]):
+        watchlist: Set[str] = set(self.alert_system.watchlist)
+        positions: Set[str] = set(self.alert_system.positions)
+
+        for symbol, received_at in dirty.items():
+            with self._lock:
+                state = self._state[symbol]
+                market = state['market'] or {}
+                social = state['social']
+
+            try:
+                alerts = []
+                if symbol in watchlist:
+                    alerts.extend(self.alert_system.evaluate_entry_rules(symbol, social, market))
+                if symbol in positions:
+                    alerts.extend(self.alert_system.evaluate_exit_rules(symbol, social, market))
+
+                for alert in alerts:
+                    alert['latency_ms'] = round((time.monotonic() - received_at) * 1000, 2)
+                    self.alert_system._send_alert(alert)
+                    with self._lock:
+                        self._latencies.append(alert['latency_ms'])
+                        self.stats['alerts'] += 1
+
+                with self._lock:
+                    self.stats['evaluations'] += 1
+
+            except Exception as e:
+                with self._lock:
+                    self.stats['errors'] += 1
+                print(f"   ❌ Error evaluating {symbol}: {e}")
+
+    def get_stats(self) -> Dict:
+        """Counters and data-arrival-to-alert latency percentiles (ms)"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self.stats, symbols=len(self._state), queued=self._events.qsize())
+
+        if latencies:
+            stats['latency_ms'] = {
+                'p50': latencies[len(latencies) // 2],
+                'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                'max': latencies[-1]
+            }
+        return stats
@@ -0,0 +1,263 @@
+"""
+Append-only alert journal
+SQLite (WAL) log of every alert sent, written in batches from a background thread
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+DEFAULT_JOURNAL_PATH = os.getenv(
+    'ALERT_JOURNAL_DB',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 'alerts_history.db')
+)
+
+
+class AlertJournal:
+    """
+    Alert history stored as an append-only SQLite table.
+
+    append() only buffers the alert; a writer thread commits the buffer as one
+    transaction every flush_interval seconds (or as soon as batch_size alerts
+    are waiting), so a burst of alerts costs one fsync instead of one file
+    rewrite each. WAL mode lets other processes read and append concurrently.
+    Retention is by age and/or row count instead of a fixed cap.
+    """
+
+    PRUNE_INTERVAL_SECONDS = 3600
+
+    def __init__(self, db_path: str = DEFAULT_JOURNAL_PATH, retention_days: Optional[int] = 90,
+                 max_rows: Optional[int] = None, batch_size: int = 100, flush_interval: float = 1.0):
+        """
+        Args:
+            db_path: SQLite file holding the journal
+            retention_days: Delete alerts older than this (None keeps everything)
+            max_rows: Keep at most this many alerts (None = unlimited)
+            batch_size: Buffered alerts that trigger an immediate commit
+            flush_interval: Maximum seconds an alert waits in the buffer
+        """
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._buffer: List[tuple] = []
+        self._cond = threading.Condition()
+        self._db_lock = threading.Lock()
+        self._running = True
+        self.stats = {'appended': 0, 'commits': 0, 'pruned': 0}
+
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+        self._writer = threading.Thread(target=self._write_loop, name='alert-journal', daemon=True)
+        self._writer.start()
+
+    def _init_db(self):
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # In WAL mode NORMAL only syncs at checkpoints - commits stay durable across app crashes
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS alerts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_alerts_symbol ON alerts(symbol, created_at);
+                CREATE INDEX IF NOT EXISTS idx_alerts_type ON alerts(type, created_at);
+                CREATE INDEX IF NOT EXISTS idx_alerts_created ON alerts(created_at);
+            """)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, alert: Dict):
+        """
+        Queue an alert for the journal
+
+        Args:
+            alert: Alert dictionary with symbol, type (or alert_type) and timestamp
+        """
+        row = (
+            str(alert.get('symbol', '')).upper(),
+            alert.get('type') or alert.get('alert_type') or 'UNKNOWN',
+            alert.get('timestamp') or datetime.now().isoformat(),
+            json.dumps(alert, default=str)
+        )
+
+        with self._cond:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self):
+        """Commit everything buffered so far on the calling thread"""
+        with self._cond:
+            rows, self._buffer = self._buffer, []
+        self._commit(rows)
+
+    def _write_loop(self):
+        last_prune = 0.0
+        while True:
+            with self._cond:
+                if self._running and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                rows, self._buffer = self._buffer, []
+                running = self._running
+
+            self._commit(rows)
+            if not running:
+                return
+
+            if time.monotonic() - last_prune > self.PRUNE_INTERVAL_SECONDS:
+                last_prune = time.monotonic()
+                try:
+                    self.prune()
+                except Exception as e:
+                    print(f"   ⚠️  Failed to prune alert journal: {e}")
+
+    def _commit(self, rows: List[tuple]):
+        if not rows:
+            return
+        try:
+            with self._db_lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO alerts (symbol, type, created_at, payload) VALUES (?, ?, ?, ?)", rows
+                )
+            self.stats['appended'] += len(rows)
+            self.stats['commits'] += 1
+        except Exception as e:
+            print(f"   ⚠️  Failed to write alert journal: {e}")
+
+    def prune(self) -> int:
+        """
+        Apply the retention policy
+
+        Returns:
+            Number of alerts deleted
+        """
+        deleted = 0
+        with self._db_lock, self._conn:
+            if self.retention_days is not None:
+                cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+                deleted += self._conn.execute("DELETE FROM alerts WHERE created_at < ?", (cutoff,)).rowcount
+
+            if self.max_rows is not None:
+                deleted += self._conn.execute("""
+                    DELETE FROM alerts WHERE id <= (
+                        SELECT id FROM alerts ORDER BY id DESC LIMIT 1 OFFSET ?
+                    )
+                """, (self.max_rows,)).rowcount
+
+        self.stats['pruned'] += deleted
+        return deleted
+
+    def migrate_json(self, json_path: str = 'alerts_history.json') -> int:
+        """
+        Import a legacy alerts_history.json file once (renamed to *.migrated afterwards)
+
+        Returns:
+            Number of alerts imported
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        try:
+            with open(json_path, 'r') as f:
+                history = json.load(f)
+        except Exception as e:
+            print(f"   ⚠️  Failed to read {json_path}: {e}")
+            return 0
+
+        for alert in history:
+            self.append(alert)
+        self.flush()
+
+        os.replace(json_path, json_path + '.migrated')
+        print(f"📦 Migrated {len(history)} alerts from {json_path}")
+        return len(history)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def query(self, symbol: Optional[str] = None, alert_type: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """
+        Read alerts, newest first
+
+        Args:
+            symbol: Filter by ticker
+            alert_type: Filter by alert type (e.g. ENTRY_SIGNAL)
+            since: Only alerts at or after this ISO timestamp
+            until: Only alerts before this ISO timestamp
+            limit: Maximum alerts to return
+
+        Returns:
+            List of alert dictionaries
+        """
+        self.flush()
+
+        query = "SELECT payload FROM alerts WHERE 1=1"
+        params = []
+
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol.upper())
+        if alert_type:
+            query += " AND type = ?"
+            params.append(alert_type)
+        if since:
+            query += " AND created_at >= ?"
+            params.append(since)
+        if until:
+            query += " AND created_at < ?"
+            params.append(until)
+
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._db_lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [json.loads(row['payload']) for row in rows]
+
+    def count_by_type(self, since: Optional[str] = None) -> Dict[str, int]:
+        """Number of alerts per type"""
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT type, COUNT(*) AS n FROM alerts WHERE created_at >= ? GROUP BY type",
+                (since or '',)
+            ).fetchall()
+        return {row['type']: row['n'] for row in rows}
+
+    def get_stats(self) -> Dict:
+        """Journal size and writer counters"""
+        with self._db_lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+        with self._cond:
+            buffered = len(self._buffer)
+        return dict(self.stats, rows=total, buffered=buffered)
+
+    def close(self):
+        """Flush and close the journal"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._writer.join(5)
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
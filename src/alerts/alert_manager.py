@@ -0,0 +1,376 @@
+"""
+User-defined price and indicator alerts
+"""
+
+import os
+import sys
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field as dataclass_field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.alerts.rule_index import RuleIndex
+from src.utils.watchlist_executor import WatchlistExecutor
+
+
+# alert_type -> (market data field, direction)
+THRESHOLD_ALERTS = {
+    'price_above': ('current_price', 'above'),
+    'price_below': ('current_price', 'below'),
+    'change_above': ('change_percent', 'above'),
+    'change_below': ('change_percent', 'below'),
+    'rvol_above': ('rvol', 'above'),
+    'volume_above': ('volume', 'above'),
+    'gap_above': ('gap_percent', 'above'),
+    'rsi_above': ('rsi', 'above'),
+    'rsi_below': ('rsi', 'below'),
+    'vwap_above': ('vwap', 'above'),
+    'vwap_below': ('vwap', 'below'),
+}
+
+EVENT_ALERTS = ('setup_detected', 'sentiment_flip')
+
+
+@dataclass
+class Alert:
+    """A user-defined alert rule"""
+    id: int
+    symbol: str
+    alert_type: str
+    message: str
+    field: Optional[str] = None
+    condition: Optional[str] = None
+    value: Optional[float] = None
+    repeat: bool = False
+    active: bool = True
+    created_at: str = dataclass_field(default_factory=lambda: datetime.now().isoformat())
+    triggered_at: Optional[str] = None
+    triggered_value: Optional[float] = None
+    trigger_count: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class AlertManager:
+    """
+    Manages user-defined alerts and checks them against live market data.
+
+    Rules are compiled into a RuleIndex, so a quote update only evaluates the
+    rules whose thresholds it crossed. Supported alert types:
+    - Threshold alerts: price_above/below, change_above/below, rvol_above,
+      volume_above, gap_above, rsi_above/below, vwap_above/below, or
+      'indicator' with an explicit field and condition
+    - Event alerts: setup_detected (Ross Cameron setup appears),
+      sentiment_flip (social sentiment changes sign)
+    """
+
+    def __init__(self, check_interval: int = 60, market_data=None, setup_analyzer=None,
+                 social_intelligence=None, max_workers: int = 8):
+        """
+        Args:
+            check_interval: Seconds between market data polls
+            market_data: MarketDataFetcher (created lazily if not given)
+            setup_analyzer: RossCameronAnalyzer for setup_detected alerts (created lazily)
+            social_intelligence: SocialIntelligence for sentiment_flip alerts (created lazily)
+            max_workers: Symbols fetched at once per poll
+        """
+        self.check_interval = check_interval
+        self.market_data = market_data
+        self.setup_analyzer = setup_analyzer
+        self.social_intelligence = social_intelligence
+
+        self.alerts: Dict[int, Alert] = {}
+        self.index = RuleIndex()
+        self.triggered = deque(maxlen=500)
+        self.listeners: List[Callable[[Alert, Dict], None]] = []
+
+        self.executor = WatchlistExecutor(max_workers=max_workers, name='alert-manager')
+        self.running = False
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Last setup / sentiment sign per symbol for event alerts
+        self._last_setup: Dict[str, Optional[str]] = {}
+        self._last_sentiment_sign: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Alert management
+    # ------------------------------------------------------------------
+
+    def add_alert(self, symbol: str, alert_type: str, value: Optional[float] = None,
+                  field: Optional[str] = None, condition: Optional[str] = None,
+                  message: Optional[str] = None, repeat: bool = False, **kwargs) -> Alert:
+        """
+        Create an alert
+
+        Args:
+            symbol: Stock ticker symbol
+            alert_type: One of THRESHOLD_ALERTS, EVENT_ALERTS or 'indicator'
+            value: Threshold (also accepted as target_price / threshold)
+            field: Market data field for 'indicator' alerts (e.g. rsi, rvol)
+            condition: 'above' or 'below' for 'indicator' alerts
+            message: Custom message (generated if omitted)
+            repeat: Keep the alert active after it triggers
+
+        Returns:
+            The created Alert
+        """
+        symbol = symbol.upper()
+        if value is None:
+            value = kwargs.get('target_price', kwargs.get('threshold'))
+
+        if alert_type in THRESHOLD_ALERTS:
+            field, condition = THRESHOLD_ALERTS[alert_type]
+        elif alert_type == 'indicator':
+            if not field or condition not in RuleIndex.DIRECTIONS:
+                raise ValueError("indicator alerts need a field and condition ('above' or 'below')")
+        elif alert_type not in EVENT_ALERTS:
+            raise ValueError(f"Unknown alert type: {alert_type}")
+
+        if alert_type not in EVENT_ALERTS:
+            if value is None:
+                raise ValueError(f"{alert_type} alerts need a value")
+            value = float(value)
+
+        with self._lock:
+            alert_id = self._next_id
+            self._next_id += 1
+
+        alert = Alert(
+            id=alert_id,
+            symbol=symbol,
+            alert_type=alert_type,
+            message=message or self._default_message(symbol, alert_type, field, condition, value),
+            field=field,
+            condition=condition,
+            value=value,
+            repeat=bool(repeat)
+        )
+
+        with self._lock:
+            self.alerts[alert_id] = alert
+
+        if alert_type in EVENT_ALERTS:
+            self.index.add_event(alert_id, symbol, alert_type)
+        else:
+            self.index.add_threshold(alert_id, symbol, field, condition, value)
+
+        print(f"🔔 Alert #{alert_id} added: {alert.message}")
+        return alert
+
+    def remove_alert(self, alert_id: int):
+        """Delete an alert"""
+        with self._lock:
+            if alert_id not in self.alerts:
+                raise ValueError(f"Alert {alert_id} not found")
+            del self.alerts[alert_id]
+        self.index.remove(alert_id)
+
+    def export_alerts(self) -> List[Dict]:
+        """All alerts as dictionaries, newest first"""
+        with self._lock:
+            alerts = list(self.alerts.values())
+        return [alert.to_dict() for alert in sorted(alerts, key=lambda a: a.id, reverse=True)]
+
+    def get_triggered(self, limit: int = 50) -> List[Dict]:
+        """Recently triggered alerts, newest first"""
+        return list(self.triggered)[-limit:][::-1]
+
+    def add_listener(self, callback: Callable[[Alert, Dict], None]):
+        """Register a callback invoked as callback(alert, event) when an alert triggers"""
+        self.listeners.append(callback)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def process_quote(self, symbol: str, data: Dict) -> List[Alert]:
+        """
+        Check a market data update against the index
+
+        Args:
+            symbol: Stock ticker symbol
+            data: MarketDataFetcher.get_current_data output (or any field -> value dict)
+
+        Returns:
+            Alerts triggered by this update
+        """
+        if data.get('data_available') is False:
+            return []
+
+        symbol = symbol.upper()
+        triggered = []
+
+        for alert_id in self.index.update(symbol, data):
+            rule = self.alerts.get(alert_id)
+            alert = self._trigger(alert_id, data.get(rule.field)) if rule else None
+            if alert:
+                triggered.append(alert)
+
+        if self.index.has_event(symbol, 'setup_detected'):
+            triggered.extend(self._check_setup(symbol, data))
+
+        return triggered
+
+    def process_sentiment(self, symbol: str, score: float) -> List[Alert]:
+        """
+        Check a social sentiment score for a sign flip
+
+        Returns:
+            Alerts triggered by this update
+        """
+        symbol = symbol.upper()
+        sign = (score > 0) - (score < 0)
+        previous = self._last_sentiment_sign.get(symbol)
+        self._last_sentiment_sign[symbol] = sign
+
+        if previous is None or sign == 0 or previous == 0 or sign == previous:
+            return []
+
+        triggered = []
+        for alert_id in self.index.fire_event(symbol, 'sentiment_flip'):
+            alert = self._trigger(alert_id, score)
+            if alert:
+                triggered.append(alert)
+        return triggered
+
+    def _check_setup(self, symbol: str, data: Dict) -> List[Alert]:
+        if self.setup_analyzer is None:
+            from src.analysis.ross_cameron_setups import RossCameronAnalyzer
+            self.setup_analyzer = RossCameronAnalyzer()
+
+        setup = self.setup_analyzer.analyze_setup(data)
+        setup_type = setup.get('setup_type') if setup.get('setup_valid') else None
+        previous = self._last_setup.get(symbol)
+        self._last_setup[symbol] = setup_type
+
+        if not setup_type or setup_type == previous:
+            return []
+
+        triggered = []
+        for alert_id in self.index.fire_event(symbol, 'setup_detected'):
+            alert = self._trigger(alert_id, None, {'setup_type': setup_type})
+            if alert:
+                triggered.append(alert)
+        return triggered
+
+    def _trigger(self, alert_id: int, value, details: Optional[Dict] = None) -> Optional[Alert]:
+        with self._lock:
+            alert = self.alerts.get(alert_id)
+            if alert is None or not alert.active:
+                return None
+
+            alert.triggered_at = datetime.now().isoformat()
+            alert.triggered_value = value
+            alert.trigger_count += 1
+            if not alert.repeat:
+                alert.active = False
+
+        # One-shot alerts leave the index so they are never matched again
+        if not alert.repeat:
+            self.index.remove(alert_id)
+
+        event = {'alert_id': alert.id, 'symbol': alert.symbol, 'alert_type': alert.alert_type,
+                 'message': alert.message, 'value': value, 'timestamp': alert.triggered_at}
+        if details:
+            event.update(details)
+        self.triggered.append(event)
+
+        print(f"🚨 Alert #{alert.id} triggered: {alert.message}")
+        for callback in self.listeners:
+            try:
+                callback(alert, event)
+            except Exception as e:
+                print(f"   ⚠️  Alert listener failed: {e}")
+
+        return alert
+
+    # ------------------------------------------------------------------
+    # Monitoring
+    # ------------------------------------------------------------------
+
+    def check_alerts(self) -> List[Alert]:
+        """
+        Fetch market data once for every symbol with active alerts and check them
+
+        Returns:
+            Alerts triggered in this cycle
+        """
+        symbols = sorted(self.index.symbols())
+        if not symbols:
+            return []
+
+        if self.market_data is None:
+            from src.data.market_data import MarketDataFetcher
+            self.market_data = MarketDataFetcher()
+
+        sentiment_symbols = {s for s in symbols if self.index.has_event(s, 'sentiment_flip')}
+        if sentiment_symbols and self.social_intelligence is None:
+            from src.analysis.social_intelligence import SocialIntelligence
+            self.social_intelligence = SocialIntelligence()
+
+        def check(symbol):
+            triggered = self.process_quote(symbol, self.market_data.get_current_data(symbol))
+            if symbol in sentiment_symbols:
+                analysis = self.social_intelligence.analyze_stock(symbol)
+                triggered.extend(self.process_sentiment(symbol, analysis['sentiment']['score']))
+            return triggered
+
+        triggered = []
+        for result in self.executor.run(symbols, check):
+            triggered.extend(result)
+        return triggered
+
+    def start_monitoring(self):
+        """Start checking alerts in a background thread"""
+        if self.running:
+            return
+
+        self.running = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._monitor, name='alert-manager', daemon=True)
+        self._thread.start()
+        print(f"🔔 Alert monitoring started (every {self.check_interval}s)")
+
+    def stop_monitoring(self):
+        """Stop the background thread"""
+        self.running = False
+        self._stop.set()
+
+    def _monitor(self):
+        while not self._stop.is_set():
+            try:
+                self.check_alerts()
+            except Exception as e:
+                print(f"❌ Error checking alerts: {e}")
+            self._stop.wait(self.check_interval)
+
+    def get_stats(self) -> Dict:
+        """Alert counts and rule index statistics"""
+        with self._lock:
+            active = sum(1 for alert in self.alerts.values() if alert.active)
+            total = len(self.alerts)
+        return {
+            'alerts': total,
+            'active': active,
+            'triggered': len(self.triggered),
+            'index': self.index.get_stats(),
+            'last_check': self.executor.last_scan
+        }
+
+    @staticmethod
+    def _default_message(symbol: str, alert_type: str, field: Optional[str],
+                         condition: Optional[str], value: Optional[float]) -> str:
+        if alert_type == 'setup_detected':
+            return f"${symbol}: momentum setup detected"
+        if alert_type == 'sentiment_flip':
+            return f"${symbol}: social sentiment flipped"
+        return f"${symbol}: {field} {condition} {value:g}"
@@ -0,0 +1,483 @@
+"""
+Outbound notification dispatcher
+Queues push notifications and delivers them from background workers so a slow
+provider never blocks alert evaluation
+"""
+
+import heapq
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.utils.rate_limiter import get_rate_limiter
+
+
+class DeliveryError(Exception):
+    """A notification could not be delivered"""
+
+    def __init__(self, message: str, retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class NotificationChannel:
+    """
+    Base class for a push channel.
+
+    Each channel owns a pooled requests.Session and draws from the process-wide
+    rate limiter named after the channel (see PLATFORM_RATE_LIMITS).
+    """
+
+    name = 'channel'
+    # Provider limit on the message body (UTF-16 code units), None = unlimited
+    max_body_length: Optional[int] = None
+
+    def __init__(self, recipients: List[str], timeout: Tuple[float, float] = (3.0, 10.0),
+                 pool_size: int = 10):
+        """
+        Args:
+            recipients: Device tokens / chat IDs / URLs notifications go to
+            timeout: (connect, read) timeout in seconds
+            pool_size: Keep-alive connections kept open to the provider
+        """
+        self.recipients = recipients
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.rate_limiter = get_rate_limiter(self.name)
+
+    def send(self, recipient: str, title: str, body: str, alerts: List[Dict]):
+        """Deliver one (possibly digest) message - raise DeliveryError on failure"""
+        raise NotImplementedError
+
+    def fits(self, body: str) -> bool:
+        """Whether the body is within the provider's length limit"""
+        return self.max_body_length is None or len(body.encode('utf-16-le')) // 2 <= self.max_body_length
+
+    def truncate(self, body: str) -> str:
+        """Cut a body that is over the limit, marking the cut"""
+        if self.fits(body):
+            return body
+        suffix = '\n…'
+        text = body[:self.max_body_length - len(suffix)]
+        # Characters outside the BMP take two code units
+        excess = len((text + suffix).encode('utf-16-le')) // 2 - self.max_body_length
+        if excess > 0:
+            text = text[:-excess]
+        return text + suffix
+
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        try:
+            response = self.session.post(url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise DeliveryError(f"{self.name} request failed: {e}")
+
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After')
+            raise DeliveryError(f"{self.name} rate limited", retry_after=float(retry_after) if retry_after else None)
+        if response.status_code >= 500:
+            raise DeliveryError(f"{self.name} error: {response.status_code}")
+        if response.status_code >= 400:
+            raise DeliveryError(f"{self.name} rejected: {response.status_code}", retryable=False)
+        return response
+
+    def close(self):
+        self.session.close()
+
+
+class FirebaseChannel(NotificationChannel):
+    """Firebase Cloud Messaging"""
+
+    name = 'firebase'
+    url = 'https://fcm.googleapis.com/fcm/send'
+
+    def __init__(self, server_key: str, recipients: List[str], **kwargs):
+        super().__init__(recipients, **kwargs)
+        self.session.headers.update({
+            'Authorization': f'key={server_key}',
+            'Content-Type': 'application/json'
+        })
+
+    def send(self, recipient: str, title: str, body: str, alerts: List[Dict]):
+        self._post(self.url, json={
+            'to': recipient,
+            'notification': {
+                'title': title,
+                'body': body,
+                'sound': 'default',
+                'priority': 'high'
+            },
+            'data': alerts[0] if len(alerts) == 1 else {'alerts': alerts}
+        })
+
+
+class TelegramChannel(NotificationChannel):
+    """Telegram Bot"""
+
+    name = 'telegram'
+    max_body_length = 4096
+
+    def __init__(self, bot_token: str, recipients: List[str], **kwargs):
+        super().__init__(recipients, **kwargs)
+        self.url = f'https://api.telegram.org/bot{bot_token}/sendMessage'
+
+    def send(self, recipient: str, title: str, body: str, alerts: List[Dict]):
+        self._post(self.url, json={
+            'chat_id': recipient,
+            'text': body,
+            'parse_mode': 'HTML'
+        })
+
+
+class WebhookChannel(NotificationChannel):
+    """Generic JSON webhook - each recipient is a URL"""
+
+    name = 'webhook'
+
+    def send(self, recipient: str, title: str, body: str, alerts: List[Dict]):
+        self._post(recipient, json={'title': title, 'body': body, 'alerts': alerts})
+
+
+def create_channel(service: str) -> Optional[NotificationChannel]:
+    """
+    Build a channel from environment credentials
+
+    Args:
+        service: 'firebase', 'telegram' or 'webhook'
+
+    Returns:
+        The channel, or None if it isn't configured
+    """
+    if service == 'firebase':
+        server_key = os.getenv('FCM_SERVER_KEY')
+        tokens = [t for t in os.getenv('FCM_DEVICE_TOKEN', '').split(',') if t]
+        if server_key and tokens:
+            return FirebaseChannel(server_key, tokens)
+        print("   ⚠️  FCM credentials not configured")
+
+    elif service == 'telegram':
+        bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
+        chat_ids = [c for c in os.getenv('TELEGRAM_CHAT_ID', '').split(',') if c]
+        if bot_token and chat_ids:
+            return TelegramChannel(bot_token, chat_ids)
+        print("   ⚠️  Telegram credentials not configured")
+
+    elif service == 'webhook':
+        urls = [u for u in os.getenv('ALERT_WEBHOOK_URL', '').split(',') if u]
+        if urls:
+            return WebhookChannel(urls)
+        print("   ⚠️  Webhook URL not configured")
+
+    else:
+        print(f"   ⚠️  {service} notifications not yet implemented")
+
+    return None
+
+
+class NotificationDispatcher:
+    """
+    Asynchronous outbound notification queue.
+
+    dispatch() only appends to a per-(channel, recipient) buffer and returns.
+    A scheduler releases each buffer once its coalescing window has passed, so a
+    burst of alerts for the same recipient goes out as a single digest. Worker
+    threads deliver through the channel's pooled session under the channel rate
+    limit; failures are rescheduled with exponential backoff instead of holding
+    a worker.
+    """
+
+    def __init__(self, workers: int = 4, coalesce_seconds: float = 2.0, max_retries: int = 3,
+                 backoff_seconds: float = 1.0, max_backoff_seconds: float = 30.0,
+                 max_pending: int = 10000, max_digest: int = 20):
+        """
+        Args:
+            workers: Delivery threads
+            coalesce_seconds: Window in which alerts for one recipient are merged
+            max_retries: Attempts after the first one before a message is dropped
+            backoff_seconds: First retry delay (doubles each attempt, with jitter)
+            max_backoff_seconds: Upper bound on the retry delay
+            max_pending: Alerts buffered before new ones are dropped
+            max_digest: Maximum alerts merged into one digest
+        """
+        self.workers = workers
+        self.coalesce_seconds = coalesce_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_pending = max_pending
+        self.max_digest = max_digest
+
+        self.channels: Dict[str, NotificationChannel] = {}
+
+        self._buffers: Dict[Tuple[str, str], List[Tuple[Dict, str, float]]] = {}
+        self._schedule: List[Tuple[float, int, Tuple]] = []  # (due, seq, job)
+        self._ready: deque = deque()
+        self._seq = 0
+        self._pending = 0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self._latencies = deque(maxlen=1000)
+
+        self.stats = {
+            'enqueued': 0,
+            'dropped': 0,
+            'messages': 0,
+            'digests': 0,
+            'delivered_alerts': 0,
+            'retries': 0,
+            'split_digests': 0,
+            'failed': 0
+        }
+
+    def add_channel(self, channel: NotificationChannel):
+        """Register a channel - alerts are sent to every recipient of every channel"""
+        self.channels[channel.name] = channel
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def dispatch(self, alert: Dict, message: str) -> bool:
+        """
+        Queue an alert for delivery (never blocks on the network)
+
+        Args:
+            alert: Alert dictionary (needs 'type' and 'symbol')
+            message: Formatted notification text
+
+        Returns:
+            False if the queue is full and the alert was dropped
+        """
+        now = time.monotonic()
+
+        with self._cond:
+            if self._pending >= self.max_pending:
+                self.stats['dropped'] += 1
+                return False
+
+            for channel in self.channels.values():
+                for recipient in channel.recipients:
+                    key = (channel.name, recipient)
+                    buffer = self._buffers.get(key)
+                    if buffer is None:
+                        self._buffers[key] = [(alert, message, now)]
+                        self._push(now + self.coalesce_seconds, ('flush', key))
+                    else:
+                        buffer.append((alert, message, now))
+                    self._pending += 1
+
+            self.stats['enqueued'] += 1
+            self._cond.notify_all()
+
+        return True
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the scheduler and delivery workers"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+
+        self._threads = [threading.Thread(target=self._schedule_loop, name='notify-scheduler', daemon=True)]
+        self._threads += [threading.Thread(target=self._worker_loop, name=f'notify-{i}', daemon=True)
+                          for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop all threads (undelivered messages are discarded)"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        for channel in self.channels.values():
+            channel.close()
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """
+        Deliver everything queued now, skipping the coalescing window
+
+        Returns:
+            True if the queue drained before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._schedule = [(min(due, time.monotonic()), seq, job) for due, seq, job in self._schedule]
+            heapq.heapify(self._schedule)
+            self._cond.notify_all()
+
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+
+    def _push(self, due: float, job: Tuple):
+        self._seq += 1
+        heapq.heappush(self._schedule, (due, self._seq, job))
+
+    def _schedule_loop(self):
+        """Move due jobs onto the ready queue"""
+        with self._cond:
+            while self._running:
+                now = time.monotonic()
+                while self._schedule and self._schedule[0][0] <= now:
+                    _, _, job = heapq.heappop(self._schedule)
+                    self._ready.append(job)
+                    self._cond.notify_all()
+
+                timeout = self._schedule[0][0] - now if self._schedule else None
+                self._cond.wait(timeout)
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while self._running and not self._ready:
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+                job = self._ready.popleft()
+                if job[0] == 'flush':
+                    # Take the whole buffer - later alerts start a new window
+                    key = job[1]
+                    entries = self._buffers.pop(key, [])
+                    if len(entries) > self.max_digest:
+                        self._buffers[key] = entries[self.max_digest:]
+                        self._ready.append(('flush', key))
+                        entries = entries[:self.max_digest]
+                    # Digests over the channel's length limit go out as several messages
+                    groups = self._split(key, entries)
+                    if len(groups) > 1:
+                        self.stats['split_digests'] += 1
+                        self._ready.extend(('send', key, group, 0) for group in groups[1:])
+                        self._cond.notify_all()
+                    job = ('send', key, groups[0], 0)
+
+                self._in_flight += 1
+
+            try:
+                self._deliver(*job[1:])
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+    def _deliver(self, key: Tuple[str, str], entries: List[Tuple[Dict, str, float]], attempt: int):
+        channel_name, recipient = key
+        channel = self.channels.get(channel_name)
+        if channel is None or not entries:
+            self._finish(entries, delivered=False)
+            return
+
+        title, body = self._compose([(alert, message) for alert, message, _ in entries])
+        body = channel.truncate(body)
+
+        try:
+            channel.rate_limiter.acquire()
+            channel.send(recipient, title, body, [alert for alert, _, _ in entries])
+
+        except DeliveryError as e:
+            if e.retryable and attempt < self.max_retries:
+                delay = e.retry_after or min(self.max_backoff_seconds,
+                                             self.backoff_seconds * (2 ** attempt))
+                delay *= random.uniform(0.8, 1.2)
+                with self._cond:
+                    self.stats['retries'] += 1
+                    self._push(time.monotonic() + delay, ('send', key, entries, attempt + 1))
+                    self._cond.notify_all()
+                return
+
+            print(f"   ❌ {channel_name} delivery failed: {e}")
+            self._finish(entries, delivered=False)
+            return
+
+        except Exception as e:
+            print(f"   ❌ {channel_name} delivery failed: {e}")
+            self._finish(entries, delivered=False)
+            return
+
+        self._finish(entries, delivered=True)
+
+    def _finish(self, entries: List[Tuple[Dict, str, float]], delivered: bool):
+        now = time.monotonic()
+        with self._cond:
+            self._pending -= len(entries)
+            if delivered:
+                self.stats['messages'] += 1
+                self.stats['delivered_alerts'] += len(entries)
+                if len(entries) > 1:
+                    self.stats['digests'] += 1
+                self._latencies.extend(now - queued_at for _, _, queued_at in entries)
+            else:
+                self.stats['failed'] += len(entries)
+            self._cond.notify_all()
+
+    def _split(self, key: Tuple[str, str], entries: List[Tuple[Dict, str, float]]) -> List[List]:
+        """Pack entries into as few digests as fit the channel's length limit"""
+        channel = self.channels.get(key[0])
+        if channel is None or channel.max_body_length is None or len(entries) == 1:
+            return [entries]
+
+        groups, current = [], []
+        for entry in entries:
+            candidate = current + [entry]
+            if current and not channel.fits(self._compose([(a, m) for a, m, _ in candidate])[1]):
+                groups.append(current)
+                candidate = [entry]
+            current = candidate
+        groups.append(current)
+        return groups
+
+    @staticmethod
+    def _compose(items: List[Tuple[Dict, str]]) -> Tuple[str, str]:
+        """Single alert -> its own message, several -> one digest"""
+        if len(items) == 1:
+            alert, message = items[0]
+            return f"{alert['type']}: {alert['symbol']}", message
+
+        symbols = list(dict.fromkeys(alert['symbol'] for alert, _ in items))
+        title = f"{len(items)} alerts: {', '.join(symbols[:5])}" + ('…' if len(symbols) > 5 else '')
+        separator = '\n\n' + '─' * 20 + '\n\n'
+        return title, f"🔔 {title}{separator}" + separator.join(message for _, message in items)
+
+    def get_stats(self) -> Dict:
+        """Counters, queue depth and enqueue-to-delivery latency (seconds)"""
+        with self._cond:
+            latencies = sorted(self._latencies)
+            stats = dict(self.stats, pending=self._pending, in_flight=self._in_flight,
+                         channels=list(self.channels))
+
+        if latencies:
+            stats['latency_seconds'] = {
+                'p50': round(latencies[len(latencies) // 2], 3),
+                'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                'max': round(latencies[-1], 3)
+            }
+        return stats
@@ -0,0 +1,239 @@
+"""
+Compiled alert rule index
+Per-symbol, per-field sorted threshold arrays so each update only touches the
+rules whose thresholds it crossed
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class _ThresholdArray:
+    """
+    Sorted thresholds for one (symbol, field, direction) with a parallel rule ID list
+    """
+
+    __slots__ = ('thresholds', 'rule_ids')
+
+    def __init__(self):
+        self.thresholds: List[float] = []
+        self.rule_ids: List[int] = []
+
+    def insert(self, threshold: float, rule_id: int):
+        position = bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(position, threshold)
+        self.rule_ids.insert(position, rule_id)
+
+    def remove(self, threshold: float, rule_id: int) -> bool:
+        position = bisect_left(self.thresholds, threshold)
+        while position < len(self.thresholds) and self.thresholds[position] == threshold:
+            if self.rule_ids[position] == rule_id:
+                del self.thresholds[position]
+                del self.rule_ids[position]
+                return True
+            position += 1
+        return False
+
+    def __len__(self):
+        return len(self.thresholds)
+
+
+class RuleIndex:
+    """
+    Threshold and event rules compiled into lookup structures.
+
+    Threshold rules ('above' / 'below') live in sorted arrays keyed by
+    (symbol, field, direction). When a field moves from prev to cur, the rules
+    it crossed are one contiguous slice of the array, found with two bisects:
+
+        above:  prev <  threshold <= cur
+        below:  cur  <= threshold <  prev
+
+    so an update costs O(log n + fired) no matter how many rules are active.
+    Event rules (e.g. setup_detected, sentiment_flip) are plain
+    (symbol, event) -> rule ID sets.
+    """
+
+    DIRECTIONS = ('above', 'below')
+
+    def __init__(self):
+        self._arrays: Dict[Tuple[str, str, str], _ThresholdArray] = {}
+        self._events: Dict[Tuple[str, str], Set[int]] = {}
+        self._rules: Dict[int, Tuple] = {}  # rule_id -> compiled key
+        self._last: Dict[Tuple[str, str], float] = {}
+        self._pending: Dict[Tuple[str, str], Set[int]] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {'updates': 0, 'candidates': 0}
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def add_threshold(self, rule_id: int, symbol: str, field: str, direction: str, threshold: float):
+        """
+        Add a threshold rule
+
+        Args:
+            rule_id: Unique rule ID
+            symbol: Stock ticker symbol
+            field: Market data field (e.g. current_price, rvol)
+            direction: 'above' or 'below'
+            threshold: Value that has to be crossed
+        """
+        if direction not in self.DIRECTIONS:
+            raise ValueError(f"Unknown direction: {direction}")
+
+        symbol = symbol.upper()
+        threshold = float(threshold)
+
+        with self._lock:
+            key = (symbol, field, direction)
+            self._arrays.setdefault(key, _ThresholdArray()).insert(threshold, rule_id)
+            self._rules[rule_id] = ('threshold', key, threshold)
+
+            # Already on the far side of the threshold - fire on the next update
+            last = self._last.get((symbol, field))
+            if last is not None and self._holds(direction, last, threshold):
+                self._pending.setdefault((symbol, field), set()).add(rule_id)
+
+    def add_event(self, rule_id: int, symbol: str, event: str):
+        """
+        Add an event rule
+
+        Args:
+            rule_id: Unique rule ID
+            symbol: Stock ticker symbol
+            event: Event name (e.g. setup_detected, sentiment_flip)
+        """
+        key = (symbol.upper(), event)
+        with self._lock:
+            self._events.setdefault(key, set()).add(rule_id)
+            self._rules[rule_id] = ('event', key, None)
+
+    def remove(self, rule_id: int) -> bool:
+        """
+        Remove a rule
+
+        Returns:
+            True if the rule was indexed
+        """
+        with self._lock:
+            compiled = self._rules.pop(rule_id, None)
+            if compiled is None:
+                return False
+
+            kind, key, threshold = compiled
+            if kind == 'threshold':
+                array = self._arrays[key]
+                array.remove(threshold, rule_id)
+                if not array:
+                    del self._arrays[key]
+                pending = self._pending.get(key[:2])
+                if pending:
+                    pending.discard(rule_id)
+            else:
+                rule_ids = self._events[key]
+                rule_ids.discard(rule_id)
+                if not rule_ids:
+                    del self._events[key]
+            return True
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def update(self, symbol: str, values: Dict[str, float]) -> List[int]:
+        """
+        Apply new field values for a symbol
+
+        Args:
+            symbol: Stock ticker symbol
+            values: Field -> new value (non-numeric values are ignored)
+
+        Returns:
+            IDs of threshold rules crossed by this update
+        """
+        symbol = symbol.upper()
+        fired: List[int] = []
+
+        with self._lock:
+            self.stats['updates'] += 1
+
+            for field, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+
+                value = float(value)
+                prev = self._last.get((symbol, field))
+                self._last[(symbol, field)] = value
+
+                pending = self._pending.pop((symbol, field), None)
+
+                above = self._arrays.get((symbol, field, 'above'))
+                if above:
+                    if prev is None:
+                        lo, hi = 0, bisect_right(above.thresholds, value)
+                    elif value > prev:
+                        lo, hi = bisect_right(above.thresholds, prev), bisect_right(above.thresholds, value)
+                    else:
+                        lo = hi = 0
+                    fired.extend(above.rule_ids[lo:hi])
+
+                below = self._arrays.get((symbol, field, 'below'))
+                if below:
+                    if prev is None:
+                        lo, hi = bisect_left(below.thresholds, value), len(below)
+                    elif value < prev:
+                        lo, hi = bisect_left(below.thresholds, value), bisect_left(below.thresholds, prev)
+                    else:
+                        lo = hi = 0
+                    fired.extend(below.rule_ids[lo:hi])
+
+                if pending:
+                    for rule_id in pending:
+                        _, (_, _, direction), threshold = self._rules[rule_id]
+                        if self._holds(direction, value, threshold) and rule_id not in fired:
+                            fired.append(rule_id)
+
+            self.stats['candidates'] += len(fired)
+
+        return fired
+
+    def fire_event(self, symbol: str, event: str) -> List[int]:
+        """
+        Returns:
+            IDs of rules subscribed to this event for the symbol
+        """
+        with self._lock:
+            return list(self._events.get((symbol.upper(), event), ()))
+
+    def symbols(self) -> Set[str]:
+        """Symbols that have at least one active rule"""
+        with self._lock:
+            return {key[0] for key in self._arrays} | {key[0] for key in self._events}
+
+    def has_event(self, symbol: str, event: str) -> bool:
+        """Whether any rule listens for this event on the symbol"""
+        with self._lock:
+            return (symbol.upper(), event) in self._events
+
+    def last_value(self, symbol: str, field: str) -> Optional[float]:
+        """Last value seen for a symbol field"""
+        with self._lock:
+            return self._last.get((symbol.upper(), field))
+
+    def get_stats(self) -> Dict:
+        """Index sizes and match counters"""
+        with self._lock:
+            return dict(
+                self.stats,
+                rules=len(self._rules),
+                threshold_arrays=len(self._arrays),
+                event_keys=len(self._events)
+            )
+
+    @staticmethod
+    def _holds(direction: str, value: float, threshold: float) -> bool:
+        return value >= threshold if direction == 'above' else value <= threshold
@@ -6,11 +6,8 @@ Monitors stocks and sends push notifications for trading opportunities
 import os
 import sys
 import time
-import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import schedule
-import requests
 
 # Add parent to path
 parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,6 +15,11 @@ sys.path.insert(0, parent_dir)
 
 from src.analysis.social_intelligence import SocialIntelligence
 from src.data.market_data import MarketDataFetcher
+from src.alerts.alert_engine import AlertEngine
+from src.alerts.alert_journal import AlertJournal
+from src.alerts.notification_dispatcher import NotificationDispatcher, create_channel
+from src.alerts.state_store import AlertStateStore
+from src.utils.watchlist_executor import WatchlistExecutor
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -33,7 +35,15 @@ class SmartAlertSystem:
     - Sentiment changes
     """
 
-    def __init__(self, push_service='firebase'):
+    def __init__(self, push_service='firebase', namespace='default',
+                 state_store: Optional[AlertStateStore] = None):
+        """
+        Args:
+            push_service: Notification channel ('firebase', 'telegram', 'webhook')
+            namespace: Cooldown/state namespace (e.g. a user ID) - monitors sharing
+                       a namespace share cooldowns
+            state_store: Shared cooldown and state store (default: local SQLite file)
+        """
         self.social_intel = SocialIntelligence()
         self.market_data = MarketDataFetcher()
         self.push_service = push_service
@@ -47,11 +57,40 @@ class SmartAlertSystem:
             'volume_spike': 2.0  # 2x average volume
         }
 
+        # Minimum seconds between two alerts of the same type for a symbol
+        self.cooldowns = {
+            'ENTRY_SIGNAL': 1800,
+            'EXIT_SIGNAL': 900,
+            'BREAKOUT': 1800,
+            'SENTIMENT_SHIFT': 3600,
+            'default': 1800
+        }
+
         # Track state
         self.watchlist = []
         self.positions = []
-        self.last_alerts = {}  # Prevent duplicate alerts
-        self.previous_state = {}  # Track previous values
+
+        # Cooldowns and previous values survive restarts and are shared between monitors
+        self.namespace = namespace
+        self.state_store = state_store or AlertStateStore()
+
+        # Rules run when inputs change, not on a timer
+        self.engine = AlertEngine(self)
+        if self.market_data.lake is not None:
+            # Every bar sync of a monitored symbol becomes a bar event
+            self.market_data.lake.add_listener(self._on_bars)
+
+        # Outbound notifications are queued, coalesced and delivered in the background
+        self.dispatcher = NotificationDispatcher()
+        channel = create_channel(push_service)
+        if channel:
+            self.dispatcher.add_channel(channel)
+        self.dispatcher.start()
+
+        # Alert history - picks up the old JSON history file on first run
+        self.journal = AlertJournal()
+        self.journal.migrate_json('alerts_history.json')
+        self.executor = WatchlistExecutor(max_workers=8, name='alert-poll')
 
     def set_watchlist(self, symbols: List[str]):
         """Set stocks to monitor for entry opportunities"""
@@ -75,49 +114,9 @@ class SmartAlertSystem:
 
         for symbol in self.watchlist:
             try:
-                # Get social intelligence
-                social = self.social_intel.analyze_stock(symbol)
-
-                # Get market data
-                market = self.market_data.get_current_data(symbol)
-
-                # Check for strong buy signal
-                if (social['signal'] in ['STRONG_BUY', 'BUY'] and
-                    social['confidence'] >= self.thresholds['strong_buy_confidence']):
-
-                    alert = {
-                        'type': 'ENTRY_SIGNAL',
-                        'symbol': symbol,
-                        'signal': social['signal'],
-                        'confidence': social['confidence'],
-                        'price': market.get('current_price', 0),
-                        'sentiment': social['sentiment']['score'],
-                        'mentions': social['sentiment']['mentions'],
-                        'reasoning': social['reasoning'][:3],  # Top 3 reasons
-                        'timestamp': datetime.now().isoformat()
-                    }
-
+                social, market = self._fetch_symbol(symbol)
+                for alert in self.evaluate_entry_rules(symbol, social, market):
                     self._send_alert(alert)
-
-                # Check for price breakout
-                if market.get('data_available'):
-                    price_change = market.get('change_percent', 0)
-                    volume_ratio = market.get('volume', 0) / market.get('avg_volume', 1) if market.get('avg_volume') else 0
-
-                    if (abs(price_change) >= self.thresholds['price_change_percent'] and
-                        volume_ratio >= self.thresholds['volume_spike']):
-
-                        alert = {
-                            'type': 'BREAKOUT',
-                            'symbol': symbol,
-                            'price': market['current_price'],
-                            'change_percent': price_change,
-                            'volume_ratio': volume_ratio,
-                            'timestamp': datetime.now().isoformat()
-                        }
-
-                        self._send_alert(alert)
-
             except Exception as e:
                 print(f"   ❌ Error scanning {symbol}: {e}")
 
@@ -133,70 +132,131 @@ class SmartAlertSystem:
 
         for symbol in self.positions:
             try:
-                # Get social intelligence
-                social = self.social_intel.analyze_stock(symbol)
-
-                # Get market data
-                market = self.market_data.get_current_data(symbol)
-
-                # Check for sell signal
-                if (social['signal'] in ['STRONG_SELL', 'SELL'] and
-                    social['confidence'] >= self.thresholds['strong_sell_confidence']):
-
-                    alert = {
-                        'type': 'EXIT_SIGNAL',
-                        'symbol': symbol,
-                        'signal': social['signal'],
-                        'confidence': social['confidence'],
-                        'price': market.get('current_price', 0),
-                        'sentiment': social['sentiment']['score'],
-                        'reasoning': social['reasoning'][:3],
-                        'timestamp': datetime.now().isoformat()
-                    }
-
+                social, market = self._fetch_symbol(symbol)
+                for alert in self.evaluate_exit_rules(symbol, social, market):
                     self._send_alert(alert)
+            except Exception as e:
+                print(f"   ❌ Error scanning {symbol}: {e}")
 
-                # Check for sentiment shift
-                prev_sentiment = self.previous_state.get(f"{symbol}_sentiment", 0)
-                current_sentiment = social['sentiment']['score']
+    def _fetch_symbol(self, symbol: str):
+        """Fetch social intelligence and market data for one symbol"""
+        return self.social_intel.analyze_stock(symbol), self.market_data.get_current_data(symbol)
 
-                if prev_sentiment > 0.3 and current_sentiment < 0:
-                    alert = {
-                        'type': 'SENTIMENT_SHIFT',
-                        'symbol': symbol,
-                        'previous_sentiment': prev_sentiment,
-                        'current_sentiment': current_sentiment,
-                        'change': current_sentiment - prev_sentiment,
-                        'timestamp': datetime.now().isoformat()
-                    }
+    def evaluate_entry_rules(self, symbol: str, social: Optional[Dict], market: Dict) -> List[Dict]:
+        """
+        Entry rules for a watchlist symbol
 
-                    self._send_alert(alert)
+        Args:
+            symbol: Stock ticker symbol
+            social: Latest SocialIntelligence analysis (None if not available yet)
+            market: Latest market snapshot
 
-                # Update state
-                self.previous_state[f"{symbol}_sentiment"] = current_sentiment
+        Returns:
+            List of alerts to send
+        """
+        alerts = []
+
+        # Check for strong buy signal
+        if (social and social['signal'] in ['STRONG_BUY', 'BUY'] and
+                social['confidence'] >= self.thresholds['strong_buy_confidence']):
+
+            alerts.append({
+                'type': 'ENTRY_SIGNAL',
+                'symbol': symbol,
+                'signal': social['signal'],
+                'confidence': social['confidence'],
+                'price': market.get('current_price', 0),
+                'sentiment': social['sentiment']['score'],
+                'mentions': social['sentiment']['mentions'],
+                'reasoning': social['reasoning'][:3],  # Top 3 reasons
+                'timestamp': datetime.now().isoformat()
+            })
+
+        # Check for price breakout
+        if market.get('data_available'):
+            price_change = market.get('change_percent', 0)
+            volume_ratio = market.get('volume', 0) / market.get('avg_volume', 1) if market.get('avg_volume') else 0
+
+            if (abs(price_change) >= self.thresholds['price_change_percent'] and
+                    volume_ratio >= self.thresholds['volume_spike']):
+
+                alerts.append({
+                    'type': 'BREAKOUT',
+                    'symbol': symbol,
+                    'price': market['current_price'],
+                    'change_percent': price_change,
+                    'volume_ratio': volume_ratio,
+                    'timestamp': datetime.now().isoformat()
+                })
+
+        return alerts
+
+    def evaluate_exit_rules(self, symbol: str, social: Optional[Dict], market: Dict) -> List[Dict]:
+        """
+        Exit rules for a held position
 
-            except Exception as e:
-                print(f"   ❌ Error scanning {symbol}: {e}")
+        Args:
+            symbol: Stock ticker symbol
+            social: Latest SocialIntelligence analysis (None if not available yet)
+            market: Latest market snapshot
+
+        Returns:
+            List of alerts to send
+        """
+        alerts = []
+
+        if not social:
+            return alerts
+
+        # Check for sell signal
+        if (social['signal'] in ['STRONG_SELL', 'SELL'] and
+                social['confidence'] >= self.thresholds['strong_sell_confidence']):
+
+            alerts.append({
+                'type': 'EXIT_SIGNAL',
+                'symbol': symbol,
+                'signal': social['signal'],
+                'confidence': social['confidence'],
+                'price': market.get('current_price', 0),
+                'sentiment': social['sentiment']['score'],
+                'reasoning': social['reasoning'][:3],
+                'timestamp': datetime.now().isoformat()
+            })
+
+        # Check for sentiment shift (and update state)
+        current_sentiment = social['sentiment']['score']
+        prev_sentiment = self.state_store.swap_state(
+            f"{self.namespace}:{symbol}:sentiment", current_sentiment, default=0
+        )
+
+        if prev_sentiment > 0.3 and current_sentiment < 0:
+            alerts.append({
+                'type': 'SENTIMENT_SHIFT',
+                'symbol': symbol,
+                'previous_sentiment': prev_sentiment,
+                'current_sentiment': current_sentiment,
+                'change': current_sentiment - prev_sentiment,
+                'timestamp': datetime.now().isoformat()
+            })
+
+        return alerts
 
     def _send_alert(self, alert: Dict):
         """
-        Send push notification
+        Queue push notification
 
         Supports:
         - Firebase Cloud Messaging (FCM)
         - Telegram Bot
-        - Email
-        - SMS (Twilio)
+        - Generic webhook
         """
-        # Prevent duplicate alerts (within 30 minutes)
-        alert_key = f"{alert['symbol']}_{alert['type']}"
-        last_alert_time = self.last_alerts.get(alert_key)
+        # Prevent duplicate alerts - atomically claims the cooldown window for this alert
+        alert_key = f"{self.namespace}:{alert['symbol']}:{alert['type']}"
+        cooldown = self.cooldowns.get(alert['type'], self.cooldowns['default'])
 
-        if last_alert_time:
-            time_diff = (datetime.now() - last_alert_time).seconds
-            if time_diff < 1800:  # 30 minutes
-                print(f"   ⏭️  Skipping duplicate alert for {alert['symbol']}")
-                return
+        if not self.state_store.check_and_set(alert_key, cooldown):
+            print(f"   ⏭️  Skipping duplicate alert for {alert['symbol']}")
+            return
 
         # Format message
         message = self._format_alert_message(alert)
@@ -206,16 +266,8 @@ class SmartAlertSystem:
         print(message)
         print(f"{'='*70}\n")
 
-        # Send via configured service
-        if self.push_service == 'firebase':
-            self._send_firebase(alert, message)
-        elif self.push_service == 'telegram':
-            self._send_telegram(alert, message)
-        elif self.push_service == 'email':
-            self._send_email(alert, message)
-
-        # Update last alert time
-        self.last_alerts[alert_key] = datetime.now()
+        # Hand off to the dispatcher - delivery happens on its worker threads
+        self.dispatcher.dispatch(alert, message)
 
         # Save to alerts history
         self._save_alert_to_history(alert)
@@ -282,102 +334,46 @@ Change: {alert['change']:.2f}
 
         return str(alert)
 
-    def _send_firebase(self, alert: Dict, message: str):
-        """Send via Firebase Cloud Messaging"""
-        fcm_token = os.getenv('FCM_DEVICE_TOKEN')
-        fcm_server_key = os.getenv('FCM_SERVER_KEY')
-
-        if not fcm_token or not fcm_server_key:
-            print("   ⚠️  FCM credentials not configured")
-            return
-
-        url = 'https://fcm.googleapis.com/fcm/send'
-        headers = {
-            'Authorization': f'key={fcm_server_key}',
-            'Content-Type': 'application/json'
-        }
-
-        payload = {
-            'to': fcm_token,
-            'notification': {
-                'title': f"{alert['type']}: {alert['symbol']}",
-                'body': message,
-                'sound': 'default',
-                'priority': 'high'
-            },
-            'data': alert
-        }
-
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-            if response.status_code == 200:
-                print(f"   ✅ Push notification sent via Firebase")
-            else:
-                print(f"   ❌ Firebase error: {response.status_code}")
-        except Exception as e:
-            print(f"   ❌ Firebase send failed: {e}")
-
-    def _send_telegram(self, alert: Dict, message: str):
-        """Send via Telegram Bot"""
-        bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-        chat_id = os.getenv('TELEGRAM_CHAT_ID')
-
-        if not bot_token or not chat_id:
-            print("   ⚠️  Telegram credentials not configured")
-            return
-
-        url = f'https://api.telegram.org/bot{bot_token}/sendMessage'
-        payload = {
-            'chat_id': chat_id,
-            'text': message,
-            'parse_mode': 'HTML'
-        }
-
-        try:
-            response = requests.post(url, json=payload)
-            if response.status_code == 200:
-                print(f"   ✅ Telegram notification sent")
-            else:
-                print(f"   ❌ Telegram error: {response.status_code}")
-        except Exception as e:
-            print(f"   ❌ Telegram send failed: {e}")
-
-    def _send_email(self, alert: Dict, message: str):
-        """Send via Email (using SendGrid or SMTP)"""
-        # TODO: Implement email sending
-        print("   ⚠️  Email notifications not yet implemented")
-
     def _save_alert_to_history(self, alert: Dict):
-        """Save alert to JSON file for history"""
-        history_file = 'alerts_history.json'
-
-        try:
-            # Load existing history
-            if os.path.exists(history_file):
-                with open(history_file, 'r') as f:
-                    history = json.load(f)
-            else:
-                history = []
-
-            # Add new alert
-            history.append(alert)
-
-            # Keep only last 1000 alerts
-            history = history[-1000:]
+        """Append alert to the alert journal"""
+        self.journal.append(alert)
+
+    def get_alert_history(self, symbol: Optional[str] = None, alert_type: Optional[str] = None,
+                          since: Optional[str] = None, until: Optional[str] = None,
+                          limit: int = 100) -> List[Dict]:
+        """Query past alerts by symbol, type and time range (newest first)"""
+        return self.journal.query(symbol, alert_type, since, until, limit)
+
+    def _on_bars(self, symbol: str, interval: str, df):
+        """Publish the newest written bar of a watched or held symbol"""
+        if symbol in self.watchlist or symbol in self.positions:
+            bar = df.iloc[-1]
+            self.engine.publish_bar(symbol, bar.to_dict())
+
+    def poll_sources(self):
+        """
+        Fetch every monitored symbol once and publish the updates to the alert engine.
+        Symbols that are both watched and held are fetched a single time; the engine
+        drops updates that didn't change anything.
+        """
+        symbols = list(dict.fromkeys(self.watchlist + self.positions))
 
-            # Save
-            with open(history_file, 'w') as f:
-                json.dump(history, f, indent=2, default=str)
+        def fetch(symbol):
+            market = self.market_data.get_current_data(symbol)
+            self.engine.publish_quote(symbol, market)
+            social = self.social_intel.analyze_stock(symbol)
+            self.engine.publish_sentiment(symbol, social)
 
-        except Exception as e:
-            print(f"   ⚠️  Failed to save alert history: {e}")
+        for symbol, _, error in self.executor.iter_results(symbols, fetch):
+            if error is not None:
+                print(f"   ❌ Error fetching {symbol}: {error}")
 
     def start_monitoring(self, scan_interval_minutes: int = 5):
         """
         Start continuous monitoring
 
         Args:
-            scan_interval_minutes: How often to scan (default: 5 minutes)
+            scan_interval_minutes: How often to poll the data sources (default: 5 minutes)
         """
         print(f"""
 ╔═══════════════════════════════════════════════════════════════════╗
@@ -387,27 +383,30 @@ Change: {alert['change']:.2f}
 📋 Watchlist ({len(self.watchlist)}): {', '.join(self.watchlist)}
 💼 Positions ({len(self.positions)}): {', '.join(self.positions)}
 
-⏰ Scan Interval: {scan_interval_minutes} minutes
+⏰ Poll Interval: {scan_interval_minutes} minutes
 🔔 Push Service: {self.push_service}
 
 Starting monitoring...
         """)
 
-        # Schedule scans
-        schedule.every(scan_interval_minutes).minutes.do(self.scan_for_entry_signals)
-        schedule.every(scan_interval_minutes).minutes.do(self.scan_for_exit_signals)
-
-        # Initial scan
-        self.scan_for_entry_signals()
-        self.scan_for_exit_signals()
+        self.engine.start()
 
-        # Run forever
+        # Run forever - the engine evaluates rules as updates arrive
         try:
             while True:
-                schedule.run_pending()
-                time.sleep(10)
+                print(f"\n🔄 Polling data sources... ({datetime.now().strftime('%H:%M:%S')})")
+                self.poll_sources()
+                time.sleep(scan_interval_minutes * 60)
         except KeyboardInterrupt:
             print("\n\n🛑 Monitoring stopped")
+        finally:
+            self.engine.stop()
+            self.dispatcher.flush(timeout=10)
+            self.dispatcher.stop()
+            self.journal.close()
+            self.state_store.close()
+            print(f"📊 Engine stats: {self.engine.get_stats()}")
+            print(f"📨 Notification stats: {self.dispatcher.get_stats()}")
 
 
 def main():
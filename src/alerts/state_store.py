@@ -0,0 +1,174 @@
+"""
+Shared alert state store
+Cooldowns and last-seen values in SQLite so de-duplication survives restarts
+and holds across several monitor processes
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_STATE_PATH = os.getenv(
+    'ALERT_STATE_DB',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                 'alerts_state.db')
+)
+
+
+class AlertStateStore:
+    """
+    Cooldown and state store with atomic check-and-set.
+
+    check_and_set() is a single conditional UPSERT: the row is only written if
+    the previous firing is older than the cooldown, and the caller may fire only
+    if its write went through. SQLite serialises writers across processes, so
+    when several monitors race on the same alert exactly one of them wins.
+    Times are stored as epoch seconds, so cooldowns of any length are exact.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_STATE_PATH, owner: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite file shared by all monitors on this host
+            owner: Identifier recorded with each firing (default: host:pid)
+        """
+        self.db_path = db_path
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self.stats = {'allowed': 0, 'suppressed': 0}
+
+        # Autocommit mode - every statement is its own transaction unless we BEGIN explicitly
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS cooldowns (
+                    key TEXT PRIMARY KEY,
+                    last_fired REAL NOT NULL,
+                    owner TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_cooldowns_fired ON cooldowns(last_fired);
+            """)
+
+    # ------------------------------------------------------------------
+    # Cooldowns
+    # ------------------------------------------------------------------
+
+    def check_and_set(self, key: str, cooldown_seconds: float, now: Optional[float] = None) -> bool:
+        """
+        Claim the right to fire an alert
+
+        Args:
+            key: Alert key (e.g. "default:TSLA:ENTRY_SIGNAL")
+            cooldown_seconds: Minimum time between two firings of this key
+            now: Epoch seconds (default: current time)
+
+        Returns:
+            True if the alert may fire (and the cooldown was started), False if
+            it fired within the cooldown window
+        """
+        now = time.time() if now is None else now
+
+        with self._lock:
+            cursor = self._conn.execute("""
+                INSERT INTO cooldowns (key, last_fired, owner) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    last_fired = excluded.last_fired,
+                    owner = excluded.owner
+                WHERE cooldowns.last_fired <= excluded.last_fired - ?
+            """, (key, now, self.owner, cooldown_seconds))
+
+            allowed = cursor.rowcount == 1
+            self.stats['allowed' if allowed else 'suppressed'] += 1
+
+        return allowed
+
+    def reset(self, key: str):
+        """Clear a cooldown so the alert may fire again immediately"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cooldowns WHERE key = ?", (key,))
+
+    def last_fired(self, key: str) -> Optional[float]:
+        """Epoch seconds of the last firing, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT last_fired FROM cooldowns WHERE key = ?", (key,)).fetchone()
+        return row['last_fired'] if row else None
+
+    def prune(self, older_than_seconds: float = 7 * 24 * 3600) -> int:
+        """
+        Delete cooldowns that expired long ago
+
+        Returns:
+            Number of rows deleted
+        """
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM cooldowns WHERE last_fired < ?", (time.time() - older_than_seconds,)
+            ).rowcount
+
+    # ------------------------------------------------------------------
+    # Values
+    # ------------------------------------------------------------------
+
+    def get_state(self, key: str, default: Any = None) -> Any:
+        """Read a stored value"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row['value']) if row else default
+
+    def set_state(self, key: str, value: Any):
+        """Store a JSON-serialisable value"""
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO state (key, value, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """, (key, json.dumps(value), time.time()))
+
+    def swap_state(self, key: str, value: Any, default: Any = None) -> Any:
+        """
+        Store a value and return the previous one in a single transaction
+
+        Two monitors updating the same key each see the value the other wrote,
+        never the same previous value twice.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+                self._conn.execute("""
+                    INSERT INTO state (key, value, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+                """, (key, json.dumps(value), time.time()))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return json.loads(row['value']) if row else default
+
+    def get_stats(self) -> Dict:
+        """Row counts and check-and-set counters"""
+        with self._lock:
+            cooldowns = self._conn.execute("SELECT COUNT(*) FROM cooldowns").fetchone()[0]
+            values = self._conn.execute("SELECT COUNT(*) FROM state").fetchone()[0]
+        return dict(self.stats, cooldowns=cooldowns, values=values)
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,231 @@
+"""
+Comprehensive stock analysis
+Combines AI agents, premium data, Finnhub and quantitative analysis into one
+report, fetched concurrently under a deadline
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import requests
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.data.market_data import MarketDataFetcher
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.task_graph import STATUS_OK, STATUS_TIMEOUT, TaskGraph
+
+FINNHUB_URL = 'https://finnhub.io/api/v1'
+
+AGENT_STAGES = ('chatgpt', 'gemini', 'perplexity')
+
+# Monte Carlo horizon per analysis type (trading days)
+HORIZON_DAYS = {'long-term': 252, 'day-trading': 5}
+
+
+class ComprehensiveAnalyzer:
+    """
+    Multi-source analysis for long-term investing or day trading.
+
+    Sources are stages of a TaskGraph: market data, premium data, Finnhub and
+    the quantitative models start together; the AI agents start as soon as
+    market data is in (their prompts need it); the summary runs on whatever
+    finished. A request never takes longer than deadline_seconds - sources
+    that miss it are reported as timed out - and each source's result is
+    memoized for its own TTL, so repeated requests only pay for stale data.
+    The summary is built after the graph returns, so it is always present.
+    """
+
+    def __init__(self, chatgpt_agent=None, gemini_agent=None, perplexity_agent=None,
+                 premium_data_collector=None, quantitative_analyzer=None,
+                 finnhub_api_key: Optional[str] = None, market_data: Optional[MarketDataFetcher] = None,
+                 deadline_seconds: float = 25.0, max_workers: int = 16):
+        """
+        Args:
+            chatgpt_agent, gemini_agent, perplexity_agent: Agents exposing analyze_stock(stock_data)
+            premium_data_collector: Collector exposing collect_all_data(symbol)
+            quantitative_analyzer: QuantitativeAnalyzer for risk metrics and Monte Carlo
+            finnhub_api_key: Finnhub token (fundamentals, analyst ratings, company news)
+            market_data: Price source (default: quantitative analyzer's, or a new fetcher)
+            deadline_seconds: Default time budget per analysis
+            max_workers: Threads shared by all concurrent analyses
+        """
+        self.agents = {'chatgpt': chatgpt_agent, 'gemini': gemini_agent, 'perplexity': perplexity_agent}
+        self.premium_data_collector = premium_data_collector
+        self.quantitative_analyzer = quantitative_analyzer
+        self.finnhub_api_key = finnhub_api_key
+        self.market_data = (market_data or getattr(quantitative_analyzer, 'market_data', None)
+                            or MarketDataFetcher())
+        self.deadline_seconds = deadline_seconds
+
+        self.graph = TaskGraph('comprehensive-analysis', max_workers=max_workers)
+        self.graph.add('market_data', self._market_data_stage, ttl_seconds=30)
+        self.graph.add('premium_data', self._premium_data_stage, ttl_seconds=900)
+        self.graph.add('finnhub', self._finnhub_stage, ttl_seconds=900)
+        self.graph.add('risk_metrics', self._risk_metrics_stage, ttl_seconds=3600)
+        self.graph.add('monte_carlo', self._monte_carlo_stage, ttl_seconds=3600)
+        for name in AGENT_STAGES:
+            self.graph.add(name, self._agent_stage(name), deps=['market_data'], ttl_seconds=900, timeout=20)
+
+    def get_comprehensive_analysis(self, symbol: str, analysis_type: str = 'long-term',
+                                   deadline_seconds: Optional[float] = None) -> Dict:
+        """
+        Analyze a stock with every configured source
+
+        Args:
+            symbol: Stock ticker symbol
+            analysis_type: 'long-term' or 'day-trading'
+            deadline_seconds: Time budget (default: the analyzer's)
+
+        Returns:
+            Dictionary with each source's result, a combined summary and a
+            per-source status report (ok / error / timeout / skipped / not configured)
+        """
+        symbol = symbol.upper()
+        deadline = deadline_seconds or self.deadline_seconds
+        started = datetime.now()
+
+        stages = ['market_data']
+        if self.premium_data_collector is not None:
+            stages.append('premium_data')
+        if self.finnhub_api_key:
+            stages.append('finnhub')
+        if self.quantitative_analyzer is not None:
+            stages += ['risk_metrics', 'monte_carlo']
+        stages += [name for name in AGENT_STAGES if self.agents[name] is not None]
+
+        results = self.graph.run({'symbol': symbol, 'analysis_type': analysis_type}, deadline, stages=stages)
+
+        def value(stage: str) -> Any:
+            result = results.get(stage)
+            return result['value'] if result and result['status'] == STATUS_OK else None
+
+        sources = {}
+        for stage in self.graph.stage_names:
+            if stage in results:
+                sources[stage] = {k: v for k, v in results[stage].items() if k != 'value'}
+            else:
+                sources[stage] = {'status': 'not configured'}
+
+        return {
+            'symbol': symbol,
+            'analysis_type': analysis_type,
+            'market_data': value('market_data'),
+            'ai_analysis': {name: value(name) for name in AGENT_STAGES if name in results},
+            'premium_data': value('premium_data'),
+            'finnhub': value('finnhub'),
+            'quantitative': {'risk_metrics': value('risk_metrics'), 'monte_carlo': value('monte_carlo')},
+            'summary': self._summarize({stage: value(stage) for stage in results}),
+            'sources': sources,
+            'timed_out': [name for name, result in results.items() if result['status'] == STATUS_TIMEOUT],
+            'deadline_seconds': deadline,
+            'elapsed_ms': round((datetime.now() - started).total_seconds() * 1000, 1),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def get_stats(self) -> Dict:
+        """Per-source outcomes, latency and memo cache stats"""
+        return self.graph.get_stats()
+
+    # ------------------------------------------------------------------
+    # Stages (each receives {'symbol', 'analysis_type', <dependency results>})
+    # ------------------------------------------------------------------
+
+    def _market_data_stage(self, inputs: Dict) -> Dict:
+        data = self.market_data.get_current_data(inputs['symbol'])
+        if not data.get('data_available', True) or data.get('error'):
+            raise RuntimeError(data.get('error', 'No market data'))
+        return data
+
+    def _premium_data_stage(self, inputs: Dict) -> Dict:
+        return self.premium_data_collector.collect_all_data(inputs['symbol'])
+
+    def _risk_metrics_stage(self, inputs: Dict) -> Dict:
+        period = '1y' if inputs['analysis_type'] == 'long-term' else '3mo'
+        result = self.quantitative_analyzer.calculate_risk_metrics(inputs['symbol'], period)
+        if not result.get('success'):
+            raise RuntimeError(result.get('error', 'Risk metrics failed'))
+        return result
+
+    def _monte_carlo_stage(self, inputs: Dict) -> Dict:
+        days = HORIZON_DAYS.get(inputs['analysis_type'], 252)
+        result = self.quantitative_analyzer.monte_carlo_simulation(inputs['symbol'], days=days, simulations=10000)
+        if not result.get('success'):
+            raise RuntimeError(result.get('error', 'Monte Carlo failed'))
+        # Keep the summary, drop per-day bands and sample paths
+        return {key: result[key] for key in ('days', 'simulations', 'current_price', 'historical',
+                                             'final_distribution', 'elapsed_seconds')}
+
+    def _agent_stage(self, name: str):
+        def run(inputs: Dict) -> Dict:
+            stock_data = dict(inputs['market_data'], analysis_type=inputs['analysis_type'])
+            result = self.agents[name].analyze_stock(stock_data)
+            # Agents report failures in the payload - raise so they aren't memoized
+            if result.get('error'):
+                raise RuntimeError(result['error'])
+            return result
+        return run
+
+    def _finnhub_stage(self, inputs: Dict) -> Dict:
+        symbol = inputs['symbol']
+        today = datetime.now().date()
+
+        metrics = self._finnhub_get('stock/metric', {'symbol': symbol, 'metric': 'all'}).get('metric', {})
+        recommendations = self._finnhub_get('stock/recommendation', {'symbol': symbol})
+        news = self._finnhub_get('company-news', {'symbol': symbol, 'from': (today - timedelta(days=7)).isoformat(),
+                                                  'to': today.isoformat()})
+
+        latest = recommendations[0] if recommendations else {}
+        return {
+            'fundamentals': {key: metrics.get(key) for key in (
+                'peTTM', 'pbAnnual', 'psTTM', 'epsGrowthTTMYoy', 'revenueGrowthTTMYoy',
+                'roeTTM', 'netProfitMarginTTM', 'currentRatioAnnual', 'totalDebt/totalEquityAnnual',
+                'dividendYieldIndicatedAnnual', '52WeekHigh', '52WeekLow', 'beta', 'marketCapitalization'
+            )},
+            'analyst_ratings': {key: latest.get(key) for key in (
+                'period', 'strongBuy', 'buy', 'hold', 'sell', 'strongSell'
+            )} if latest else None,
+            'news': [{'headline': item.get('headline'), 'source': item.get('source'),
+                      'url': item.get('url'), 'datetime': item.get('datetime')}
+                     for item in news[:10]]
+        }
+
+    def _finnhub_get(self, endpoint: str, params: Dict) -> Any:
+        get_rate_limiter('finnhub').acquire()
+        response = requests.get(f"{FINNHUB_URL}/{endpoint}", params={**params, 'token': self.finnhub_api_key},
+                                timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _summarize(inputs: Dict) -> Dict:
+        """Combine whatever sources finished into one view"""
+        agents = {name: inputs.get(name) for name in AGENT_STAGES if inputs.get(name)}
+        valid_setups = [name for name, result in agents.items() if result.get('setup_valid')]
+        risk = inputs.get('risk_metrics') or {}
+        monte_carlo = (inputs.get('monte_carlo') or {}).get('final_distribution', {})
+
+        summary = {
+            'ai_consensus': {
+                'agents_responded': len(agents),
+                'setup_valid_votes': len(valid_setups),
+                'setups': {name: result.get('setup_type') for name, result in agents.items()},
+                'risk_levels': {name: result.get('risk_level') for name, result in agents.items()}
+            },
+            'quantitative': {
+                'volatility': risk.get('volatility'),
+                'sharpe_ratio': risk.get('sharpe_ratio'),
+                'max_drawdown': risk.get('max_drawdown'),
+                'beta': risk.get('beta'),
+                'probability_profit': monte_carlo.get('probability_profit'),
+                'expected_return_percent': monte_carlo.get('expected_return_percent')
+            }
+        }
+        market = inputs.get('market_data') or {}
+        if market:
+            summary['price'] = {key: market.get(key) for key in ('current_price', 'change_percent', 'rvol',
+                                                                 'gap_percent')}
+        return summary
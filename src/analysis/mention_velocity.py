@@ -0,0 +1,404 @@
+"""
+Mention Velocity Engine
+Streaming per-ticker mention-rate baselines and z-score spike detection
+"""
+
+import re
+import threading
+from array import array
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from math import sqrt
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+TICKER_PATTERN = re.compile(r'\$([A-Z]{1,5})\b')
+
+
+class _TickerState:
+    """
+    Fixed-size state for one ticker.
+    One EWMA mean/variance pair per time-of-day bucket plus a ring with the
+    counts of the last day of windows, so memory per ticker does not grow
+    with traffic.
+    """
+
+    __slots__ = ('means', 'variances', 'samples', 'active', 'counts', 'floor', 'newest',
+                 'spiked_window', 'last_z')
+
+    def __init__(self, n_buckets: int, ring_size: int, window: int):
+        self.means = array('d', [0.0]) * n_buckets
+        self.variances = array('d', [0.0]) * n_buckets
+        self.samples = array('I', [0]) * n_buckets
+        # Folded windows that had at least one mention (zero-filled ones excluded)
+        self.active = array('I', [0]) * n_buckets
+        self.counts = array('H', [0]) * ring_size
+        # Windows [floor, newest] are still in the ring, older ones are folded
+        self.floor = window
+        self.newest = window
+        self.spiked_window = -1
+        self.last_z = 0.0
+
+
+class MentionVelocityEngine:
+    """
+    Tracks how fast each ticker is being mentioned compared to its own history.
+
+    Mentions are counted in short windows (default 60s) by their own timestamp,
+    so batches of older posts from a scraper land in the windows they were
+    posted in. The last day of windows is kept as raw counts; a window is folded
+    into the EWMA mean and variance of its time-of-day bucket when it leaves
+    that day, so a ticker that is always busy at the open is not flagged every
+    morning. The newest window is compared to the baseline (the folded EWMA
+    continued over the retained windows of the same bucket) on every live
+    ingestion, which means a spike is raised as soon as the count crosses the
+    threshold instead of when the window ends.
+    """
+
+    def __init__(self,
+                 window_seconds: int = 60,
+                 bucket_minutes: int = 30,
+                 alpha: float = 0.05,
+                 z_threshold: float = 3.0,
+                 min_samples: int = 10,
+                 min_active_windows: int = 3,
+                 max_tickers: int = 10000,
+                 on_spike: Optional[Callable[[Dict], None]] = None):
+        """
+        Args:
+            window_seconds: Length of a counting window
+            bucket_minutes: Size of a time-of-day bucket (baselines are kept per bucket)
+            alpha: EWMA smoothing factor
+            z_threshold: Z-score that counts as a spike
+            min_samples: Closed windows a bucket needs before it can raise spikes
+            min_active_windows: Of those, windows that had mentions - quiet windows
+                alone do not make a baseline
+            max_tickers: Least recently seen tickers are dropped beyond this
+            on_spike: Optional callback invoked with each spike event
+        """
+        if (bucket_minutes * 60) % window_seconds:
+            raise ValueError("bucket_minutes must be a multiple of window_seconds")
+
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_minutes * 60
+        self.n_buckets = 86400 // self.bucket_seconds
+        self.windows_per_day = 86400 // window_seconds
+        self.windows_per_bucket = self.bucket_seconds // window_seconds
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+        self.min_active_windows = min_active_windows
+        self.max_tickers = max_tickers
+        self.on_spike = on_spike
+
+        self._tickers: 'OrderedDict[str, _TickerState]' = OrderedDict()
+        self._recent_ids = set()
+        self._recent_id_order = deque(maxlen=50000)
+        self._spikes = deque(maxlen=500)
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'mentions': 0,
+            'duplicates': 0,
+            'backfilled': 0,
+            'late': 0,
+            'spikes': 0,
+            'evicted_tickers': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def ingest(self, text: str, timestamp=None, tickers: Optional[Iterable[str]] = None,
+               item_id: Optional[str] = None) -> List[Dict]:
+        """
+        Ingest one social message from the firehose
+
+        Args:
+            text: Message text ($TICKER cashtags are extracted)
+            timestamp: When the message was posted (datetime, ISO string or epoch seconds)
+            tickers: Extra tickers the message is known to be about
+            item_id: Stable id used to ignore the same message seen twice
+
+        Returns:
+            List of spike events raised by this message
+        """
+        if item_id is not None:
+            with self._lock:
+                if item_id in self._recent_ids:
+                    self.stats['duplicates'] += 1
+                    return []
+                if len(self._recent_id_order) == self._recent_id_order.maxlen:
+                    self._recent_ids.discard(self._recent_id_order[0])
+                self._recent_id_order.append(item_id)
+                self._recent_ids.add(item_id)
+
+        symbols = set(TICKER_PATTERN.findall(text or ''))
+        if tickers:
+            symbols.update(t.upper() for t in tickers)
+
+        spikes = []
+        for symbol in symbols:
+            spike = self.record(symbol, 1, timestamp)
+            if spike:
+                spikes.append(spike)
+        return spikes
+
+    def ingest_mentions(self, symbol: str, mentions: List[Dict]) -> List[Dict]:
+        """
+        Ingest mentions collected by SocialSentimentAnalyzer for a symbol
+
+        Args:
+            symbol: Symbol the mentions were collected for
+            mentions: Mention dicts with 'text'/'title', 'created' and 'url' fields
+
+        Returns:
+            List of spike events raised
+        """
+        spikes = []
+        for mention in mentions:
+            text = f"{mention.get('title', '')} {mention.get('text', '')}"
+            item_id = mention.get('url') or f"{mention.get('platform')}:{hash(text)}:{mention.get('created')}"
+            spikes.extend(self.ingest(text, mention.get('created'), [symbol], item_id))
+        return spikes
+
+    def record(self, ticker: str, count: int = 1, timestamp=None) -> Optional[Dict]:
+        """
+        Record mentions of a ticker
+
+        Args:
+            ticker: Stock ticker symbol
+            count: Number of mentions
+            timestamp: When the mentions happened (default: now)
+
+        Returns:
+            Spike event if this record pushed the ticker over the threshold
+        """
+        ts = self._to_epoch(timestamp)
+        window = int(ts // self.window_seconds)
+
+        with self._lock:
+            state = self._get_state(ticker, window)
+
+            if window <= state.newest - self.windows_per_day:
+                # Older than the retained day - its window is already folded
+                self.stats['late'] += 1
+                return None
+
+            if window > state.newest:
+                self._advance(state, window)
+            elif window < state.floor:
+                state.floor = window
+
+            slot = window % self.windows_per_day
+            state.counts[slot] = min(state.counts[slot] + count, 0xFFFF)
+            self.stats['mentions'] += count
+
+            if window < state.newest:
+                # Backfill of a past window - counted, but never a live spike
+                self.stats['backfilled'] += count
+                return None
+
+            z = self._z_score(state)
+            state.last_z = z
+            if z is None or z < self.z_threshold or state.spiked_window == window:
+                return None
+
+            state.spiked_window = window
+            mean, variance, _, _ = self._baseline(state)
+            spike = {
+                'ticker': ticker,
+                'z_score': round(z, 2),
+                'count': state.counts[slot],
+                'baseline_mean': round(mean, 3),
+                'baseline_std': round(sqrt(variance), 3),
+                'window_start': datetime.fromtimestamp(window * self.window_seconds, timezone.utc).isoformat(),
+                'detected_at': datetime.now(timezone.utc).isoformat()
+            }
+            self._spikes.append(spike)
+            self.stats['spikes'] += 1
+
+        if self.on_spike:
+            try:
+                self.on_spike(spike)
+            except Exception as e:
+                print(f"   ⚠️  Spike callback failed: {e}")
+
+        return spike
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_velocity(self, ticker: str, timestamp=None) -> Dict:
+        """
+        Current mention velocity of a ticker against its baseline
+
+        Returns:
+            Dictionary with rate, baseline and z-score
+        """
+        window = int(self._to_epoch(timestamp) // self.window_seconds)
+
+        with self._lock:
+            state = self._tickers.get(ticker)
+            if state is None:
+                return self._empty_velocity(ticker)
+
+            if window > state.newest:
+                self._advance(state, window)
+
+            mean, variance, samples, active = self._baseline(state)
+            z = self._z_score(state)
+            count = state.counts[state.newest % self.windows_per_day]
+
+            return {
+                'ticker': ticker,
+                'window_count': count,
+                'rate_per_minute': round(count * 60 / self.window_seconds, 2),
+                'baseline_mean': round(mean, 3),
+                'baseline_std': round(sqrt(variance), 3),
+                'baseline_windows': samples,
+                'active_windows': active,
+                'baseline_ready': z is not None,
+                'z_score': round(z, 2) if z is not None else 0.0,
+                'spiking': z is not None and z >= self.z_threshold
+            }
+
+    def top_trending(self, limit: int = 20) -> List[Dict]:
+        """
+        Tickers with the highest z-score in their latest window
+
+        Args:
+            limit: Maximum number of tickers to return
+
+        Returns:
+            List of velocity dictionaries sorted by z-score
+        """
+        with self._lock:
+            ranked = sorted(self._tickers.items(), key=lambda kv: kv[1].last_z or 0, reverse=True)
+            symbols = [symbol for symbol, state in ranked[:limit] if state.last_z]
+
+        return [self.get_velocity(symbol) for symbol in symbols]
+
+    def recent_spikes(self, limit: int = 50) -> List[Dict]:
+        """Most recent spike events, newest first"""
+        with self._lock:
+            return list(self._spikes)[-limit:][::-1]
+
+    def get_stats(self) -> Dict:
+        """Engine counters for the metrics endpoint"""
+        with self._lock:
+            return dict(self.stats, tickers=len(self._tickers))
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _get_state(self, ticker: str, window: int) -> _TickerState:
+        state = self._tickers.get(ticker)
+        if state is None:
+            state = _TickerState(self.n_buckets, self.windows_per_day, window)
+            self._tickers[ticker] = state
+            if len(self._tickers) > self.max_tickers:
+                self._tickers.popitem(last=False)
+                self.stats['evicted_tickers'] += 1
+        else:
+            self._tickers.move_to_end(ticker)
+        return state
+
+    def _bucket(self, window: int) -> int:
+        return (window * self.window_seconds % 86400) // self.bucket_seconds
+
+    def _ewma(self, mean: float, variance: float, samples: int, value: float) -> tuple:
+        if samples == 0:
+            return value, 0.0
+        diff = value - mean
+        incr = self.alpha * diff
+        return mean + incr, (1 - self.alpha) * (variance + diff * incr)
+
+    def _fold(self, state: _TickerState, window: int, value: int):
+        bucket = self._bucket(window)
+        state.means[bucket], state.variances[bucket] = self._ewma(
+            state.means[bucket], state.variances[bucket], state.samples[bucket], value)
+        if state.samples[bucket] < 0xFFFFFFFF:
+            state.samples[bucket] += 1
+        if value and state.active[bucket] < 0xFFFFFFFF:
+            state.active[bucket] += 1
+
+    def _advance(self, state: _TickerState, window: int):
+        """Make window the newest one, folding the windows that leave the retained day"""
+        ring = self.windows_per_day
+        new_floor = window - ring + 1
+        if new_floor > state.floor:
+            # Windows up to the previous newest may hold counts
+            stop = min(new_floor, state.newest + 1)
+            for old in range(state.floor, stop):
+                self._fold(state, old, state.counts[old % ring])
+                state.counts[old % ring] = 0
+
+            # Quiet windows after it count as zero; more than a day of silence is
+            # capped at one day so a dormant ticker costs a bounded amount to wake up
+            for empty in range(max(stop, new_floor - ring), new_floor):
+                self._fold(state, empty, 0)
+            state.floor = new_floor
+
+        state.newest = window
+
+    def _baseline(self, state: _TickerState) -> tuple:
+        """
+        Baseline of the newest window's bucket: the folded EWMA continued over the
+        retained windows of that bucket before the newest one (yesterday's part of
+        the bucket, then today's)
+
+        Returns:
+            (mean, variance, samples, active) tuple
+        """
+        bucket = self._bucket(state.newest)
+        mean, variance = state.means[bucket], state.variances[bucket]
+        samples, active = state.samples[bucket], state.active[bucket]
+
+        run_start = state.newest - state.newest % self.windows_per_bucket
+        for start in (run_start - self.windows_per_day, run_start):
+            for window in range(max(start, state.floor), min(start + self.windows_per_bucket, state.newest)):
+                value = state.counts[window % self.windows_per_day]
+                mean, variance = self._ewma(mean, variance, samples, value)
+                samples += 1
+                active += 1 if value else 0
+
+        return mean, variance, samples, active
+
+    def _z_score(self, state: _TickerState) -> Optional[float]:
+        mean, variance, samples, active = self._baseline(state)
+        if samples < self.min_samples or active < self.min_active_windows:
+            return None
+
+        # Poisson floor keeps near-silent tickers from spiking on a single mention
+        std = max(sqrt(variance), sqrt(mean), 1.0)
+        return (state.counts[state.newest % self.windows_per_day] - mean) / std
+
+    def _to_epoch(self, timestamp) -> float:
+        if timestamp is None or timestamp == '':
+            return datetime.now(timezone.utc).timestamp()
+        if isinstance(timestamp, (int, float)):
+            return float(timestamp)
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+        try:
+            return datetime.fromisoformat(str(timestamp).replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return datetime.now(timezone.utc).timestamp()
+
+    def _empty_velocity(self, ticker: str) -> Dict:
+        return {
+            'ticker': ticker,
+            'window_count': 0,
+            'rate_per_minute': 0.0,
+            'baseline_mean': 0.0,
+            'baseline_std': 0.0,
+            'baseline_windows': 0,
+            'active_windows': 0,
+            'baseline_ready': False,
+            'z_score': 0.0,
+            'spiking': False
+        }
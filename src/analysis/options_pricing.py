@@ -0,0 +1,168 @@
+"""
+Vectorized Black-Scholes pricing
+Prices, Greeks and implied volatilities for whole option chains as NumPy
+array operations (inputs broadcast against each other)
+"""
+from typing import Dict
+
+import numpy as np
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+MIN_VOLATILITY = 1e-4
+MAX_VOLATILITY = 5.0
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF, double precision (Hart 1968 / West 2005)"""
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    e = np.exp(-0.5 * z * z)
+
+    numerator = ((((((0.0352624965998911 * z + 0.700383064443688) * z + 6.37396220353165) * z
+                    + 33.912866078383) * z + 112.079291497871) * z + 221.213596169931) * z
+                 + 220.206867912376)
+    denominator = (((((((0.0883883476483184 * z + 1.75566716318264) * z + 16.064177579207) * z
+                       + 86.7807322029461) * z + 296.564248779674) * z + 637.333633378831) * z
+                    + 793.826512519948) * z + 440.413735824752)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tail = e / (z + 1 / (z + 2 / (z + 3 / (z + 4 / (z + 0.65))))) / SQRT_2PI
+
+    lower = np.where(z < 7.07106781186547, e * numerator / denominator, np.where(z < 37, tail, 0.0))
+    return np.where(x > 0, 1 - lower, lower)
+
+
+def _as_call(option_types) -> np.ndarray:
+    """'call'/'put' (or 'c'/'p', or booleans) -> True for calls"""
+    types = np.asarray(option_types)
+    if types.dtype == bool:
+        return types
+    lowered = np.char.lower(types.astype(str))
+    if not np.all(np.isin(lowered, ['call', 'put', 'c', 'p'])):
+        raise ValueError("Option types must be 'call' or 'put'")
+    return np.char.startswith(lowered, 'c')
+
+
+def black_scholes(spot, strike, years, rate, volatility, option_type='call',
+                  dividend_yield=0.0) -> Dict[str, np.ndarray]:
+    """
+    Black-Scholes-Merton prices and Greeks
+
+    Args:
+        spot: Underlying price
+        strike: Strike price(s)
+        years: Time to expiry in years
+        rate: Continuously compounded risk-free rate
+        volatility: Annualized volatility
+        option_type: 'call'/'put' per contract
+        dividend_yield: Continuous dividend yield
+
+    Returns:
+        Dictionary of arrays: price, delta, gamma, vega (per 1 vol point),
+        theta (per calendar day), rho (per 1% rate), intrinsic, d1, d2
+    """
+    S, K, T, r, sigma, q = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in
+                                                 (spot, strike, years, rate, volatility, dividend_yield)))
+    is_call = np.broadcast_to(_as_call(option_type), S.shape)
+    sign = np.where(is_call, 1.0, -1.0)
+
+    live = (T > 0) & (sigma > 0)
+    T_safe = np.where(live, T, 1.0)
+    sigma_safe = np.where(live, sigma, 1.0)
+    sqrt_T = np.sqrt(T_safe)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma_safe ** 2) * T_safe) / (sigma_safe * sqrt_T)
+    d2 = d1 - sigma_safe * sqrt_T
+
+    disc_q = np.exp(-q * T)
+    disc_r = np.exp(-r * T)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+    pdf_d1 = norm_pdf(d1)
+
+    price = sign * (S * disc_q * cdf_d1 - K * disc_r * cdf_d2)
+    delta = sign * disc_q * cdf_d1
+    gamma = disc_q * pdf_d1 / (S * sigma_safe * sqrt_T)
+    vega = S * disc_q * pdf_d1 * sqrt_T
+    theta = (-S * disc_q * pdf_d1 * sigma_safe / (2 * sqrt_T)
+             + sign * (q * S * disc_q * cdf_d1 - r * K * disc_r * cdf_d2))
+    rho = sign * K * T_safe * disc_r * cdf_d2
+
+    # Expired or zero-volatility contracts are worth their discounted forward intrinsic value
+    intrinsic = np.maximum(sign * (S - K), 0.0)
+    forward_intrinsic = np.maximum(sign * (S * disc_q - K * disc_r), 0.0)
+    in_the_money = sign * (S * disc_q - K * disc_r) > 0
+
+    return {
+        'price': np.where(live, price, forward_intrinsic),
+        'delta': np.where(live, delta, np.where(in_the_money, sign * disc_q, 0.0)),
+        'gamma': np.where(live, gamma, 0.0),
+        'vega': np.where(live, vega / 100, 0.0),
+        'theta': np.where(live, theta / 365, 0.0),
+        'rho': np.where(live, rho / 100, 0.0),
+        'intrinsic': intrinsic,
+        'd1': np.where(live, d1, np.nan),
+        'd2': np.where(live, d2, np.nan)
+    }
+
+
+def implied_volatility(price, spot, strike, years, rate, option_type='call', dividend_yield=0.0,
+                       tolerance: float = 1e-8, max_iterations: int = 100) -> np.ndarray:
+    """
+    Batched implied-volatility solver
+
+    Newton steps on every contract at once; a contract whose step leaves its
+    current bracket [low, high] (or whose vega vanishes) bisects instead, so
+    deep in/out-of-the-money contracts still converge.
+
+    Returns:
+        Annualized volatility per contract, NaN where the price is outside
+        the no-arbitrage bounds or the contract is expired
+    """
+    target, S, K, T, r, q = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in
+                                                  (price, spot, strike, years, rate, dividend_yield)))
+    is_call = np.broadcast_to(_as_call(option_type), S.shape)
+    sign = np.where(is_call, 1.0, -1.0)
+
+    disc_q, disc_r = np.exp(-q * T), np.exp(-r * T)
+    lower_bound = np.maximum(sign * (S * disc_q - K * disc_r), 0.0)
+    upper_bound = np.where(is_call, S * disc_q, K * disc_r)
+    valid = (T > 0) & np.isfinite(target) & (target > lower_bound) & (target < upper_bound)
+
+    # Brenner-Subrahmanyam starting point
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.sqrt(2 * np.pi / np.where(T > 0, T, 1.0)) * target / S
+    sigma = np.clip(np.nan_to_num(sigma, nan=0.3), 0.05, 2.0)
+    low = np.full(S.shape, MIN_VOLATILITY)
+    high = np.full(S.shape, MAX_VOLATILITY)
+    active = valid.copy()
+
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        result = black_scholes(S.flat[idx], K.flat[idx], T.flat[idx], r.flat[idx], sigma.flat[idx],
+                               is_call.flat[idx], q.flat[idx])
+        diff = result['price'] - target.flat[idx]
+
+        converged = np.abs(diff) < tolerance
+        too_high = diff > 0
+        high.flat[idx] = np.where(too_high, sigma.flat[idx], high.flat[idx])
+        low.flat[idx] = np.where(too_high, low.flat[idx], sigma.flat[idx])
+
+        vega = result['vega'] * 100
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = sigma.flat[idx] - diff / vega
+        bisect = 0.5 * (low.flat[idx] + high.flat[idx])
+        usable = (vega > 1e-12) & (newton > low.flat[idx]) & (newton < high.flat[idx])
+        sigma.flat[idx] = np.where(converged, sigma.flat[idx], np.where(usable, newton, bisect))
+
+        active.flat[idx[converged]] = False
+        # Bracket collapsed without meeting the price tolerance (e.g. flat vega): stop there
+        active.flat[idx[high.flat[idx] - low.flat[idx] < 1e-12]] = False
+
+    return np.where(valid, sigma, np.nan)
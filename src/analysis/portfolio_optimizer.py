@@ -0,0 +1,152 @@
+"""
+Long-only mean-variance portfolio optimization
+Projected-gradient (FISTA) solver over the capped simplex, NumPy only
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+def project_capped_simplex(v: np.ndarray, cap: float = 1.0) -> np.ndarray:
+    """
+    Euclidean projection onto {w : 0 <= w <= cap, sum(w) = 1}
+
+    w = clip(v - tau, 0, cap). The sum is piecewise linear in tau with kinks
+    at v and v - cap, so tau is found exactly by evaluating it at every kink
+    (prefix sums over sorted v) and interpolating inside the crossing segment.
+    """
+    values = np.sort(v)
+    prefix = np.r_[0.0, np.cumsum(values)]
+    kinks = np.sort(np.r_[values - cap, values])
+
+    lo = np.searchsorted(values, kinks, 'right')        # first v > tau
+    hi = np.searchsorted(values, kinks + cap, 'left')   # first v >= tau + cap
+    totals = cap * (len(values) - hi) + (prefix[hi] - prefix[lo]) - (hi - lo) * kinks
+
+    k = min(int(np.searchsorted(-totals, -1.0, 'right')) - 1, len(kinks) - 2)  # last kink with total >= 1
+    k = max(k, 0)
+    span = totals[k] - totals[k + 1]
+    tau = kinks[k] + (totals[k] - 1.0) * (kinks[k + 1] - kinks[k]) / span if span > 0 else kinks[k]
+    return np.clip(v - tau, 0, cap)
+
+
+def nearest_psd(cov: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Covariance with negative eigenvalues clipped (pairwise estimates over
+    different day sets need not be positive semi-definite)
+
+    Returns:
+        (PSD covariance, largest eigenvalue)
+    """
+    values, vectors = np.linalg.eigh(cov)
+    if values[0] < 0:
+        values = np.maximum(values, 0)
+        cov = (vectors * values) @ vectors.T
+    return cov, float(values[-1])
+
+
+def solve_mean_variance(mu: np.ndarray, cov: np.ndarray, risk_aversion: float, max_weight: float = 1.0,
+                        start: Optional[np.ndarray] = None, lipschitz: Optional[float] = None,
+                        max_iterations: int = 2000, tolerance: float = 1e-8) -> np.ndarray:
+    """
+    Maximize mu'w - risk_aversion/2 * w'Σw over long-only weights summing to 1
+
+    Args:
+        mu: Expected returns
+        cov: Covariance (positive semi-definite)
+        risk_aversion: Variance penalty
+        max_weight: Cap per position
+        start: Warm start weights
+        lipschitz: Largest eigenvalue of cov (computed if omitted)
+
+    Returns:
+        Weights
+    """
+    n = len(mu)
+    if lipschitz is None:
+        lipschitz = float(np.linalg.eigvalsh(cov)[-1])
+    step = 1.0 / max(risk_aversion * lipschitz, 1e-12)
+
+    w = project_capped_simplex(start if start is not None else np.full(n, 1.0 / n), max_weight)
+    y, t = w, 1.0
+    for _ in range(max_iterations):
+        gradient = mu - risk_aversion * (cov @ y)
+        w_next = project_capped_simplex(y + step * gradient, max_weight)
+        step_taken = w_next - w
+        if np.dot(y - w_next, step_taken) > 0:
+            # Momentum points uphill: restart (O'Donoghue & Candes)
+            t = 1.0
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        y = w_next + ((t - 1) / t_next) * step_taken
+        converged = np.abs(step_taken).max() < tolerance
+        w, t = w_next, t_next
+        if converged:
+            break
+    return w
+
+
+def portfolio_stats(weights: np.ndarray, mu: np.ndarray, cov: np.ndarray, risk_free_rate: float) -> Dict:
+    expected = float(weights @ mu)
+    volatility = float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+    return {
+        'expected_return': expected,
+        'volatility': volatility,
+        'sharpe_ratio': (expected - risk_free_rate) / volatility if volatility > 0 else 0.0
+    }
+
+
+def optimize(mu: np.ndarray, cov: np.ndarray, risk_free_rate: float = 0.0, max_weight: float = 1.0,
+             frontier_points: int = 25, refine_steps: int = 8) -> Dict[str, np.ndarray]:
+    """
+    Minimum-variance and maximum-Sharpe long-only portfolios
+
+    The maximum-Sharpe portfolio comes from a warm-started sweep along the
+    efficient frontier (risk aversion from high to low), refined by a
+    golden-section search between the best point's neighbours.
+
+    Returns:
+        {'min_variance': weights, 'max_sharpe': weights, 'frontier': [(return, volatility), ...]}
+    """
+    n = len(mu)
+    if max_weight * n < 1 - 1e-9:
+        raise ValueError(f"max_weight {max_weight} is infeasible for {n} assets")
+
+    cov, lipschitz = nearest_psd(cov)
+    min_variance = solve_mean_variance(np.zeros(n), cov, 1.0, max_weight, lipschitz=lipschitz)
+
+    # Risk aversions scaled so the return and variance terms are comparable
+    scale = max(np.abs(mu).max(), 1e-9) / max(lipschitz, 1e-12)
+    log_aversions = np.log(scale) + np.linspace(3, -2, frontier_points) * np.log(10)
+
+    def sharpe_at(log_aversion: float, start: np.ndarray) -> Tuple[float, np.ndarray]:
+        weights = solve_mean_variance(mu, cov, float(np.exp(log_aversion)), max_weight,
+                                      start=start, lipschitz=lipschitz)
+        return portfolio_stats(weights, mu, cov, risk_free_rate)['sharpe_ratio'], weights
+
+    frontier, sweep = [], []
+    weights = min_variance
+    for log_aversion in log_aversions:
+        sharpe, weights = sharpe_at(log_aversion, weights)
+        stats = portfolio_stats(weights, mu, cov, risk_free_rate)
+        frontier.append((stats['expected_return'], stats['volatility']))
+        sweep.append((sharpe, weights))
+
+    # Sharpe is unimodal along the frontier: golden-section search around the best point
+    best = int(np.argmax([sharpe for sharpe, _ in sweep]))
+    best_sharpe, best_weights = sweep[best]
+    lo = log_aversions[max(best - 1, 0)]
+    hi = log_aversions[min(best + 1, len(log_aversions) - 1)]
+    ratio = (np.sqrt(5) - 1) / 2
+    for _ in range(refine_steps):
+        a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        sharpe_a, weights_a = sharpe_at(a, best_weights)
+        sharpe_b, weights_b = sharpe_at(b, best_weights)
+        for sharpe, weights in ((sharpe_a, weights_a), (sharpe_b, weights_b)):
+            if sharpe > best_sharpe:
+                best_sharpe, best_weights = sharpe, weights
+        if sharpe_a > sharpe_b:
+            hi = b
+        else:
+            lo = a
+
+    return {'min_variance': min_variance, 'max_sharpe': best_weights, 'frontier': frontier}
@@ -0,0 +1,562 @@
+"""
+Quantitative analysis
+Monte Carlo price simulation, portfolio optimization, options pricing and risk
+metrics on daily price history
+"""
+import math
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.monte_carlo import MonteCarloEngine, TRADING_DAYS
+from src.analysis import portfolio_optimizer
+from src.analysis.options_pricing import black_scholes, implied_volatility
+from src.analysis.returns_service import ReturnsService
+from src.analysis.risk_metrics import compute_risk_metrics
+from src.data.market_data import MarketDataFetcher
+
+
+class QuantitativeAnalyzer:
+    """Quantitative models on daily price history"""
+
+    # Request limits (a 1M x 252 run takes several seconds per core)
+    MAX_SIMULATIONS = 1_000_000
+    MAX_DAYS = 10 * TRADING_DAYS
+
+    GREEKS = ('delta', 'gamma', 'vega', 'theta', 'rho')
+
+    # Trading days per unit of a yfinance-style period
+    PERIOD_DAYS = {'d': 1, 'wk': 5, 'mo': 21, 'y': TRADING_DAYS}
+
+    def __init__(self, risk_free_rate: float = 0.045, market_data: Optional[MarketDataFetcher] = None,
+                 monte_carlo: Optional[MonteCarloEngine] = None,
+                 returns_service: Optional[ReturnsService] = None):
+        """
+        Args:
+            risk_free_rate: Annual risk-free rate (0.045 = 4.5%)
+            market_data: Price source (default: MarketDataFetcher backed by the data lake)
+            monte_carlo: Simulation engine (default: uses every core for large runs)
+            returns_service: Cached returns/covariance for multi-symbol methods
+        """
+        self.risk_free_rate = risk_free_rate
+        self.market_data = market_data or MarketDataFetcher()
+        self.monte_carlo = monte_carlo or MonteCarloEngine(workers=os.cpu_count() or 1)
+        self.returns_service = returns_service or ReturnsService(market_data=self.market_data)
+
+    def _get_daily_closes(self, symbol: str, period: str = '1y') -> Optional[pd.Series]:
+        """Daily closing prices, oldest first"""
+        df = self.market_data.get_stock_data(symbol, period=period, interval='1d')
+        if df is None or df.empty:
+            return None
+        closes = df['Close'].dropna()
+        return closes if len(closes) >= 2 else None
+
+    def monte_carlo_simulation(self, symbol: str, days: int = TRADING_DAYS, simulations: int = 10000,
+                               method: str = 'gbm', seed: Optional[int] = None, antithetic: bool = False,
+                               moment_matching: bool = False, block_size: int = 1,
+                               history_period: str = '1y') -> Dict:
+        """
+        Simulate future prices from the symbol's daily history
+
+        Args:
+            symbol: Stock ticker symbol
+            days: Trading days ahead
+            simulations: Number of paths
+            method: 'gbm' (drift/volatility estimated from history) or
+                    'bootstrap' (resampled historical daily returns)
+            seed: RNG seed for reproducible results
+            antithetic: Antithetic variates (variance reduction)
+            moment_matching: Moment-matched normal draws (GBM only)
+            block_size: Bootstrap block length in days
+            history_period: History used for estimation
+
+        Returns:
+            Dictionary with final-price distribution, percentile bands and sample paths
+        """
+        if method not in ('gbm', 'bootstrap'):
+            return {'success': False, 'symbol': symbol, 'error': f"Unknown method: {method}"}
+        if not 1 <= days <= self.MAX_DAYS or not 1 <= simulations <= self.MAX_SIMULATIONS:
+            return {'success': False, 'symbol': symbol,
+                    'error': f"days must be 1-{self.MAX_DAYS} and simulations 1-{self.MAX_SIMULATIONS:,}"}
+
+        try:
+            closes = self._get_daily_closes(symbol, history_period)
+            if closes is None:
+                return {'success': False, 'symbol': symbol, 'error': 'No price history available'}
+
+            log_returns = np.diff(np.log(closes.to_numpy(dtype=float)))
+            current_price = float(closes.iloc[-1])
+            sigma = float(log_returns.std(ddof=1) * math.sqrt(TRADING_DAYS))
+            mu = float(log_returns.mean() * TRADING_DAYS + 0.5 * sigma ** 2)
+
+            if method == 'gbm':
+                result = self.monte_carlo.simulate_gbm(
+                    current_price, mu, sigma, days=days, simulations=simulations, seed=seed,
+                    antithetic=antithetic, moment_matching=moment_matching
+                )
+            else:
+                result = self.monte_carlo.simulate_bootstrap(
+                    current_price, log_returns, days=days, simulations=simulations, seed=seed,
+                    block_size=block_size, antithetic=antithetic
+                )
+
+            return {
+                'success': True,
+                'symbol': symbol,
+                'current_price': round(current_price, 2),
+                'historical': {
+                    'period': history_period,
+                    'observations': len(log_returns),
+                    'annual_return': round(mu * 100, 2),
+                    'annual_volatility': round(sigma * 100, 2)
+                },
+                **result.to_dict(),
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            print(f"Error running Monte Carlo for {symbol}: {e}")
+            return {'success': False, 'symbol': symbol, 'error': str(e)}
+
+    def optimize_portfolio(self, symbols: List[str], estimator: str = 'rolling', shrinkage='ledoit_wolf',
+                           max_weight: float = 1.0) -> Dict:
+        """
+        Long-only minimum-variance and maximum-Sharpe portfolios
+
+        Args:
+            symbols: Stock ticker symbols
+            estimator: Covariance estimator ('rolling' or 'ewma')
+            shrinkage: None, intensity in [0, 1] or 'ledoit_wolf'
+            max_weight: Cap per position (0.25 = 25%)
+
+        Returns:
+            Dictionary with weights and expected return/volatility/Sharpe per portfolio
+        """
+        started = time.perf_counter()
+        try:
+            available, cov = self.returns_service.covariance(symbols, estimator, shrinkage)
+            if len(available) < 2:
+                return {'success': False, 'error': 'Need price history for at least 2 symbols',
+                        'missing': [s for s in symbols if s.upper() not in available]}
+            loaded = time.perf_counter()
+
+            # Arithmetic expected return from the mean log return
+            _, log_means = self.returns_service.mean_returns(available)
+            mu = log_means + 0.5 * np.diag(cov)
+            portfolios = portfolio_optimizer.optimize(mu, cov, self.risk_free_rate, max_weight)
+            solved = time.perf_counter()
+
+            def describe(weights: np.ndarray) -> Dict:
+                stats = portfolio_optimizer.portfolio_stats(weights, mu, cov, self.risk_free_rate)
+                order = np.argsort(-weights)
+                return {
+                    'weights': {available[i]: round(float(weights[i]) * 100, 2)
+                                for i in order if weights[i] >= 1e-4},
+                    'expected_return': round(stats['expected_return'] * 100, 2),
+                    'volatility': round(stats['volatility'] * 100, 2),
+                    'sharpe_ratio': round(stats['sharpe_ratio'], 3)
+                }
+
+            return {
+                'success': True,
+                'symbols': available,
+                'missing': [s for s in symbols if s.upper() not in available],
+                'estimator': estimator,
+                'shrinkage': shrinkage,
+                'max_sharpe': describe(portfolios['max_sharpe']),
+                'min_variance': describe(portfolios['min_variance']),
+                'equal_weight': describe(np.full(len(available), 1.0 / len(available))),
+                'efficient_frontier': [{'return': round(r * 100, 2), 'volatility': round(v * 100, 2)}
+                                       for r, v in portfolios['frontier']],
+                'observations': self.returns_service.observations(available),
+                'timings_ms': {'covariance': round((loaded - started) * 1000, 2),
+                               'optimization': round((solved - loaded) * 1000, 2)},
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            print(f"Error optimizing portfolio: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def calculate_correlation_matrix(self, symbols: List[str], estimator: str = 'rolling',
+                                     shrinkage=None, threshold: float = 0.7) -> Dict:
+        """
+        Correlation matrix of daily returns
+
+        Args:
+            symbols: Stock ticker symbols
+            estimator: 'rolling' or 'ewma'
+            shrinkage: None, intensity in [0, 1] or 'ledoit_wolf'
+            threshold: |correlation| reported as a highly correlated pair
+
+        Returns:
+            Dictionary with the matrix, highly correlated pairs and average correlation
+        """
+        started = time.perf_counter()
+        try:
+            available, corr = self.returns_service.correlation(symbols, estimator, shrinkage)
+            if len(available) < 2:
+                return {'success': False, 'error': 'Need price history for at least 2 symbols',
+                        'missing': [s for s in symbols if s.upper() not in available]}
+
+            upper_i, upper_j = np.triu_indices(len(available), k=1)
+            upper = corr[upper_i, upper_j]
+            strong = np.flatnonzero(np.abs(upper) >= threshold)
+            strong = strong[np.argsort(-np.abs(upper[strong]))]
+
+            rounded = np.round(corr, 4)
+            return {
+                'success': True,
+                'symbols': available,
+                'missing': [s for s in symbols if s.upper() not in available],
+                'estimator': estimator,
+                'shrinkage': shrinkage,
+                'matrix': {s: dict(zip(available, rounded[i].tolist())) for i, s in enumerate(available)},
+                'highly_correlated_pairs': [
+                    {'symbol1': available[upper_i[k]], 'symbol2': available[upper_j[k]],
+                     'correlation': round(float(upper[k]), 4)}
+                    for k in strong
+                ],
+                'average_correlation': round(float(upper.mean()), 4),
+                'observations': self.returns_service.observations(available),
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            print(f"Error calculating correlation matrix: {e}")
+            return {'success': False, 'error': str(e)}
+
+    # ------------------------------------------------------------------
+    # Options
+    # ------------------------------------------------------------------
+
+    def _spot_and_volatility(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """Last close and annualized historical volatility (rolling window)"""
+        available, prices = self.returns_service.latest_prices([symbol])
+        if not available:
+            return None
+        _, cov = self.returns_service.covariance(available)
+        return float(prices[0]), float(np.sqrt(cov[0, 0]))
+
+    @staticmethod
+    def _records(columns: Dict[str, np.ndarray], decimals: int = 4) -> List[Dict]:
+        """Column arrays -> JSON-safe row dictionaries (NaN -> None)"""
+        df = pd.DataFrame(columns).round(decimals)
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+
+    def black_scholes_options(self, symbol: str, strike: float, days: int = 30, option_type: str = 'call',
+                              volatility: Optional[float] = None, dividend_yield: float = 0.0) -> Dict:
+        """
+        Price one contract with Black-Scholes
+
+        Args:
+            symbol: Stock ticker symbol
+            strike: Strike price
+            days: Calendar days to expiry
+            option_type: 'call' or 'put'
+            volatility: Annualized volatility (default: historical volatility)
+            dividend_yield: Continuous dividend yield
+
+        Returns:
+            Dictionary with price, Greeks, intrinsic and time value
+        """
+        result = self.price_options(symbol, [strike], [days], option_type, volatility, dividend_yield)
+        if not result.get('success'):
+            return result
+
+        contract = result['contracts'][0]
+        return {
+            'success': True,
+            'symbol': result['symbol'],
+            'current_price': result['current_price'],
+            'strike': strike,
+            'days_to_expiry': days,
+            'option_type': option_type,
+            'volatility': result['volatility'],
+            'volatility_source': result['volatility_source'],
+            'risk_free_rate': self.risk_free_rate,
+            'price': contract['price'],
+            'intrinsic_value': contract['intrinsic_value'],
+            'time_value': contract['time_value'],
+            'greeks': {greek: contract[greek] for greek in self.GREEKS},
+            'timestamp': result['timestamp']
+        }
+
+    def price_options(self, symbol: str, strikes: Sequence[float], days: Sequence[int],
+                      option_type: str = 'both', volatility: Optional[float] = None,
+                      dividend_yield: float = 0.0) -> Dict:
+        """
+        Price every strike x expiry (x call/put) combination in one vectorized pass
+
+        Args:
+            symbol: Stock ticker symbol
+            strikes: Strike prices
+            days: Calendar days to expiry
+            option_type: 'call', 'put' or 'both'
+            volatility: Annualized volatility (default: historical volatility)
+            dividend_yield: Continuous dividend yield
+
+        Returns:
+            Dictionary with one row per contract (price, intrinsic/time value, Greeks)
+        """
+        if option_type not in ('call', 'put', 'both'):
+            return {'success': False, 'symbol': symbol, 'error': f"Unknown option type: {option_type}"}
+        started = time.perf_counter()
+        try:
+            inputs = self._spot_and_volatility(symbol)
+            if inputs is None:
+                return {'success': False, 'symbol': symbol, 'error': 'No price history available'}
+            spot, historical_volatility = inputs
+            sigma = historical_volatility if volatility is None else float(volatility)
+            loaded = time.perf_counter()
+
+            types = ['call', 'put'] if option_type == 'both' else [option_type]
+            grid_types, grid_days, grid_strikes = np.meshgrid(
+                np.array(types), np.asarray(days, dtype=float), np.asarray(strikes, dtype=float), indexing='ij'
+            )
+            grid_types, grid_days, grid_strikes = grid_types.ravel(), grid_days.ravel(), grid_strikes.ravel()
+
+            priced = black_scholes(spot, grid_strikes, grid_days / 365, self.risk_free_rate, sigma,
+                                   grid_types, dividend_yield)
+            computed = time.perf_counter()
+
+            contracts = self._records({
+                'type': grid_types,
+                'strike': grid_strikes,
+                'days_to_expiry': grid_days.astype(int),
+                'price': priced['price'],
+                'intrinsic_value': priced['intrinsic'],
+                'time_value': priced['price'] - priced['intrinsic'],
+                **{greek: priced[greek] for greek in self.GREEKS}
+            })
+
+            return {
+                'success': True,
+                'symbol': symbol.upper(),
+                'current_price': round(spot, 2),
+                'volatility': round(sigma, 4),
+                'volatility_source': 'historical' if volatility is None else 'input',
+                'historical_volatility': round(historical_volatility, 4),
+                'risk_free_rate': self.risk_free_rate,
+                'dividend_yield': dividend_yield,
+                'contracts': contracts,
+                'timings_ms': {'inputs': round((loaded - started) * 1000, 2),
+                               'pricing': round((computed - loaded) * 1000, 2),
+                               'serialize': round((time.perf_counter() - computed) * 1000, 2)},
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            print(f"Error pricing options for {symbol}: {e}")
+            return {'success': False, 'symbol': symbol, 'error': str(e)}
+
+    def option_chain_analysis(self, symbol: str, expirations: int = 4, option_type: str = 'both',
+                              dividend_yield: float = 0.0) -> Dict:
+        """
+        Implied volatility and Greeks for the listed option chain
+
+        Market prices are bid/ask mids (last trade when there's no two-sided
+        quote). Implied volatilities are solved for the whole chain at once;
+        Greeks use each contract's implied volatility, or the historical
+        volatility where it can't be solved.
+
+        Args:
+            symbol: Stock ticker symbol
+            expirations: Nearest expiration dates to include
+            option_type: 'call', 'put' or 'both'
+            dividend_yield: Continuous dividend yield
+
+        Returns:
+            Dictionary with contracts per expiration and the ATM volatility term structure
+        """
+        if option_type not in ('call', 'put', 'both'):
+            return {'success': False, 'symbol': symbol, 'error': f"Unknown option type: {option_type}"}
+        started = time.perf_counter()
+        try:
+            chain = self.market_data.get_option_chain(symbol, expirations)
+            inputs = self._spot_and_volatility(symbol)
+            if chain is None or inputs is None:
+                return {'success': False, 'symbol': symbol, 'error': 'No option chain or price history available'}
+            if option_type != 'both':
+                chain = chain[chain['type'] == option_type].reset_index(drop=True)
+            spot, historical_volatility = inputs
+            fetched = time.perf_counter()
+
+            bid, ask, last = (chain[c].to_numpy(dtype=float) for c in ('bid', 'ask', 'last'))
+            two_sided = (bid > 0) & (ask >= bid)
+            market = np.where(two_sided, (bid + ask) / 2, last)
+
+            # Expiry at the 16:00 New York close
+            expiry = pd.to_datetime(chain['expiration']).dt.tz_localize('America/New_York') + pd.Timedelta(hours=16)
+            now = pd.Timestamp.now(tz='America/New_York')
+            years = np.maximum((expiry - now).dt.total_seconds().to_numpy() / (365 * 86400), 0.0)
+            strikes = chain['strike'].to_numpy(dtype=float)
+            types = chain['type'].to_numpy()
+
+            iv = implied_volatility(market, spot, strikes, years, self.risk_free_rate, types, dividend_yield)
+            solved = time.perf_counter()
+            greeks = black_scholes(spot, strikes, years, self.risk_free_rate,
+                                   np.where(np.isfinite(iv), iv, historical_volatility), types, dividend_yield)
+            computed = time.perf_counter()
+
+            columns = {
+                'contract': chain['contract'].to_numpy(),
+                'type': types,
+                'strike': strikes,
+                'bid': bid,
+                'ask': ask,
+                'market_price': market,
+                'implied_volatility': iv,
+                'yahoo_implied_volatility': chain['implied_volatility'].to_numpy(dtype=float),
+                'model_price': greeks['price'],
+                'volume': chain['volume'].to_numpy(dtype=float),
+                'open_interest': chain['open_interest'].to_numpy(dtype=float),
+                **{greek: greeks[greek] for greek in self.GREEKS}
+            }
+
+            by_expiration = []
+            moneyness = np.abs(np.log(strikes / spot))
+            for expiration, rows in chain.groupby('expiration', sort=True).indices.items():
+                rows = rows[np.lexsort((strikes[rows], types[rows]))]
+                solvable = rows[np.isfinite(iv[rows])]
+                atm = solvable[np.argsort(moneyness[solvable])[:2]] if len(solvable) else solvable
+                by_expiration.append({
+                    'expiration': expiration,
+                    'days_to_expiry': round(float(years[rows[0]] * 365), 2),
+                    'atm_implied_volatility': round(float(iv[atm].mean()), 4) if len(atm) else None,
+                    'contracts': self._records({name: values[rows] for name, values in columns.items()})
+                })
+
+            return {
+                'success': True,
+                'symbol': symbol.upper(),
+                'current_price': round(spot, 2),
+                'historical_volatility': round(historical_volatility, 4),
+                'risk_free_rate': self.risk_free_rate,
+                'contracts_priced': len(chain),
+                'implied_volatility_solved': int(np.isfinite(iv).sum()),
+                'expirations': by_expiration,
+                'timings_ms': {'fetch': round((fetched - started) * 1000, 2),
+                               'implied_volatility': round((solved - fetched) * 1000, 2),
+                               'greeks': round((computed - solved) * 1000, 2),
+                               'serialize': round((time.perf_counter() - computed) * 1000, 2)},
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            print(f"Error analyzing option chain for {symbol}: {e}")
+            return {'success': False, 'symbol': symbol, 'error': str(e)}
+
+    # ------------------------------------------------------------------
+    # Risk metrics
+    # ------------------------------------------------------------------
+
+    def _period_rows(self, period: str) -> int:
+        """Return rows covered by a period such as '3mo' or '1y'"""
+        count = ''.join(filter(str.isdigit, period))
+        unit = period[len(count):]
+        if not count or unit not in self.PERIOD_DAYS:
+            raise ValueError(f"Unsupported period: {period}")
+        return int(count) * self.PERIOD_DAYS[unit]
+
+    def calculate_risk_metrics_batch(self, symbols: List[str], period: str = '1y', benchmark: str = 'SPY',
+                                     confidence: float = 0.95) -> Dict:
+        """
+        Risk metrics for many symbols in one pass over the cached returns matrix
+
+        Args:
+            symbols: Stock ticker symbols
+            period: Lookback ('3mo', '6mo', '1y', '2y', ...)
+            benchmark: Symbol for beta/correlation (None to skip)
+            confidence: VaR/CVaR confidence level
+
+        Returns:
+            Dictionary with metrics per symbol (percentages for returns, volatility,
+            drawdowns and one-day VaR/CVaR) and per-stage timings
+        """
+        started = time.perf_counter()
+        try:
+            rows = self._period_rows(period)
+            if not 0.5 < confidence < 1:
+                raise ValueError("confidence must be between 0.5 and 1")
+
+            requested = list(dict.fromkeys(s.upper() for s in symbols))
+            universe = requested + ([benchmark.upper()] if benchmark else [])
+            self.returns_service.track(universe)
+            loaded = time.perf_counter()
+
+            available, dates, returns = self.returns_service.returns_matrix(universe, rows)
+            bench_returns = None
+            if benchmark and benchmark.upper() in available:
+                bench_returns = returns[:, available.index(benchmark.upper())]
+            columns = [i for i, s in enumerate(available) if s in requested]
+            returns = returns[:, columns]
+            names = [available[i] for i in columns]
+            sliced = time.perf_counter()
+
+            metrics = compute_risk_metrics(returns, self.risk_free_rate, bench_returns, confidence)
+            computed = time.perf_counter()
+
+            percent = {'total_return', 'annual_return', 'volatility', 'max_drawdown', 'current_drawdown',
+                       'var_historical', 'cvar_historical', 'var_parametric', 'cvar_parametric'}
+            table = {name: np.round(values * 100 if name in percent else values, 4)
+                     for name, values in metrics.items()}
+            table['observations'] = metrics['observations']
+            records = self._records(table)
+            results = dict(zip(names, records))
+
+            return {
+                'success': True,
+                'period': period,
+                'start_date': str(dates[0])[:10] if len(dates) else None,
+                'end_date': str(dates[-1])[:10] if len(dates) else None,
+                'benchmark': benchmark.upper() if bench_returns is not None else None,
+                'confidence': confidence,
+                'risk_free_rate': self.risk_free_rate,
+                'metrics': results,
+                'missing': [s for s in requested if s not in results],
+                'timings_ms': {'prices': round((loaded - started) * 1000, 2),
+                               'returns': round((sliced - loaded) * 1000, 2),
+                               'metrics': round((computed - sliced) * 1000, 2),
+                               'serialize': round((time.perf_counter() - computed) * 1000, 2)},
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            print(f"Error calculating risk metrics: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def calculate_risk_metrics(self, symbol: str, period: str = '1y', benchmark: str = 'SPY',
+                               confidence: float = 0.95) -> Dict:
+        """
+        Risk metrics for one symbol
+
+        Returns:
+            Dictionary with volatility, Sharpe/Sortino, drawdowns, beta and VaR/CVaR
+        """
+        result = self.calculate_risk_metrics_batch([symbol], period, benchmark, confidence)
+        if not result.get('success'):
+            return {**result, 'symbol': symbol}
+        metrics = result['metrics'].get(symbol.upper())
+        if metrics is None:
+            return {'success': False, 'symbol': symbol, 'error': 'No price history available'}
+
+        return {
+            'success': True,
+            'symbol': symbol.upper(),
+            **{key: result[key] for key in ('period', 'start_date', 'end_date', 'benchmark',
+                                            'confidence', 'risk_free_rate')},
+            **metrics,
+            'timings_ms': result['timings_ms'],
+            'timestamp': result['timestamp']
+        }
@@ -0,0 +1,395 @@
+"""
+Returns / covariance service
+Aligned daily-returns matrix for the tracked universe with incrementally
+maintained rolling-window and EWMA covariance estimators
+"""
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.data.market_data import MarketDataFetcher
+
+TRADING_DAYS = 252
+NS_PER_DAY = 86_400 * 10 ** 9
+ESTIMATORS = ('rolling', 'ewma')
+
+
+class _WindowMoments:
+    """
+    Weighted second moments of the last `window` return rows.
+
+    With mask m (1 = return present) and returns r (0 where missing):
+        C = sum w m m'    (pairwise observation weight)
+        A = sum w r m'    (A[i, j] = weighted sum of r_i over days j is present)
+        P = sum w r r'    (pairwise cross products)
+    Weights are 1 for a rolling window and decay**age for EWMA, so a new day is
+    one decay plus two rank-1 updates (add the new row, drop the oldest).
+    """
+
+    def __init__(self, decay: float, window: int):
+        self.decay = decay
+        self.window = window
+        self.C = self.A = self.P = None
+
+    def rebuild(self, returns: np.ndarray, mask: np.ndarray):
+        weights = self.decay ** np.arange(len(returns) - 1, -1, -1, dtype=float)
+        weighted_r = returns * weights[:, None]
+        weighted_m = mask * weights[:, None]
+        self.C = mask.T @ weighted_m
+        self.A = returns.T @ weighted_m
+        self.P = returns.T @ weighted_r
+
+    def push(self, r: np.ndarray, m: np.ndarray, dropped: Optional[Tuple[np.ndarray, np.ndarray]]):
+        if self.decay != 1.0:
+            self.C *= self.decay
+            self.A *= self.decay
+            self.P *= self.decay
+        self._add(r, m, 1.0)
+        if dropped is not None:
+            self._add(dropped[0], dropped[1], -self.decay ** self.window)
+
+    def replace_last(self, old: Tuple[np.ndarray, np.ndarray], new: Tuple[np.ndarray, np.ndarray]):
+        self._add(old[0], old[1], -1.0)
+        self._add(new[0], new[1], 1.0)
+
+    def _add(self, r: np.ndarray, m: np.ndarray, weight: float):
+        wm = weight * m
+        self.C += np.outer(m, wm)
+        self.A += np.outer(r, wm)
+        self.P += np.outer(r, weight * r)
+
+
+class ReturnsService:
+    """
+    Aligned daily returns for a growing universe of symbols.
+
+    Close prices come from MarketDataFetcher (daily bars served from the data
+    lake, so a refresh downloads only new sessions) and are aligned on one
+    calendar. Log returns run from each symbol's previous close, and days a
+    symbol didn't trade are masked out of every estimate.
+
+    Both estimators are kept for the whole universe: a new session is an O(n²)
+    rank-1 update, and today's still-changing bar replaces the last row in
+    place. A request slices the rows/columns for its symbols out of that state,
+    so a 500-name covariance costs an index, not 500 downloads and a rebuild.
+    """
+
+    def __init__(self, market_data: Optional[MarketDataFetcher] = None, window: int = TRADING_DAYS,
+                 ewma_lambda: float = 0.94, history_period: str = '2y', refresh_seconds: float = 3600,
+                 rebuild_every: int = 250):
+        """
+        Args:
+            market_data: Price source (default: lake-backed MarketDataFetcher)
+            window: Return rows in the rolling window (and the EWMA's truncation)
+            ewma_lambda: EWMA decay (0.94 = RiskMetrics daily)
+            history_period: Daily history kept per symbol
+            refresh_seconds: Minimum time between two price refreshes of a symbol
+            rebuild_every: Incremental updates before a full rebuild (bounds rounding drift)
+        """
+        self.market_data = market_data or MarketDataFetcher()
+        self.window = window
+        self.ewma_lambda = ewma_lambda
+        self.history_period = history_period
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_every = rebuild_every
+
+        self._lock = threading.RLock()
+        self.symbols: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._series: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._fetched: Dict[str, float] = {}
+        self._unavailable: Dict[str, float] = {}
+
+        self.days = np.empty(0, dtype=np.int64)        # calendar, days since epoch
+        self.closes = np.empty((0, 0))                 # (days, symbols), NaN = no bar
+        self.returns = np.empty((0, 0))                # (days - 1, symbols), 0 where masked
+        self.mask = np.empty((0, 0))                   # 1.0 where the return exists
+        self._moments = {
+            'rolling': _WindowMoments(1.0, window),
+            'ewma': _WindowMoments(ewma_lambda, window)
+        }
+        self._updates_since_rebuild = 0
+        self.stats = {'refreshes': 0, 'price_loads': 0, 'rebuilds': 0, 'incremental_updates': 0,
+                      'requests': 0}
+
+    # ------------------------------------------------------------------
+    # Universe / prices
+    # ------------------------------------------------------------------
+
+    def track(self, symbols: List[str]) -> List[str]:
+        """
+        Add symbols to the universe and refresh stale prices
+
+        Returns:
+            The requested symbols that have price history, in request order
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        now = time.monotonic()
+
+        stale = [s for s in symbols
+                 if now - self._fetched.get(s, float('-inf')) >= self.refresh_seconds
+                 and now - self._unavailable.get(s, float('-inf')) >= self.refresh_seconds]
+
+        # Download outside the lock; other requests keep reading the current state
+        loaded = {}
+        for symbol in stale:
+            series = self._load_series(symbol)
+            if series is None:
+                self._unavailable[symbol] = now
+            else:
+                loaded[symbol] = series
+
+        if loaded:
+            with self._lock:
+                for symbol, series in loaded.items():
+                    self._series[symbol] = self._merge_series(self._series.get(symbol), series)
+                    self._fetched[symbol] = now
+                self._apply(list(loaded))
+
+        return [s for s in symbols if s in self._columns]
+
+    def _load_series(self, symbol: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(session days since epoch, closes) for a symbol, or None"""
+        try:
+            df = self.market_data.get_stock_data(symbol, period=self.history_period, interval='1d')
+            self.stats['price_loads'] += 1
+            if df is None or df.empty:
+                return None
+            closes = df['Close'].to_numpy(dtype=float)
+            index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+            days = index.normalize().as_unit('ns').asi8 // NS_PER_DAY
+            valid = np.isfinite(closes) & (closes > 0)
+            days, closes = days[valid], closes[valid]
+            if len(days) < 2:
+                return None
+            # Keep the last bar of a session if the source repeats a day
+            last = np.r_[days[1:] != days[:-1], True]
+            return days[last], closes[last]
+        except Exception as e:
+            print(f"Error loading daily prices for {symbol}: {e}")
+            return None
+
+    @staticmethod
+    def _merge_series(stored: Optional[Tuple[np.ndarray, np.ndarray]],
+                      loaded: Tuple[np.ndarray, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Stored history extended by (and overridden with) the loaded sessions"""
+        if stored is None:
+            return loaded
+        keep = stored[0] < loaded[0][0]
+        return np.concatenate([stored[0][keep], loaded[0]]), np.concatenate([stored[1][keep], loaded[1]])
+
+    def _apply(self, refreshed: List[str]):
+        """Fold refreshed series into the matrices, incrementally when possible"""
+        self.stats['refreshes'] += 1
+        added = [s for s in refreshed if s not in self._columns]
+        symbols = self.symbols + added
+
+        calendar = np.unique(np.concatenate([self._series[s][0] for s in symbols]))
+        closes = np.full((len(calendar), len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            days, values = self._series[symbol]
+            closes[np.searchsorted(calendar, days), j] = values
+        returns, mask = self._log_returns(closes)
+
+        old_rows = len(self.returns)
+        incremental = (
+            not added
+            and old_rows > 0
+            and self._updates_since_rebuild < self.rebuild_every
+            and len(calendar) >= len(self.days)
+            and np.array_equal(calendar[:len(self.days)], self.days)
+            and np.array_equal(returns[:old_rows - 1], self.returns[:old_rows - 1])
+            and np.array_equal(mask[:old_rows - 1], self.mask[:old_rows - 1])
+        )
+
+        if incremental:
+            last = old_rows - 1
+            old_row, new_row = (self.returns[last], self.mask[last]), (returns[last], mask[last])
+            if not (np.array_equal(old_row[0], new_row[0]) and np.array_equal(old_row[1], new_row[1])):
+                # Today's bar moved: swap the provisional row
+                for moments in self._moments.values():
+                    moments.replace_last(old_row, new_row)
+                self._updates_since_rebuild += 1
+            for row in range(old_rows, len(returns)):
+                dropped_row = row - self.window
+                dropped = (returns[dropped_row], mask[dropped_row]) if dropped_row >= 0 else None
+                for moments in self._moments.values():
+                    moments.push(returns[row], mask[row], dropped)
+                self._updates_since_rebuild += 1
+            self.stats['incremental_updates'] += 1
+        else:
+            start = max(0, len(returns) - self.window)
+            for moments in self._moments.values():
+                moments.rebuild(returns[start:], mask[start:])
+            self._updates_since_rebuild = 0
+            self.stats['rebuilds'] += 1
+
+        self.symbols = symbols
+        self._columns = {s: j for j, s in enumerate(symbols)}
+        self.days, self.closes, self.returns, self.mask = calendar, closes, returns, mask
+
+    @staticmethod
+    def _log_returns(closes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Log returns from each symbol's previous close, and the presence mask"""
+        log_closes = np.log(closes)
+        rows = np.arange(len(closes))[:, None]
+        # Forward fill: row of the latest close at or before each day
+        last_seen = np.maximum.accumulate(np.where(np.isfinite(log_closes), rows, -1), axis=0)
+        filled = np.take_along_axis(log_closes, np.maximum(last_seen, 0), axis=0)
+
+        present = np.isfinite(log_closes[1:]) & (last_seen[:-1] >= 0)
+        returns = np.where(present, log_closes[1:] - filled[:-1], 0.0)
+        return returns, present.astype(float)
+
+    # ------------------------------------------------------------------
+    # Estimates
+    # ------------------------------------------------------------------
+
+    def _indices(self, symbols: List[str]) -> Tuple[List[str], np.ndarray]:
+        available = self.track(symbols)
+        return available, np.array([self._columns[s] for s in available], dtype=int)
+
+    def covariance(self, symbols: List[str], estimator: str = 'rolling', shrinkage=None,
+                   annualize: bool = True) -> Tuple[List[str], np.ndarray]:
+        """
+        Covariance of daily log returns
+
+        Args:
+            symbols: Stock ticker symbols
+            estimator: 'rolling' (sample covariance over the window) or
+                       'ewma' (RiskMetrics, zero mean)
+            shrinkage: None, an intensity in [0, 1], or 'ledoit_wolf', shrinking
+                       toward a scaled identity
+            annualize: Scale to annual (x 252)
+
+        Returns:
+            (symbols with data, k x k covariance matrix)
+        """
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"Unknown estimator: {estimator} (use {', '.join(ESTIMATORS)})")
+        available, idx = self._indices(symbols)
+        self.stats['requests'] += 1
+
+        with self._lock:
+            moments = self._moments[estimator]
+            grid = np.ix_(idx, idx)
+            C, A, P = moments.C[grid], moments.A[grid], moments.P[grid]
+            window_returns = self.returns[-self.window:][:, idx] if shrinkage == 'ledoit_wolf' else None
+            window_mask = self.mask[-self.window:][:, idx] if shrinkage == 'ledoit_wolf' else None
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if estimator == 'rolling':
+                means = A / C  # means[i, j] = mean of i over days j traded
+                cov = (P - C * means * means.T) / (C - 1)
+            else:
+                cov = P / C
+        cov = np.nan_to_num(cov)
+
+        if shrinkage is not None:
+            if shrinkage == 'ledoit_wolf':
+                intensity = self._ledoit_wolf_intensity(cov, window_returns, window_mask)
+            else:
+                intensity = float(shrinkage)
+            cov = self.shrink(cov, intensity)
+
+        return available, cov * TRADING_DAYS if annualize else cov
+
+    def correlation(self, symbols: List[str], estimator: str = 'rolling',
+                    shrinkage=None) -> Tuple[List[str], np.ndarray]:
+        """Correlation matrix (same arguments as covariance)"""
+        available, cov = self.covariance(symbols, estimator, shrinkage, annualize=False)
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.nan_to_num(cov / np.outer(std, std))
+        np.fill_diagonal(corr, 1.0)
+        return available, np.clip(corr, -1.0, 1.0)
+
+    def mean_returns(self, symbols: List[str], annualize: bool = True) -> Tuple[List[str], np.ndarray]:
+        """Mean daily log return over the rolling window"""
+        available, idx = self._indices(symbols)
+        with self._lock:
+            moments = self._moments['rolling']
+            with np.errstate(divide='ignore', invalid='ignore'):
+                means = np.nan_to_num(np.diag(moments.A)[idx] / np.diag(moments.C)[idx])
+        return available, means * TRADING_DAYS if annualize else means
+
+    def observations(self, symbols: List[str]) -> Dict[str, int]:
+        """Return days in the rolling window per symbol"""
+        with self._lock:
+            counts = np.diag(self._moments['rolling'].C) if self.symbols else np.empty(0)
+            return {s: int(counts[self._columns[s]]) for s in symbols if s in self._columns}
+
+    def returns_matrix(self, symbols: List[str], rows: Optional[int] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Aligned daily log returns
+
+        Args:
+            symbols: Stock ticker symbols
+            rows: Latest rows to return (None = full history)
+
+        Returns:
+            (symbols with data, session dates, returns with NaN where masked)
+        """
+        available, idx = self._indices(symbols)
+        with self._lock:
+            start = 0 if rows is None else max(0, len(self.returns) - rows)
+            returns = np.where(self.mask[start:, idx] > 0, self.returns[start:, idx], np.nan)
+            dates = (self.days[1:][start:] * NS_PER_DAY).view('M8[ns]')
+        return available, dates, returns
+
+    def latest_prices(self, symbols: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Last close of each symbol"""
+        available, idx = self._indices(symbols)
+        with self._lock:
+            closes = self.closes[:, idx]
+            rows = np.where(np.isfinite(closes), np.arange(len(closes))[:, None], -1).max(axis=0)
+            return available, closes[rows, np.arange(len(idx))]
+
+    @staticmethod
+    def shrink(cov: np.ndarray, intensity: float) -> np.ndarray:
+        """Blend toward mu * I (mu = average variance)"""
+        intensity = min(max(intensity, 0.0), 1.0)
+        target = np.eye(len(cov)) * np.trace(cov) / max(len(cov), 1)
+        return (1 - intensity) * cov + intensity * target
+
+    @staticmethod
+    def _ledoit_wolf_intensity(cov: np.ndarray, returns: np.ndarray, mask: np.ndarray) -> float:
+        """
+        Ledoit-Wolf (2004) optimal intensity toward a scaled identity, with the
+        sampling-error term estimated from the window's returns
+        """
+        counts = mask.sum(axis=0)
+        if len(cov) < 2 or counts.min() < 2:
+            return 0.0
+        X = (returns - returns.sum(axis=0) / counts) * mask
+        T = len(X)
+        mu = np.trace(cov) / len(cov)
+        d2 = np.sum((cov - mu * np.eye(len(cov))) ** 2)
+        if d2 <= 0:
+            return 0.0
+        # sum_t ||x_t x_t' - S||^2 without forming the outer products
+        squared_norms = np.einsum('ij,ij->i', X, X)
+        b2 = (np.sum(squared_norms ** 2) - 2 * np.sum((X @ cov) * X) + T * np.sum(cov ** 2)) / T ** 2
+        return float(min(max(b2, 0.0), d2) / d2)
+
+    def get_stats(self) -> Dict:
+        """Service statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'symbols': len(self.symbols),
+                'sessions': len(self.days),
+                'window': self.window,
+                'ewma_lambda': self.ewma_lambda,
+                'last_session': (pd.Timestamp(int(self.days[-1]) * NS_PER_DAY).date().isoformat()
+                                 if len(self.days) else None)
+            }
@@ -0,0 +1,137 @@
+"""
+Batched risk metrics
+Column-wise NumPy computations over an aligned daily-returns matrix
+(one column per symbol, NaN where a symbol has no return)
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+TRADING_DAYS = 252
+
+
+def norm_ppf(p: float) -> float:
+    """Inverse standard normal CDF (Acklam's rational approximation, ~1e-9)"""
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+
+    if not 0 < p < 1:
+        raise ValueError("p must be in (0, 1)")
+    if p < 0.02425:
+        q = np.sqrt(-2 * np.log(p))
+        return (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+               ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    if p > 1 - 0.02425:
+        return -norm_ppf(1 - p)
+    q = p - 0.5
+    r = q * q
+    return (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q / \
+           (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+
+
+def compute_risk_metrics(log_returns: np.ndarray, risk_free_rate: float = 0.0,
+                         benchmark: Optional[np.ndarray] = None, confidence: float = 0.95) -> Dict[str, np.ndarray]:
+    """
+    Risk metrics for every column of a returns matrix at once
+
+    Args:
+        log_returns: (days, symbols) daily log returns, NaN where missing
+        risk_free_rate: Annual risk-free rate for Sharpe/Sortino
+        benchmark: (days,) benchmark daily log returns for beta/correlation
+        confidence: VaR/CVaR confidence level
+
+    Returns:
+        Dictionary of (symbols,) arrays. Returns, volatility and drawdowns are
+        fractions (0.12 = 12%); VaR/CVaR are positive one-day loss fractions
+    """
+    present = np.isfinite(log_returns)
+    counts = present.sum(axis=0)
+    valid = counts >= 2
+    safe_counts = np.maximum(counts, 1)
+
+    simple = np.where(present, np.expm1(np.where(present, log_returns, 0.0)), 0.0)
+    log_zeroed = np.where(present, log_returns, 0.0)
+
+    mean = simple.sum(axis=0) / safe_counts
+    variance = np.where(present, (simple - mean) ** 2, 0.0).sum(axis=0) / np.maximum(counts - 1, 1)
+    daily_std = np.sqrt(variance)
+    volatility = daily_std * np.sqrt(TRADING_DAYS)
+
+    daily_rf = risk_free_rate / TRADING_DAYS
+    annual_excess = (mean - daily_rf) * TRADING_DAYS
+    downside = np.where(present, np.minimum(simple - daily_rf, 0.0) ** 2, 0.0).sum(axis=0) / safe_counts
+    downside_deviation = np.sqrt(downside) * np.sqrt(TRADING_DAYS)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(volatility > 0, annual_excess / volatility, np.nan)
+        sortino = np.where(downside_deviation > 0, annual_excess / downside_deviation, np.nan)
+
+    # Drawdowns on the cumulative log-price path (missing days carry the last value)
+    cumulative = np.cumsum(log_zeroed, axis=0)
+    peaks = np.maximum.accumulate(np.maximum(cumulative, 0.0), axis=0)
+    drawdowns = np.expm1(cumulative - peaks)
+    max_drawdown = drawdowns.min(axis=0, initial=0.0)
+    current_drawdown = drawdowns[-1] if len(drawdowns) else np.zeros(log_returns.shape[1])
+
+    total_return = np.expm1(log_zeroed.sum(axis=0))
+    with np.errstate(invalid='ignore'):
+        annual_return = np.expm1(log_zeroed.sum(axis=0) / safe_counts * TRADING_DAYS)
+
+    # Historical VaR/CVaR: empirical quantile of each column's simple returns
+    tail = 1 - confidence
+    ordered = np.sort(np.where(present, simple, np.inf), axis=0)  # missing values sort last
+    positions = tail * (counts - 1)
+    below, fraction = np.floor(positions).astype(int), positions - np.floor(positions)
+    columns = np.arange(simple.shape[1])
+    above = np.minimum(below + 1, np.maximum(counts - 1, 0))
+    with np.errstate(invalid='ignore'):
+        quantile = ordered[below, columns] * (1 - fraction) + ordered[above, columns] * fraction
+    var_historical = -quantile
+    in_tail = present & (simple <= quantile)
+    with np.errstate(invalid='ignore'):
+        cvar_historical = -np.where(in_tail, simple, 0.0).sum(axis=0) / np.maximum(in_tail.sum(axis=0), 1)
+
+    z = norm_ppf(tail)
+    var_parametric = -(mean + z * daily_std)
+    cvar_parametric = -(mean - daily_std * np.exp(-0.5 * z * z) / np.sqrt(2 * np.pi) / tail)
+
+    metrics = {
+        'observations': counts,
+        'total_return': total_return,
+        'annual_return': annual_return,
+        'volatility': volatility,
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+        'max_drawdown': max_drawdown,
+        'current_drawdown': current_drawdown,
+        'var_historical': var_historical,
+        'cvar_historical': cvar_historical,
+        'var_parametric': var_parametric,
+        'cvar_parametric': cvar_parametric
+    }
+
+    if benchmark is not None:
+        both = present & np.isfinite(benchmark)[:, None]
+        pair_counts = both.sum(axis=0)
+        bench = np.where(both, np.expm1(np.where(both, benchmark[:, None], 0.0)), 0.0)
+        own = np.where(both, simple, 0.0)
+        safe_pairs = np.maximum(pair_counts, 1)
+        bench_dev = np.where(both, bench - bench.sum(axis=0) / safe_pairs, 0.0)
+        own_dev = np.where(both, own - own.sum(axis=0) / safe_pairs, 0.0)
+        covariance = (own_dev * bench_dev).sum(axis=0)
+        bench_var = (bench_dev ** 2).sum(axis=0)
+        own_var = (own_dev ** 2).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            metrics['beta'] = np.where((pair_counts >= 2) & (bench_var > 0), covariance / bench_var, np.nan)
+            metrics['correlation'] = np.where((pair_counts >= 2) & (bench_var > 0) & (own_var > 0),
+                                              covariance / np.sqrt(bench_var * own_var), np.nan)
+
+    for name, values in metrics.items():
+        if name != 'observations':
+            metrics[name] = np.where(valid, values, np.nan)
+    return metrics
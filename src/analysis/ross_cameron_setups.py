@@ -1,6 +1,7 @@
 """
 Ross Cameron / Warrior Trading Setup Detection
 """
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
@@ -19,9 +20,77 @@ class SetupType(Enum):
 class RossCameronAnalyzer:
     """Detect Ross Cameron momentum setups"""
 
-    def __init__(self):
-        self.min_rvol = 2.0
-        self.min_gap_percent = 3.0
+    # Minimum score for a setup to be valid
+    DEFAULT_MIN_SCORES = {
+        SetupType.GAP_AND_GO: 5,
+        SetupType.RED_TO_GREEN: 6,
+        SetupType.FIRST_GREEN_DAY: 6,
+        SetupType.MICRO_PULLBACK: 5,
+        SetupType.BULL_FLAG: 5
+    }
+
+    # Targets as multiples of risk (R) above the entry
+    DEFAULT_TARGET_MULTIPLES = {
+        SetupType.GAP_AND_GO: (1.5, 2.5, 4),
+        SetupType.RED_TO_GREEN: (2, 3, 5),
+        SetupType.FIRST_GREEN_DAY: (2, 3, 5),
+        SetupType.MICRO_PULLBACK: (2, 3, 4),
+        SetupType.BULL_FLAG: (3, 5, 8)
+    }
+
+    def __init__(self, min_rvol: float = 2.0, min_gap_percent: float = 3.0,
+                 min_scores: Optional[Dict[SetupType, int]] = None,
+                 target_multiples: Optional[Dict[SetupType, Tuple[float, float, float]]] = None):
+        """
+        Args:
+            min_rvol: Minimum relative volume for Gap & Go
+            min_gap_percent: Minimum gap (%) for Gap & Go
+            min_scores: Per-setup score cutoffs (overrides DEFAULT_MIN_SCORES)
+            target_multiples: Per-setup target R-multiples (overrides DEFAULT_TARGET_MULTIPLES)
+        """
+        self.min_rvol = min_rvol
+        self.min_gap_percent = min_gap_percent
+        self.min_scores = {**self.DEFAULT_MIN_SCORES, **(min_scores or {})}
+        self.target_multiples = {**self.DEFAULT_TARGET_MULTIPLES, **(target_multiples or {})}
+
+    @classmethod
+    def from_params(cls, params: Dict) -> 'RossCameronAnalyzer':
+        """
+        Build an analyzer from flat parameters, e.g. from a parameter sweep
+
+        Args:
+            params: min_rvol, min_gap_percent, min_score_<setup> and
+                    targets_<setup> (three multiples), where <setup> is the
+                    lower-case SetupType name (e.g. min_score_gap_and_go)
+
+        Returns:
+            RossCameronAnalyzer
+        """
+        min_scores, target_multiples = {}, {}
+        for setup in cls.DEFAULT_MIN_SCORES:
+            key = setup.name.lower()
+            if f"min_score_{key}" in params:
+                min_scores[setup] = int(params[f"min_score_{key}"])
+            if f"targets_{key}" in params:
+                target_multiples[setup] = tuple(float(m) for m in params[f"targets_{key}"])
+
+        return cls(
+            min_rvol=float(params.get('min_rvol', 2.0)),
+            min_gap_percent=float(params.get('min_gap_percent', 3.0)),
+            min_scores=min_scores,
+            target_multiples=target_multiples
+        )
+
+    def get_params(self) -> Dict:
+        """Current parameters in the flat form accepted by from_params"""
+        params = {'min_rvol': self.min_rvol, 'min_gap_percent': self.min_gap_percent}
+        for setup in self.DEFAULT_MIN_SCORES:
+            params[f"min_score_{setup.name.lower()}"] = self.min_scores[setup]
+            params[f"targets_{setup.name.lower()}"] = list(self.target_multiples[setup])
+        return params
+
+    def _targets(self, setup: SetupType, entry: float, risk: float) -> List[float]:
+        return [round(entry + risk * multiple, 2) for multiple in self.target_multiples[setup]]
 
     def analyze_setup(self, stock_data: Dict, historical_df: Optional[pd.DataFrame] = None) -> Dict:
         """
@@ -124,20 +193,17 @@ class RossCameronAnalyzer:
             criteria_met.append("מחיר מעל EMA9")
             score += 1
 
-        valid = score >= 5
+        min_score = self.min_scores[SetupType.GAP_AND_GO]
+        valid = score >= min_score
 
         # Calculate entry, stop, targets
         entry = round(max(vwap, ema9) * 1.01, 2)  # 1% above VWAP/EMA9
         stop = round(min(vwap, ema9) * 0.99, 2)   # 1% below
         risk = entry - stop
 
-        targets = [
-            round(entry + risk * 1.5, 2),  # 1.5R
-            round(entry + risk * 2.5, 2),  # 2.5R
-            round(entry + risk * 4, 2)     # 4R
-        ]
+        targets = self._targets(SetupType.GAP_AND_GO, entry, risk)  # 1.5R / 2.5R / 4R by default
 
-        confidence = 'high' if score >= 6 else 'medium' if score >= 5 else 'low'
+        confidence = 'high' if score > min_score else 'medium' if score >= min_score else 'low'
 
         return {
             'valid': valid,
@@ -191,19 +257,16 @@ class RossCameronAnalyzer:
             criteria_met.append("מעל מחיר סגירה קודם")
             score += 2
 
-        valid = score >= 6
+        min_score = self.min_scores[SetupType.RED_TO_GREEN]
+        valid = score >= min_score
 
         entry = round(prev_close * 1.005, 2)  # 0.5% above previous close
         stop = round(data.get('day_low', price * 0.98), 2)
         risk = entry - stop
 
-        targets = [
-            round(entry + risk * 2, 2),
-            round(entry + risk * 3, 2),
-            round(entry + risk * 5, 2)
-        ]
+        targets = self._targets(SetupType.RED_TO_GREEN, entry, risk)
 
-        confidence = 'high' if score >= 7 else 'medium' if score >= 6 else 'low'
+        confidence = 'high' if score > min_score else 'medium' if score >= min_score else 'low'
 
         return {
             'valid': valid,
@@ -263,20 +326,16 @@ class RossCameronAnalyzer:
             criteria_met.append(f"עלייה בנפח: {rvol:.1f}x")
             score += 2
 
-        valid = score >= 6
+        valid = score >= self.min_scores[SetupType.FIRST_GREEN_DAY]
 
         price = data.get('current_price', 0)
         entry = round(price * 1.02, 2)
         stop = round(data.get('day_low', price * 0.96), 2)
         risk = entry - stop
 
-        targets = [
-            round(entry + risk * 2, 2),
-            round(entry + risk * 3, 2),
-            round(entry + risk * 5, 2)
-        ]
+        targets = self._targets(SetupType.FIRST_GREEN_DAY, entry, risk)
 
-        confidence = 'medium' if score >= 6 else 'low'
+        confidence = 'medium' if valid else 'low'
 
         return {
             'valid': valid,
@@ -328,19 +387,16 @@ class RossCameronAnalyzer:
             criteria_met.append(f"נפח טוב: {rvol:.1f}x")
             score += 1
 
-        valid = score >= 5
+        min_score = self.min_scores[SetupType.MICRO_PULLBACK]
+        valid = score >= min_score
 
         entry = round(max(ema9, vwap) * 1.005, 2)
         stop = round(ema9 * 0.98, 2)
         risk = entry - stop
 
-        targets = [
-            round(entry + risk * 2, 2),
-            round(entry + risk * 3, 2),
-            round(entry + risk * 4, 2)
-        ]
+        targets = self._targets(SetupType.MICRO_PULLBACK, entry, risk)
 
-        confidence = 'high' if score >= 6 else 'medium' if score >= 5 else 'low'
+        confidence = 'high' if score > min_score else 'medium' if score >= min_score else 'low'
 
         return {
             'valid': valid,
@@ -404,20 +460,16 @@ class RossCameronAnalyzer:
             criteria_met.append("קרוב לתמיכה")
             score += 2
 
-        valid = score >= 5
+        valid = score >= self.min_scores[SetupType.BULL_FLAG]
 
         entry = round(data.get('day_high', price * 1.01) * 1.005, 2)
         stop = round(support * 0.98, 2)
         risk = entry - stop
 
-        # Bull flag targets are ambitious
-        targets = [
-            round(entry + risk * 3, 2),
-            round(entry + risk * 5, 2),
-            round(entry + risk * 8, 2)
-        ]
+        # Bull flag targets are ambitious (3R / 5R / 8R by default)
+        targets = self._targets(SetupType.BULL_FLAG, entry, risk)
 
-        confidence = 'medium' if score >= 5 else 'low'
+        confidence = 'medium' if valid else 'low'
 
         return {
             'valid': valid,
@@ -431,6 +483,119 @@ class RossCameronAnalyzer:
             'confidence': confidence
         }
 
+    # Order in which analyze_setup compares setups (earlier wins ties)
+    SETUP_SEQUENCE = [
+        SetupType.GAP_AND_GO,
+        SetupType.RED_TO_GREEN,
+        SetupType.FIRST_GREEN_DAY,
+        SetupType.MICRO_PULLBACK,
+        SetupType.BULL_FLAG
+    ]
+
+    def score_setups(self, features: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Vectorized version of analyze_setup for many bars at once
+
+        Applies the same criteria, scores, entries, stops and target multiples as
+        the _check_* methods, but to whole arrays (e.g. every bar of a backtest).
+
+        Args:
+            features: Equal-length arrays keyed like get_current_data output:
+                      current_price, previous_close, gap_percent, change_percent,
+                      rvol, vwap, ema_9, ema_20, day_high, day_low, plus
+                      recent_red (red closes among the two bars before the
+                      latest), recent_high (highest high in the history window)
+                      and has_history (bool)
+
+        Returns:
+            Dictionary of arrays: setup (index into SETUP_SEQUENCE, -1 = none),
+            score, entry, stop and targets (n x 3)
+        """
+        price = np.asarray(features['current_price'], dtype=float)
+        prev_close = np.asarray(features['previous_close'], dtype=float)
+        gap = np.asarray(features['gap_percent'], dtype=float)
+        change = np.asarray(features['change_percent'], dtype=float)
+        rvol = np.asarray(features['rvol'], dtype=float)
+        vwap = np.asarray(features['vwap'], dtype=float)
+        ema9 = np.asarray(features['ema_9'], dtype=float)
+        ema20 = np.asarray(features['ema_20'], dtype=float)
+        day_high = np.asarray(features['day_high'], dtype=float)
+        day_low = np.asarray(features['day_low'], dtype=float)
+        recent_red = np.asarray(features['recent_red'])
+        recent_high = np.asarray(features['recent_high'], dtype=float)
+        has_history = np.asarray(features['has_history'], dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Gap & Go
+            gap_score = (3 * (np.abs(gap) >= self.min_gap_percent) + 2 * (rvol >= self.min_rvol) +
+                         (price > vwap) + (price > ema9))
+            gap_entry = self._round_price(np.maximum(vwap, ema9) * 1.01)
+            gap_stop = self._round_price(np.minimum(vwap, ema9) * 0.99)
+
+            # Red to Green
+            r2g_score = (2 * ((gap < 0) | (change < 0)) + 3 * (change > 0) + 2 * (rvol >= 2.5) +
+                         2 * (price > prev_close))
+            r2g_entry = self._round_price(prev_close * 1.005)
+            r2g_stop = self._round_price(day_low)
+
+            # First Green Day
+            fgd_score = np.where(has_history, 3 * (recent_red >= 2) + 3 * (change > 2) + 2 * (rvol >= 2.0), 0)
+            fgd_entry = self._round_price(price * 1.02)
+            fgd_stop = self._round_price(day_low)
+
+            # Micro Pullback
+            near_ema = (ema9 > 0) & (np.abs(price - ema9) / ema9 < 0.02)
+            mp_score = 2 * near_ema + 2 * (price > vwap) + 2 * (ema9 > ema20) + (rvol >= 1.5)
+            mp_entry = self._round_price(np.maximum(ema9, vwap) * 1.005)
+            mp_stop = self._round_price(ema9 * 0.98)
+
+            # Bull Flag
+            pullback = (recent_high - price) / recent_high
+            support = np.maximum(ema9, vwap)
+            bf_score = np.where(
+                has_history,
+                3 * ((pullback > 0.05) & (pullback < 0.15)) + 2 * ((rvol > 0.5) & (rvol < 1.5)) +
+                2 * (np.abs(price - support) / support < 0.03),
+                0
+            )
+            bf_entry = self._round_price(day_high * 1.005)
+            bf_stop = self._round_price(support * 0.98)
+
+        scores = np.stack([gap_score, r2g_score, fgd_score, mp_score, bf_score])
+        valid = scores >= np.array([self.min_scores[setup] for setup in self.SETUP_SEQUENCE])[:, None]
+        entries = np.stack([gap_entry, r2g_entry, fgd_entry, mp_entry, bf_entry])
+        stops = np.stack([gap_stop, r2g_stop, fgd_stop, mp_stop, bf_stop])
+        multiples = np.array([self.target_multiples[setup] for setup in self.SETUP_SEQUENCE], dtype=float)
+
+        # Best valid setup - first one wins ties, as in analyze_setup
+        masked = np.where(valid, scores, 0)
+        best = masked.argmax(axis=0)
+        columns = np.arange(price.shape[0])
+        found = masked[best, columns] > 0
+
+        entry = entries[best, columns]
+        stop = stops[best, columns]
+        risk = entry - stop
+        targets = self._round_price(entry[:, None] + risk[:, None] * multiples[best])
+
+        return {
+            'setup': np.where(found, best, -1),
+            'score': masked[best, columns],
+            'entry': entry,
+            'stop': stop,
+            'targets': targets
+        }
+
+    @staticmethod
+    def _round_price(values: np.ndarray) -> np.ndarray:
+        """round(x, 2) for arrays, matching Python's round() on values that sit on a half cent"""
+        rounded = np.round(values, 2)
+        scaled = values * 100
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        if near_half.any():
+            rounded[near_half] = [round(float(value), 2) for value in values[near_half]]
+        return rounded
+
     def _no_setup(self, reason: str) -> Dict:
         """Return no setup found"""
         return {
@@ -0,0 +1,652 @@
+"""
+Sector research
+Sector rankings and entry/exit levels, materialized on a schedule into
+versioned snapshots that the research endpoints read from
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.data.market_data import MarketDataFetcher
+from src.utils.watchlist_executor import WatchlistExecutor
+
+DEFAULT_SNAPSHOT_DB = os.getenv('SECTOR_SNAPSHOT_DB', os.path.join(parent_dir, 'sector_snapshots.db'))
+SECTORS_CONFIG = os.path.join(parent_dir, 'config', 'sectors.json')
+
+# Default universe; config/sectors.json ({"Sector": ["SYM", ...]}) replaces it
+DEFAULT_SECTORS = {
+    'Technology': ['AAPL', 'MSFT', 'GOOGL', 'META', 'ORCL', 'CRM', 'ADBE', 'NOW', 'PLTR', 'SHOP'],
+    'Semiconductors': ['NVDA', 'AMD', 'AVGO', 'TSM', 'QCOM', 'INTC', 'MU', 'AMAT', 'LRCX', 'ARM'],
+    'Healthcare': ['LLY', 'UNH', 'JNJ', 'ABBV', 'MRK', 'PFE', 'TMO', 'ISRG', 'VRTX', 'AMGN'],
+    'Financials': ['JPM', 'BAC', 'WFC', 'GS', 'MS', 'V', 'MA', 'AXP', 'BLK', 'SCHW'],
+    'Energy': ['XOM', 'CVX', 'COP', 'EOG', 'SLB', 'OXY', 'MPC', 'PSX', 'VLO', 'FSLR'],
+    'Consumer': ['AMZN', 'TSLA', 'HD', 'MCD', 'NKE', 'SBUX', 'COST', 'WMT', 'PG', 'KO'],
+    'Industrials': ['CAT', 'DE', 'GE', 'HON', 'UNP', 'BA', 'LMT', 'RTX', 'UPS', 'ETN'],
+    'Communication': ['NFLX', 'DIS', 'CMCSA', 'T', 'VZ', 'TMUS', 'SPOT', 'UBER', 'ABNB', 'RBLX'],
+    'Israel': ['TEVA.TA', 'NICE.TA', 'ESLT.TA', 'CYBR', 'MNDY', 'WIX', 'CHKP', 'FVRR', 'GLBE', 'INMD']
+}
+
+HISTORY_PERIOD = '1y'
+MIN_BARS = 50
+
+
+class SectorResearch:
+    """
+    Sector overview, per-sector rankings and per-stock entry/exit analysis.
+
+    A materialization run refreshes daily bars for the whole universe (lake
+    backed, so only new sessions are downloaded), fingerprints each symbol's
+    bars and recomputes only the sectors whose membership or member bars
+    changed since their last snapshot. Each recomputed sector is stored as a
+    new version in SQLite (the last keep_versions per sector are kept), and
+    reads are served from the latest version in memory - a page load never
+    triggers a universe-wide fetch.
+
+    start() runs materialization every interval_seconds in the background;
+    invalidate(symbols) wakes it early for the sectors those symbols are in.
+    That happens when the sector membership changes (set_sectors(), or an
+    edited config/sectors.json) and when a live analysis sees newer bars than
+    the snapshot was built from.
+    """
+
+    def __init__(self, market_data: Optional[MarketDataFetcher] = None, db_path: str = DEFAULT_SNAPSHOT_DB,
+                 sectors: Optional[Dict[str, List[str]]] = None, interval_seconds: float = 900,
+                 keep_versions: int = 5, max_workers: int = 8, snapshot_max_age: float = 3600,
+                 config_check_seconds: float = 60):
+        """
+        Args:
+            market_data: Price source (default: lake-backed MarketDataFetcher)
+            db_path: SQLite file holding the snapshots
+            sectors: Sector membership (default: config/sectors.json or DEFAULT_SECTORS)
+            interval_seconds: Time between scheduled materialization runs
+            keep_versions: Snapshot versions kept per sector
+            max_workers: Symbols whose bars are refreshed at once
+            snapshot_max_age: analyze_entry_exit() recomputes a stock whose snapshot is older
+            config_check_seconds: How often config/sectors.json is checked for edits
+                (only when sectors is not given)
+        """
+        self.market_data = market_data or MarketDataFetcher()
+        self.db_path = db_path
+        self._watch_config = not sectors
+        self._config_mtime = self._sectors_config_mtime()
+        self.sectors = sectors or self._load_sectors()
+        self.config_check_seconds = config_check_seconds
+        self.interval_seconds = interval_seconds
+        self.keep_versions = keep_versions
+        self.snapshot_max_age = snapshot_max_age
+        self.executor = WatchlistExecutor(max_workers=max_workers, name='sector-research')
+
+        self._db_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._init_db()
+
+        self._snapshots: Dict[str, Dict] = self._load_latest()
+        # Last run that rebuilt or confirmed each sector (unchanged sectors keep their snapshot)
+        self._verified_ts: Dict[str, float] = {name: s['created_ts'] for name, s in self._snapshots.items()}
+        self._symbol_metrics: Dict[str, Tuple[str, Optional[Dict]]] = {}
+        self._dirty = set()
+        self._wake = threading.Event()
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'invalidations': 0, 'runs': 0, 'sectors_recomputed': 0, 'sectors_unchanged': 0, 'symbols_computed': 0,
+                      'symbols_reused': 0, 'last_run_seconds': None, 'last_run_at': None, 'errors': 0}
+
+    @staticmethod
+    def _load_sectors() -> Dict[str, List[str]]:
+        try:
+            if os.path.exists(SECTORS_CONFIG):
+                with open(SECTORS_CONFIG, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️  Could not read {SECTORS_CONFIG}, using default sectors: {e}")
+        return DEFAULT_SECTORS
+
+    @staticmethod
+    def _sectors_config_mtime() -> Optional[float]:
+        try:
+            return os.path.getmtime(SECTORS_CONFIG)
+        except OSError:
+            return None
+
+    def _init_db(self):
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sector_snapshots (
+                    sector TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (sector, version)
+                );
+            """)
+
+    def _load_latest(self) -> Dict[str, Dict]:
+        """Latest stored snapshot of every sector"""
+        with self._db_lock:
+            rows = self._conn.execute("""
+                SELECT s.payload FROM sector_snapshots s
+                JOIN (SELECT sector, MAX(version) AS version FROM sector_snapshots GROUP BY sector) latest
+                  ON s.sector = latest.sector AND s.version = latest.version
+            """).fetchall()
+        snapshots = {}
+        for (payload,) in rows:
+            snapshot = json.loads(payload)
+            snapshots[snapshot['sector']] = snapshot
+        return snapshots
+
+    # ------------------------------------------------------------------
+    # Reads (served from snapshots)
+    # ------------------------------------------------------------------
+
+    def get_all_sectors_overview(self, top_n: int = 3) -> Dict:
+        """
+        Overview of every sector from the latest snapshots
+
+        Args:
+            top_n: Leaders listed per sector
+
+        Returns:
+            Dictionary with per-sector aggregates and leaders, the newest
+            snapshot version and the sectors not materialized yet
+        """
+        sectors = {}
+        for name in self.sectors:
+            snapshot = self._snapshots.get(name)
+            if snapshot is None:
+                continue
+            sectors[name] = {
+                **snapshot['aggregates'],
+                'top_stocks': snapshot['rankings'][:top_n],
+                'version': snapshot['version'],
+                'updated_at': snapshot['created_at']
+            }
+
+        ranked = sorted(sectors, key=lambda name: sectors[name]['avg_score'] or 0, reverse=True)
+        return {
+            'sectors': {name: sectors[name] for name in ranked},
+            'sector_ranking': ranked,
+            'version': max((s['version'] for s in sectors.values()), default=0),
+            'pending': [name for name in self.sectors if name not in sectors],
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def get_sector_top_stocks(self, sector: str, top_n: int = 5) -> List[Dict]:
+        """
+        Top-ranked stocks of a sector
+
+        Args:
+            sector: Sector name (case-insensitive)
+            top_n: Number of stocks
+
+        Returns:
+            Ranked stock analyses (empty for an unknown sector)
+        """
+        name = self._sector_name(sector)
+        if name is None:
+            return []
+        if name not in self._snapshots:
+            if self._running.is_set():
+                # Not materialized yet: the background thread builds it (see is_pending)
+                self.invalidate(self.sectors[name])
+                return []
+            self.materialize([name])
+        snapshot = self._snapshots.get(name)
+        return snapshot['rankings'][:top_n] if snapshot else []
+
+    def is_pending(self, sector: str) -> bool:
+        """Whether a known sector has no snapshot yet"""
+        name = self._sector_name(sector)
+        return name is not None and name not in self._snapshots
+
+    def get_snapshot(self, sector: str, version: Optional[int] = None) -> Optional[Dict]:
+        """
+        A stored sector snapshot
+
+        Args:
+            sector: Sector name (case-insensitive)
+            version: Snapshot version (default: latest)
+
+        Returns:
+            Snapshot dictionary or None
+        """
+        name = self._sector_name(sector)
+        if name is None:
+            return None
+        if version is None:
+            return self._snapshots.get(name)
+        with self._db_lock:
+            row = self._conn.execute("SELECT payload FROM sector_snapshots WHERE sector = ? AND version = ?",
+                                     (name, version)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_versions(self, sector: str) -> List[Dict]:
+        """Stored versions of a sector, newest first"""
+        name = self._sector_name(sector)
+        with self._db_lock:
+            rows = self._conn.execute("""
+                SELECT version, created_at, fingerprint FROM sector_snapshots
+                WHERE sector = ? ORDER BY version DESC
+            """, (name,)).fetchall()
+        return [{'version': v, 'created_at': c, 'fingerprint': f} for v, c, f in rows]
+
+    def analyze_entry_exit(self, symbol: str) -> Dict:
+        """
+        Entry/exit analysis for a stock
+
+        Served from the latest snapshot when the stock belongs to a sector
+        materialized within snapshot_max_age, otherwise computed from its bars.
+
+        Args:
+            symbol: Stock ticker symbol
+
+        Returns:
+            Analysis dictionary, or {'error': ...}
+        """
+        symbol = symbol.upper()
+        for name in self._sectors_of([symbol]):
+            snapshot = self._snapshots.get(name)
+            verified = self._verified_ts.get(name, snapshot['created_ts']) if snapshot else 0
+            if snapshot and time.time() - verified < self.snapshot_max_age:
+                for stock in snapshot['rankings']:
+                    if stock['symbol'] == symbol:
+                        return {**stock, 'source': 'snapshot', 'snapshot_version': snapshot['version']}
+
+        df = self.market_data.get_stock_data(symbol, period=HISTORY_PERIOD, interval='1d')
+        if df is None or df.empty:
+            return {'error': f'No price data for {symbol}'}
+        analysis = self._analyze_bars(symbol, df)
+        if analysis is None:
+            return {'error': f'Not enough price history for {symbol}'}
+        sectors = self._sectors_of([symbol])
+
+        cached = self._symbol_metrics.get(symbol)
+        if sectors and (cached is None or cached[0] != self._bars_fingerprint(df)):
+            # Newer bars than the snapshot was built from
+            self.invalidate([symbol])
+        return {**analysis, 'sector': sectors[0] if sectors else None, 'source': 'live'}
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def materialize(self, sectors: Optional[List[str]] = None, force: bool = False) -> Dict:
+        """
+        Refresh bars and rebuild the snapshots of sectors whose inputs changed
+
+        Args:
+            sectors: Sectors to consider (default: all)
+            force: Rebuild even if nothing changed
+
+        Returns:
+            {'version', 'recomputed', 'unchanged', 'failed', 'elapsed_seconds'}
+        """
+        with self._run_lock:
+            started = time.monotonic()
+            names = [name for name in (sectors or self.sectors) if name in self.sectors]
+            symbols = list(dict.fromkeys(s.upper() for name in names for s in self.sectors[name]))
+
+            fingerprints = {}
+            for symbol, result, error in self.executor.iter_results(symbols, self._refresh_symbol):
+                if error is not None:
+                    print(f"   ❌ Error refreshing {symbol}: {error}")
+                    self.stats['errors'] += 1
+                else:
+                    fingerprints[symbol] = result
+
+            version = self._next_version()
+            recomputed, unchanged, failed = [], [], []
+            for name in names:
+                members = [s.upper() for s in self.sectors[name]]
+                fingerprint = self._sector_fingerprint(members, fingerprints)
+                current = self._snapshots.get(name)
+                if not force and current is not None and current['fingerprint'] == fingerprint:
+                    self._verified_ts[name] = time.time()
+                    unchanged.append(name)
+                    continue
+
+                try:
+                    self._store(self._build_snapshot(name, members, fingerprint, version))
+                    recomputed.append(name)
+                except Exception as e:
+                    print(f"❌ Error materializing sector {name}: {e}")
+                    self.stats['errors'] += 1
+                    failed.append(name)
+
+            elapsed = time.monotonic() - started
+            self.stats['runs'] += 1
+            self.stats['sectors_recomputed'] += len(recomputed)
+            self.stats['sectors_unchanged'] += len(unchanged)
+            self.stats['last_run_seconds'] = round(elapsed, 3)
+            self.stats['last_run_at'] = datetime.now().isoformat()
+            return {'version': version if recomputed else None, 'recomputed': recomputed,
+                    'unchanged': unchanged, 'failed': failed, 'elapsed_seconds': round(elapsed, 3)}
+
+    def _refresh_symbol(self, symbol: str) -> Optional[str]:
+        """Bring a symbol's bars up to date; recompute its metrics if they changed"""
+        df = self.market_data.get_stock_data(symbol, period=HISTORY_PERIOD, interval='1d')
+        fingerprint = self._bars_fingerprint(df)
+        cached = self._symbol_metrics.get(symbol)
+        if cached is not None and cached[0] == fingerprint:
+            self.stats['symbols_reused'] += 1
+        else:
+            metrics = self._analyze_bars(symbol, df) if fingerprint else None
+            self._symbol_metrics[symbol] = (fingerprint, metrics)
+            self.stats['symbols_computed'] += 1
+        return fingerprint
+
+    @staticmethod
+    def _bars_fingerprint(df: Optional[pd.DataFrame]) -> Optional[str]:
+        """Identifies a bar history by its length and last bar"""
+        if df is None or df.empty:
+            return None
+        last = df.iloc[-1]
+        return (f"{len(df)}:{df.index[-1].value}:{last['Open']!r}:{last['High']!r}:{last['Low']!r}:"
+                f"{last['Close']!r}:{last['Volume']!r}")
+
+    @staticmethod
+    def _sector_fingerprint(members: List[str], fingerprints: Dict[str, Optional[str]]) -> str:
+        """Hash of the membership and every member's bars"""
+        digest = hashlib.sha1()
+        for symbol in members:
+            digest.update(f"{symbol}={fingerprints.get(symbol)};".encode())
+        return digest.hexdigest()
+
+    def _build_snapshot(self, name: str, members: List[str], fingerprint: str, version: int) -> Dict:
+        stocks = [dict(metrics) for symbol in members
+                  for _, metrics in [self._symbol_metrics.get(symbol, (None, None))] if metrics]
+        stocks.sort(key=lambda s: (s['score'], s['return_3m'] or -np.inf), reverse=True)
+
+        returns_3m = [s['return_3m'] for s in stocks if s['return_3m'] is not None]
+        median_3m = float(np.median(returns_3m)) if returns_3m else None
+        for rank, stock in enumerate(stocks, 1):
+            stock['rank'] = rank
+            stock['sector'] = name
+            stock['relative_strength'] = (round(stock['return_3m'] - median_3m, 2)
+                                          if stock['return_3m'] is not None and median_3m is not None else None)
+
+        def average(key: str) -> Optional[float]:
+            values = [s[key] for s in stocks if s[key] is not None]
+            return round(float(np.mean(values)), 2) if values else None
+
+        now = datetime.now()
+        return {
+            'sector': name,
+            'version': version,
+            'created_at': now.isoformat(),
+            'created_ts': time.time(),
+            'fingerprint': fingerprint,
+            'members': members,
+            'aggregates': {
+                'members': len(members),
+                'analyzed': len(stocks),
+                'avg_score': average('score'),
+                'avg_return_1m': average('return_1m'),
+                'avg_return_3m': average('return_3m'),
+                'uptrend_count': sum(s['trend'] == 'uptrend' for s in stocks),
+                'buy_count': sum(s['recommendation'] == 'Buy' for s in stocks)
+            },
+            'rankings': stocks
+        }
+
+    def _next_version(self) -> int:
+        with self._db_lock:
+            row = self._conn.execute("SELECT MAX(version) FROM sector_snapshots").fetchone()
+        return (row[0] or 0) + 1
+
+    def _store(self, snapshot: Dict):
+        """Persist a snapshot, prune old versions and publish it to readers"""
+        with self._db_lock, self._conn:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO sector_snapshots (sector, version, created_at, fingerprint, payload)
+                VALUES (?, ?, ?, ?, ?)
+            """, (snapshot['sector'], snapshot['version'], snapshot['created_at'], snapshot['fingerprint'],
+                  json.dumps(snapshot)))
+            self._conn.execute("""
+                DELETE FROM sector_snapshots WHERE sector = ? AND version NOT IN (
+                    SELECT version FROM sector_snapshots WHERE sector = ? ORDER BY version DESC LIMIT ?
+                )
+            """, (snapshot['sector'], snapshot['sector'], self.keep_versions))
+        # Readers see either the old or the new snapshot, never a partial one
+        self._snapshots[snapshot['sector']] = snapshot
+        self._verified_ts[snapshot['sector']] = snapshot['created_ts']
+
+    # ------------------------------------------------------------------
+    # Per-stock analysis
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _analyze_bars(symbol: str, df: pd.DataFrame) -> Optional[Dict]:
+        """Trend, momentum, score and entry/exit levels from daily bars"""
+        close = df['Close'].to_numpy(dtype=float)
+        high = df['High'].to_numpy(dtype=float)
+        low = df['Low'].to_numpy(dtype=float)
+        volume = df['Volume'].to_numpy(dtype=float)
+        if len(close) < MIN_BARS:
+            return None
+
+        price = close[-1]
+
+        def change(days: int) -> Optional[float]:
+            return (price / close[-1 - days] - 1) * 100 if len(close) > days else None
+
+        def sma(days: int) -> Optional[float]:
+            return float(close[-days:].mean()) if len(close) >= days else None
+
+        sma20, sma50, sma200 = sma(20), sma(50), sma(200)
+
+        # Wilder RSI and ATR (14)
+        delta = np.diff(close)
+        gains = pd.Series(np.maximum(delta, 0)).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+        losses = pd.Series(np.maximum(-delta, 0)).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+        rsi = 100.0 if losses == 0 else 100 - 100 / (1 + gains / losses)
+        true_range = np.maximum(high[1:], close[:-1]) - np.minimum(low[1:], close[:-1])
+        atr = float(pd.Series(true_range).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1])
+
+        high_52w, low_52w = float(high[-252:].max()), float(low[-252:].min())
+        from_high = (price / high_52w - 1) * 100
+        average_volume = volume[-21:-1].mean()
+        rvol = volume[-1] / average_volume if average_volume > 0 else None
+
+        above_long = sma200 is None or sma50 > sma200
+        if price > sma50 and above_long:
+            trend = 'uptrend'
+        elif price < sma50 and not above_long:
+            trend = 'downtrend'
+        else:
+            trend = 'sideways'
+
+        return_1m, return_3m, return_6m = change(21), change(63), change(126)
+        momentum = 0.5 * (return_3m if return_3m is not None else return_1m) + 0.3 * (return_6m or 0) + \
+            0.2 * return_1m
+        score = (25 * (price > sma50) + 15 * (sma200 is not None and sma50 > sma200) + 10 * (price > sma20)
+                 + float(np.clip(momentum + 10, 0, 25))
+                 + (15 if 40 <= rsi <= 70 else 5 if rsi > 70 else 0)
+                 + 10 * (1 - min(-from_high, 30) / 30))
+
+        # Entry on a pullback to the 20-day average (at most 1 ATR below price), 2 ATR stop
+        entry = max(sma20, price - atr) if trend == 'uptrend' else price
+        entry = min(entry, price)
+        stop = entry - 2 * atr
+        risk = entry - stop
+        target_1 = high_52w if high_52w > entry + risk else entry + 1.5 * risk
+        target_2 = max(entry + 3 * risk, target_1)
+
+        if score >= 70 and trend == 'uptrend':
+            recommendation = 'Buy'
+        elif score >= 45 and trend != 'downtrend':
+            recommendation = 'Watch'
+        else:
+            recommendation = 'Avoid'
+
+        exit_signals = []
+        if price < sma50:
+            exit_signals.append('Close below 50-day average')
+        if rsi > 75:
+            exit_signals.append('RSI overbought')
+        if sma200 is not None and sma50 < sma200:
+            exit_signals.append('50-day average below 200-day')
+
+        def rounded(value: Optional[float], decimals: int = 2) -> Optional[float]:
+            return round(float(value), decimals) if value is not None and np.isfinite(value) else None
+
+        return {
+            'symbol': symbol.upper(),
+            'price': rounded(price),
+            'score': rounded(score, 1),
+            'recommendation': recommendation,
+            'trend': trend,
+            'return_1m': rounded(return_1m),
+            'return_3m': rounded(return_3m),
+            'return_6m': rounded(return_6m),
+            'sma_20': rounded(sma20),
+            'sma_50': rounded(sma50),
+            'sma_200': rounded(sma200),
+            'rsi': rounded(rsi, 1),
+            'atr': rounded(atr),
+            'rvol': rounded(rvol),
+            'high_52w': rounded(high_52w),
+            'low_52w': rounded(low_52w),
+            'from_high_percent': rounded(from_high),
+            'entry': {
+                'price': rounded(entry),
+                'zone': [rounded(min(entry, price)), rounded(price)],
+                'stop_loss': rounded(stop),
+                'targets': [rounded(target_1), rounded(target_2)],
+                'risk_reward': rounded((target_1 - entry) / risk if risk > 0 else None)
+            },
+            'exit': {
+                'trailing_stop': rounded(price - 2 * atr),
+                'signals': exit_signals
+            },
+            'as_of': df.index[-1].isoformat()
+        }
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def invalidate(self, symbols: List[str]):
+        """Bars of these symbols changed: rebuild their sectors on the next wake-up"""
+        sectors = self._sectors_of([s.upper() for s in symbols])
+        if sectors:
+            self.stats['invalidations'] += 1
+            self._dirty.update(sectors)
+            self._wake.set()
+
+    def set_sectors(self, sectors: Dict[str, List[str]]):
+        """
+        Replace the sector membership
+
+        Sectors that are new or whose members changed are invalidated; removed
+        sectors stop being served.
+        """
+        previous = self.sectors
+        self.sectors = sectors
+        for name in set(previous) - set(sectors):
+            self._snapshots.pop(name, None)
+            self._verified_ts.pop(name, None)
+
+        changed = [name for name, members in sectors.items()
+                   if [s.upper() for s in members] != [s.upper() for s in previous.get(name, [])]]
+        self.invalidate([symbol for name in changed for symbol in sectors[name]])
+
+    def _check_sectors_config(self):
+        """Pick up edits to config/sectors.json"""
+        mtime = self._sectors_config_mtime()
+        if mtime != self._config_mtime:
+            self._config_mtime = mtime
+            print("📊 Sector config changed - reloading")
+            self.set_sectors(self._load_sectors())
+
+    def start(self):
+        """Materialize now and then every interval_seconds in the background"""
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name='sector-research', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread"""
+        self._running.clear()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        next_full = time.monotonic()
+        while self._running.is_set():
+            wait = max(0.0, next_full - time.monotonic())
+            if self._watch_config:
+                wait = min(wait, self.config_check_seconds)
+            if self._wake.wait(wait):
+                self._wake.clear()
+            if not self._running.is_set():
+                break
+
+            try:
+                if self._watch_config:
+                    self._check_sectors_config()
+                if time.monotonic() >= next_full:
+                    self._dirty.clear()
+                    result = self.materialize()
+                    next_full = time.monotonic() + self.interval_seconds
+                else:
+                    dirty, self._dirty = list(self._dirty), set()
+                    if not dirty:
+                        continue
+                    result = self.materialize(dirty)
+                if result['recomputed']:
+                    print(f"📊 Sector snapshots v{result['version']}: {', '.join(result['recomputed'])} "
+                          f"({result['elapsed_seconds']}s)")
+            except Exception as e:
+                print(f"❌ Sector materialization failed: {e}")
+                self.stats['errors'] += 1
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _sector_name(self, sector: str) -> Optional[str]:
+        lowered = sector.lower().replace('-', ' ').replace('_', ' ')
+        for name in self.sectors:
+            if name.lower() == lowered:
+                return name
+        return None
+
+    def _sectors_of(self, symbols: List[str]) -> List[str]:
+        wanted = set(symbols)
+        return [name for name, members in self.sectors.items() if wanted & {s.upper() for s in members}]
+
+    def get_stats(self) -> Dict:
+        """Materialization counters and snapshot versions"""
+        return {
+            **self.stats,
+            'sectors': len(self.sectors),
+            'materialized': len(self._snapshots),
+            'versions': {name: snapshot['version'] for name, snapshot in self._snapshots.items()},
+            'refresh': self.executor.last_scan
+        }
+
+    def close(self):
+        """Stop the scheduler and close the snapshot database"""
+        self.stop()
+        self.executor.shutdown()
+        with self._db_lock:
+            self._conn.close()
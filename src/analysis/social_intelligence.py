@@ -6,6 +6,7 @@ Integrates social sentiment and influencer recommendations into trading system
 import os
 import sys
 from datetime import datetime
+from functools import partial
 from typing import Dict, List, Optional
 
 # Add parent directory to path to import our modules
@@ -14,6 +15,11 @@ sys.path.insert(0, parent_dir)
 
 from social_sentiment_analyzer import SocialSentimentAnalyzer
 from influencers_feed import InfluencersFeed
+from influencer_ingestion import InfluencerIngestionService
+from influencer_index import InfluencerMentionIndex
+from src.analysis.mention_velocity import MentionVelocityEngine
+from src.utils.ttl_cache import TTLCache
+from src.utils.watchlist_executor import WatchlistExecutor
 
 
 class SocialIntelligence:
@@ -22,10 +28,25 @@ class SocialIntelligence:
     Provides trading signals based on social media intelligence
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, influencer_index: Optional[InfluencerMentionIndex] = None):
         self.sentiment_analyzer = SocialSentimentAnalyzer()
         self.influencers_feed = InfluencersFeed()
-        self.cache = {}  # Cache recent analyses
+
+        # Ticker -> influencer items index over the locally ingested feed
+        self.influencer_index = influencer_index or InfluencerMentionIndex(
+            InfluencerIngestionService(feed=self.influencers_feed)
+        )
+
+        # Cache recent analyses - bounded, expires after 1 hour, hot symbols refresh in the background
+        self.cache = TTLCache('social_intelligence', max_entries=500,
+                              max_bytes=32 * 1024 * 1024, ttl_seconds=3600)
+
+        # Every mention the analyzer collects feeds the velocity baselines
+        self.mention_velocity = MentionVelocityEngine()
+        self.sentiment_analyzer.add_mention_listener(self.mention_velocity.ingest_mentions)
+
+        # Symbols are analyzed concurrently; platform rate limits pace the requests
+        self.executor = WatchlistExecutor(max_workers=max_workers, name='social-scan')
 
     def analyze_stock(self, symbol: str, use_cache: bool = True) -> Dict:
         """
@@ -38,22 +59,30 @@ class SocialIntelligence:
         Returns:
             Dictionary with analysis results
         """
-        # Check cache
-        if use_cache and symbol in self.cache:
-            cache_age = (datetime.now() - self.cache[symbol]['timestamp']).seconds
-            if cache_age < 3600:  # 1 hour
-                return self.cache[symbol]['data']
+        loader = partial(self._run_analysis, symbol)
+
+        if use_cache:
+            # Concurrent callers missing on the same symbol share one fetch
+            return self.cache.get_or_load(symbol, loader)
 
+        result = loader()
+        self.cache.set(symbol, result, loader)
+        return result
+
+    def _run_analysis(self, symbol: str) -> Dict:
+        """
+        Fetch sentiment and build the analysis result (uncached)
+        """
         print(f"🔍 Analyzing social intelligence for ${symbol}...")
 
         # Get social sentiment
         sentiment_data = self.sentiment_analyzer.get_comprehensive_sentiment(symbol)
+        sentiment_data['velocity'] = self.mention_velocity.get_velocity(symbol)
+
+        influencer_data = self.influencer_index.lookup(symbol)
 
         # Calculate social signal
-        signal, confidence, reasoning = self._calculate_signal(
-            sentiment_data,
-            None  # Influencer data would go here if we had it cached
-        )
+        signal, confidence, reasoning = self._calculate_signal(sentiment_data, influencer_data)
 
         result = {
             'symbol': symbol,
@@ -63,20 +92,21 @@ class SocialIntelligence:
                 'label': sentiment_data['overall_sentiment'],
                 'mentions': sentiment_data['total_mentions'],
                 'trending_score': sentiment_data['trending_score'],
+                'velocity': sentiment_data['velocity'],
                 'platforms': sentiment_data['platforms']
             },
+            'influencers': {
+                'mentioned': influencer_data['mentioned'],
+                'buy_count': influencer_data['buy_count'],
+                'sell_count': influencer_data['sell_count'],
+                'influencers': influencer_data['influencers']
+            },
             'signal': signal,
             'confidence': confidence,
             'reasoning': reasoning,
             'recommendation': self._get_recommendation(signal, confidence)
         }
 
-        # Cache result
-        self.cache[symbol] = {
-            'timestamp': datetime.now(),
-            'data': result
-        }
-
         return result
 
     def _calculate_signal(self, sentiment_data: Dict, influencer_data: Optional[Dict]) -> tuple:
@@ -92,6 +122,8 @@ class SocialIntelligence:
 
         sentiment_score = sentiment_data['sentiment_score']
         mentions = sentiment_data['total_mentions']
+        velocity = sentiment_data.get('velocity') or {}
+        spiking = velocity.get('spiking', False)
 
         # Sentiment analysis
         if sentiment_score > 0.5:
@@ -113,8 +145,28 @@ class SocialIntelligence:
             reasoning.append(f"🟡 Moderate negative sentiment ({sentiment_score:.2f})")
             confidence += 15
 
-        # Volume analysis
-        if mentions > 500:
+        # Volume analysis - relative to the ticker's own baseline once one exists,
+        # fixed mention cutoffs only until the velocity engine has warmed up
+        if velocity.get('baseline_ready'):
+            z = velocity['z_score']
+            if z >= 6:
+                reasoning.append(f"🔥 Mention explosion: {z:.1f}σ above baseline ({mentions} mentions)")
+                confidence += 30
+            elif z >= 4:
+                reasoning.append(f"📈 Mention spike: {z:.1f}σ above baseline")
+                confidence += 20
+            elif z >= 3:
+                reasoning.append(f"📈 Unusual attention: {z:.1f}σ above baseline")
+                confidence += 15
+            elif z >= 2:
+                reasoning.append(f"👀 Rising attention: {z:.1f}σ above baseline")
+                confidence += 10
+            elif z >= 1:
+                reasoning.append(f"👀 Slightly elevated attention: {z:.1f}σ above baseline")
+                confidence += 5
+            else:
+                reasoning.append(f"😐 Normal attention for this ticker ({z:+.1f}σ)")
+        elif mentions > 500:
             reasoning.append(f"🔥 Viral: {mentions} mentions")
             confidence += 30
         elif mentions > 200:
@@ -145,16 +197,29 @@ class SocialIntelligence:
                 reasoning.append(f"💬 StockTwits very bullish: {bullish} vs {bearish}")
                 confidence += 5
 
+        # Influencer recommendations
+        if influencer_data and influencer_data.get('mentioned'):
+            buy_count = influencer_data['buy_count']
+            sell_count = influencer_data['sell_count']
+            if buy_count > sell_count:
+                reasoning.append(f"👥 {buy_count} influencers recommend BUY")
+                confidence += 10
+            elif sell_count > buy_count:
+                reasoning.append(f"👥 {sell_count} influencers recommend SELL")
+                confidence += 10
+            else:
+                reasoning.append(f"👥 Mentioned by {len(influencer_data['influencers'])} influencers")
+
         # Determine signal
-        if sentiment_score > 0.4 and mentions > 100:
+        if sentiment_score > 0.4 and (mentions > 100 or spiking):
             signal = 'STRONG_BUY'
-        elif sentiment_score > 0.3 and mentions > 50:
+        elif sentiment_score > 0.3 and (mentions > 50 or spiking):
             signal = 'BUY'
         elif sentiment_score > 0.15:
             signal = 'WEAK_BUY'
-        elif sentiment_score < -0.4 and mentions > 100:
+        elif sentiment_score < -0.4 and (mentions > 100 or spiking):
             signal = 'STRONG_SELL'
-        elif sentiment_score < -0.3 and mentions > 50:
+        elif sentiment_score < -0.3 and (mentions > 50 or spiking):
             signal = 'SELL'
         elif sentiment_score < -0.15:
             signal = 'WEAK_SELL'
@@ -181,31 +246,36 @@ class SocialIntelligence:
         }
         return recommendations.get(signal, "No recommendation")
 
-    def scan_watchlist(self, watchlist: List[str]) -> List[Dict]:
+    def scan_watchlist(self, watchlist: List[str], on_progress=None) -> List[Dict]:
         """
         Scan multiple stocks and return sorted by signal strength
 
         Args:
             watchlist: List of stock symbols
+            on_progress: Optional callback(completed, total, symbol, error)
 
         Returns:
             List of analysis results sorted by confidence
         """
         print(f"\n🔍 Scanning {len(watchlist)} stocks...")
 
-        results = []
-        for symbol in watchlist:
-            try:
-                analysis = self.analyze_stock(symbol)
-                results.append(analysis)
-            except Exception as e:
-                print(f"   ❌ Error analyzing {symbol}: {e}")
+        results = self.executor.run(watchlist, self.analyze_stock,
+                                    on_progress or WatchlistExecutor.print_progress)
 
         # Sort by confidence (highest first)
         results.sort(key=lambda x: x['confidence'], reverse=True)
 
         return results
 
+    def iter_watchlist(self, watchlist: List[str], on_progress=None):
+        """
+        Stream analyses as each symbol completes (completion order)
+
+        Yields:
+            (symbol, analysis, error) tuples
+        """
+        return self.executor.iter_results(watchlist, self.analyze_stock, on_progress)
+
     def get_top_opportunities(self, watchlist: List[str], min_confidence: int = 60) -> List[Dict]:
         """
         Get top trading opportunities from watchlist
@@ -265,6 +335,7 @@ class SocialIntelligence:
             f"Sentiment Score: {analysis['sentiment']['score']:.2f} ({analysis['sentiment']['label'].upper()})",
             f"Total Mentions: {analysis['sentiment']['mentions']}",
             f"Trending Score: {analysis['sentiment']['trending_score']}",
+            f"Mention Velocity: {analysis['sentiment'].get('velocity', {}).get('z_score', 0):+.1f}σ",
             f"",
             f"Reasoning:",
         ]
@@ -0,0 +1,9 @@
+"""
+Backtesting modules
+"""
+from .backtester import Backtester, BacktestResult
+from .bar_loader import BarLoader, CSVBarLoader, YFinanceBarLoader
+from .sweep import ParameterSweep, SweepDataset
+
+__all__ = ['Backtester', 'BacktestResult', 'BarLoader', 'CSVBarLoader', 'YFinanceBarLoader',
+           'ParameterSweep', 'SweepDataset']
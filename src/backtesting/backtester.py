@@ -0,0 +1,430 @@
+"""
+Backtesting engine for the Ross Cameron setups
+Replays historical intraday bars through RossCameronAnalyzer and simulates
+entries, stops and the three targets of each setup
+"""
+import heapq
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.ross_cameron_setups import RossCameronAnalyzer
+from src.backtesting.bar_loader import BarLoader, YFinanceBarLoader
+from src.backtesting.features import compute_features
+
+
+class BacktestResult:
+    """Outcome of a backtest run"""
+
+    def __init__(self, initial_capital: float, final_capital: float, trades: List[Dict],
+                 equity_curve: List[Dict], setup_stats: Dict[str, Dict], params: Dict,
+                 skipped_signals: int = 0, bars_processed: int = 0, elapsed_seconds: float = 0.0):
+        self.initial_capital = initial_capital
+        self.final_capital = final_capital
+        self.trades = trades
+        self.equity_curve = equity_curve
+        self.setup_stats = setup_stats
+        self.params = params
+        self.skipped_signals = skipped_signals
+        self.bars_processed = bars_processed
+        self.elapsed_seconds = elapsed_seconds
+
+        self.total_return = (final_capital - initial_capital) / initial_capital * 100 if initial_capital else 0
+        self.max_drawdown, self.max_drawdown_percent = self._max_drawdown()
+        self.sharpe_ratio = self._sharpe()
+
+        wins = [t for t in trades if t['pnl'] > 0]
+        losses = [t for t in trades if t['pnl'] <= 0]
+        gross_loss = -sum(t['pnl'] for t in losses)
+        self.win_rate = len(wins) / len(trades) * 100 if trades else 0
+        self.profit_factor = sum(t['pnl'] for t in wins) / gross_loss if gross_loss else None
+        self.avg_r = sum(t['r_multiple'] for t in trades) / len(trades) if trades else 0
+
+    def _max_drawdown(self) -> Tuple[float, float]:
+        if not self.equity_curve:
+            return 0.0, 0.0
+        equity = np.array([point['equity'] for point in self.equity_curve])
+        peaks = np.maximum.accumulate(np.r_[self.initial_capital, equity])[1:]
+        drawdown = peaks - equity
+        worst = int(drawdown.argmax())
+        return float(drawdown[worst]), float(drawdown[worst] / peaks[worst] * 100) if peaks[worst] else 0.0
+
+    def _sharpe(self) -> Optional[float]:
+        """Annualized Sharpe ratio of daily equity returns"""
+        if len(self.equity_curve) < 2:
+            return None
+        series = pd.Series([p['equity'] for p in self.equity_curve],
+                           index=pd.to_datetime([p['time'] for p in self.equity_curve], utc=True, format='ISO8601'))
+        daily = series.groupby(series.index.date).last()
+        returns = pd.concat([pd.Series([self.initial_capital]), daily.reset_index(drop=True)]).pct_change().dropna()
+        if len(returns) < 2 or returns.std() == 0:
+            return None
+        return float(returns.mean() / returns.std() * math.sqrt(252))
+
+    def to_dict(self) -> Dict:
+        return {
+            'initial_capital': round(self.initial_capital, 2),
+            'final_capital': round(self.final_capital, 2),
+            'total_return': round(self.total_return, 2),
+            'total_trades': len(self.trades),
+            'win_rate': round(self.win_rate, 2),
+            'profit_factor': round(self.profit_factor, 2) if self.profit_factor is not None else None,
+            'avg_r_multiple': round(self.avg_r, 3),
+            'max_drawdown': round(self.max_drawdown, 2),
+            'max_drawdown_percent': round(self.max_drawdown_percent, 2),
+            'sharpe_ratio': round(self.sharpe_ratio, 2) if self.sharpe_ratio is not None else None,
+            'setup_stats': self.setup_stats,
+            'equity_curve': self.equity_curve,
+            'trades': self.trades,
+            'skipped_signals': self.skipped_signals,
+            'bars_processed': self.bars_processed,
+            'elapsed_seconds': round(self.elapsed_seconds, 2),
+            'params': self.params
+        }
+
+
+def simulate_symbol(symbol: str, bars: pd.DataFrame, analyzer: RossCameronAnalyzer,
+                    entry_window: int = 3, breakeven_after_target: bool = True) -> List[Dict]:
+    """Compute features for a symbol's bars and simulate its trades (see simulate_features)"""
+    return simulate_features(symbol, compute_features(bars), bars.index, analyzer,
+                             entry_window, breakeven_after_target)
+
+
+def simulate_features(symbol: str, features: Dict[str, np.ndarray], index: pd.DatetimeIndex,
+                      analyzer: RossCameronAnalyzer, entry_window: int = 3,
+                      breakeven_after_target: bool = True) -> List[Dict]:
+    """
+    Find setups on every bar and simulate the resulting trades (per share)
+
+    A setup on bar i places a buy stop at its entry price for the next
+    entry_window bars of the same session. After a fill, a third of the
+    position exits at each target; the stop moves to break-even after the
+    first target (optional); anything left is flattened at the session close.
+    When a bar touches both the stop and a target, the stop is assumed to
+    have been hit first.
+
+    Args:
+        symbol: Ticker
+        features: Output of compute_features (parameter-independent, so it can be
+                  computed once and reused for many analyzer settings)
+        index: Bar timestamps
+        analyzer: Setup detector
+        entry_window: Bars a buy stop stays active after the signal
+        breakeven_after_target: Move the stop to the entry after the first target
+
+    Returns:
+        Trades with prices, times, setup and R-multiple (position sizing is
+        applied later, across symbols)
+    """
+    signals = analyzer.score_setups(features)
+
+    high, low, open_, close = features['high'], features['low'], features['open'], features['close']
+    day, day_end = features['day'], features['day_end']
+    setup, entry, stop, targets = signals['setup'], signals['entry'], signals['stop'], signals['targets']
+    n = len(high)
+
+    candidate = (setup >= 0) & features['has_history'] & (entry > stop) & (stop > 0) & np.isfinite(entry)
+
+    # Vectorized pre-filter: does the buy stop trigger within the entry window at all?
+    fillable = np.zeros(n, dtype=bool)
+    for offset in range(1, entry_window + 1):
+        shifted_high = np.r_[high[offset:], np.full(offset, np.nan)]
+        same_day = np.r_[day[offset:] == day[:-offset], np.zeros(offset, dtype=bool)] if n > offset else np.zeros(n, dtype=bool)
+        fillable |= same_day & (shifted_high >= entry)
+
+    setup_names = [s.value for s in analyzer.SETUP_SEQUENCE]
+    nanos = index.as_unit('ns').asi8
+    trades = []
+    next_free = 0
+
+    for i in np.flatnonzero(candidate & fillable):
+        if i < next_free:
+            continue
+
+        last = day_end[i]
+        window_end = min(i + entry_window, last)
+        triggered = np.flatnonzero(high[i + 1:window_end + 1] >= entry[i])
+        if not len(triggered):
+            continue
+
+        fill_bar = i + 1 + triggered[0]
+        fill = max(entry[i], open_[fill_bar])
+        stop_level = stop[i]
+        risk = fill - stop_level
+        if risk <= 0:
+            continue
+
+        exits = []  # (price, bar) per third
+        target_from = stop_from = fill_bar
+
+        for leg in range(3):
+            seg_high = high[target_from:last + 1]
+            seg_low = low[stop_from:last + 1]
+            target_hits = np.flatnonzero(seg_high >= targets[i, leg])
+            stop_hits = np.flatnonzero(seg_low <= stop_level)
+            target_bar = target_from + target_hits[0] if len(target_hits) else last + 1
+            stop_bar = stop_from + stop_hits[0] if len(stop_hits) else last + 1
+
+            if stop_bar <= target_bar and stop_bar <= last:
+                price = min(stop_level, open_[stop_bar]) if stop_bar > fill_bar else stop_level
+                exits.extend([(price, stop_bar)] * (3 - leg))
+                break
+
+            if target_bar > last:
+                exits.extend([(close[last], last)] * (3 - leg))
+                break
+
+            exits.append((max(targets[i, leg], open_[target_bar]) if target_bar > fill_bar else targets[i, leg],
+                          target_bar))
+            target_from = target_bar
+            stop_from = target_bar + 1
+            if breakeven_after_target and leg == 0:
+                stop_level = max(stop_level, fill)
+
+        exit_price = sum(price for price, _ in exits) / 3
+        exit_bar = max(bar for _, bar in exits)
+        next_free = exit_bar + 1
+
+        trades.append({
+            'symbol': symbol,
+            'setup_type': setup_names[setup[i]],
+            'signal_time': i,
+            'entry_time': fill_bar,
+            'exit_time': exit_bar,
+            'entry_price': round(float(fill), 4),
+            'stop_loss': round(float(stop[i]), 4),
+            'targets': [float(t) for t in targets[i]],
+            'exit_price': round(float(exit_price), 4),
+            'exits': [{'price': round(float(p), 4), 'time': b} for p, b in exits],
+            'risk_per_share': round(float(risk), 4),
+            'pnl_per_share': float(exit_price - fill),
+            'r_multiple': round(float((exit_price - fill) / risk), 3),
+            'score': int(signals['score'][i]),
+            '_entry_ns': int(nanos[fill_bar]),
+            '_exit_ns': int(nanos[exit_bar])
+        })
+
+    # Bar positions -> ISO timestamps, converting only the bars that are referenced
+    used = sorted({trade[key] for trade in trades for key in ('signal_time', 'entry_time', 'exit_time')}
+                  | {leg['time'] for trade in trades for leg in trade['exits']})
+    iso = dict(zip(used, (stamp.isoformat() for stamp in index[used].to_pydatetime())))
+    for trade in trades:
+        for key in ('signal_time', 'entry_time', 'exit_time'):
+            trade[key] = iso[trade[key]]
+        for leg in trade['exits']:
+            leg['time'] = iso[leg['time']]
+
+    return trades
+
+
+def _simulate_task(args) -> Tuple[str, List[Dict], int]:
+    """Worker-process entry point: load bars and simulate one symbol"""
+    symbol, loader, start_date, end_date, interval, analyzer, entry_window, breakeven = args
+    try:
+        bars = loader.load(symbol, start_date, end_date, interval)
+    except Exception as e:
+        print(f"   ❌ {symbol}: failed to load bars: {e}")
+        return symbol, [], 0
+    if bars is None or len(bars) < 3:
+        return symbol, [], 0
+    return symbol, simulate_symbol(symbol, bars, analyzer, entry_window, breakeven), len(bars)
+
+
+class Backtester:
+    """
+    Backtests RossCameronAnalyzer setups on intraday bars.
+
+    Setup detection and the pre-filtering of which signals could fill are
+    vectorized over all bars of a symbol; only signals that would actually
+    trigger are walked bar by bar. Symbols are simulated independently (in
+    worker processes when workers > 1) and then replayed in time order through
+    one account, which applies risk-based sizing, the position limit and
+    commissions.
+    """
+
+    def __init__(self, initial_capital: float = 10000, analyzer: Optional[RossCameronAnalyzer] = None,
+                 bar_loader: Optional[BarLoader] = None, interval: str = '5m', entry_window: int = 3,
+                 breakeven_after_target: bool = True, max_positions: int = 5,
+                 commission_per_share: float = 0.005, workers: int = 1):
+        """
+        Args:
+            initial_capital: Starting account size
+            analyzer: Setup detector (default: RossCameronAnalyzer())
+            bar_loader: Source of historical bars (default: cached Yahoo Finance)
+            interval: Bar size
+            entry_window: Bars a buy stop stays active after the signal
+            breakeven_after_target: Move the stop to the entry after the first target
+            max_positions: Maximum simultaneous open positions
+            commission_per_share: Commission charged on entry and on exit
+            workers: Processes used to simulate symbols in parallel
+        """
+        self.initial_capital = initial_capital
+        self.analyzer = analyzer or RossCameronAnalyzer()
+        self.bar_loader = bar_loader or YFinanceBarLoader()
+        self.interval = interval
+        self.entry_window = entry_window
+        self.breakeven_after_target = breakeven_after_target
+        self.max_positions = max_positions
+        self.commission_per_share = commission_per_share
+        self.workers = workers
+
+    def run_backtest(self, symbols: List[str], start_date: str, end_date: str,
+                     risk_per_trade: float = 0.02) -> BacktestResult:
+        """
+        Run a backtest
+
+        Args:
+            symbols: Tickers to test
+            start_date: First day (YYYY-MM-DD)
+            end_date: Last day, exclusive (YYYY-MM-DD)
+            risk_per_trade: Fraction of equity risked per trade (0.02 = 2%)
+
+        Returns:
+            BacktestResult
+        """
+        started = time.perf_counter()
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        tasks = [(symbol, self.bar_loader, start_date, end_date, self.interval, self.analyzer,
+                  self.entry_window, self.breakeven_after_target) for symbol in symbols]
+
+        print(f"\n📊 Backtesting {len(symbols)} symbols {start_date} → {end_date} ({self.interval} bars)")
+
+        if self.workers > 1 and len(symbols) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_simulate_task, tasks, chunksize=max(1, len(tasks) // (self.workers * 4))))
+        else:
+            results = [_simulate_task(task) for task in tasks]
+
+        candidates = [trade for _, trades, _ in results for trade in trades]
+        bars_processed = sum(bars for _, _, bars in results)
+
+        result = self.evaluate_trades(candidates, risk_per_trade, {
+            'symbols': symbols,
+            'start_date': start_date,
+            'end_date': end_date,
+            'interval': self.interval
+        }, bars_processed=bars_processed, started=started)
+
+        print(f"✅ {len(result.trades)} trades, return {result.total_return:.2f}%, "
+              f"{bars_processed:,} bars in {result.elapsed_seconds:.1f}s")
+        return result
+
+    def evaluate_trades(self, candidates: List[Dict], risk_per_trade: float, params: Optional[Dict] = None,
+                        bars_processed: int = 0, started: Optional[float] = None) -> BacktestResult:
+        """
+        Run simulated trades through the account and build the report
+
+        Args:
+            candidates: Per-share trades from simulate_symbol / simulate_features
+            risk_per_trade: Fraction of equity risked per trade
+            params: Run description to include in the result
+            bars_processed: Number of bars the trades were simulated on
+            started: perf_counter() value when the run started
+
+        Returns:
+            BacktestResult
+        """
+        trades, equity_curve, skipped = self._replay(candidates, risk_per_trade)
+
+        return BacktestResult(
+            initial_capital=self.initial_capital,
+            final_capital=equity_curve[-1]['equity'] if equity_curve else self.initial_capital,
+            trades=trades,
+            equity_curve=equity_curve,
+            setup_stats=self._setup_stats(trades),
+            params=dict(params or {},
+                        risk_per_trade=risk_per_trade,
+                        entry_window=self.entry_window,
+                        breakeven_after_target=self.breakeven_after_target,
+                        max_positions=self.max_positions,
+                        commission_per_share=self.commission_per_share,
+                        analyzer=self.analyzer.get_params()),
+            skipped_signals=skipped,
+            bars_processed=bars_processed,
+            elapsed_seconds=time.perf_counter() - started if started is not None else 0.0
+        )
+
+    def _replay(self, candidates: List[Dict], risk_per_trade: float) -> Tuple[List[Dict], List[Dict], int]:
+        """
+        Size and account for trades in time order
+
+        Returns:
+            (executed trades, equity curve, signals skipped for lack of capital or slots)
+        """
+        candidates.sort(key=lambda t: t['_entry_ns'])
+        equity = self.initial_capital
+        open_positions: List[Tuple[int, int, Dict]] = []  # heap by exit time (epoch ns)
+        capital_in_use = 0.0
+        executed, curve = [], []
+        skipped = 0
+
+        def realize_until(moment):
+            nonlocal equity, capital_in_use
+            while open_positions and (moment is None or open_positions[0][0] <= moment):
+                _, _, trade = heapq.heappop(open_positions)
+                equity += trade['pnl']
+                capital_in_use -= trade['shares'] * trade['entry_price']
+                curve.append({'time': trade['exit_time'], 'equity': round(equity, 2)})
+
+        for sequence, candidate in enumerate(candidates):
+            realize_until(candidate['_entry_ns'])
+
+            if len(open_positions) >= self.max_positions:
+                skipped += 1
+                continue
+
+            shares = int(equity * risk_per_trade / candidate['risk_per_share'])
+            shares = min(shares, int((equity - capital_in_use) / candidate['entry_price']))
+            if shares < 1:
+                skipped += 1
+                continue
+
+            commission = 2 * shares * self.commission_per_share
+            trade = {key: value for key, value in candidate.items()
+                     if key != 'pnl_per_share' and not key.startswith('_')}
+            trade.update(shares=shares, commission=round(commission, 2),
+                         pnl=round(shares * candidate['pnl_per_share'] - commission, 2))
+
+            capital_in_use += shares * candidate['entry_price']
+            heapq.heappush(open_positions, (candidate['_exit_ns'], sequence, trade))
+            executed.append(trade)
+
+        realize_until(None)
+        return executed, curve, skipped
+
+    @staticmethod
+    def _setup_stats(trades: List[Dict]) -> Dict[str, Dict]:
+        """Per-setup trade count, win rate, average R and P&L"""
+        stats = {}
+        for trade in trades:
+            row = stats.setdefault(trade['setup_type'], {'trades': 0, 'wins': 0, 'sum_r': 0.0,
+                                                         'pnl': 0.0, 'gross_profit': 0.0, 'gross_loss': 0.0})
+            row['trades'] += 1
+            row['wins'] += trade['pnl'] > 0
+            row['sum_r'] += trade['r_multiple']
+            row['pnl'] += trade['pnl']
+            if trade['pnl'] > 0:
+                row['gross_profit'] += trade['pnl']
+            else:
+                row['gross_loss'] -= trade['pnl']
+
+        return {
+            setup: {
+                'trades': row['trades'],
+                'win_rate': round(row['wins'] / row['trades'] * 100, 2),
+                'avg_r_multiple': round(row['sum_r'] / row['trades'], 3),
+                'total_pnl': round(row['pnl'], 2),
+                'profit_factor': round(row['gross_profit'] / row['gross_loss'], 2) if row['gross_loss'] else None
+            }
+            for setup, row in stats.items()
+        }
@@ -0,0 +1,141 @@
+"""
+Historical bar loaders for the backtester
+Every loader returns a DataFrame indexed by timestamp with Open/High/Low/Close/Volume columns
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pandas as pd
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.data.data_lake import BAR_COLUMNS, DEFAULT_LAKE_DIR, DataLake
+
+
+class BarLoader:
+    """
+    Base class for bar sources.
+
+    Loaders must be picklable (plain attributes only) so the backtester can
+    hand them to worker processes.
+    """
+
+    def load(self, symbol: str, start: str, end: str, interval: str = '5m') -> Optional[pd.DataFrame]:
+        """
+        Args:
+            symbol: Stock ticker symbol
+            start: First date (inclusive, YYYY-MM-DD)
+            end: Last date (exclusive, YYYY-MM-DD)
+            interval: Bar size (e.g. '5m')
+
+        Returns:
+            DataFrame with BAR_COLUMNS sorted by time, or None if there's no data
+        """
+        raise NotImplementedError
+
+    def source_key(self) -> str:
+        """Loader type and where it reads from - bars cached from a loader are keyed by it"""
+        return type(self).__name__
+
+    @staticmethod
+    def _clip(df: Optional[pd.DataFrame], start: str, end: str) -> Optional[pd.DataFrame]:
+        if df is None or df.empty:
+            return None
+
+        df = df[BAR_COLUMNS].sort_index()
+        df = df[~df.index.duplicated(keep='last')]
+
+        index = df.index
+        tz = index.tz
+        start_ts = pd.Timestamp(start, tz=tz) if tz else pd.Timestamp(start)
+        end_ts = pd.Timestamp(end, tz=tz) if tz else pd.Timestamp(end)
+        df = df[(index >= start_ts) & (index < end_ts)]
+        return df if not df.empty else None
+
+
+class CSVBarLoader(BarLoader):
+    """
+    Reads bars from CSV files: {directory}/{SYMBOL}_{interval}.csv or {directory}/{SYMBOL}.csv
+    The first column is the timestamp.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def source_key(self) -> str:
+        return f"{type(self).__name__}:{os.path.abspath(self.directory)}"
+
+    def load(self, symbol: str, start: str, end: str, interval: str = '5m') -> Optional[pd.DataFrame]:
+        for name in (f"{symbol.upper()}_{interval}.csv", f"{symbol.upper()}.csv"):
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                df = pd.read_csv(path, index_col=0)
+                df.index = pd.to_datetime(df.index, utc=True)
+                df.columns = [c.capitalize() for c in df.columns]
+                return self._clip(df, start, end)
+        return None
+
+
+class DataLakeBarLoader(BarLoader):
+    """
+    Reads bars from the local market data lake (no downloads).
+    Fill the lake with `python3 -m src.data.data_lake backfill` or `import-csv`.
+    """
+
+    def __init__(self, lake_dir: str = DEFAULT_LAKE_DIR):
+        self.lake_dir = lake_dir
+        self._lake = None
+
+    @property
+    def lake(self) -> DataLake:
+        if self._lake is None:
+            self._lake = DataLake(self.lake_dir)
+        return self._lake
+
+    def source_key(self) -> str:
+        # Covers YFinanceBarLoader too: same lake, but it downloads what is missing
+        return f"{type(self).__name__}:{os.path.abspath(self.lake_dir)}"
+
+    def __getstate__(self):
+        # Each process opens its own lake (memory maps and SQLite handles don't pickle)
+        return dict(self.__dict__, _lake=None)
+
+    def load(self, symbol: str, start: str, end: str, interval: str = '5m') -> Optional[pd.DataFrame]:
+        return self._clip(self.lake.read_frame(symbol, start, end, interval), start, end)
+
+
+class YFinanceBarLoader(DataLakeBarLoader):
+    """
+    Downloads bars from Yahoo Finance into the local data lake, so a symbol is
+    only downloaded for the days the lake doesn't cover yet.
+
+    Note: Yahoo only serves intraday (5m) bars for roughly the last 60 days;
+    longer histories have to be imported into the lake from another source.
+    """
+
+    def load(self, symbol: str, start: str, end: str, interval: str = '5m') -> Optional[pd.DataFrame]:
+        symbol = symbol.upper()
+        start_day = datetime.fromisoformat(start[:10])
+        end_day = datetime.fromisoformat(end[:10])
+
+        coverage = self.lake.coverage(symbol, interval)
+        missing = []
+        if coverage is None:
+            missing.append((start_day, end_day))
+        else:
+            first = coverage['first'].tz_localize(None).to_pydatetime()
+            last = coverage['last'].tz_localize(None).to_pydatetime()
+            if start_day < first - timedelta(days=1):
+                missing.append((start_day, first))
+            if end_day > last + timedelta(days=1):
+                missing.append((last, end_day))
+
+        for range_start, range_end in missing:
+            self.lake.backfill(symbol, interval, start=range_start.date().isoformat(),
+                               end=(range_end + timedelta(days=1)).date().isoformat())
+
+        return super().load(symbol, start, end, interval)
@@ -0,0 +1,94 @@
+"""
+Per-bar setup features for backtesting
+Computes, for every bar at once, the inputs RossCameronAnalyzer sees live
+"""
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# 5 days of 5-minute regular-session bars - the window get_current_data looks at
+HISTORY_BARS = 5 * 78
+
+
+def compute_features(bars: pd.DataFrame, history_bars: int = HISTORY_BARS) -> Dict[str, np.ndarray]:
+    """
+    Build analyzer inputs for every bar
+
+    Mirrors MarketDataFetcher.get_current_data, which runs on the last 5 days of
+    5-minute bars: RVOL is the bar's volume over the window's average volume,
+    gap and change are measured against the previous session close, VWAP is
+    anchored to the session and day_high/day_low are the latest bar's range.
+
+    Args:
+        bars: DataFrame with Open/High/Low/Close/Volume indexed by time
+        history_bars: Look-back window standing in for the 5-day history
+
+    Returns:
+        Dictionary of equal-length arrays usable by RossCameronAnalyzer.score_setups,
+        plus OHLC arrays, session codes (day) and the session's last bar index (day_end)
+    """
+    open_ = bars['Open'].to_numpy(dtype=float)
+    high = bars['High'].to_numpy(dtype=float)
+    low = bars['Low'].to_numpy(dtype=float)
+    close = bars['Close'].to_numpy(dtype=float)
+    volume = bars['Volume'].to_numpy(dtype=float)
+    n = len(bars)
+
+    index = bars.index
+    if index.tz is not None:
+        index = index.tz_convert('America/New_York')
+    day, _ = pd.factorize(index.normalize())
+
+    # Previous session close for every bar
+    day_starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    day_ends = np.r_[day_starts[1:] - 1, n - 1]
+    session_close = close[day_ends]
+    previous_close = np.r_[np.nan, session_close[:-1]][day]
+    day_end = day_ends[day]
+
+    # Session-anchored VWAP
+    typical = (high + low + close) / 3
+    grouped = pd.DataFrame({'pv': typical * volume, 'v': volume}).groupby(day)
+    cum_pv = grouped['pv'].cumsum().to_numpy()
+    cum_v = grouped['v'].cumsum().to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vwap = np.where(cum_v > 0, cum_pv / cum_v, typical)
+
+    close_series = pd.Series(close)
+    ema_9 = close_series.ewm(span=9, adjust=False).mean().to_numpy()
+    ema_20 = close_series.ewm(span=20, adjust=False).mean().to_numpy()
+
+    min_periods = max(1, history_bars // 5)
+    avg_volume = pd.Series(volume).rolling(history_bars, min_periods=min_periods).mean().to_numpy()
+    recent_high = pd.Series(high).rolling(history_bars, min_periods=1).max().to_numpy()
+
+    red = np.r_[False, close[1:] < close[:-1]].astype(int)
+    recent_red = np.r_[0, 0, red[1:-1] + red[:-2]] if n >= 2 else np.zeros(n, dtype=int)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rvol = np.where(avg_volume > 0, volume / avg_volume, 0.0)
+        gap_percent = (open_ - previous_close) / previous_close * 100
+        change_percent = (close - previous_close) / previous_close * 100
+
+    return {
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'day': day,
+        'day_end': day_end,
+        'current_price': close,
+        'previous_close': previous_close,
+        'gap_percent': gap_percent,
+        'change_percent': change_percent,
+        'rvol': rvol,
+        'vwap': vwap,
+        'ema_9': ema_9,
+        'ema_20': ema_20,
+        'day_high': high,
+        'day_low': low,
+        'recent_red': recent_red[:n],
+        'recent_high': recent_high,
+        'has_history': (np.arange(n) >= 2) & ~np.isnan(previous_close) & ~np.isnan(avg_volume),
+    }
@@ -0,0 +1,569 @@
+"""
+Parameter sweeps for the Ross Cameron setups
+Grid or random search over RossCameronAnalyzer thresholds on historical bars,
+spread over a process pool, with every finished trial checkpointed to SQLite
+
+Usage: python3 -m src.backtesting.sweep --symbols TSLA,AMD --start 2024-01-01 --end 2024-03-01
+       [--method grid|random] [--trials N] [--seed N] [--workers N] [--space space.json]
+       [--csv-dir DIR] [--db PATH] [--sweep-id ID] [--top N]
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.analysis.ross_cameron_setups import RossCameronAnalyzer
+from src.backtesting.backtester import Backtester, simulate_features
+from src.backtesting.bar_loader import BarLoader, CSVBarLoader, YFinanceBarLoader
+from src.backtesting.features import compute_features
+
+DEFAULT_SWEEP_DB = os.getenv('SWEEP_DB', os.path.join(parent_dir, 'sweep_results.db'))
+
+DEFAULT_DATASET_DIR = os.getenv(
+    'SWEEP_DATASET_DIR',
+    os.path.join(parent_dir, 'data_cache', 'sweeps')
+)
+
+# Parameters in RossCameronAnalyzer.from_params form. A list is a set of
+# choices (grid or random); a (low, high) tuple is a range sampled uniformly
+# (random search only - integers if both bounds are integers).
+DEFAULT_SPACE = {
+    'min_rvol': [1.5, 2.0, 2.5, 3.0],
+    'min_gap_percent': [2.0, 3.0, 4.0, 5.0],
+    'min_score_gap_and_go': [5, 6, 7],
+    'min_score_red_to_green': [6, 7, 8],
+    'min_score_first_green_day': [6, 8],
+    'min_score_micro_pullback': [5, 6, 7],
+    'min_score_bull_flag': [5, 7],
+    'targets_gap_and_go': [[1, 2, 3], [1.5, 2.5, 4], [2, 3, 5]],
+}
+
+METRIC_COLUMNS = ['total_return', 'total_trades', 'win_rate', 'profit_factor',
+                  'avg_r_multiple', 'max_drawdown_percent', 'sharpe_ratio']
+
+
+class SweepDataset:
+    """
+    Bars and setup features for a fixed symbol list and date range.
+
+    Every array is a .npy file holding all symbols back to back (the manifest
+    records each symbol's slice). Workers open them with mmap, so they share
+    the OS page cache instead of each holding a copy of the dataset. Features
+    don't depend on analyzer parameters, so they are computed once per dataset,
+    not once per trial.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        self.arrays = {
+            key: np.load(os.path.join(directory, f"{key}.npy"), mmap_mode='r')
+            for key in self.manifest['keys'] + ['timestamps']
+        }
+
+    @classmethod
+    def build(cls, directory: str, symbols: List[str], start_date: str, end_date: str,
+              bar_loader: BarLoader, interval: str = '5m') -> 'SweepDataset':
+        """
+        Load bars, compute features and write the dataset
+
+        Returns:
+            The opened SweepDataset
+        """
+        columns: Dict[str, List[np.ndarray]] = {}
+        timestamps, entries = [], []
+        offset = 0
+
+        for symbol in symbols:
+            try:
+                bars = bar_loader.load(symbol, start_date, end_date, interval)
+            except Exception as e:
+                print(f"   ❌ {symbol}: failed to load bars: {e}")
+                continue
+            if bars is None or len(bars) < 3:
+                print(f"   ⚠️  {symbol}: no bars, skipped")
+                continue
+
+            features = compute_features(bars)
+            for key, values in features.items():
+                columns.setdefault(key, []).append(np.asarray(values))
+
+            index = bars.index
+            timestamps.append(index.as_unit('ns').asi8)  # UTC epoch nanoseconds
+            entries.append({
+                'symbol': symbol,
+                'start': offset,
+                'stop': offset + len(bars),
+                'tz': str(index.tz) if index.tz is not None else None
+            })
+            offset += len(bars)
+
+        if not entries:
+            raise ValueError("No bars available for any symbol")
+
+        # Write to a temporary directory and rename, so a half-written dataset is never opened
+        staging = f"{directory}.tmp{os.getpid()}"
+        os.makedirs(staging, exist_ok=True)
+        for key, parts in columns.items():
+            np.save(os.path.join(staging, f"{key}.npy"), np.concatenate(parts))
+        np.save(os.path.join(staging, 'timestamps.npy'), np.concatenate(timestamps))
+
+        with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+            json.dump({
+                'symbols': entries,
+                'keys': list(columns),
+                'start_date': start_date,
+                'end_date': end_date,
+                'interval': interval,
+                'bars': offset,
+                'created_at': datetime.now().isoformat()
+            }, f, indent=2)
+
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+        os.replace(staging, directory)
+        return cls(directory)
+
+    @property
+    def bars(self) -> int:
+        return self.manifest['bars']
+
+    def iter_symbols(self) -> Iterator[Tuple[str, Dict[str, np.ndarray], pd.DatetimeIndex]]:
+        """Yield (symbol, features, index) with features as views into the memory maps"""
+        for entry in self.manifest['symbols']:
+            window = slice(entry['start'], entry['stop'])
+            features = {key: self.arrays[key][window] for key in self.manifest['keys']}
+            index = pd.DatetimeIndex(self.arrays['timestamps'][window].view('M8[ns]'))
+            if entry['tz']:
+                index = index.tz_localize('UTC').tz_convert(entry['tz'])
+            yield entry['symbol'], features, index
+
+
+# Dataset opened once per worker process
+_worker_dataset: Optional[SweepDataset] = None
+
+
+def _init_worker(directory: str):
+    global _worker_dataset
+    _worker_dataset = SweepDataset(directory)
+
+
+def _run_trial(trial_id: int, params: Dict, options: Dict) -> Dict:
+    """Backtest one parameter set on the worker's dataset"""
+    started = time.perf_counter()
+    try:
+        analyzer = RossCameronAnalyzer.from_params(params)
+        backtester = Backtester(
+            initial_capital=options['initial_capital'],
+            analyzer=analyzer,
+            bar_loader=BarLoader(),
+            entry_window=options['entry_window'],
+            breakeven_after_target=options['breakeven_after_target'],
+            max_positions=options['max_positions'],
+            commission_per_share=options['commission_per_share']
+        )
+
+        candidates = []
+        for symbol, features, index in _worker_dataset.iter_symbols():
+            candidates.extend(simulate_features(symbol, features, index, analyzer,
+                                                options['entry_window'], options['breakeven_after_target']))
+
+        summary = backtester.evaluate_trades(candidates, options['risk_per_trade']).to_dict()
+        result = {column: summary[column] for column in METRIC_COLUMNS}
+        result['error'] = None
+    except Exception as e:
+        result = {column: None for column in METRIC_COLUMNS}
+        result['error'] = str(e)
+
+    result.update(trial_id=trial_id, params=params, elapsed_seconds=time.perf_counter() - started)
+    return result
+
+
+class ParameterSweep:
+    """
+    Grid or random search over analyzer parameters.
+
+    Each sweep has an id derived from its configuration; results go into the
+    sweep_trials table as trials finish. Re-running the same sweep (or passing
+    its sweep_id) skips the trials that are already stored, so an interrupted
+    sweep resumes where it stopped.
+    """
+
+    def __init__(self, symbols: List[str], start_date: str, end_date: str,
+                 space: Optional[Dict] = None, bar_loader: Optional[BarLoader] = None,
+                 interval: str = '5m', db_path: str = DEFAULT_SWEEP_DB,
+                 dataset_dir: str = DEFAULT_DATASET_DIR, workers: Optional[int] = None,
+                 initial_capital: float = 10000, risk_per_trade: float = 0.02,
+                 entry_window: int = 3, breakeven_after_target: bool = True,
+                 max_positions: int = 5, commission_per_share: float = 0.005):
+        """
+        Args:
+            symbols: Tickers to backtest every trial on
+            start_date: First day (YYYY-MM-DD)
+            end_date: Last day, exclusive (YYYY-MM-DD)
+            space: Search space (default: DEFAULT_SPACE)
+            bar_loader: Source of historical bars (default: cached Yahoo Finance)
+            interval: Bar size
+            db_path: SQLite file for results
+            dataset_dir: Where memory-mapped datasets are kept
+            workers: Worker processes (default: all cores)
+            initial_capital, risk_per_trade, entry_window, breakeven_after_target,
+            max_positions, commission_per_share: Backtester settings shared by all trials
+        """
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self.start_date = start_date
+        self.end_date = end_date
+        self.space = space or DEFAULT_SPACE
+        self.bar_loader = bar_loader or YFinanceBarLoader()
+        self.interval = interval
+        self.db_path = db_path
+        self.dataset_dir = dataset_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.options = {
+            'initial_capital': initial_capital,
+            'risk_per_trade': risk_per_trade,
+            'entry_window': entry_window,
+            'breakeven_after_target': breakeven_after_target,
+            'max_positions': max_positions,
+            'commission_per_share': commission_per_share
+        }
+
+        self._conn = sqlite3.connect(db_path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sweeps (
+                sweep_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                method TEXT NOT NULL,
+                total_trials INTEGER NOT NULL,
+                config TEXT NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS sweep_trials (
+                sweep_id TEXT NOT NULL,
+                trial_id INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                total_return REAL,
+                total_trades INTEGER,
+                win_rate REAL,
+                profit_factor REAL,
+                avg_r_multiple REAL,
+                max_drawdown_percent REAL,
+                sharpe_ratio REAL,
+                elapsed_seconds REAL,
+                error TEXT,
+                completed_at TEXT NOT NULL,
+                PRIMARY KEY (sweep_id, trial_id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_sweep_trials_sharpe ON sweep_trials(sweep_id, sharpe_ratio);
+            CREATE INDEX IF NOT EXISTS idx_sweep_trials_return ON sweep_trials(sweep_id, total_return);
+        """)
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Trials
+    # ------------------------------------------------------------------
+
+    def trials(self, method: str = 'grid', n_trials: Optional[int] = None, seed: int = 0) -> List[Dict]:
+        """
+        Parameter sets to evaluate, in a deterministic order
+
+        Args:
+            method: 'grid' (every combination) or 'random'
+            n_trials: Number of trials (random: required; grid: optional cap)
+            seed: Random seed
+
+        Returns:
+            List of parameter dictionaries
+        """
+        keys = sorted(self.space)
+
+        if method == 'grid':
+            ranges = [key for key in keys if isinstance(self.space[key], tuple)]
+            if ranges:
+                raise ValueError(f"Ranges can only be used with random search: {', '.join(ranges)}")
+            combos = itertools.product(*(self.space[key] for key in keys))
+            if n_trials:
+                combos = itertools.islice(combos, n_trials)
+            return [dict(zip(keys, combo)) for combo in combos]
+
+        if method != 'random':
+            raise ValueError(f"Unknown sweep method: {method}")
+        if not n_trials:
+            raise ValueError("Random search needs n_trials")
+
+        rng = random.Random(seed)
+        trials, seen = [], set()
+        for _ in range(n_trials * 20):
+            params = {key: self._sample(rng, self.space[key]) for key in keys}
+            fingerprint = json.dumps(params, sort_keys=True)
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                trials.append(params)
+                if len(trials) == n_trials:
+                    break
+        return trials
+
+    @staticmethod
+    def _sample(rng: random.Random, values):
+        if isinstance(values, tuple):
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                return rng.randint(low, high)
+            return round(rng.uniform(low, high), 4)
+        return rng.choice(values)
+
+    def sweep_id(self, method: str = 'grid', n_trials: Optional[int] = None, seed: int = 0) -> str:
+        """Id identifying this configuration (same configuration -> same id -> resume)"""
+        return hashlib.sha1(json.dumps(self._config(method, n_trials, seed), sort_keys=True)
+                            .encode()).hexdigest()[:12]
+
+    def _config(self, method: str, n_trials: Optional[int], seed: int) -> Dict:
+        return {
+            'symbols': self.symbols,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'interval': self.interval,
+            'bar_source': self.bar_loader.source_key(),
+            'space': {key: list(values) for key, values in self.space.items()},
+            'ranges': sorted(key for key, values in self.space.items() if isinstance(values, tuple)),
+            'method': method,
+            'n_trials': n_trials,
+            'seed': seed,
+            'options': self.options
+        }
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def dataset(self) -> SweepDataset:
+        """Open the memory-mapped dataset for this symbol list and date range, building it if needed"""
+        key = hashlib.sha1(json.dumps([self.symbols, self.start_date, self.end_date, self.interval,
+                                       self.bar_loader.source_key()]).encode()).hexdigest()[:12]
+        directory = os.path.join(self.dataset_dir, key)
+        if os.path.exists(os.path.join(directory, 'manifest.json')):
+            return SweepDataset(directory)
+
+        print(f"📦 Building dataset for {len(self.symbols)} symbols...")
+        os.makedirs(self.dataset_dir, exist_ok=True)
+        dataset = SweepDataset.build(directory, self.symbols, self.start_date, self.end_date,
+                                     self.bar_loader, self.interval)
+        print(f"✅ Dataset ready: {dataset.bars:,} bars in {directory}")
+        return dataset
+
+    def run(self, method: str = 'grid', n_trials: Optional[int] = None, seed: int = 0,
+            sweep_id: Optional[str] = None) -> str:
+        """
+        Run (or resume) a sweep
+
+        Args:
+            method: 'grid' or 'random'
+            n_trials: Number of trials (see trials())
+            seed: Random seed
+            sweep_id: Explicit id (default: derived from the configuration)
+
+        Returns:
+            The sweep id, for results()
+        """
+        sweep_id = sweep_id or self.sweep_id(method, n_trials, seed)
+        trials = self.trials(method, n_trials, seed)
+
+        self._conn.execute("""
+            INSERT OR IGNORE INTO sweeps (sweep_id, created_at, method, total_trials, config)
+            VALUES (?, ?, ?, ?, ?)
+        """, (sweep_id, datetime.now().isoformat(), method, len(trials),
+              json.dumps(self._config(method, n_trials, seed))))
+        self._conn.commit()
+
+        done = {row['trial_id'] for row in self._conn.execute(
+            "SELECT trial_id FROM sweep_trials WHERE sweep_id = ?", (sweep_id,))}
+        pending = [(trial_id, params) for trial_id, params in enumerate(trials) if trial_id not in done]
+
+        print(f"\n🔬 Sweep {sweep_id}: {len(trials)} trials ({len(done)} already done), {self.workers} workers")
+        if not pending:
+            return sweep_id
+
+        dataset = self.dataset()
+        started = time.perf_counter()
+        completed = 0
+        buffer: List[Dict] = []
+        last_save = time.monotonic()
+
+        def record(result: Dict):
+            nonlocal completed, last_save
+            buffer.append(result)
+            completed += 1
+            if len(buffer) >= 100 or time.monotonic() - last_save >= 2:
+                self._save(sweep_id, buffer)
+                buffer.clear()
+                last_save = time.monotonic()
+                rate = completed / (time.perf_counter() - started)
+                print(f"   {len(done) + completed}/{len(trials)} trials ({rate:.1f}/s)")
+
+        try:
+            if self.workers == 1:
+                _init_worker(dataset.directory)
+                for trial_id, params in pending:
+                    record(_run_trial(trial_id, params, self.options))
+            else:
+                self._run_pool(dataset, pending, record)
+        except KeyboardInterrupt:
+            print("\n🛑 Sweep interrupted - finished trials are saved, run it again to resume")
+        finally:
+            self._save(sweep_id, buffer)
+
+        print(f"✅ {completed} trials in {time.perf_counter() - started:.1f}s")
+        return sweep_id
+
+    def _run_pool(self, dataset: SweepDataset, pending: List[Tuple[int, Dict]], record):
+        """Feed trials to the pool, keeping a bounded number in flight"""
+        queue = iter(pending)
+        window = self.workers * 4
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(dataset.directory,)) as pool:
+            in_flight = set()
+            try:
+                while True:
+                    for trial_id, params in itertools.islice(queue, window - len(in_flight)):
+                        in_flight.add(pool.submit(_run_trial, trial_id, params, self.options))
+                    if not in_flight:
+                        break
+
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(future.result())
+            except KeyboardInterrupt:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+    def _save(self, sweep_id: str, results: List[Dict]):
+        if not results:
+            return
+        completed_at = datetime.now().isoformat()
+        self._conn.executemany("""
+            INSERT OR REPLACE INTO sweep_trials (
+                sweep_id, trial_id, params, total_return, total_trades, win_rate, profit_factor,
+                avg_r_multiple, max_drawdown_percent, sharpe_ratio, elapsed_seconds, error, completed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (sweep_id, r['trial_id'], json.dumps(r['params'])) +
+            tuple(r[column] for column in METRIC_COLUMNS) +
+            (r['elapsed_seconds'], r['error'], completed_at)
+            for r in results
+        ])
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def results(self, sweep_id: str, order_by: str = 'sharpe_ratio', limit: int = 20,
+                min_trades: int = 0) -> List[Dict]:
+        """
+        Best trials of a sweep
+
+        Args:
+            sweep_id: Sweep id returned by run()
+            order_by: Metric to sort by (descending; max_drawdown_percent ascending)
+            limit: Number of trials
+            min_trades: Ignore trials with fewer trades
+
+        Returns:
+            List of trial dictionaries (params decoded)
+        """
+        if order_by not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric: {order_by}")
+        direction = 'ASC' if order_by == 'max_drawdown_percent' else 'DESC'
+
+        rows = self._conn.execute(f"""
+            SELECT * FROM sweep_trials
+            WHERE sweep_id = ? AND error IS NULL AND total_trades >= ? AND {order_by} IS NOT NULL
+            ORDER BY {order_by} {direction}
+            LIMIT ?
+        """, (sweep_id, min_trades, limit)).fetchall()
+
+        return [dict(row, params=json.loads(row['params'])) for row in rows]
+
+    def close(self):
+        """Close the results database"""
+        self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parameter sweep for the Ross Cameron setups')
+    parser.add_argument('--symbols', required=True, help='Comma-separated tickers')
+    parser.add_argument('--start', required=True, help='First day (YYYY-MM-DD)')
+    parser.add_argument('--end', required=True, help='Last day, exclusive (YYYY-MM-DD)')
+    parser.add_argument('--method', choices=['grid', 'random'], default='grid')
+    parser.add_argument('--trials', type=int, default=None, help='Number of trials (required for random)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--space', help='JSON file with the search space ({"param": [choices]} '
+                                        'or {"param": {"range": [low, high]}})')
+    parser.add_argument('--csv-dir', help='Read bars from CSV files instead of Yahoo Finance')
+    parser.add_argument('--interval', default='5m')
+    parser.add_argument('--db', default=DEFAULT_SWEEP_DB)
+    parser.add_argument('--sweep-id', help='Resume or name a sweep explicitly')
+    parser.add_argument('--top', type=int, default=10, help='Number of best trials to print')
+    args = parser.parse_args()
+
+    space = None
+    if args.space:
+        with open(args.space) as f:
+            space = {
+                key: tuple(values['range']) if isinstance(values, dict) else values
+                for key, values in json.load(f).items()
+            }
+
+    sweep = ParameterSweep(
+        symbols=[s.strip() for s in args.symbols.split(',') if s.strip()],
+        start_date=args.start,
+        end_date=args.end,
+        space=space,
+        bar_loader=CSVBarLoader(args.csv_dir) if args.csv_dir else None,
+        interval=args.interval,
+        db_path=args.db,
+        workers=args.workers
+    )
+
+    try:
+        sweep_id = sweep.run(method=args.method, n_trials=args.trials, seed=args.seed, sweep_id=args.sweep_id)
+
+        print(f"\n🏆 Top {args.top} trials by Sharpe ratio:")
+        for row in sweep.results(sweep_id, limit=args.top):
+            print(f"   #{row['trial_id']:<5} sharpe={row['sharpe_ratio']:.2f} "
+                  f"return={row['total_return']:.1f}% trades={row['total_trades']} "
+                  f"win={row['win_rate']:.1f}% dd={row['max_drawdown_percent']:.1f}%")
+            print(f"          {json.dumps(row['params'])}")
+    finally:
+        sweep.close()
+
+
+if __name__ == "__main__":
+    main()
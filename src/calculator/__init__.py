@@ -0,0 +1,6 @@
+"""
+Position sizing modules
+"""
+from .position_calculator import PositionCalculator, Position
+
+__all__ = ['PositionCalculator', 'Position']
@@ -0,0 +1,343 @@
+"""
+Position sizing
+Risk-based share counts for one trade or for whole scans at once, scenario
+grids over risk and account size, and portfolio-level risk budgeting
+"""
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+LIMIT_NONE = 'none'
+LIMIT_RISK = 'risk'
+LIMIT_POSITION_CAP = 'position_cap'
+LIMIT_INVALID = 'invalid'
+
+
+@dataclass
+class Position:
+    """A sized trade"""
+    shares: int
+    entry_price: Optional[float]
+    stop_loss: Optional[float]
+    total_cost: float
+    risk_amount: float
+    risk_percent: float
+    position_percent: float
+    targets: List[float]
+    potential_profit: List[float]
+    risk_reward_ratios: List[float]
+    limited_by: str
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class PositionCalculator:
+    """
+    Sizes trades so that a stop-out loses a fixed share of the account.
+
+    shares = floor(min(account * risk% / |entry - stop|, account * max_position% / entry))
+
+    Every method works on arrays: size_batch() sizes a whole scan in one
+    pass, scenario_grid() broadcasts the same computation over risk
+    percentages x account sizes, and allocate_portfolio() budgets risk across
+    the positions as a group (correlation-aware, with exposure caps) without
+    iterating. A stop above the entry sizes a short.
+    """
+
+    def __init__(self, account_size: float, max_position_percent: float = 100.0):
+        """
+        Args:
+            account_size: Account value
+            max_position_percent: Largest single position as % of the account
+        """
+        if account_size <= 0:
+            raise ValueError("account_size must be positive")
+        self.account_size = account_size
+        self.max_position_percent = max_position_percent
+
+    def calculate_position(self, entry_price: float, stop_loss: float, targets: Sequence[float] = (),
+                           risk_percent: float = 2.0) -> Position:
+        """
+        Size a single trade
+
+        Args:
+            entry_price: Entry price
+            stop_loss: Stop price (below entry for longs, above for shorts)
+            targets: Profit targets
+            risk_percent: % of the account lost if the stop is hit
+
+        Returns:
+            Position
+        """
+        if entry_price <= 0 or stop_loss <= 0:
+            raise ValueError("Prices must be positive")
+        if entry_price == stop_loss:
+            raise ValueError("Stop loss must differ from the entry price")
+        if not 0 < risk_percent <= 100:
+            raise ValueError("risk_percent must be between 0 and 100")
+
+        sized = self.size_batch([entry_price], [stop_loss], [list(targets)] if targets else None, risk_percent)
+        return self.positions(sized)[0]
+
+    # ------------------------------------------------------------------
+    # Vectorized sizing
+    # ------------------------------------------------------------------
+
+    def size_batch(self, entries, stops, targets=None, risk_percent=2.0,
+                   account_size=None, max_position_percent=None) -> Dict[str, np.ndarray]:
+        """
+        Size many trades at once
+
+        All inputs broadcast against each other along the leading axes; the
+        last axis is the trade.
+
+        Args:
+            entries: Entry prices (..., n)
+            stops: Stop prices (..., n)
+            targets: Target prices (n, k), NaN-padded for fewer targets
+            risk_percent: % of the account risked per trade
+            account_size: Account value(s) (default: the calculator's)
+            max_position_percent: Position cap(s) as % of the account
+
+        Returns:
+            Dictionary of arrays: shares, total_cost, risk_amount, risk_percent,
+            position_percent, valid, limited_by and, with targets,
+            potential_profit / risk_reward (..., n, k)
+        """
+        account = self.account_size if account_size is None else account_size
+        cap = self.max_position_percent if max_position_percent is None else max_position_percent
+        entry, stop, risk_pct, account, cap = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (entries, stops, risk_percent, account, cap)))
+
+        per_share_risk = np.abs(entry - stop)
+        valid = (np.isfinite(entry) & np.isfinite(stop) & (entry > 0) & (stop > 0) & (per_share_risk > 0)
+                 & (account > 0) & (risk_pct > 0))
+        safe_risk = np.where(valid, per_share_risk, 1.0)
+        safe_entry = np.where(valid, entry, 1.0)
+
+        by_risk = np.floor(account * risk_pct / 100 / safe_risk + 1e-9)
+        by_cap = np.floor(account * cap / 100 / safe_entry + 1e-9)
+        shares = np.where(valid, np.maximum(np.minimum(by_risk, by_cap), 0), 0).astype(np.int64)
+
+        result = self._costs(shares, entry, stop, account, valid)
+        result['limited_by'] = np.where(~valid, LIMIT_INVALID,
+                                        np.where(shares == 0, LIMIT_NONE,
+                                                 np.where(by_cap < by_risk, LIMIT_POSITION_CAP, LIMIT_RISK)))
+
+        if targets is not None:
+            target = self._targets_array(targets, entry.shape[-1])
+            direction = np.sign(entry - stop)[..., None]
+            move = direction * (target - entry[..., None])
+            result['targets'] = target
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result['potential_profit'] = shares[..., None] * move
+                result['risk_reward'] = np.where(valid[..., None], move / safe_risk[..., None], np.nan)
+        return result
+
+    def scenario_grid(self, entries, stops, risk_percents: Sequence[float],
+                      account_sizes: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+        """
+        Size every trade under every (account size, risk %) combination
+
+        Args:
+            entries, stops: Trades (n,)
+            risk_percents: Risk levels (R,)
+            account_sizes: Account values (A,) (default: the calculator's)
+
+        Returns:
+            Per-trade arrays (A, R, n) - shares, total_cost, risk_amount - and
+            per-scenario totals (A, R): total_cost, total_risk, exposure_percent,
+            positions
+        """
+        accounts = np.asarray(account_sizes if account_sizes is not None else [self.account_size], dtype=float)
+        risks = np.asarray(risk_percents, dtype=float)
+        sized = self.size_batch(np.asarray(entries, dtype=float)[None, None, :],
+                                np.asarray(stops, dtype=float)[None, None, :],
+                                risk_percent=risks[None, :, None], account_size=accounts[:, None, None])
+
+        total_cost = sized['total_cost'].sum(axis=-1)
+        return {
+            'account_sizes': accounts,
+            'risk_percents': risks,
+            'shares': sized['shares'],
+            'total_cost': sized['total_cost'],
+            'risk_amount': sized['risk_amount'],
+            'totals': {
+                'total_cost': total_cost,
+                'total_risk': sized['risk_amount'].sum(axis=-1),
+                'exposure_percent': total_cost / accounts[:, None] * 100,
+                'positions': (sized['shares'] > 0).sum(axis=-1)
+            }
+        }
+
+    def allocate_portfolio(self, entries, stops, correlation: Optional[np.ndarray] = None,
+                           risk_percent=2.0, max_portfolio_risk_percent: float = 6.0,
+                           max_exposure_percent: float = 100.0) -> Dict[str, np.ndarray]:
+        """
+        Size trades as one portfolio
+
+        Starting from the standalone sizes:
+        1. Each trade's risk is divided by sqrt(sum of its positive
+           correlations), so k perfectly correlated trades carry the same
+           combined risk as k independent ones
+        2. Everything is scaled down so the correlated stop-out risk
+           sqrt(r' C r) stays within max_portfolio_risk_percent of the account
+           (without a correlation matrix: the plain sum of risks)
+        3. Everything is scaled down so total cost stays within max_exposure_percent
+
+        Args:
+            entries, stops: Trades (n,)
+            correlation: (n, n) return correlations; NaN (unknown) counts as 1
+            risk_percent: Standalone risk per trade (% of account)
+            max_portfolio_risk_percent: Portfolio risk budget (% of account)
+            max_exposure_percent: Gross exposure cap (% of account)
+
+        Returns:
+            size_batch() arrays for the final sizes plus standalone_shares,
+            risk_contribution and a 'portfolio' summary
+        """
+        entry = np.asarray(entries, dtype=float)
+        stop = np.asarray(stops, dtype=float)
+        standalone = self.size_batch(entry, stop, risk_percent=risk_percent)
+        valid = standalone['valid']
+        per_share_risk = np.where(valid, np.abs(entry - stop), 0.0)
+        safe_entry = np.where(valid, entry, 0.0)
+
+        # Continuous standalone sizes (before rounding to shares), zero for invalid trades
+        shares = np.where(valid, np.minimum(self.account_size * np.asarray(risk_percent) / 100
+                                            / np.where(valid, per_share_risk, 1.0),
+                                            self.account_size * self.max_position_percent / 100
+                                            / np.where(valid, entry, 1.0)), 0.0)
+
+        if correlation is not None:
+            corr = np.where(np.isnan(correlation), 1.0, np.clip(correlation, -1.0, 1.0))
+            np.fill_diagonal(corr, 1.0)
+            crowding = np.where(valid[None, :], np.maximum(corr, 0.0), 0.0).sum(axis=1)
+            shares = shares / np.sqrt(np.maximum(crowding, 1.0))
+        else:
+            corr = np.ones((len(entry), len(entry)))
+
+        risk = shares * per_share_risk
+        portfolio_risk = float(np.sqrt(max(risk @ corr @ risk, 0.0)))
+        risk_budget = self.account_size * max_portfolio_risk_percent / 100
+        risk_scale = min(1.0, risk_budget / portfolio_risk) if portfolio_risk > 0 else 1.0
+
+        exposure = float((shares * safe_entry).sum()) * risk_scale
+        exposure_cap = self.account_size * max_exposure_percent / 100
+        exposure_scale = min(1.0, exposure_cap / exposure) if exposure > 0 else 1.0
+
+        final = np.floor(shares * risk_scale * exposure_scale + 1e-9).astype(np.int64)
+        result = self._costs(final, entry, stop, np.full(entry.shape, float(self.account_size)), valid)
+        result['limited_by'] = standalone['limited_by']
+        result['standalone_shares'] = standalone['shares']
+
+        final_risk = result['risk_amount']
+        final_portfolio_risk = float(np.sqrt(max(final_risk @ corr @ final_risk, 0.0)))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result['risk_contribution'] = (final_risk * (corr @ final_risk) / final_portfolio_risk
+                                           if final_portfolio_risk > 0 else np.zeros_like(final_risk))
+        result['portfolio'] = {
+            'positions': int((final > 0).sum()),
+            'total_cost': float(result['total_cost'].sum()),
+            'exposure_percent': float(result['total_cost'].sum() / self.account_size * 100),
+            'sum_of_risks': float(final_risk.sum()),
+            'portfolio_risk': final_portfolio_risk,
+            'portfolio_risk_percent': final_portfolio_risk / self.account_size * 100,
+            'risk_scale': risk_scale,
+            'exposure_scale': exposure_scale,
+            'binding': ('exposure' if exposure_scale < 1 else 'portfolio_risk' if risk_scale < 1 else 'none')
+        }
+        return result
+
+    # ------------------------------------------------------------------
+    # Setups in, positions out
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def from_setups(setups: Union[List[Dict], Dict[str, np.ndarray]]) -> Tuple[List[Optional[str]], np.ndarray,
+                                                                            np.ndarray, np.ndarray]:
+        """
+        Trade arrays from RossCameronAnalyzer output
+
+        Args:
+            setups: analyze_setup() results (optionally with 'symbol'), plain
+                    {'entry_price', 'stop_loss', 'targets'} dicts, or the
+                    arrays returned by score_setups()
+
+        Returns:
+            (symbols, entries, stops, targets (n, k) NaN-padded); trades
+            without a valid setup get NaN prices and size to zero
+        """
+        if isinstance(setups, dict):
+            found = np.asarray(setups['setup']) >= 0
+            entries = np.where(found, np.asarray(setups['entry'], dtype=float), np.nan)
+            stops = np.where(found, np.asarray(setups['stop'], dtype=float), np.nan)
+            targets = np.asarray(setups['targets'], dtype=float)
+            return [None] * len(entries), entries, stops, targets
+
+        symbols, entries, stops, targets = [], [], [], []
+        for setup in setups:
+            symbols.append(setup['symbol'].upper() if setup.get('symbol') else None)
+            usable = setup.get('setup_valid', True)
+            entry = setup.get('entry_point', setup.get('entry_price'))
+            stop = setup.get('stop_loss')
+            entries.append(float(entry) if usable and entry is not None else np.nan)
+            stops.append(float(stop) if usable and stop is not None else np.nan)
+            targets.append([float(t) for t in setup.get('targets') or []])
+        return symbols, np.array(entries, dtype=float), np.array(stops, dtype=float), \
+            PositionCalculator._targets_array(targets, len(setups))
+
+    def positions(self, sized: Dict[str, np.ndarray]) -> List[Position]:
+        """size_batch() arrays (one dimension) as Position objects"""
+        positions = []
+        for i in range(len(sized['shares'])):
+            profits = sized.get('potential_profit')
+            ratios = sized.get('risk_reward')
+            keep = np.isfinite(ratios[i]) if ratios is not None else np.zeros(0, dtype=bool)
+            positions.append(Position(
+                shares=int(sized['shares'][i]),
+                entry_price=self._price(sized['entry_price'][i]),
+                stop_loss=self._price(sized['stop_loss'][i]),
+                total_cost=round(float(sized['total_cost'][i]), 2),
+                risk_amount=round(float(sized['risk_amount'][i]), 2),
+                risk_percent=round(float(sized['risk_percent'][i]), 3),
+                position_percent=round(float(sized['position_percent'][i]), 2),
+                targets=[round(float(t), 4) for t in sized['targets'][i][keep]] if ratios is not None else [],
+                potential_profit=[round(float(p), 2) for p in profits[i][keep]] if profits is not None else [],
+                risk_reward_ratios=[round(float(r), 2) for r in ratios[i][keep]] if ratios is not None else [],
+                limited_by=str(sized['limited_by'][i])
+            ))
+        return positions
+
+    @staticmethod
+    def _price(value: float) -> Optional[float]:
+        return round(float(value), 4) if np.isfinite(value) else None
+
+    @staticmethod
+    def _costs(shares: np.ndarray, entry: np.ndarray, stop: np.ndarray, account: np.ndarray,
+               valid: np.ndarray) -> Dict[str, np.ndarray]:
+        total_cost = np.where(valid, shares * entry, 0.0)
+        risk_amount = np.where(valid, shares * np.abs(entry - stop), 0.0)
+        return {
+            'shares': shares,
+            'entry_price': entry,
+            'stop_loss': stop,
+            'total_cost': total_cost,
+            'risk_amount': risk_amount,
+            'risk_percent': risk_amount / account * 100,
+            'position_percent': total_cost / account * 100,
+            'valid': valid
+        }
+
+    @staticmethod
+    def _targets_array(targets, n: int) -> np.ndarray:
+        """Ragged target lists as an (n, k) NaN-padded array"""
+        if isinstance(targets, np.ndarray):
+            return targets.astype(float).reshape(n, -1)
+        width = max((len(t) for t in targets), default=0)
+        array = np.full((n, width), np.nan)
+        for i, row in enumerate(targets):
+            array[i, :len(row)] = row
+        return array
@@ -3,5 +3,6 @@ Data fetching and processing modules
 """
 from .market_data import MarketDataFetcher
 from .currency_converter import CurrencyConverter
+from .data_lake import DataLake
 
-__all__ = ['MarketDataFetcher', 'CurrencyConverter']
+__all__ = ['MarketDataFetcher', 'CurrencyConverter', 'DataLake']
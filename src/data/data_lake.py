@@ -0,0 +1,557 @@
+"""
+Local market data lake
+Per-symbol, per-interval bar files that are memory-mapped and sliced in place,
+so history is downloaded once and every reader shares the same pages
+
+Layout ({root}/{interval}/):
+    {SYMBOL}.time  - bar open times, int64 UTC epoch nanoseconds, sorted
+    {SYMBOL}.bars  - float64 rows of Open, High, Low, Close, Volume
+    manifest.db    - (in root) one row per series: rows, first/last time, timezone, source, complete_history
+
+Usage: python3 -m src.data.data_lake backfill --symbols TSLA,AMD [--interval 5m] [--days 59]
+       python3 -m src.data.data_lake import-csv PATH [--interval 5m] [--symbol SYMBOL]
+       python3 -m src.data.data_lake list
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows - single-process locking only
+    fcntl = None
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.utils.rate_limiter import get_rate_limiter
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+ROW_BYTES = 8 * len(BAR_COLUMNS)
+
+DEFAULT_LAKE_DIR = os.getenv(
+    'MARKET_DATA_LAKE',
+    os.path.join(parent_dir, 'data_cache', 'lake')
+)
+
+# Days of history Yahoo Finance serves per intraday interval, and days per request
+YAHOO_MAX_DAYS = {'1m': 29, '2m': 59, '5m': 59, '15m': 59, '30m': 59, '90m': 59, '60m': 729, '1h': 729}
+YAHOO_CHUNK_DAYS = {'1m': 7}
+
+_PERIOD_PATTERN = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+
+class DataLake:
+    """
+    Memory-mapped bar store.
+
+    Reads are two binary searches on the time file and a slice of both maps -
+    no parsing and no copy - so a random date-range read costs microseconds
+    regardless of how much history is stored. read_frame() wraps the slice in
+    a DataFrame without copying; those frames are read-only (adding columns,
+    e.g. indicators, is fine; .copy() before modifying bar values).
+
+    Writes append in place when new bars extend (or re-deliver the tail of)
+    a series, and rewrite the files atomically otherwise. A per-series file
+    lock keeps writers and re-mapping readers in different processes apart.
+    """
+
+    def __init__(self, root: str = DEFAULT_LAKE_DIR):
+        """
+        Args:
+            root: Lake directory
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._maps: Dict[Tuple[str, str], Tuple[Tuple, np.ndarray, np.ndarray]] = {}
+        self._timezones: Dict[Tuple[str, str], Optional[str]] = {}
+        self.stats = {'reads': 0, 'rows_read': 0, 'remaps': 0, 'writes': 0,
+                      'rows_written': 0, 'rewrites': 0}
+        self.listeners = []
+
+        self._conn = sqlite3.connect(os.path.join(root, 'manifest.db'), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS series (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    rows INTEGER NOT NULL,
+                    first_time INTEGER,
+                    last_time INTEGER,
+                    timezone TEXT,
+                    source TEXT,
+                    updated_at TEXT NOT NULL,
+                    complete_history INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (symbol, interval)
+                )
+            """)
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(series)")}
+            if 'complete_history' not in columns:
+                self._conn.execute("ALTER TABLE series ADD COLUMN complete_history INTEGER NOT NULL DEFAULT 0")
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Files and locking
+    # ------------------------------------------------------------------
+
+    def _paths(self, symbol: str, interval: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, interval, symbol.upper())
+        return f"{base}.time", f"{base}.bars"
+
+    @contextmanager
+    def _file_lock(self, symbol: str, interval: str, exclusive: bool):
+        directory = os.path.join(self.root, interval)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{symbol.upper()}.lock"), 'a') as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _open(self, symbol: str, interval: str, locked: bool = False) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Memory maps of a whole series, re-mapped only when the files changed
+
+        Args:
+            locked: The caller already holds the series' file lock
+        """
+        key = (symbol.upper(), interval)
+        time_path, bar_path = self._paths(*key)
+
+        try:
+            time_stat, bar_stat = os.stat(time_path), os.stat(bar_path)
+        except FileNotFoundError:
+            self._maps.pop(key, None)
+            return None
+
+        signature = (time_stat.st_ino, time_stat.st_size, bar_stat.st_ino, bar_stat.st_size)
+        cached = self._maps.get(key)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+
+        with self._file_lock(*key, exclusive=False) if not locked else nullcontext():
+            time_stat, bar_stat = os.stat(time_path), os.stat(bar_path)
+            signature = (time_stat.st_ino, time_stat.st_size, bar_stat.st_ino, bar_stat.st_size)
+            rows = min(time_stat.st_size // 8, bar_stat.st_size // ROW_BYTES)
+            if rows == 0:
+                self._maps.pop(key, None)
+                return None
+            # Plain ndarray views of the maps - slicing np.memmap objects is several times slower
+            times = np.memmap(time_path, dtype='<i8', mode='r', shape=(rows,)).view(np.ndarray)
+            values = np.memmap(bar_path, dtype='<f8', mode='r', shape=(rows, len(BAR_COLUMNS))).view(np.ndarray)
+
+        self._maps[key] = (signature, times, values)
+        self.stats['remaps'] += 1
+        return times, values
+
+    def _timezone(self, symbol: str, interval: str) -> Optional[str]:
+        key = (symbol.upper(), interval)
+        if key not in self._timezones:
+            with self._lock:
+                row = self._conn.execute("SELECT timezone FROM series WHERE symbol = ? AND interval = ?",
+                                         key).fetchone()
+            if row is None:
+                return None
+            self._timezones[key] = row['timezone']
+        return self._timezones[key]
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def read_arrays(self, symbol: str, start=None, end=None,
+                    interval: str = '5m') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zero-copy slice of a series
+
+        Args:
+            symbol: Stock ticker symbol
+            start: First time, inclusive (str/datetime/Timestamp; naive values are
+                   in the series' timezone). None = from the beginning
+            end: Last time, exclusive. None = to the end
+            interval: Bar size
+
+        Returns:
+            (times as int64 UTC nanoseconds, n x 5 float64 OHLCV values) -
+            read-only views, empty if there's no data
+        """
+        opened = self._open(symbol, interval)
+        if opened is None:
+            return np.empty(0, dtype='<i8'), np.empty((0, len(BAR_COLUMNS)))
+
+        times, values = opened
+        tz = self._timezone(symbol, interval)
+        lo = 0 if start is None else int(np.searchsorted(times, self._to_ns(start, tz), 'left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, self._to_ns(end, tz), 'left'))
+
+        self.stats['reads'] += 1
+        self.stats['rows_read'] += max(0, hi - lo)
+        return times[lo:hi], values[lo:hi]
+
+    def read_frame(self, symbol: str, start=None, end=None, interval: str = '5m') -> Optional[pd.DataFrame]:
+        """
+        Slice of a series as a DataFrame backed by the memory map
+
+        Returns:
+            Read-only DataFrame with BAR_COLUMNS indexed by time (in the series'
+            timezone), or None if there's no data in the range
+        """
+        times, values = self.read_arrays(symbol, start, end, interval)
+        if not len(times):
+            return None
+        return self._frame(times, values, self._timezone(symbol, interval))
+
+    def read_period(self, symbol: str, period: str = '5d', interval: str = '5m') -> Optional[pd.DataFrame]:
+        """
+        Latest bars for a yfinance-style period: '5d' (last 5 sessions), '2wk',
+        '1mo', '1y' (calendar, back from the last bar) or 'max'
+        """
+        opened = self._open(symbol, interval)
+        if opened is None:
+            return None
+        times, values = opened
+        tz = self._timezone(symbol, interval)
+
+        if period == 'max':
+            return self._frame(times, values, tz)
+
+        match = _PERIOD_PATTERN.match(period)
+        if not match:
+            raise ValueError(f"Unsupported period: {period}")
+        count, unit = int(match.group(1)), match.group(2)
+
+        if unit == 'd':
+            lo = self._sessions_start(times, count, tz)
+        else:
+            offset = {'wk': pd.DateOffset(weeks=count), 'mo': pd.DateOffset(months=count),
+                      'y': pd.DateOffset(years=count)}[unit]
+            last = pd.Timestamp(int(times[-1]), tz='UTC')
+            lo = int(np.searchsorted(times, (last - offset).value, 'left'))
+
+        self.stats['reads'] += 1
+        self.stats['rows_read'] += len(times) - lo
+        return self._frame(times[lo:], values[lo:], tz)
+
+    @staticmethod
+    def _sessions_start(times: np.ndarray, sessions: int, tz: Optional[str]) -> int:
+        """Index of the first bar of the last `sessions` trading days"""
+        window = sessions * 1000
+        while True:
+            lo = max(0, len(times) - window)
+            index = pd.DatetimeIndex(times[lo:].view('M8[ns]'))
+            if tz:
+                index = index.tz_localize('UTC').tz_convert(tz)
+            days = index.normalize().asi8
+            starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+            if len(starts) > sessions or lo == 0:
+                return lo + int(starts[max(0, len(starts) - sessions)])
+            window *= 2
+
+    @staticmethod
+    def _frame(times: np.ndarray, values: np.ndarray, tz: Optional[str]) -> pd.DataFrame:
+        index = pd.DatetimeIndex(times.view('M8[ns]'))
+        if tz:
+            index = index.tz_localize('UTC').tz_convert(tz)
+        return pd.DataFrame(values, index=index, columns=BAR_COLUMNS, copy=False)
+
+    @staticmethod
+    def _to_ns(value, tz: Optional[str]) -> int:
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        stamp = pd.Timestamp(value)
+        if stamp.tzinfo is None:
+            stamp = stamp.tz_localize(tz or 'UTC')
+        return stamp.tz_convert('UTC').as_unit('ns').value
+
+    def coverage(self, symbol: str, interval: str = '5m') -> Optional[Dict]:
+        """First/last bar time, row count and complete_history flag of a series, or None"""
+        opened = self._open(symbol, interval)
+        if opened is None:
+            return None
+        times, _ = opened
+        tz = self._timezone(symbol, interval) or 'UTC'
+        with self._lock:
+            row = self._conn.execute("SELECT complete_history FROM series WHERE symbol = ? AND interval = ?",
+                                     (symbol.upper(), interval)).fetchone()
+        return {
+            'rows': len(times),
+            'first': pd.Timestamp(int(times[0]), tz='UTC').tz_convert(tz),
+            'last': pd.Timestamp(int(times[-1]), tz='UTC').tz_convert(tz),
+            'complete_history': bool(row and row['complete_history'])
+        }
+
+    def list_series(self) -> List[Dict]:
+        """Manifest rows for every stored series"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM series ORDER BY interval, symbol").fetchall()
+        return [dict(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def add_listener(self, callback):
+        """
+        Register a callback that receives every batch of written bars
+        Called as callback(symbol, interval, df) - used to feed the alert engine
+        """
+        self.listeners.append(callback)
+
+    def write(self, symbol: str, df: pd.DataFrame, interval: str = '5m', source: str = '',
+              complete_history: bool = False) -> int:
+        """
+        Store bars, replacing any stored bars with the same timestamps
+
+        Args:
+            symbol: Stock ticker symbol
+            df: DataFrame with Open/High/Low/Close/Volume indexed by time
+            interval: Bar size
+            source: Where the bars came from (recorded in the manifest)
+            complete_history: df starts at the source's earliest bar (a 'max' download);
+                recorded so later 'max' reads only need new bars
+
+        Returns:
+            Number of bars written
+        """
+        if df is None or df.empty:
+            return 0
+
+        symbol = symbol.upper()
+        df = df[BAR_COLUMNS].dropna(subset=['Open', 'High', 'Low', 'Close'])
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        if df.empty:
+            return 0
+
+        index = pd.DatetimeIndex(df.index)
+        tz = str(index.tz) if index.tz is not None else None
+        times = np.ascontiguousarray(index.as_unit('ns').asi8, dtype='<i8')
+        values = np.ascontiguousarray(df.to_numpy(dtype='<f8'))
+
+        with self._lock, self._file_lock(symbol, interval, exclusive=True):
+            existing = self._open(symbol, interval, locked=True)
+            if existing is None:
+                self._rewrite(symbol, interval, times, values)
+            else:
+                old_times, old_values = existing
+                tail = int(np.searchsorted(old_times, times[0], 'left'))
+                keeps_tail = tail == len(old_times) or (
+                    len(times) >= len(old_times) - tail and np.isin(old_times[tail:], times).all()
+                )
+                if keeps_tail:
+                    self._write_at(symbol, interval, tail, times, values)
+                else:
+                    merged = pd.DataFrame(np.vstack([old_values, values]),
+                                          index=np.r_[old_times, times]).groupby(level=0).last()
+                    self._rewrite(symbol, interval, merged.index.to_numpy(dtype='<i8'),
+                                  np.ascontiguousarray(merged.to_numpy(dtype='<f8')))
+                    self.stats['rewrites'] += 1
+
+            self._update_manifest(symbol, interval, tz, source, complete_history)
+
+        self.stats['writes'] += 1
+        self.stats['rows_written'] += len(times)
+
+        for callback in self.listeners:
+            try:
+                callback(symbol, interval, df)
+            except Exception as e:
+                print(f"⚠️  Lake listener failed: {e}")
+
+        return len(times)
+
+    def _write_at(self, symbol: str, interval: str, row: int, times: np.ndarray, values: np.ndarray):
+        """Overwrite from `row` on (files only grow, so existing maps stay valid)"""
+        time_path, bar_path = self._paths(symbol, interval)
+        # Bars first: readers size the series by the shorter of the two files
+        with open(bar_path, 'r+b') as f:
+            f.seek(row * ROW_BYTES)
+            f.write(values.tobytes())
+        with open(time_path, 'r+b') as f:
+            f.seek(row * 8)
+            f.write(times.tobytes())
+
+    def _rewrite(self, symbol: str, interval: str, times: np.ndarray, values: np.ndarray):
+        """Replace a series' files atomically"""
+        time_path, bar_path = self._paths(symbol, interval)
+        os.makedirs(os.path.dirname(time_path), exist_ok=True)
+        for path, data in ((bar_path, values), (time_path, times)):
+            staging = f"{path}.tmp{os.getpid()}"
+            data.tofile(staging)
+            os.replace(staging, path)
+
+    def _update_manifest(self, symbol: str, interval: str, tz: Optional[str], source: str,
+                         complete_history: bool = False):
+        times, _ = self._open(symbol, interval, locked=True)
+        self._conn.execute("""
+            INSERT INTO series (symbol, interval, rows, first_time, last_time, timezone, source, updated_at,
+                                complete_history)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol, interval) DO UPDATE SET
+                rows = excluded.rows,
+                first_time = excluded.first_time,
+                last_time = excluded.last_time,
+                timezone = COALESCE(series.timezone, excluded.timezone),
+                source = excluded.source,
+                updated_at = excluded.updated_at,
+                complete_history = MAX(series.complete_history, excluded.complete_history)
+        """, (symbol, interval, len(times), int(times[0]), int(times[-1]), tz, source,
+              datetime.now().isoformat(), int(complete_history)))
+        self._conn.commit()
+        self._timezones.pop((symbol, interval), None)
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def backfill(self, symbol: str, interval: str = '5m', start: Optional[str] = None,
+                 end: Optional[str] = None, days: Optional[int] = None) -> int:
+        """
+        Download bars from Yahoo Finance into the lake
+
+        Args:
+            symbol: Stock ticker symbol
+            interval: Bar size
+            start: First day (YYYY-MM-DD); default: as far back as Yahoo serves
+            end: Last day, exclusive (default: tomorrow)
+            days: Alternative to start - number of days back from today
+
+        Returns:
+            Number of bars written
+        """
+        import yfinance as yf
+
+        end_day = datetime.fromisoformat(end[:10]) if end else datetime.now() + timedelta(days=1)
+        max_days = YAHOO_MAX_DAYS.get(interval)
+        if start:
+            start_day = datetime.fromisoformat(start[:10])
+        else:
+            start_day = end_day - timedelta(days=days or max_days or 365 * 10)
+        if max_days:
+            start_day = max(start_day, datetime.now() - timedelta(days=max_days))
+
+        chunk = timedelta(days=YAHOO_CHUNK_DAYS.get(interval, max_days or 365 * 100))
+        ticker = yf.Ticker(symbol)
+        limiter = get_rate_limiter('yahoo')
+        written = 0
+
+        chunk_start = start_day
+        while chunk_start < end_day:
+            chunk_end = min(end_day, chunk_start + chunk)
+            limiter.acquire()
+            try:
+                df = ticker.history(start=chunk_start.date().isoformat(), end=chunk_end.date().isoformat(),
+                                    interval=interval)
+                written += self.write(symbol, df, interval, source='yahoo')
+            except Exception as e:
+                print(f"   ⚠️  {symbol}: no {interval} bars for {chunk_start.date()} - {chunk_end.date()}: {e}")
+            chunk_start = chunk_end
+
+        return written
+
+    def import_csv(self, path: str, symbol: Optional[str] = None, interval: str = '5m') -> int:
+        """
+        Load bars from a CSV file (first column = timestamp)
+
+        Args:
+            path: CSV file, named {SYMBOL}_{interval}.csv or {SYMBOL}.csv unless symbol is given
+            symbol: Stock ticker symbol
+            interval: Bar size
+
+        Returns:
+            Number of bars written
+        """
+        symbol = symbol or os.path.basename(path).split('.')[0].split('_')[0]
+        df = pd.read_csv(path, index_col=0)
+        df.index = pd.to_datetime(df.index, utc=True)
+        df.columns = [c.capitalize() for c in df.columns]
+        if df.index.tz is not None:
+            df.index = df.index.tz_convert('America/New_York')
+        return self.write(symbol, df, interval, source=f"csv:{os.path.basename(path)}")
+
+    def get_stats(self) -> Dict:
+        """Read/write counters and number of stored series"""
+        with self._lock:
+            series = self._conn.execute("SELECT COUNT(*) FROM series").fetchone()[0]
+        return dict(self.stats, series=series, mapped=len(self._maps))
+
+    def close(self):
+        """Close the manifest and drop the memory maps"""
+        with self._lock:
+            self._maps.clear()
+            self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Market data lake')
+    parser.add_argument('--root', default=DEFAULT_LAKE_DIR, help='Lake directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    backfill = commands.add_parser('backfill', help='Download bars from Yahoo Finance')
+    backfill.add_argument('--symbols', required=True, help='Comma-separated tickers')
+    backfill.add_argument('--interval', default='5m')
+    backfill.add_argument('--start', help='First day (YYYY-MM-DD)')
+    backfill.add_argument('--end', help='Last day, exclusive (YYYY-MM-DD)')
+    backfill.add_argument('--days', type=int, help='Days back from today (instead of --start)')
+
+    import_csv = commands.add_parser('import-csv', help='Import bars from CSV files')
+    import_csv.add_argument('path', help='CSV file or directory of CSV files')
+    import_csv.add_argument('--interval', default='5m')
+    import_csv.add_argument('--symbol', help='Ticker (default: from the file name)')
+
+    commands.add_parser('list', help='Show stored series')
+
+    args = parser.parse_args()
+    lake = DataLake(args.root)
+
+    try:
+        if args.command == 'backfill':
+            for symbol in [s.strip().upper() for s in args.symbols.split(',') if s.strip()]:
+                started = time.perf_counter()
+                written = lake.backfill(symbol, args.interval, args.start, args.end, args.days)
+                print(f"✅ {symbol}: {written:,} {args.interval} bars in {time.perf_counter() - started:.1f}s")
+
+        elif args.command == 'import-csv':
+            paths = [args.path] if os.path.isfile(args.path) else sorted(
+                os.path.join(args.path, name) for name in os.listdir(args.path) if name.endswith('.csv'))
+            for path in paths:
+                written = lake.import_csv(path, args.symbol, args.interval)
+                print(f"✅ {os.path.basename(path)}: {written:,} bars")
+
+        elif args.command == 'list':
+            series = lake.list_series()
+            if not series:
+                print("📭 Data lake is empty")
+            for row in series:
+                tz = row['timezone'] or 'UTC'
+                first = pd.Timestamp(row['first_time'], tz='UTC').tz_convert(tz)
+                last = pd.Timestamp(row['last_time'], tz='UTC').tz_convert(tz)
+                print(f"   {row['symbol']:<8} {row['interval']:<4} {row['rows']:>10,} bars  "
+                      f"{first:%Y-%m-%d %H:%M} → {last:%Y-%m-%d %H:%M}  ({row['source']})")
+    finally:
+        lake.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,76 @@
 """
 Market data fetching and processing
 """
+import time
 import yfinance as yf
 import pandas as pd
 import pandas_ta as ta
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import pytz
 
+from .data_lake import DataLake
+
 
 class MarketDataFetcher:
     """Fetch and process market data"""
 
-    def __init__(self):
+    # Beyond this gap the lake is refreshed with a full period download
+    # instead of the bars since its last stored session
+    MAX_INCREMENTAL_DAYS = 55
+
+    # How far back Yahoo serves intraday bars - period='max' can't reach further
+    INTRADAY_HISTORY_DAYS = {'1m': 7, '2m': 60, '5m': 60, '15m': 60, '30m': 60, '90m': 60,
+                             '60m': 730, '1h': 730}
+
+    def __init__(self, data_lake: Optional[DataLake] = None, use_lake: bool = True,
+                 min_sync_seconds: float = 30):
+        """
+        Args:
+            data_lake: Local bar store (default: DataLake() when use_lake is set)
+            use_lake: Serve history from the local data lake, downloading only new bars
+            min_sync_seconds: Minimum time between two Yahoo syncs of the same symbol
+        """
         self.israel_tz = pytz.timezone('Asia/Jerusalem')
         self.us_tz = pytz.timezone('America/New_York')
 
-    def get_stock_data(self, symbol: str, period: str = "5d") -> Optional[pd.DataFrame]:
+        self.lake = data_lake
+        if self.lake is None and use_lake:
+            try:
+                self.lake = DataLake()
+            except Exception as e:
+                print(f"⚠️  Data lake unavailable, history will be downloaded directly: {e}")
+        self.min_sync_seconds = min_sync_seconds
+        self._last_sync: Dict[Tuple[str, str], float] = {}
+        self._full_periods = set()
+
+    def get_stock_data(self, symbol: str, period: str = "5d", interval: str = "5m") -> Optional[pd.DataFrame]:
         """
         Fetch stock data from Yahoo Finance
 
+        With the data lake enabled, only bars newer than the stored history are
+        downloaded and the result is a read-only view of the lake's memory map
+        (adding indicator columns is fine).
+
         Args:
             symbol: Stock ticker symbol
             period: Data period (1d, 5d, 1mo, etc.)
+            interval: Bar size
 
         Returns:
             DataFrame with OHLCV data or None
         """
+        if self.lake is not None:
+            try:
+                df = self._get_from_lake(symbol, period, interval)
+                if df is not None and not df.empty:
+                    return df
+            except Exception as e:
+                print(f"Data lake error for {symbol}, downloading directly: {e}")
+
         try:
             ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval="5m")
+            df = ticker.history(period=period, interval=interval)
 
             if df.empty:
                 return None
@@ -40,6 +81,55 @@ class MarketDataFetcher:
             print(f"Error fetching data for {symbol}: {e}")
             return None
 
+    def _get_from_lake(self, symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        """Bring the lake up to date (at most every min_sync_seconds) and read the period from it"""
+        key = (symbol.upper(), interval)
+        now = time.monotonic()
+
+        if now - self._last_sync.get(key, float('-inf')) >= self.min_sync_seconds:
+            ticker = yf.Ticker(symbol)
+            coverage = self.lake.coverage(symbol, interval)
+            full = self._needs_full_download(key, period, coverage)
+            if full:
+                df = ticker.history(period=period, interval=interval)
+                self._full_periods.add(key + (period,))
+            else:
+                # From the start of the last stored session - re-delivers its partial bar
+                df = ticker.history(start=coverage['last'].date().isoformat(), interval=interval)
+            self.lake.write(symbol, df, interval, source='yahoo', complete_history=full and period == 'max')
+            self._last_sync[key] = now
+
+        return self.lake.read_period(symbol, period, interval)
+
+    def _needs_full_download(self, key: Tuple[str, str], period: str, coverage: Optional[Dict]) -> bool:
+        """Whether the stored history is too old or too short for an incremental sync"""
+        if coverage is None:
+            return True
+        now = pd.Timestamp.now(tz=coverage['last'].tz)
+        if (now - coverage['last']).days > self.MAX_INCREMENTAL_DAYS:
+            return True
+        if key + (period,) in self._full_periods:
+            return False
+
+        # Earliest bar the period needs ('5d' = today and the 4 sessions before)
+        count = int(''.join(filter(str.isdigit, period)) or 1)
+        if period == 'max':
+            if coverage.get('complete_history'):
+                return False
+            days = self.INTRADAY_HISTORY_DAYS.get(key[1])
+            if days is None:
+                # Daily bars go back to the listing - only a stored 'max' download covers that
+                return True
+            needed = now - timedelta(days=days) + timedelta(days=3)
+        elif period.endswith('d'):
+            needed = now.normalize() - pd.offsets.BDay(max(count - 1, 0))
+        elif period.endswith(('wk', 'mo', 'y')):
+            unit = {'wk': 'weeks', 'mo': 'months', 'y': 'years'}[period.lstrip('0123456789')]
+            needed = now - pd.DateOffset(**{unit: count}) + timedelta(days=3)
+        else:
+            return True
+        return coverage['first'] > needed
+
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators"""
 
@@ -150,6 +240,47 @@ class MarketDataFetcher:
             'timestamp': datetime.now(self.israel_tz).isoformat()
         }
 
+    def get_option_chain(self, symbol: str, expirations: int = 4) -> Optional[pd.DataFrame]:
+        """
+        Listed option contracts from Yahoo Finance
+
+        Args:
+            symbol: Stock ticker symbol
+            expirations: Number of nearest expiration dates to fetch
+
+        Returns:
+            DataFrame with expiration, type ('call'/'put'), contract, strike, bid,
+            ask, last, volume, open_interest and Yahoo's implied_volatility, or None
+        """
+        try:
+            ticker = yf.Ticker(symbol)
+            frames = []
+            for expiration in list(ticker.options)[:max(expirations, 0)]:
+                chain = ticker.option_chain(expiration)
+                for option_type, contracts in (('call', chain.calls), ('put', chain.puts)):
+                    if contracts is None or contracts.empty:
+                        continue
+                    frames.append(pd.DataFrame({
+                        'expiration': expiration,
+                        'type': option_type,
+                        'contract': contracts['contractSymbol'],
+                        'strike': contracts['strike'],
+                        'bid': contracts['bid'],
+                        'ask': contracts['ask'],
+                        'last': contracts['lastPrice'],
+                        'volume': contracts['volume'],
+                        'open_interest': contracts['openInterest'],
+                        'implied_volatility': contracts['impliedVolatility']
+                    }))
+
+            if not frames:
+                return None
+            return pd.concat(frames, ignore_index=True)
+
+        except Exception as e:
+            print(f"Error fetching option chain for {symbol}: {e}")
+            return None
+
     def scan_for_momentum(self, symbols: List[str], criteria: Dict) -> List[Dict]:
         """
         Scan multiple stocks for momentum setups
@@ -0,0 +1,6 @@
+"""
+Database modules
+"""
+from .trade_database import TradeDatabase
+
+__all__ = ['TradeDatabase']
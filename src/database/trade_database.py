@@ -0,0 +1,605 @@
+"""
+Trade journal database
+SQLite (WAL) store for executed trades with indexed queries and
+trigger-maintained summary tables for statistics
+"""
+
+import csv
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+# R-multiple histogram: 0.5R buckets, clamped to [-5R, +10R]
+R_BUCKET_SIZE = 0.5
+R_BUCKET_MIN = -10
+R_BUCKET_MAX = 20
+
+# Additive per-setup totals kept in the summary tables
+SUMMARY_COLUMNS = (
+    'trades', 'wins', 'losses', 'gross_profit', 'gross_loss', 'r_trades', 'sum_r', 'sum_r_squared'
+)
+SUMMARY_COLUMNS_SQL = ',\n                    '.join(
+    f"{column} {'INTEGER' if column in ('trades', 'wins', 'losses', 'r_trades') else 'REAL'} NOT NULL DEFAULT 0"
+    for column in SUMMARY_COLUMNS
+)
+
+TRADE_COLUMNS = (
+    'symbol', 'side', 'setup_type', 'entry_price', 'shares', 'stop_loss', 'target_price',
+    'entry_time', 'exit_price', 'exit_time', 'status', 'pnl', 'pnl_percent', 'r_multiple',
+    'r_bucket', 'fees', 'notes'
+)
+
+
+class TradeDatabase:
+    """
+    Trade journal.
+
+    Trades live in one table indexed by symbol, setup type, status and
+    entry/exit time. Closing, inserting or deleting a closed trade updates the
+    summary tables through SQL triggers - per-setup totals and an R-multiple
+    histogram, overall and per exit day - so statistics are read from a handful
+    of summary rows no matter how many trades are stored. Only the partial days
+    at the ends of a time range are aggregated from the trades themselves, over
+    a covering exit_time index.
+    """
+
+    # setup_type + SUMMARY_COLUMNS computed over trade rows
+    AGGREGATE_SQL = """setup_type, COUNT(*) AS trades, SUM(pnl > 0) AS wins, SUM(pnl <= 0) AS losses,
+                   SUM(MAX(pnl, 0)) AS gross_profit, SUM(MIN(pnl, 0)) AS gross_loss,
+                   COUNT(r_multiple) AS r_trades, COALESCE(SUM(r_multiple), 0) AS sum_r,
+                   COALESCE(SUM(r_multiple * r_multiple), 0) AS sum_r_squared"""
+
+    def __init__(self, db_path: str = 'trades.db'):
+        """
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(f"""
+                CREATE TABLE IF NOT EXISTS trades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL,
+                    side TEXT NOT NULL DEFAULT 'long',
+                    setup_type TEXT NOT NULL DEFAULT 'unknown',
+                    entry_price REAL NOT NULL,
+                    shares REAL NOT NULL,
+                    stop_loss REAL,
+                    target_price REAL,
+                    entry_time TEXT NOT NULL,
+                    exit_price REAL,
+                    exit_time TEXT,
+                    status TEXT NOT NULL DEFAULT 'open',
+                    pnl REAL,
+                    pnl_percent REAL,
+                    r_multiple REAL,
+                    r_bucket INTEGER,
+                    fees REAL NOT NULL DEFAULT 0,
+                    notes TEXT
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol, entry_time);
+                CREATE INDEX IF NOT EXISTS idx_trades_setup ON trades(setup_type, status);
+                CREATE INDEX IF NOT EXISTS idx_trades_entry ON trades(entry_time);
+                -- Covers date-ranged aggregates without touching the table
+                CREATE INDEX IF NOT EXISTS idx_trades_closed
+                    ON trades(status, exit_time, setup_type, pnl, r_multiple, r_bucket);
+
+                CREATE TABLE IF NOT EXISTS setup_summary (
+                    setup_type TEXT PRIMARY KEY,
+                    {SUMMARY_COLUMNS_SQL}
+                );
+
+                CREATE TABLE IF NOT EXISTS daily_summary (
+                    day TEXT NOT NULL,
+                    setup_type TEXT NOT NULL,
+                    {SUMMARY_COLUMNS_SQL},
+                    PRIMARY KEY (day, setup_type)
+                );
+
+                CREATE TABLE IF NOT EXISTS r_histogram (
+                    setup_type TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    trades INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (setup_type, bucket)
+                );
+
+                CREATE TABLE IF NOT EXISTS daily_r_histogram (
+                    day TEXT NOT NULL,
+                    setup_type TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    trades INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, setup_type, bucket)
+                );
+
+                CREATE TRIGGER IF NOT EXISTS trades_summary_add
+                AFTER INSERT ON trades WHEN NEW.status = 'closed'
+                BEGIN
+                    {self._summary_sql('NEW', 1)}
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trades_summary_remove
+                AFTER DELETE ON trades WHEN OLD.status = 'closed'
+                BEGIN
+                    {self._summary_sql('OLD', -1)}
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trades_summary_update_old
+                AFTER UPDATE ON trades WHEN OLD.status = 'closed'
+                BEGIN
+                    {self._summary_sql('OLD', -1)}
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trades_summary_update_new
+                AFTER UPDATE ON trades WHEN NEW.status = 'closed'
+                BEGIN
+                    {self._summary_sql('NEW', 1)}
+                END;
+            """)
+
+    @staticmethod
+    def _summary_sql(row: str, sign: int) -> str:
+        """Upserts that add (sign=1) or remove (sign=-1) one closed trade from the summary tables"""
+        values = ', '.join([
+            f"{sign}",
+            f"{sign} * ({row}.pnl > 0)",
+            f"{sign} * ({row}.pnl <= 0)",
+            f"{sign} * MAX({row}.pnl, 0)",
+            f"{sign} * MIN({row}.pnl, 0)",
+            f"{sign} * ({row}.r_multiple IS NOT NULL)",
+            f"{sign} * COALESCE({row}.r_multiple, 0)",
+            f"{sign} * COALESCE({row}.r_multiple * {row}.r_multiple, 0)",
+        ])
+        updates = ', '.join(f"{column} = {column} + excluded.{column}" for column in SUMMARY_COLUMNS)
+        day = f"substr({row}.exit_time, 1, 10)"
+
+        return f"""
+            INSERT INTO setup_summary (setup_type, {', '.join(SUMMARY_COLUMNS)})
+                VALUES ({row}.setup_type, {values})
+                ON CONFLICT(setup_type) DO UPDATE SET {updates};
+            INSERT INTO daily_summary (day, setup_type, {', '.join(SUMMARY_COLUMNS)})
+                VALUES ({day}, {row}.setup_type, {values})
+                ON CONFLICT(day, setup_type) DO UPDATE SET {updates};
+            INSERT INTO r_histogram (setup_type, bucket, trades)
+                SELECT {row}.setup_type, {row}.r_bucket, {sign} WHERE {row}.r_bucket IS NOT NULL
+                ON CONFLICT(setup_type, bucket) DO UPDATE SET trades = trades + {sign};
+            INSERT INTO daily_r_histogram (day, setup_type, bucket, trades)
+                SELECT {day}, {row}.setup_type, {row}.r_bucket, {sign} WHERE {row}.r_bucket IS NOT NULL
+                ON CONFLICT(day, setup_type, bucket) DO UPDATE SET trades = trades + {sign};
+        """
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_trade(self, symbol: str, entry_price: float, shares: float, setup_type: Optional[str] = None,
+                  side: str = 'long', stop_loss: Optional[float] = None, target_price: Optional[float] = None,
+                  entry_time: Optional[str] = None, exit_price: Optional[float] = None,
+                  exit_time: Optional[str] = None, fees: float = 0, notes: Optional[str] = None,
+                  **kwargs) -> int:
+        """
+        Record a trade (open, or already closed if exit_price is given)
+
+        Args:
+            symbol: Stock ticker symbol
+            entry_price: Fill price
+            shares: Position size
+            setup_type: Setup that triggered the trade (e.g. 'Gap & Go')
+            side: 'long' or 'short'
+            stop_loss: Initial stop (needed for R-multiples)
+            target_price: Profit target
+            entry_time: ISO timestamp (default: now)
+            exit_price: Exit fill for already-closed trades
+            exit_time: ISO timestamp of the exit
+            fees: Commissions and fees
+            notes: Free text
+
+        Returns:
+            Trade ID
+        """
+        row = self._build_row(dict(
+            symbol=symbol, entry_price=entry_price, shares=shares, setup_type=setup_type, side=side,
+            stop_loss=stop_loss, target_price=target_price, entry_time=entry_time,
+            exit_price=exit_price, exit_time=exit_time, fees=fees, notes=notes
+        ))
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO trades ({', '.join(TRADE_COLUMNS)}) VALUES ({', '.join('?' * len(TRADE_COLUMNS))})",
+                row
+            )
+        return cursor.lastrowid
+
+    def close_trade(self, trade_id: int, exit_price: float, exit_time: Optional[str] = None,
+                    fees: Optional[float] = None, notes: Optional[str] = None, **kwargs):
+        """
+        Close an open trade
+
+        Args:
+            trade_id: Trade ID
+            exit_price: Exit fill price
+            exit_time: ISO timestamp (default: now)
+            fees: Total fees (replaces the stored value if given)
+            notes: Notes (replaces the stored value if given)
+        """
+        with self._lock, self._conn:
+            current = self._conn.execute("SELECT * FROM trades WHERE id = ?", (trade_id,)).fetchone()
+            if current is None:
+                raise ValueError(f"Trade {trade_id} not found")
+
+            trade = dict(current)
+            trade.update(exit_price=exit_price, exit_time=exit_time)
+            if fees is not None:
+                trade['fees'] = fees
+            if notes is not None:
+                trade['notes'] = notes
+
+            row = self._build_row(trade)
+            self._conn.execute(
+                f"UPDATE trades SET {', '.join(f'{c} = ?' for c in TRADE_COLUMNS)} WHERE id = ?",
+                row + (trade_id,)
+            )
+
+    def delete_trade(self, trade_id: int):
+        """Delete a trade"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM trades WHERE id = ?", (trade_id,))
+
+    def bulk_insert(self, trades: Iterable[Dict], batch_size: int = 10000) -> int:
+        """
+        Insert many trades, one transaction per batch
+
+        Args:
+            trades: Trade dictionaries with the add_trade fields
+            batch_size: Rows per transaction
+
+        Returns:
+            Number of trades inserted
+        """
+        sql = f"INSERT INTO trades ({', '.join(TRADE_COLUMNS)}) VALUES ({', '.join('?' * len(TRADE_COLUMNS))})"
+        inserted = 0
+        batch = []
+
+        for trade in trades:
+            batch.append(self._build_row(trade))
+            if len(batch) >= batch_size:
+                inserted += self._insert_batch(sql, batch)
+                batch = []
+
+        if batch:
+            inserted += self._insert_batch(sql, batch)
+
+        return inserted
+
+    def _insert_batch(self, sql: str, rows: List[tuple]) -> int:
+        with self._lock, self._conn:
+            self._conn.executemany(sql, rows)
+        return len(rows)
+
+    def import_csv(self, csv_path: str, batch_size: int = 10000) -> int:
+        """
+        Import trades from a CSV file whose header uses the add_trade field names
+        (symbol, entry_price, shares, setup_type, side, stop_loss, exit_price, ...)
+
+        Returns:
+            Number of trades imported
+        """
+        numeric = ('entry_price', 'shares', 'stop_loss', 'target_price', 'exit_price', 'fees')
+
+        def rows():
+            with open(csv_path, newline='') as f:
+                for record in csv.DictReader(f):
+                    trade = {key: (value if value != '' else None) for key, value in record.items()}
+                    for key in numeric:
+                        if trade.get(key) is not None:
+                            trade[key] = float(trade[key])
+                    yield trade
+
+        count = self.bulk_insert(rows(), batch_size)
+        print(f"📥 Imported {count} trades from {csv_path}")
+        return count
+
+    def rebuild_summaries(self):
+        """Recompute the summary tables from the trades table"""
+        with self._lock, self._conn:
+            for table in ('setup_summary', 'daily_summary', 'r_histogram', 'daily_r_histogram'):
+                self._conn.execute(f"DELETE FROM {table}")
+
+            self._conn.execute(f"""
+                INSERT INTO daily_summary
+                SELECT substr(exit_time, 1, 10), {self.AGGREGATE_SQL}
+                FROM trades WHERE status = 'closed' GROUP BY substr(exit_time, 1, 10), setup_type
+            """)
+            self._conn.execute(f"""
+                INSERT INTO setup_summary
+                SELECT setup_type, {', '.join(f'SUM({c})' for c in SUMMARY_COLUMNS)}
+                FROM daily_summary GROUP BY setup_type
+            """)
+            self._conn.execute("""
+                INSERT INTO daily_r_histogram
+                SELECT substr(exit_time, 1, 10), setup_type, r_bucket, COUNT(*)
+                FROM trades WHERE status = 'closed' AND r_bucket IS NOT NULL
+                GROUP BY substr(exit_time, 1, 10), setup_type, r_bucket
+            """)
+            self._conn.execute("""
+                INSERT INTO r_histogram
+                SELECT setup_type, bucket, SUM(trades) FROM daily_r_histogram GROUP BY setup_type, bucket
+            """)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_trade(self, trade_id: int) -> Optional[Dict]:
+        """Single trade by ID"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM trades WHERE id = ?", (trade_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_all_trades(self, limit: int = 100, offset: int = 0, symbol: Optional[str] = None,
+                       setup_type: Optional[str] = None, status: Optional[str] = None) -> List[Dict]:
+        """
+        Trades, newest entry first
+
+        Args:
+            limit: Maximum trades to return
+            offset: Rows to skip (pagination)
+            symbol: Filter by ticker
+            setup_type: Filter by setup
+            status: 'open' or 'closed'
+        """
+        query = "SELECT * FROM trades WHERE 1=1"
+        params = []
+
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol.upper())
+        if setup_type:
+            query += " AND setup_type = ?"
+            params.append(setup_type)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+
+        query += " ORDER BY entry_time DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_trade_stats(self, setup_type: Optional[str] = None, since: Optional[str] = None,
+                        until: Optional[str] = None) -> Dict:
+        """
+        Performance statistics
+
+        Args:
+            setup_type: Only this setup
+            since: Only trades closed at or after this ISO timestamp
+            until: Only trades closed before this ISO timestamp
+
+        Returns:
+            Dictionary with totals, win rate, profit factor, expectancy ($ and R),
+            per-setup breakdown and R-multiple distribution
+        """
+        started = time.perf_counter()
+
+        with self._lock:
+            if since or until:
+                by_setup, histogram = self._range_stats(setup_type, since, until)
+            else:
+                where, params = ("WHERE setup_type = ?", [setup_type]) if setup_type else ("", [])
+                by_setup = [dict(row) for row in self._conn.execute(
+                    f"SELECT * FROM setup_summary {where} ORDER BY trades DESC", params
+                )]
+                histogram = [dict(row) for row in self._conn.execute(
+                    f"SELECT bucket, SUM(trades) AS trades FROM r_histogram {where} GROUP BY bucket", params
+                )]
+
+            open_params = [setup_type] if setup_type else []
+            open_trades = self._conn.execute(
+                "SELECT COUNT(*) FROM trades WHERE status = 'open'" +
+                (" AND setup_type = ?" if setup_type else ""), open_params
+            ).fetchone()[0]
+
+        by_setup = [row for row in by_setup if row['trades']]
+        totals = {key: sum(row[key] for row in by_setup)
+                  for key in ('trades', 'wins', 'losses', 'gross_profit', 'gross_loss',
+                              'r_trades', 'sum_r', 'sum_r_squared')}
+
+        stats = self._summarize(totals)
+        stats.update({
+            'open_trades': open_trades,
+            'by_setup': [dict(self._summarize(row), setup_type=row['setup_type']) for row in by_setup],
+            'r_distribution': [
+                {'r_from': row['bucket'] * R_BUCKET_SIZE, 'r_to': (row['bucket'] + 1) * R_BUCKET_SIZE,
+                 'trades': row['trades']}
+                for row in sorted(histogram, key=lambda r: r['bucket']) if row['trades']
+            ],
+            'query_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
+        return stats
+
+    def _range_stats(self, setup_type: Optional[str], since: Optional[str], until: Optional[str]):
+        """
+        Summary rows for a time range: whole days come from the daily summary
+        tables, partial days at either end are aggregated from the trades
+        """
+        full_start = since
+        if since and not self._day_aligned(since):
+            full_start = (datetime.fromisoformat(since[:10]) + timedelta(days=1)).date().isoformat()
+        full_end = until[:10] if until else None
+
+        if full_start and full_end and full_start[:10] >= full_end:
+            return self._aggregate_range(setup_type, since, until)
+
+        parts = [self._daily_range(setup_type, full_start, full_end)]
+        if full_start != since:
+            parts.append(self._aggregate_range(setup_type, since, full_start))
+        if until and not self._day_aligned(until):
+            parts.append(self._aggregate_range(setup_type, full_end, until))
+
+        if len(parts) == 1:
+            return parts[0]
+
+        by_setup: Dict[str, Dict] = {}
+        buckets: Dict[int, int] = {}
+        for rows, histogram in parts:
+            for row in rows:
+                merged = by_setup.setdefault(row['setup_type'], dict.fromkeys(SUMMARY_COLUMNS, 0))
+                for column in SUMMARY_COLUMNS:
+                    merged[column] += row[column] or 0
+            for row in histogram:
+                buckets[row['bucket']] = buckets.get(row['bucket'], 0) + row['trades']
+
+        return (
+            sorted((dict(row, setup_type=name) for name, row in by_setup.items()),
+                   key=lambda row: row['trades'], reverse=True),
+            [{'bucket': bucket, 'trades': trades} for bucket, trades in buckets.items()]
+        )
+
+    def _aggregate_range(self, setup_type: Optional[str], since: Optional[str], until: Optional[str]):
+        """Summary rows computed directly over closed trades in a time range"""
+        where = "WHERE status = 'closed'"
+        params = []
+        if since:
+            where += " AND exit_time >= ?"
+            params.append(since)
+        if until:
+            where += " AND exit_time < ?"
+            params.append(until)
+        if setup_type:
+            where += " AND setup_type = ?"
+            params.append(setup_type)
+
+        by_setup = [dict(row) for row in self._conn.execute(f"""
+            SELECT {self.AGGREGATE_SQL}
+            FROM trades {where} GROUP BY setup_type ORDER BY trades DESC
+        """, params)]
+        histogram = [dict(row) for row in self._conn.execute(f"""
+            SELECT r_bucket AS bucket, COUNT(*) AS trades
+            FROM trades {where} AND r_bucket IS NOT NULL GROUP BY r_bucket
+        """, params)]
+        return by_setup, histogram
+
+    def _daily_range(self, setup_type: Optional[str], since: Optional[str], until: Optional[str]):
+        """Summary rows for whole days, read from the daily summary tables"""
+        where = "WHERE 1=1"
+        params = []
+        if since:
+            where += " AND day >= ?"
+            params.append(since[:10])
+        if until:
+            where += " AND day < ?"
+            params.append(until[:10])
+        if setup_type:
+            where += " AND setup_type = ?"
+            params.append(setup_type)
+
+        by_setup = [dict(row) for row in self._conn.execute(f"""
+            SELECT setup_type, {', '.join(f'SUM({c}) AS {c}' for c in SUMMARY_COLUMNS)}
+            FROM daily_summary {where} GROUP BY setup_type ORDER BY trades DESC
+        """, params)]
+        histogram = [dict(row) for row in self._conn.execute(f"""
+            SELECT bucket, SUM(trades) AS trades FROM daily_r_histogram {where} GROUP BY bucket
+        """, params)]
+        return by_setup, histogram
+
+    @staticmethod
+    def _day_aligned(timestamp: Optional[str]) -> bool:
+        """True for None, a bare date or midnight"""
+        return timestamp is None or len(timestamp) == 10 or timestamp[10:].lstrip('T ') in ('00:00', '00:00:00')
+
+    @staticmethod
+    def _summarize(row: Dict) -> Dict:
+        trades = row['trades']
+        wins, losses = row['wins'], row['losses']
+        gross_profit, gross_loss = row['gross_profit'], row['gross_loss']
+        r_trades = row['r_trades']
+
+        avg_r = row['sum_r'] / r_trades if r_trades else None
+        r_std = None
+        if r_trades > 1:
+            variance = (row['sum_r_squared'] - r_trades * avg_r ** 2) / (r_trades - 1)
+            r_std = round(max(variance, 0) ** 0.5, 3)
+
+        return {
+            'total_trades': trades,
+            'wins': wins,
+            'losses': losses,
+            'win_rate': round(wins / trades * 100, 2) if trades else 0,
+            'total_pnl': round(gross_profit + gross_loss, 2),
+            'avg_win': round(gross_profit / wins, 2) if wins else 0,
+            'avg_loss': round(gross_loss / losses, 2) if losses else 0,
+            'profit_factor': round(gross_profit / -gross_loss, 2) if gross_loss else None,
+            'expectancy': round((gross_profit + gross_loss) / trades, 2) if trades else 0,
+            'expectancy_r': round(avg_r, 3) if avg_r is not None else None,
+            'r_std': r_std
+        }
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _build_row(trade: Dict) -> tuple:
+        """Normalize a trade dict and derive status, P&L and R-multiple"""
+        side = (trade.get('side') or 'long').lower()
+        direction = -1 if side == 'short' else 1
+        entry_price = float(trade['entry_price'])
+        shares = float(trade['shares'])
+        stop_loss = trade.get('stop_loss')
+        exit_price = trade.get('exit_price')
+        fees = float(trade.get('fees') or 0)
+
+        status = 'open'
+        exit_time = trade.get('exit_time')
+        pnl = pnl_percent = r_multiple = r_bucket = None
+
+        if exit_price is not None:
+            status = 'closed'
+            exit_price = float(exit_price)
+            exit_time = exit_time or datetime.now().isoformat()
+            pnl = round((exit_price - entry_price) * shares * direction - fees, 4)
+            pnl_percent = round((exit_price - entry_price) / entry_price * 100 * direction, 4) if entry_price else None
+
+            risk = abs(entry_price - float(stop_loss)) if stop_loss is not None else 0
+            if risk > 0:
+                r_multiple = round((exit_price - entry_price) * direction / risk, 4)
+                bucket = int(r_multiple // R_BUCKET_SIZE)
+                r_bucket = max(R_BUCKET_MIN, min(R_BUCKET_MAX, bucket))
+
+        return (
+            str(trade['symbol']).upper(),
+            side,
+            trade.get('setup_type') or 'unknown',
+            entry_price,
+            shares,
+            stop_loss,
+            trade.get('target_price'),
+            trade.get('entry_time') or datetime.now().isoformat(),
+            exit_price,
+            exit_time,
+            status,
+            pnl,
+            pnl_percent,
+            r_multiple,
+            r_bucket,
+            fees,
+            trade.get('notes')
+        )
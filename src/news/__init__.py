@@ -0,0 +1,7 @@
+"""
+News modules
+"""
+from .news_aggregator import NewsAggregator, NewsArticle
+from .minhash import MinHashIndex
+
+__all__ = ['NewsAggregator', 'NewsArticle', 'MinHashIndex']
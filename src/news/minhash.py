@@ -0,0 +1,158 @@
+"""
+MinHash / LSH index for near-duplicate headline detection
+"""
+import hashlib
+import re
+from collections import defaultdict, deque
+from typing import Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# Trailing " - Reuters" / " | Bloomberg" attributions
+_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+_STOPWORDS = frozenset("""
+a an the and or but of to in on at for from by with as is are was were be been it its this that these
+those after before over into up down out about than says said report reports inc corp co ltd
+""".split())
+_VOWELS = frozenset('aeiouy')
+
+
+def _stem(token: str) -> str:
+    """
+    Light Porter-style stemmer (plurals, -ed/-ing, final e) so inflections of
+    one word agree: surge/surges/surged/surging -> surg, drops/dropped/dropping -> drop
+    """
+    if len(token) <= 3 or not token.isalpha():
+        return token
+
+    if token.endswith('sses'):
+        token = token[:-2]
+    elif token.endswith(('ies', 'ied')) and len(token) > 4:
+        token = token[:-3] + 'y'
+    elif token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        token = token[:-1]
+
+    for suffix in ('ing', 'ed'):
+        stem = token[:-len(suffix)]
+        if token.endswith(suffix) and len(stem) >= 3 and _VOWELS & set(stem):
+            token = stem
+            # dropp -> drop, but fall and press keep their double letter
+            if token[-1] == token[-2] and token[-1] not in _VOWELS and token[-1] not in 'lsz':
+                token = token[:-1]
+            break
+
+    if token.endswith('e') and len(token) > 3:
+        token = token[:-1]
+    return token
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    """Stemmed content words of a headline (source attribution removed)"""
+    text = _SOURCE_SUFFIX.sub('', text or '').lower()
+    return frozenset(_stem(token.split("'")[0]) for token in _TOKEN_PATTERN.findall(text)
+                     if token not in _STOPWORDS)
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class MinHashIndex:
+    """
+    Near-duplicate lookup by Jaccard similarity of headline word sets.
+
+    Each headline gets a MinHash signature (num_perm hash minima); the
+    signature is cut into bands and two headlines become candidates when any
+    band matches exactly (LSH), which happens with high probability above
+    roughly (1/bands)^(1/rows) similarity. Candidates are confirmed with the
+    exact Jaccard similarity of their word sets, so the index has no false
+    positives and a lookup touches only a handful of entries. Entries expire
+    after window_seconds.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16,
+                 window_seconds: float = 48 * 3600, seed: int = 1):
+        """
+        Args:
+            threshold: Jaccard similarity that counts as a duplicate
+            num_perm: Hash functions per signature
+            bands: LSH bands (num_perm must divide evenly)
+            window_seconds: How long an entry stays matchable
+            seed: Seed for the hash functions
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.window_seconds = window_seconds
+
+        rng = np.random.default_rng(seed)
+        self._masks = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2)
+        self._multipliers = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+        self._items: Dict[int, Tuple[FrozenSet[str], List[Tuple[int, bytes]]]] = {}
+        self._entries: Deque[Tuple[float, int]] = deque()
+
+    def signature(self, words: FrozenSet[str]) -> np.ndarray:
+        """MinHash signature of a word set"""
+        if not words:
+            return np.zeros(self.num_perm, dtype=np.uint64)
+        base = np.array([int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'little')
+                         for word in words], dtype=np.uint64)
+        # (h ^ mask) * odd multiplier mod 2^64: one cheap permutation-like hash per row
+        return ((base[:, None] ^ self._masks) * self._multipliers).min(axis=0)
+
+    def _keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+
+    def find(self, words: FrozenSet[str]) -> Optional[Tuple[int, float]]:
+        """
+        Most similar indexed headline at or above the threshold
+
+        Returns:
+            (item_id, similarity) or None
+        """
+        best = None
+        seen = set()
+        for key in self._keys(self.signature(words)):
+            for item_id in self._buckets.get(key, ()):
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                similarity = jaccard(words, self._items[item_id][0])
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (item_id, similarity)
+        return best
+
+    def add(self, item_id: int, words: FrozenSet[str], timestamp: float):
+        """Index a headline's words (timestamps should arrive roughly in order)"""
+        if not words or item_id in self._items:
+            return
+        keys = self._keys(self.signature(words))
+        for key in keys:
+            self._buckets[key].append(item_id)
+        self._items[item_id] = (words, keys)
+        self._entries.append((timestamp, item_id))
+
+    def expire(self, now: float) -> int:
+        """Drop entries older than the window"""
+        cutoff = now - self.window_seconds
+        removed = 0
+        while self._entries and self._entries[0][0] < cutoff:
+            _, item_id = self._entries.popleft()
+            _, keys = self._items.pop(item_id)
+            for key in keys:
+                bucket = self._buckets[key]
+                bucket.remove(item_id)
+                if not bucket:
+                    del self._buckets[key]
+            removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,657 @@
+"""
+News aggregation
+Polls RSS feeds (and Finnhub when configured) incrementally into a local
+SQLite store, deduplicated and indexed by ticker and time
+"""
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field as dataclass_field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+# Add parent to path
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, parent_dir)
+
+from src.news.minhash import MinHashIndex, shingles
+from src.utils.rate_limiter import get_rate_limiter
+from src.utils.watchlist_executor import WatchlistExecutor
+
+DEFAULT_NEWS_DB = os.getenv('NEWS_DB', os.path.join(parent_dir, 'news.db'))
+
+SYMBOL_FEED_URL = 'https://feeds.finance.yahoo.com/rss/2.0/headline?s={symbol}&region=US&lang=en-US'
+MARKET_FEEDS = {
+    'yahoo': 'https://finance.yahoo.com/news/rssindex',
+    'cnbc': 'https://www.cnbc.com/id/100003114/device/rss/rss.html',
+    'marketwatch': 'https://feeds.content.dowjones.io/public/rss/mw_topstories'
+}
+FINNHUB_URL = 'https://finnhub.io/api/v1'
+
+# $TSLA, (NASDAQ: TSLA), (NYSE:F)
+CASHTAG_PATTERN = re.compile(r'\$([A-Z]{1,5})\b')
+EXCHANGE_PATTERN = re.compile(r'\((?:NASDAQ|NYSE|AMEX|NYSEARCA|TASE)\s*:\s*([A-Z.]{1,8})\)')
+
+POSITIVE_WORDS = frozenset("""
+beat beats surge surges surged soar soars soared jump jumps jumped rally rallies rallied gain gains gained
+upgrade upgrades upgraded record strong stronger growth profit profits bullish outperform raise raises
+raised higher boost boosts tops rebound rebounds buy breakout expands approval approved wins win partnership
+""".split())
+NEGATIVE_WORDS = frozenset("""
+miss misses missed plunge plunges plunged fall falls fell drop drops dropped slump slumps slumped downgrade
+downgrades downgraded weak weaker loss losses bearish underperform cut cuts lower lawsuit probe recall
+layoffs warning warns sell selloff crash crashes decline declines declined fraud bankruptcy halt halted
+investigation tumble tumbles tumbled slides slid
+""".split())
+NEGATIONS = frozenset({'not', 'no', 'never', "isn't", "doesn't", "didn't", 'without'})
+
+
+@dataclass
+class NewsArticle:
+    """A stored news article"""
+    id: int
+    title: str
+    url: str
+    source: str
+    published_at: str
+    summary: str = ''
+    symbols: List[str] = dataclass_field(default_factory=list)
+    sentiment_score: float = 0.0
+    sentiment: str = 'neutral'
+    duplicates: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def score_sentiment(text: str) -> Tuple[float, str]:
+    """
+    Lexicon sentiment of a headline
+
+    Returns:
+        (score in [-1, 1], 'positive' / 'negative' / 'neutral')
+    """
+    words = re.findall(r"[a-z']+", (text or '').lower())
+    positive = negative = 0
+    for i, word in enumerate(words):
+        polarity = 1 if word in POSITIVE_WORDS else -1 if word in NEGATIVE_WORDS else 0
+        if polarity and i > 0 and words[i - 1] in NEGATIONS:
+            polarity = -polarity
+        positive += polarity > 0
+        negative += polarity < 0
+    score = (positive - negative) / (positive + negative) if positive + negative else 0.0
+    label = 'positive' if score > 0.15 else 'negative' if score < -0.15 else 'neutral'
+    return round(score, 3), label
+
+
+class NewsAggregator:
+    """
+    News store fed by incremental polling.
+
+    A background poller pulls the market feeds and the feed of every tracked
+    symbol (symbols are tracked once requested) with conditional GETs, so an
+    unchanged feed costs a 304. New items go through one ingestion path:
+    exact URL match, then MinHash near-duplicate detection against the last
+    48 hours of headlines (a duplicate only adds its symbols and a
+    duplicate count to the original), then sentiment scoring - once per
+    article - and insertion into SQLite with a (symbol, time) index.
+
+    Per-symbol hourly mention counters are updated on insertion, so trending
+    symbols are a sum over a few buckets. The read methods used by the API
+    are indexed queries; they never fetch unless a symbol has never been
+    polled.
+    """
+
+    TREND_HOURS = 7 * 24
+
+    def __init__(self, db_path: str = DEFAULT_NEWS_DB, finnhub_api_key: Optional[str] = None,
+                 poll_interval: float = 300, retention_days: int = 30, track_days: float = 3,
+                 dedup_threshold: float = 0.7, max_workers: int = 4, autostart: bool = True):
+        """
+        Args:
+            db_path: SQLite file holding the articles
+            finnhub_api_key: Also poll Finnhub general and company news (default: FINNHUB_API_KEY)
+            poll_interval: Seconds between polls of each feed
+            retention_days: Articles older than this are deleted
+            track_days: Symbols not requested for this long stop being polled
+            dedup_threshold: Headline word-set Jaccard similarity that counts as a duplicate
+            max_workers: Feeds fetched at once
+            autostart: Start the background poller
+        """
+        self.db_path = db_path
+        self.finnhub_api_key = finnhub_api_key if finnhub_api_key is not None else os.getenv('FINNHUB_API_KEY')
+        self.poll_interval = poll_interval
+        self.retention_days = retention_days
+        self.track_days = track_days
+        self.executor = WatchlistExecutor(max_workers=max_workers, name='news')
+
+        self._db_lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+        self._dedup = MinHashIndex(threshold=dedup_threshold)
+        self._counts: Dict[int, Counter] = defaultdict(Counter)
+        self._sentiment_sums: Dict[int, Counter] = defaultdict(Counter)
+        self._tracked: Dict[str, float] = {}
+        self._load_state()
+
+        self.stats = {'polls': 0, 'not_modified': 0, 'fetch_errors': 0, 'items_seen': 0, 'inserted': 0,
+                      'url_duplicates': 0, 'near_duplicates': 0, 'sentiment_scored': 0, 'pruned': 0}
+
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if autostart:
+            self.start()
+
+    def _init_db(self):
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL UNIQUE,
+                    title TEXT NOT NULL,
+                    summary TEXT,
+                    source TEXT,
+                    published_ts REAL NOT NULL,
+                    market INTEGER NOT NULL DEFAULT 0,
+                    sentiment_score REAL NOT NULL,
+                    sentiment TEXT NOT NULL,
+                    duplicates INTEGER NOT NULL DEFAULT 0
+                );
+
+                CREATE TABLE IF NOT EXISTS article_symbols (
+                    symbol TEXT NOT NULL,
+                    published_ts REAL NOT NULL,
+                    article_id INTEGER NOT NULL,
+                    PRIMARY KEY (symbol, published_ts, article_id)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS feed_state (
+                    feed TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    high_water REAL,
+                    last_polled REAL,
+                    last_requested REAL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_ts);
+                CREATE INDEX IF NOT EXISTS idx_articles_market ON articles(market, published_ts);
+                CREATE INDEX IF NOT EXISTS idx_article_symbols_article ON article_symbols(article_id);
+            """)
+
+    def _load_state(self):
+        """Rebuild the dedup index, trend counters and tracked symbols from the store"""
+        now = time.time()
+        with self._db_lock:
+            rows = self._conn.execute("SELECT id, title, published_ts FROM articles WHERE published_ts >= ? "
+                                      "ORDER BY published_ts", (now - self._dedup.window_seconds,)).fetchall()
+            for row in rows:
+                self._dedup.add(row['id'], shingles(row['title']), row['published_ts'])
+
+            rows = self._conn.execute("""
+                SELECT s.symbol, CAST(s.published_ts / 3600 AS INTEGER) AS hour, COUNT(*) AS mentions,
+                       SUM(a.sentiment_score) AS sentiment
+                FROM article_symbols s JOIN articles a ON a.id = s.article_id
+                WHERE s.published_ts >= ? GROUP BY s.symbol, hour
+            """, (now - self.TREND_HOURS * 3600,)).fetchall()
+            for row in rows:
+                self._counts[row['hour']][row['symbol']] = row['mentions']
+                self._sentiment_sums[row['hour']][row['symbol']] = row['sentiment']
+
+            rows = self._conn.execute("SELECT feed, last_requested FROM feed_state "
+                                      "WHERE feed LIKE 'symbol:%' AND last_requested >= ?",
+                                      (now - self.track_days * 86400,)).fetchall()
+            self._tracked = {row['feed'].split(':', 1)[1]: row['last_requested'] for row in rows}
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_stock_news(self, symbol: str, hours: int = 24, limit: int = 50) -> List[NewsArticle]:
+        """
+        News mentioning a symbol
+
+        Args:
+            symbol: Stock ticker symbol
+            hours: Look-back window
+            limit: Maximum articles
+
+        Returns:
+            Articles, newest first
+        """
+        symbol = symbol.upper()
+        if self.track(symbol):
+            # First request for this symbol: fill the store once, then it's polled in the background
+            self.poll_symbol(symbol)
+
+        with self._db_lock:
+            rows = self._conn.execute("""
+                SELECT a.* FROM article_symbols s JOIN articles a ON a.id = s.article_id
+                WHERE s.symbol = ? AND s.published_ts >= ?
+                ORDER BY s.published_ts DESC LIMIT ?
+            """, (symbol, time.time() - hours * 3600, limit)).fetchall()
+        return self._articles(rows)
+
+    def get_market_news(self, hours: int = 24, limit: int = 20) -> List[NewsArticle]:
+        """
+        General market news
+
+        Returns:
+            Articles from the market feeds, newest first
+        """
+        with self._db_lock:
+            rows = self._conn.execute("""
+                SELECT * FROM articles WHERE market = 1 AND published_ts >= ?
+                ORDER BY published_ts DESC LIMIT ?
+            """, (time.time() - hours * 3600, limit)).fetchall()
+        return self._articles(rows)
+
+    def get_trending_symbols(self, hours: int = 24, limit: int = 10) -> List[Dict]:
+        """
+        Symbols with the most articles in the window
+
+        Args:
+            hours: Window length (up to 7 days)
+            limit: Maximum symbols
+
+        Returns:
+            [{'symbol', 'mentions', 'previous_mentions', 'avg_sentiment'}, ...], most mentioned first
+        """
+        hours = max(1, min(hours, self.TREND_HOURS // 2))
+        current_hour = int(time.time() // 3600)
+        mentions, previous, sentiment = Counter(), Counter(), Counter()
+        with self._db_lock:
+            for hour in range(current_hour - hours + 1, current_hour + 1):
+                mentions.update(self._counts.get(hour, {}))
+                sentiment.update(self._sentiment_sums.get(hour, {}))
+            for hour in range(current_hour - 2 * hours + 1, current_hour - hours + 1):
+                previous.update(self._counts.get(hour, {}))
+
+        return [{
+            'symbol': symbol,
+            'mentions': count,
+            'previous_mentions': previous.get(symbol, 0),
+            'avg_sentiment': round(sentiment[symbol] / count, 3)
+        } for symbol, count in mentions.most_common(limit)]
+
+    def analyze_sentiment(self, articles: List[NewsArticle]) -> Dict:
+        """
+        Aggregate the stored per-article sentiment of a set of articles
+
+        Returns:
+            Dictionary with overall label, average score and label counts
+        """
+        counts = Counter(article.sentiment for article in articles)
+        score = sum(article.sentiment_score for article in articles) / len(articles) if articles else 0.0
+        return {
+            'overall': 'positive' if score > 0.1 else 'negative' if score < -0.1 else 'neutral',
+            'score': round(score, 3),
+            'positive': counts.get('positive', 0),
+            'negative': counts.get('negative', 0),
+            'neutral': counts.get('neutral', 0),
+            'total': len(articles)
+        }
+
+    @staticmethod
+    def export_news(articles: List[NewsArticle]) -> List[Dict]:
+        """Articles as JSON-serializable dictionaries"""
+        return [article.to_dict() for article in articles]
+
+    def _articles(self, rows: List[sqlite3.Row]) -> List[NewsArticle]:
+        if not rows:
+            return []
+        ids = [row['id'] for row in rows]
+        symbols = defaultdict(list)
+        with self._db_lock:
+            for article_id, symbol in self._conn.execute(
+                    f"SELECT article_id, symbol FROM article_symbols WHERE article_id IN "
+                    f"({','.join('?' * len(ids))}) ORDER BY symbol", ids):
+                symbols[article_id].append(symbol)
+        return [NewsArticle(
+            id=row['id'],
+            title=row['title'],
+            url=row['url'],
+            source=row['source'] or '',
+            published_at=datetime.fromtimestamp(row['published_ts'], timezone.utc).isoformat(),
+            summary=row['summary'] or '',
+            symbols=symbols[row['id']],
+            sentiment_score=row['sentiment_score'],
+            sentiment=row['sentiment'],
+            duplicates=row['duplicates']
+        ) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def ingest(self, items: Iterable[Dict], market: bool = False) -> Dict[str, int]:
+        """
+        Store new items
+
+        Args:
+            items: Dictionaries with title, url, published_ts (epoch seconds) and
+                   optionally summary, source and symbols
+            market: Items come from a market-wide feed
+
+        Returns:
+            {'inserted', 'url_duplicates', 'near_duplicates'}
+        """
+        result = {'inserted': 0, 'url_duplicates': 0, 'near_duplicates': 0}
+        with self._db_lock, self._conn:
+            for item in items:
+                title = (item.get('title') or '').strip()
+                url = (item.get('url') or '').strip()
+                if not title or not url:
+                    continue
+                self.stats['items_seen'] += 1
+                published_ts = float(item.get('published_ts') or time.time())
+                symbols = self._extract_symbols(title, item.get('symbols') or ())
+
+                existing = self._conn.execute("SELECT id, published_ts FROM articles WHERE url = ?",
+                                              (url,)).fetchone()
+                if existing is not None:
+                    result['url_duplicates'] += 1
+                    self._link(existing['id'], existing['published_ts'], symbols, market)
+                    continue
+
+                words = shingles(title)
+                match = self._dedup.find(words)
+                if match is not None:
+                    original = self._conn.execute("SELECT id, published_ts FROM articles WHERE id = ?",
+                                                  (match[0],)).fetchone()
+                    if original is not None:
+                        result['near_duplicates'] += 1
+                        self._conn.execute("UPDATE articles SET duplicates = duplicates + 1 WHERE id = ?",
+                                           (original['id'],))
+                        self._link(original['id'], original['published_ts'], symbols, market)
+                        continue
+
+                score, label = score_sentiment(f"{title}. {item.get('summary') or ''}")
+                self.stats['sentiment_scored'] += 1
+                cursor = self._conn.execute("""
+                    INSERT INTO articles (url, title, summary, source, published_ts, market, sentiment_score,
+                                          sentiment)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (url, title, (item.get('summary') or '')[:1000], item.get('source') or '', published_ts,
+                      int(market), score, label))
+                article_id = cursor.lastrowid
+                self._dedup.add(article_id, words, published_ts)
+                self._link(article_id, published_ts, symbols, market, score)
+                result['inserted'] += 1
+
+        for key, value in result.items():
+            self.stats[key] += value
+        return result
+
+    def _link(self, article_id: int, published_ts: float, symbols: Iterable[str], market: bool,
+              sentiment_score: Optional[float] = None):
+        """Index an article under its symbols and count the new mentions"""
+        if market:
+            self._conn.execute("UPDATE articles SET market = 1 WHERE id = ? AND market = 0", (article_id,))
+        if sentiment_score is None and symbols:
+            sentiment_score = self._conn.execute("SELECT sentiment_score FROM articles WHERE id = ?",
+                                                 (article_id,)).fetchone()[0]
+        hour = int(published_ts // 3600)
+        for symbol in symbols:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO article_symbols (symbol, published_ts, article_id) "
+                                        "VALUES (?, ?, ?)", (symbol, published_ts, article_id))
+            if cursor.rowcount:
+                self._counts[hour][symbol] += 1
+                self._sentiment_sums[hour][symbol] += sentiment_score
+
+    @staticmethod
+    def _extract_symbols(title: str, symbols: Iterable[str]) -> List[str]:
+        found = {s.upper() for s in symbols if s}
+        found.update(CASHTAG_PATTERN.findall(title))
+        found.update(EXCHANGE_PATTERN.findall(title))
+        return sorted(found)
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def track(self, symbol: str) -> bool:
+        """
+        Poll a symbol's feed in the background from now on
+
+        Returns:
+            True if the symbol's feed has never been polled
+        """
+        now = time.time()
+        symbol = symbol.upper()
+        first_time = symbol not in self._tracked and self._feed_state(f"symbol:{symbol}") is None
+        if now - self._tracked.get(symbol, 0) > 60:
+            with self._db_lock, self._conn:
+                self._conn.execute("""
+                    INSERT INTO feed_state (feed, last_requested) VALUES (?, ?)
+                    ON CONFLICT(feed) DO UPDATE SET last_requested = excluded.last_requested
+                """, (f"symbol:{symbol}", now))
+        self._tracked[symbol] = now
+        return first_time
+
+    def poll(self) -> Dict[str, int]:
+        """
+        Poll every market feed and tracked symbol once
+
+        Returns:
+            Ingestion totals
+        """
+        now = time.time()
+        stale = [symbol for symbol, requested in self._tracked.items()
+                 if now - requested > self.track_days * 86400]
+        for symbol in stale:
+            self._tracked.pop(symbol, None)
+
+        jobs = [f"market:{name}" for name in MARKET_FEEDS] + [f"symbol:{s}" for s in self._tracked]
+        if self.finnhub_api_key:
+            jobs.append('finnhub:general')
+
+        totals = Counter()
+        for feed, result, error in self.executor.iter_results(jobs, self._poll_feed):
+            if error is not None:
+                self.stats['fetch_errors'] += 1
+                print(f"⚠️  News feed {feed} failed: {error}")
+            elif result:
+                totals.update(result)
+        self.stats['polls'] += 1
+        self.prune()
+        return dict(totals)
+
+    def poll_symbol(self, symbol: str) -> Dict[str, int]:
+        """Poll one symbol's feeds now"""
+        try:
+            return self._poll_feed(f"symbol:{symbol.upper()}")
+        except Exception as e:
+            self.stats['fetch_errors'] += 1
+            print(f"⚠️  News feed for {symbol} failed: {e}")
+            return {}
+
+    def _poll_feed(self, feed: str) -> Dict[str, int]:
+        kind, name = feed.split(':', 1)
+        state = self._feed_state(feed) or {}
+        result = Counter()
+
+        if kind == 'market':
+            items, headers = self._fetch_rss(MARKET_FEEDS[name], state)
+            result.update(self.ingest(items or [], market=True))
+        elif kind == 'finnhub':
+            items, headers = self._fetch_finnhub_general(state)
+            result.update(self.ingest(items, market=True))
+        else:
+            items, headers = self._fetch_rss(SYMBOL_FEED_URL.format(symbol=name), state, symbol=name)
+            result.update(self.ingest(items or []))
+            if self.finnhub_api_key:
+                result.update(self.ingest(self._fetch_finnhub_company(name)))
+
+        high_water = max([state.get('high_water') or 0.0] + [item['published_ts'] for item in items or []])
+        if feed == 'finnhub:general' and items:
+            high_water = max(item['finnhub_id'] for item in items)
+        with self._db_lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO feed_state (feed, etag, last_modified, high_water, last_polled)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(feed) DO UPDATE SET
+                    etag = COALESCE(excluded.etag, feed_state.etag),
+                    last_modified = COALESCE(excluded.last_modified, feed_state.last_modified),
+                    high_water = excluded.high_water,
+                    last_polled = excluded.last_polled
+            """, (feed, headers.get('etag'), headers.get('last_modified'), high_water, time.time()))
+        return dict(result)
+
+    def _feed_state(self, feed: str) -> Optional[Dict]:
+        with self._db_lock:
+            row = self._conn.execute("SELECT * FROM feed_state WHERE feed = ? AND last_polled IS NOT NULL",
+                                     (feed,)).fetchone()
+        return dict(row) if row else None
+
+    def _fetch_rss(self, url: str, state: Dict, symbol: Optional[str] = None) -> Tuple[Optional[List[Dict]], Dict]:
+        """
+        New items of an RSS feed (conditional GET; items at or before the
+        feed's high-water mark are skipped)
+
+        Returns:
+            (items, or None if the feed is unchanged; {'etag', 'last_modified'})
+        """
+        headers = {'User-Agent': 'Mozilla/5.0 (momentum-trader-ai news poller)'}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+
+        get_rate_limiter('yahoo').acquire()
+        response = requests.get(url, headers=headers, timeout=10)
+        validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+        if response.status_code == 304:
+            self.stats['not_modified'] += 1
+            return None, validators
+        response.raise_for_status()
+
+        high_water = state.get('high_water') or 0.0
+        channel = ET.fromstring(response.content).find('channel')
+        source = channel.findtext('title', '') if channel is not None else ''
+        items = []
+        for node in (channel.iter('item') if channel is not None else ()):
+            published = node.findtext('pubDate')
+            try:
+                published_ts = parsedate_to_datetime(published).timestamp() if published else time.time()
+            except (TypeError, ValueError):
+                published_ts = time.time()
+            if published_ts <= high_water:
+                continue
+            items.append({
+                'title': node.findtext('title', ''),
+                'url': node.findtext('link', '') or node.findtext('guid', ''),
+                'summary': re.sub(r'<[^>]+>', '', node.findtext('description', '') or ''),
+                'source': source,
+                'published_ts': published_ts,
+                'symbols': [symbol] if symbol else []
+            })
+        return items, validators
+
+    def _fetch_finnhub_general(self, state: Dict) -> Tuple[List[Dict], Dict]:
+        """General news newer than the last seen Finnhub id"""
+        params = {'category': 'general', 'minId': int(state.get('high_water') or 0)}
+        items = [dict(self._finnhub_item(item), finnhub_id=item.get('id', 0))
+                 for item in self._finnhub_get('news', params)]
+        return items, {}
+
+    def _fetch_finnhub_company(self, symbol: str) -> List[Dict]:
+        today = datetime.now().date()
+        news = self._finnhub_get('company-news', {'symbol': symbol, 'from': today.isoformat(),
+                                                  'to': today.isoformat()})
+        return [self._finnhub_item(item, symbol) for item in news]
+
+    def _finnhub_get(self, endpoint: str, params: Dict) -> List[Dict]:
+        get_rate_limiter('finnhub').acquire()
+        response = requests.get(f"{FINNHUB_URL}/{endpoint}", params={**params, 'token': self.finnhub_api_key},
+                                timeout=10)
+        response.raise_for_status()
+        return response.json() or []
+
+    @staticmethod
+    def _finnhub_item(item: Dict, symbol: Optional[str] = None) -> Dict:
+        related = [s for s in (item.get('related') or '').split(',') if s]
+        return {
+            'title': item.get('headline', ''),
+            'url': item.get('url', ''),
+            'summary': item.get('summary', ''),
+            'source': item.get('source', 'Finnhub'),
+            'published_ts': float(item.get('datetime') or time.time()),
+            'symbols': related + ([symbol] if symbol else [])
+        }
+
+    def prune(self) -> int:
+        """Delete articles past retention and expire old dedup and trend state"""
+        now = time.time()
+        with self._db_lock, self._conn:
+            cutoff = now - self.retention_days * 86400
+            self._conn.execute("DELETE FROM article_symbols WHERE article_id IN "
+                               "(SELECT id FROM articles WHERE published_ts < ?)", (cutoff,))
+            deleted = self._conn.execute("DELETE FROM articles WHERE published_ts < ?", (cutoff,)).rowcount
+            self._dedup.expire(now)
+            oldest_hour = int(now // 3600) - self.TREND_HOURS
+            for hour in [h for h in self._counts if h < oldest_hour]:
+                self._counts.pop(hour, None)
+                self._sentiment_sums.pop(hour, None)
+        self.stats['pruned'] += deleted
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the background poller"""
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name='news-poller', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background poller"""
+        self._running.clear()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while self._running.is_set():
+            started = time.monotonic()
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"❌ News poll failed: {e}")
+            # Sleep in short steps so stop() returns quickly
+            while self._running.is_set() and time.monotonic() - started < self.poll_interval:
+                time.sleep(1.0)
+
+    def get_stats(self) -> Dict:
+        """Ingestion counters and store size"""
+        with self._db_lock:
+            articles = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        return {
+            **self.stats,
+            'articles': articles,
+            'tracked_symbols': len(self._tracked),
+            'dedup_index': len(self._dedup),
+            'last_poll': self.executor.last_scan
+        }
+
+    def close(self):
+        """Stop polling and close the store"""
+        self.stop()
+        self.executor.shutdown()
+        with self._db_lock:
+            self._conn.close()
@@ -0,0 +1,9 @@
+"""
+Shared infrastructure utilities
+"""
+from .ttl_cache import TTLCache
+from .rate_limiter import RateLimiter, get_rate_limiter, configure_rate_limit
+from .watchlist_executor import WatchlistExecutor
+from .task_graph import TaskGraph
+
+__all__ = ['TTLCache', 'RateLimiter', 'get_rate_limiter', 'configure_rate_limit', 'WatchlistExecutor', 'TaskGraph']
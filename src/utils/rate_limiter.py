@@ -0,0 +1,113 @@
+"""
+Token-bucket rate limiters shared per external platform
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+
+# Requests per second and burst size for each platform we call.
+# These are process-wide: every scan, worker and module draws from the same bucket.
+PLATFORM_RATE_LIMITS = {
+    'reddit': {'rate': 1.0, 'burst': 6},          # ~60 requests/minute unauthenticated
+    'stocktwits': {'rate': 200 / 3600, 'burst': 10},  # 200 requests/hour
+    'twitter': {'rate': 450 / 900, 'burst': 5},   # 450 requests/15 minutes (app auth)
+    'youtube': {'rate': 1.0, 'burst': 5},
+    'yahoo': {'rate': 5.0, 'burst': 10},
+    'finnhub': {'rate': 1.0, 'burst': 30},        # 60 calls/minute on the free tier
+    'firebase': {'rate': 50.0, 'burst': 50},
+    'telegram': {'rate': 25.0, 'burst': 25},      # Bot API allows ~30 messages/second
+    'webhook': {'rate': 20.0, 'burst': 20},
+}
+
+DEFAULT_RATE_LIMIT = {'rate': 2.0, 'burst': 5}
+
+
+class RateLimiter:
+    """Thread-safe token bucket"""
+
+    def __init__(self, name: str, rate: float, burst: int):
+        """
+        Args:
+            name: Limiter name (usually the platform)
+            rate: Tokens added per second
+            burst: Maximum tokens that can accumulate
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats = {'acquired': 0, 'waited_seconds': 0.0}
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until tokens are available
+
+        Args:
+            tokens: Number of tokens to take
+            timeout: Give up after this many seconds (None waits forever)
+
+        Returns:
+            True if the tokens were taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.stats['acquired'] += tokens
+                    self.stats['waited_seconds'] += waited
+                    return True
+
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None and now + wait > deadline:
+                return False
+
+            time.sleep(wait)
+            waited += wait
+
+    def get_stats(self) -> Dict:
+        """Limiter configuration and counters"""
+        with self._lock:
+            return dict(self.stats, name=self.name, rate=self.rate, burst=self.burst,
+                        waited_seconds=round(self.stats['waited_seconds'], 3))
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(platform: str) -> RateLimiter:
+    """Return the process-wide limiter for a platform"""
+    with _registry_lock:
+        limiter = _limiters.get(platform)
+        if limiter is None:
+            limits = PLATFORM_RATE_LIMITS.get(platform, DEFAULT_RATE_LIMIT)
+            limiter = RateLimiter(platform, limits['rate'], limits['burst'])
+            _limiters[platform] = limiter
+        return limiter
+
+
+def configure_rate_limit(platform: str, rate: float, burst: int) -> RateLimiter:
+    """Override the limits for a platform (e.g. a paid API tier)"""
+    with _registry_lock:
+        PLATFORM_RATE_LIMITS[platform] = {'rate': rate, 'burst': burst}
+        limiter = RateLimiter(platform, rate, burst)
+        _limiters[platform] = limiter
+        return limiter
+
+
+def all_rate_limiter_stats() -> Dict[str, Dict]:
+    """Stats for every limiter created so far"""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.get_stats() for limiter in limiters}
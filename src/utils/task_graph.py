@@ -0,0 +1,252 @@
+"""
+Deadline-bounded DAG of tasks with memoized stage results
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from .ttl_cache import TTLCache
+
+_MISSING = object()
+
+STATUS_OK = 'ok'
+STATUS_ERROR = 'error'
+STATUS_TIMEOUT = 'timeout'
+STATUS_SKIPPED = 'skipped'
+
+
+class _Stage:
+    """A named task and the stages whose results it consumes"""
+
+    __slots__ = ('name', 'func', 'deps', 'timeout', 'allow_partial', 'cache')
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Sequence[str],
+                 timeout: Optional[float], allow_partial: bool, cache: Optional[TTLCache]):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.allow_partial = allow_partial
+        self.cache = cache
+
+
+class TaskGraph:
+    """
+    Runs a DAG of stages on a shared thread pool under a global deadline.
+
+    - Stages with no unmet dependencies start immediately and concurrently;
+      a dependent stage is submitted the moment its last input finishes
+    - Each stage receives one dict: the run's context plus its dependencies'
+      results keyed by stage name (None for a failed optional input)
+    - At the deadline (or a stage's own timeout) unfinished stages are
+      reported as 'timeout' and their dependents as 'skipped'; the request
+      returns without waiting for them
+    - Stages with ttl_seconds are memoized per cache key (single-flight via
+      TTLCache). A stage that finishes after its request gave up still fills
+      the cache, so the next request gets it for free
+    """
+
+    def __init__(self, name: str = 'task-graph', max_workers: int = 16):
+        """
+        Args:
+            name: Thread name prefix and stats name
+            max_workers: Pool size shared by all runs (stages that overrun a
+                         deadline keep their thread until they return)
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._stages: Dict[str, _Stage] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {'runs': 0, 'stages': {}}
+
+    def add(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Sequence[str] = (),
+            ttl_seconds: Optional[float] = None, timeout: Optional[float] = None,
+            allow_partial: bool = False, max_entries: int = 500) -> 'TaskGraph':
+        """
+        Add a stage (dependencies must already be added, which keeps the graph acyclic)
+
+        Args:
+            name: Stage name
+            func: Called with {**context, dep_name: dep_result, ...}
+            deps: Stages whose results this stage needs
+            ttl_seconds: Memoize results for this long (None = always run)
+            timeout: Per-stage time limit in seconds (the run deadline still applies)
+            allow_partial: Run even if some dependencies failed (their inputs are None)
+            max_entries: Memoized results kept for this stage
+
+        Returns:
+            self, for chaining
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage already defined: {name}")
+        unknown = [dep for dep in deps if dep not in self._stages]
+        if unknown:
+            raise ValueError(f"Stage {name} depends on unknown stages: {', '.join(unknown)}")
+
+        cache = TTLCache(f"{self.name}.{name}", max_entries=max_entries, ttl_seconds=ttl_seconds,
+                         refresh_ahead=1.0) if ttl_seconds else None
+        self._stages[name] = _Stage(name, func, deps, timeout, allow_partial, cache)
+        self.stats['stages'][name] = {'ok': 0, 'error': 0, 'timeout': 0, 'skipped': 0,
+                                      'cached': 0, 'total_ms': 0.0}
+        return self
+
+    @property
+    def stage_names(self) -> List[str]:
+        """Stages in definition order"""
+        return list(self._stages)
+
+    def run(self, context: Dict[str, Any], deadline_seconds: float, cache_key: Hashable = None,
+            stages: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Run the graph
+
+        Args:
+            context: Inputs passed to every stage
+            deadline_seconds: Time budget for the whole run
+            cache_key: Memoization key (default: sorted context items)
+            stages: Subset of stages to run (dependencies outside it count as
+                    unavailable: allow_partial stages get None, others are skipped)
+
+        Returns:
+            {stage: {'status', 'value', 'error', 'cached', 'started_ms', 'elapsed_ms'}}
+            in stage definition order
+        """
+        started = time.monotonic()
+        deadline = started + deadline_seconds
+        key = cache_key if cache_key is not None else tuple(sorted(context.items()))
+        unknown = [name for name in stages or () if name not in self._stages]
+        if unknown:
+            raise ValueError(f"Unknown stages: {', '.join(unknown)}")
+        pending = [name for name in self._stages if stages is None or name in stages]
+        selected = set(pending)
+
+        results: Dict[str, Dict] = {}
+        running: Dict[Future, tuple] = {}
+
+        while True:
+            self._submit_ready(pending, selected, results, running, context, key, started, deadline)
+            if not running:
+                break
+
+            now = time.monotonic()
+            limit = min(stage_deadline for _, _, stage_deadline in running.values())
+            done, _ = wait(list(running), timeout=max(0.0, limit - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage, stage_started, _ = running.pop(future)
+                elapsed = time.monotonic() - stage_started
+                try:
+                    value, cached = future.result()
+                    results[stage.name] = self._result(STATUS_OK, value, None, cached, started,
+                                                       stage_started, elapsed)
+                except Exception as e:
+                    results[stage.name] = self._result(STATUS_ERROR, None, str(e), False, started,
+                                                       stage_started, elapsed)
+
+            now = time.monotonic()
+            for future, (stage, stage_started, stage_deadline) in list(running.items()):
+                if now >= stage_deadline:
+                    running.pop(future)
+                    reason = 'deadline' if stage_deadline >= deadline else 'stage timeout'
+                    results[stage.name] = self._result(STATUS_TIMEOUT, None, f"Exceeded {reason}", False,
+                                                       started, stage_started, now - stage_started)
+
+        # Whatever is left could not start (deadline passed or inputs missing)
+        for name in pending:
+            results[name] = self._result(STATUS_SKIPPED, None, 'Inputs unavailable', False, started, None, 0.0)
+
+        self._record(results)
+        return {name: results[name] for name in self._stages if name in results}
+
+    def get_stats(self) -> Dict:
+        """Per-stage outcome counts, mean latency and memo cache stats"""
+        with self._lock:
+            stages = {}
+            for name, counts in self.stats['stages'].items():
+                executed = counts['ok'] + counts['error'] + counts['timeout']
+                stages[name] = {
+                    **{k: v for k, v in counts.items() if k != 'total_ms'},
+                    'mean_ms': round(counts['total_ms'] / executed, 2) if executed else 0.0,
+                    'cache': self._stages[name].cache.get_stats() if self._stages[name].cache else None
+                }
+            return {'name': self.name, 'runs': self.stats['runs'], 'max_workers': self.max_workers,
+                    'stages': stages}
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _submit_ready(self, pending: List[str], selected: set, results: Dict[str, Dict],
+                      running: Dict[Future, tuple],
+                      context: Dict[str, Any], key: Hashable, started: float, deadline: float):
+        """Start every pending stage whose dependencies have all finished"""
+        progressed = True
+        while progressed:
+            progressed = False
+            for name in list(pending):
+                stage = self._stages[name]
+                if not all(dep in results or dep not in selected for dep in stage.deps):
+                    continue
+                pending.remove(name)
+                progressed = True
+
+                failed = [dep for dep in stage.deps
+                          if dep not in results or results[dep]['status'] != STATUS_OK]
+                now = time.monotonic()
+                if now >= deadline or (failed and not stage.allow_partial):
+                    error = 'Deadline passed before start' if now >= deadline else f"Missing inputs: {', '.join(failed)}"
+                    results[name] = self._result(STATUS_SKIPPED, None, error, False, started, None, 0.0)
+                    continue
+
+                inputs = dict(context)
+                for dep in stage.deps:
+                    inputs[dep] = results[dep]['value'] if dep in results else None
+                stage_deadline = deadline if stage.timeout is None else min(deadline, now + stage.timeout)
+                future = self._get_pool().submit(self._execute, stage, inputs, key)
+                running[future] = (stage, now, stage_deadline)
+
+    @staticmethod
+    def _execute(stage: _Stage, inputs: Dict[str, Any], key: Hashable):
+        """Run a stage through its memo cache (runs on a pool thread)"""
+        if stage.cache is None:
+            return stage.func(inputs), False
+        cached = stage.cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached, True
+        return stage.cache.get_or_load(key, lambda: stage.func(inputs)), False
+
+    @staticmethod
+    def _result(status: str, value: Any, error: Optional[str], cached: bool, run_started: float,
+                stage_started: Optional[float], elapsed: float) -> Dict:
+        return {
+            'status': status,
+            'value': value,
+            'error': error,
+            'cached': cached,
+            'started_ms': round((stage_started - run_started) * 1000, 1) if stage_started else None,
+            'elapsed_ms': round(elapsed * 1000, 1)
+        }
+
+    def _record(self, results: Dict[str, Dict]):
+        with self._lock:
+            self.stats['runs'] += 1
+            for name, result in results.items():
+                counts = self.stats['stages'][name]
+                counts[result['status']] += 1
+                counts['cached'] += int(result['cached'])
+                counts['total_ms'] += result['elapsed_ms']
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            return self._pool
@@ -0,0 +1,278 @@
+"""
+Bounded LRU + TTL cache with single-flight loading and refresh-ahead
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Entry:
+    """Cached value with bookkeeping"""
+
+    __slots__ = ('value', 'created', 'size', 'hits', 'loader', 'refreshing')
+
+    def __init__(self, value: Any, size: int, loader: Optional[Callable[[], Any]]):
+        self.value = value
+        self.created = time.monotonic()
+        self.size = size
+        self.hits = 0
+        self.loader = loader
+        self.refreshing = False
+
+
+class _Flight:
+    """A load in progress that other callers can wait on"""
+
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Thread-safe cache bounded by entry count and approximate memory.
+
+    - Entries expire after ttl_seconds (monotonic clock, so no wrap-around)
+    - Least recently used entries are evicted when either bound is exceeded
+    - Concurrent misses for the same key share a single loader call
+    - Hot entries are reloaded in the background before they expire
+    """
+
+    def __init__(self,
+                 name: str,
+                 max_entries: int = 1000,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: float = 3600,
+                 refresh_ahead: float = 0.8,
+                 hot_hits: int = 3,
+                 refresh_workers: int = 2,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        """
+        Args:
+            name: Name reported in stats
+            max_entries: Maximum number of entries
+            max_bytes: Approximate memory bound for all values
+            ttl_seconds: Entry lifetime
+            refresh_ahead: Fraction of the TTL after which hot entries are refreshed
+            hot_hits: Hits an entry needs before it is refreshed ahead of expiry
+            refresh_workers: Background threads used for refresh-ahead
+            sizeof: Function estimating the size of a value in bytes
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead = refresh_ahead
+        self.hot_hits = hot_hits
+        self.refresh_workers = refresh_workers
+        self.sizeof = sizeof or self._json_size
+
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'loads': 0,
+            'load_errors': 0,
+            'refreshes': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value or default"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+            self.stats['hits'] += 1
+            entry.hits += 1
+            self._maybe_refresh(key, entry)
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, loader: Optional[Callable[[], Any]] = None):
+        """Store a value, evicting old entries if bounds are exceeded"""
+        size = self.sizeof(value)
+        with self._lock:
+            self._store(key, value, size, loader)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value, or call loader once no matter how many
+        threads miss on the same key at the same time
+
+        Args:
+            key: Cache key
+            loader: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.stats['hits'] += 1
+                entry.hits += 1
+                self._maybe_refresh(key, entry)
+                return entry.value
+
+            self.stats['misses'] += 1
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._inflight[key] = flight
+                leader = True
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        return self._load(key, loader, flight)
+
+    def invalidate(self, key: Hashable):
+        """Drop one entry"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        """Counters and current size for the metrics endpoint"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(
+                self.stats,
+                name=self.name,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                ttl_seconds=self.ttl_seconds,
+                inflight=len(self._inflight),
+                hit_rate=round(self.stats['hits'] / lookups, 4) if lookups else 0.0
+            )
+
+    # ------------------------------------------------------------------
+    # Internals (callers hold self._lock unless noted)
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created >= self.ttl_seconds:
+            self._entries.pop(key)
+            self._bytes -= entry.size
+            self.stats['expirations'] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: Hashable, value: Any, size: int, loader: Optional[Callable[[], Any]]):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+
+        if size > self.max_bytes:
+            # Never cache a single value larger than the whole budget
+            return
+
+        entry = _Entry(value, size, loader)
+        if old is not None:
+            entry.hits = old.hits
+        self._entries[key] = entry
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats['evictions'] += 1
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], flight: _Flight) -> Any:
+        """Run loader as the single-flight leader (called without the lock)"""
+        try:
+            value = loader()
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self.stats['load_errors'] += 1
+                self._inflight.pop(key, None)
+            flight.event.set()
+            raise
+
+        size = self.sizeof(value)
+        flight.value = value
+        with self._lock:
+            self.stats['loads'] += 1
+            self._store(key, value, size, loader)
+            self._inflight.pop(key, None)
+        flight.event.set()
+        return value
+
+    def _maybe_refresh(self, key: Hashable, entry: _Entry):
+        if (entry.loader is None or entry.refreshing or entry.hits < self.hot_hits or
+                time.monotonic() - entry.created < self.ttl_seconds * self.refresh_ahead or
+                key in self._inflight):
+            return
+
+        entry.refreshing = True
+        flight = _Flight()
+        self._inflight[key] = flight
+        if self._refresher is None:
+            self._refresher = ThreadPoolExecutor(max_workers=self.refresh_workers,
+                                                 thread_name_prefix=f"{self.name}-refresh")
+        self._refresher.submit(self._refresh, key, entry.loader, flight)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], flight: _Flight):
+        """Background reload of a hot entry (called without the lock)"""
+        try:
+            self._load(key, loader, flight)
+            with self._lock:
+                self.stats['refreshes'] += 1
+        except Exception as e:
+            print(f"   ⚠️  Background refresh of {self.name}[{key}] failed: {e}")
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+
+    @staticmethod
+    def _json_size(value: Any) -> int:
+        try:
+            return len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return 1024
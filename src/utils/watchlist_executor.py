@@ -0,0 +1,119 @@
+"""
+Bounded worker pool for scanning watchlists
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+ProgressCallback = Callable[[int, int, str, Optional[Exception]], None]
+
+
+class WatchlistExecutor:
+    """
+    Runs a per-symbol function across a watchlist with a bounded number of workers.
+
+    Pacing is left to the platform rate limiters (see rate_limiter.py) that the
+    analyzers acquire before each request, so workers only ever wait on the
+    quota they actually need instead of fixed sleeps between symbols.
+    Results are yielded in completion order.
+    """
+
+    def __init__(self, max_workers: int = 8, name: str = 'watchlist'):
+        """
+        Args:
+            max_workers: Maximum symbols processed at once
+            name: Thread name prefix
+        """
+        self.max_workers = max_workers
+        self.name = name
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.last_scan: Dict = {}
+
+    def iter_results(self, symbols: List[str], func: Callable[[str], Any],
+                     on_progress: Optional[ProgressCallback] = None) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+        """
+        Run func for every symbol and yield results as they complete
+
+        Args:
+            symbols: Symbols to process (duplicates are processed once)
+            func: Function called with each symbol
+            on_progress: Called as on_progress(completed, total, symbol, error)
+
+        Yields:
+            (symbol, result, error) tuples - result is None when error is set
+        """
+        unique = list(dict.fromkeys(symbols))
+        total = len(unique)
+        started = time.monotonic()
+        errors = 0
+        latencies = []
+
+        futures = {self._get_pool().submit(self._timed, func, symbol): symbol for symbol in unique}
+
+        for completed, future in enumerate(as_completed(futures), 1):
+            symbol = futures[future]
+            try:
+                result, elapsed = future.result()
+                latencies.append(elapsed)
+                error = None
+            except Exception as e:
+                result, error = None, e
+                errors += 1
+
+            if on_progress:
+                on_progress(completed, total, symbol, error)
+
+            yield symbol, result, error
+
+        self.last_scan = {
+            'symbols': total,
+            'errors': errors,
+            'elapsed_seconds': round(time.monotonic() - started, 3),
+            'sum_latency_seconds': round(sum(latencies), 3),
+            'max_workers': self.max_workers
+        }
+
+    def run(self, symbols: List[str], func: Callable[[str], Any],
+            on_progress: Optional[ProgressCallback] = None) -> List[Any]:
+        """
+        Run func for every symbol and collect the successful results
+
+        Returns:
+            Results in completion order (failed symbols are reported and skipped)
+        """
+        results = []
+        for symbol, result, error in self.iter_results(symbols, func, on_progress):
+            if error is not None:
+                print(f"   ❌ Error analyzing {symbol}: {error}")
+            else:
+                results.append(result)
+        return results
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    @staticmethod
+    def print_progress(completed: int, total: int, symbol: str, error: Optional[Exception]):
+        """Default progress reporter"""
+        status = '❌' if error is not None else '✅'
+        print(f"[{completed}/{total}] {status} ${symbol}")
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix=self.name)
+            return self._pool
+
+    @staticmethod
+    def _timed(func: Callable[[str], Any], symbol: str) -> Tuple[Any, float]:
+        start = time.monotonic()
+        result = func(symbol)
+        return result, time.monotonic() - start
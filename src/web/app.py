@@ -1,10 +1,12 @@
 """
 Flask web application for Momentum Trader AI
 """
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, send_from_directory
 from flask_cors import CORS
 import os
 import json
+import hashlib
+import numpy as np
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -18,13 +20,14 @@ from data import MarketDataFetcher, CurrencyConverter
 from analysis import RossCameronAnalyzer
 from backtesting import Backtester
 from database import TradeDatabase
-from alerts import AlertManager
+from alerts import AlertManager, AlertJournal
 from news import NewsAggregator
 from calculator import PositionCalculator
 from analysis.sector_research import SectorResearch
 from analysis.comprehensive_analyzer import ComprehensiveAnalyzer
 from analysis.quantitative_analysis import QuantitativeAnalyzer
 from analysis.social_intelligence import SocialIntelligence
+from src.utils.rate_limiter import all_rate_limiter_stats
 
 # Import enhanced agents and premium data
 sys.path.insert(0, os.path.join(src_path, 'agents'))
@@ -40,21 +43,45 @@ app = Flask(__name__,
             static_folder='../../static')
 CORS(app)
 
+
+def _compute_asset_version(static_dir: str) -> str:
+    """Short content hash of the static files, used to bust browser and service-worker caches"""
+    digest = hashlib.sha1()
+    for root, dirs, files in os.walk(static_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, static_dir).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+ASSET_VERSION = _compute_asset_version(app.static_folder)
+
+
+@app.context_processor
+def inject_asset_version():
+    return {'asset_version': ASSET_VERSION}
+
 # Initialize components
 market_data = MarketDataFetcher()
 currency_converter = CurrencyConverter()
 setup_analyzer = RossCameronAnalyzer()
 trade_db = TradeDatabase('../../trades.db')
 alert_manager = AlertManager(check_interval=60)
+alert_journal = AlertJournal()
+alert_manager.add_listener(lambda alert, event: alert_journal.append(event))
 news_aggregator = NewsAggregator()
 position_calculator = None  # Will be initialized with account size
-sector_research = SectorResearch()
+sector_research = SectorResearch(market_data=market_data)
+sector_research.start()  # Research endpoints read the snapshots it materializes
 
 # Initialize premium data collector
 premium_data_collector = PremiumDataCollector()
 
 # Initialize quantitative analyzer
-quantitative_analyzer = QuantitativeAnalyzer(risk_free_rate=0.045)
+quantitative_analyzer = QuantitativeAnalyzer(risk_free_rate=0.045, market_data=market_data)
 
 # Initialize social intelligence module
 social_intelligence = None
@@ -107,6 +134,21 @@ def index():
     return render_template('index.html', agents=list(agents.keys()))
 
 
+@app.route('/sw.js')
+def service_worker():
+    """Service worker, served from the root so its scope covers pages and /api"""
+    response = send_from_directory(app.static_folder, 'sw.js', max_age=0)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Service-Worker-Allowed'] = '/'
+    return response
+
+
+@app.route('/manifest.json')
+def manifest():
+    """PWA manifest"""
+    return send_from_directory(app.static_folder, 'manifest.json', mimetype='application/manifest+json')
+
+
 @app.route('/features')
 def features():
     """Features showcase page"""
@@ -290,6 +332,35 @@ def get_available_agents():
     })
 
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Runtime metrics for caches and background engines"""
+
+    metrics = {}
+
+    if social_intelligence:
+        metrics['social_intelligence_cache'] = social_intelligence.cache.get_stats()
+        metrics['mention_velocity'] = social_intelligence.mention_velocity.get_stats()
+        metrics['social_scan'] = social_intelligence.executor.last_scan
+        metrics['influencer_index'] = social_intelligence.influencer_index.get_stats()
+
+    metrics['alert_manager'] = alert_manager.get_stats()
+    metrics['alert_journal'] = alert_journal.get_stats()
+    if market_data.lake:
+        metrics['data_lake'] = market_data.lake.get_stats()
+    metrics['returns_service'] = quantitative_analyzer.returns_service.get_stats()
+    metrics['comprehensive_analysis'] = comprehensive_analyzer.get_stats()
+    metrics['sector_research'] = sector_research.get_stats()
+    metrics['news'] = news_aggregator.get_stats()
+    metrics['rate_limits'] = all_rate_limiter_stats()
+
+    return jsonify({
+        'success': True,
+        'metrics': metrics,
+        'timestamp': datetime.now().isoformat()
+    })
+
+
 @app.route('/api/exchange-rate', methods=['GET'])
 def get_exchange_rate():
     """Get current USD/ILS exchange rate"""
@@ -327,7 +398,13 @@ def run_backtest():
 @app.route('/api/trades', methods=['GET'])
 def get_trades():
     """Get trades"""
-    trades = trade_db.get_all_trades(limit=int(request.args.get('limit', 100)))
+    trades = trade_db.get_all_trades(
+        limit=int(request.args.get('limit', 100)),
+        offset=int(request.args.get('offset', 0)),
+        symbol=request.args.get('symbol'),
+        setup_type=request.args.get('setup_type'),
+        status=request.args.get('status')
+    )
     return jsonify({'success': True, 'trades': trades})
 
 
@@ -350,7 +427,11 @@ def close_trade(trade_id):
 @app.route('/api/trades/stats', methods=['GET'])
 def get_trade_stats():
     """Get stats"""
-    stats = trade_db.get_trade_stats()
+    stats = trade_db.get_trade_stats(
+        setup_type=request.args.get('setup_type'),
+        since=request.args.get('since'),
+        until=request.args.get('until')
+    )
     return jsonify({'success': True, 'stats': stats})
 
 
@@ -371,6 +452,22 @@ def create_alert():
     return jsonify({'success': True, 'alert_id': alert.id, 'alert': {'id': alert.id, 'message': alert.message}})
 
 
+@app.route('/api/alerts/history', methods=['GET'])
+def get_alert_history():
+    """
+    Query triggered alerts
+    Example: GET /api/alerts/history?symbol=TSLA&type=price_above&since=2024-01-01&limit=50
+    """
+    alerts = alert_journal.query(
+        symbol=request.args.get('symbol'),
+        alert_type=request.args.get('type'),
+        since=request.args.get('since'),
+        until=request.args.get('until'),
+        limit=request.args.get('limit', 100, type=int)
+    )
+    return jsonify({'success': True, 'alerts': alerts, 'count': len(alerts)})
+
+
 @app.route('/api/alerts/<int:alert_id>', methods=['DELETE'])
 def delete_alert(alert_id):
     """Delete alert"""
@@ -431,6 +528,78 @@ def calculate_position():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 
+@app.route('/api/calculator/batch', methods=['POST'])
+def calculate_positions_batch():
+    """
+    Size many setups at once
+
+    Body: {
+        "account_size": 10000, "risk_percent": 2.0, "max_position_percent": 100,
+        "setups": [{"symbol", "entry_point" or "entry_price", "stop_loss", "targets"}, ...],
+        "risk_percents": [0.5, 1, 2], "account_sizes": [5000, 10000],       (optional scenario grid)
+        "portfolio": {"max_risk_percent": 6, "max_exposure_percent": 100,
+                      "use_correlation": true}                             (optional portfolio sizing)
+    }
+    """
+    try:
+        data = request.get_json() or {}
+        setups = data.get('setups') or []
+        if not setups:
+            return jsonify({'success': False, 'error': 'No setups provided'}), 400
+        if len(setups) > 5000:
+            return jsonify({'success': False, 'error': 'At most 5000 setups per request'}), 400
+
+        calc = PositionCalculator(float(data.get('account_size', 10000)),
+                                  float(data.get('max_position_percent', 100.0)))
+        risk_percent = float(data.get('risk_percent', 2.0))
+        symbols, entries, stops, targets = calc.from_setups(setups)
+
+        sized = calc.size_batch(entries, stops, targets, risk_percent)
+        positions = [dict(position.to_dict(), symbol=symbol)
+                     for symbol, position in zip(symbols, calc.positions(sized))]
+        result = {'success': True, 'positions': positions}
+
+        if data.get('risk_percents') or data.get('account_sizes'):
+            grid = calc.scenario_grid(entries, stops, data.get('risk_percents') or [risk_percent],
+                                      data.get('account_sizes'))
+            result['scenarios'] = {
+                'account_sizes': grid['account_sizes'].tolist(),
+                'risk_percents': grid['risk_percents'].tolist(),
+                'shares': grid['shares'].tolist(),
+                'totals': {key: np.round(values, 2).tolist() for key, values in grid['totals'].items()}
+            }
+
+        portfolio = data.get('portfolio')
+        if portfolio is not None:
+            correlation = None
+            if portfolio.get('use_correlation', True) and all(symbols):
+                # Unknown pairs stay NaN, which the calculator treats as perfectly correlated
+                available, corr = quantitative_analyzer.returns_service.correlation(symbols)
+                correlation = np.full((len(symbols), len(symbols)), np.nan)
+                index = [symbols.index(s) for s in available]
+                correlation[np.ix_(index, index)] = corr
+            allocation = calc.allocate_portfolio(
+                entries, stops, correlation, risk_percent,
+                float(portfolio.get('max_risk_percent', 6.0)),
+                float(portfolio.get('max_exposure_percent', 100.0)))
+            result['portfolio'] = {
+                **allocation['portfolio'],
+                'correlation_used': correlation is not None,
+                'positions': [{
+                    'symbol': symbol,
+                    'shares': int(allocation['shares'][i]),
+                    'standalone_shares': int(allocation['standalone_shares'][i]),
+                    'total_cost': round(float(allocation['total_cost'][i]), 2),
+                    'risk_amount': round(float(allocation['risk_amount'][i]), 2),
+                    'risk_contribution': round(float(allocation['risk_contribution'][i]), 2)
+                } for i, symbol in enumerate(symbols)]
+            }
+
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
 # ========== NEW: Market Research API ==========
 
 @app.route('/market-research')
@@ -472,6 +641,9 @@ def get_sector_stocks(sector):
         stocks = sector_research.get_sector_top_stocks(sector, top_n=top_n)
 
         if not stocks:
+            if sector_research.is_pending(sector):
+                # First request for the sector - its snapshot is being built in the background
+                return jsonify({'sector': sector, 'stocks': [], 'pending': True}), 202
             return jsonify({'error': f'Sector {sector} not found'}), 404
 
         return jsonify({'sector': sector, 'stocks': stocks})
@@ -499,8 +671,18 @@ def comprehensive_stock_analysis(symbol):
         if analysis_type not in ['long-term', 'day-trading']:
             return jsonify({'error': 'Invalid analysis type. Use long-term or day-trading'}), 400
 
+        # Sources run concurrently; the slowest ones are cut off at the deadline
+        deadline = request.args.get('deadline', comprehensive_analyzer.deadline_seconds)
+        try:
+            deadline = float(deadline)
+        except ValueError:
+            return jsonify({'error': 'deadline must be a number of seconds'}), 400
+        # Also rejects nan/inf
+        if not 0 < deadline <= 60:
+            return jsonify({'error': 'deadline must be between 0 and 60 seconds'}), 400
+
         # Run comprehensive analysis
-        analysis = comprehensive_analyzer.get_comprehensive_analysis(symbol, analysis_type)
+        analysis = comprehensive_analyzer.get_comprehensive_analysis(symbol, analysis_type, deadline)
 
         return jsonify(analysis)
     except Exception as e:
@@ -514,8 +696,16 @@ def monte_carlo_analysis(symbol):
         symbol = symbol.upper()
         days = int(request.args.get('days', 252))  # Default: 1 year
         simulations = int(request.args.get('simulations', 10000))
-
-        result = quantitative_analyzer.monte_carlo_simulation(symbol, days, simulations)
+        method = request.args.get('method', 'gbm')  # gbm or bootstrap
+        seed = request.args.get('seed', type=int)
+        antithetic = request.args.get('antithetic', 'false').lower() == 'true'
+        moment_matching = request.args.get('moment_matching', 'false').lower() == 'true'
+        block_size = int(request.args.get('block_size', 1))
+
+        result = quantitative_analyzer.monte_carlo_simulation(
+            symbol, days, simulations, method=method, seed=seed, antithetic=antithetic,
+            moment_matching=moment_matching, block_size=block_size
+        )
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -528,7 +718,32 @@ def risk_metrics_analysis(symbol):
         symbol = symbol.upper()
         period = request.args.get('period', '1y')
 
-        result = quantitative_analyzer.calculate_risk_metrics(symbol, period)
+        benchmark = request.args.get('benchmark', 'SPY')
+
+        result = quantitative_analyzer.calculate_risk_metrics(symbol, period, benchmark)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/quant/risk-metrics', methods=['POST'])
+def batch_risk_metrics():
+    """Risk metrics for a whole watchlist in one call"""
+    try:
+        data = request.get_json()
+        symbols = data.get('symbols', [])
+
+        if not symbols:
+            return jsonify({'error': 'symbols required'}), 400
+        if len(symbols) > 2000:
+            return jsonify({'error': 'Too many symbols (max 2,000)'}), 400
+
+        result = quantitative_analyzer.calculate_risk_metrics_batch(
+            symbols,
+            period=data.get('period', '1y'),
+            benchmark=data.get('benchmark', 'SPY'),
+            confidence=float(data.get('confidence', 0.95))
+        )
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -544,7 +759,12 @@ def portfolio_optimization():
         if not symbols or len(symbols) < 2:
             return jsonify({'error': 'Need at least 2 symbols'}), 400
 
-        result = quantitative_analyzer.optimize_portfolio(symbols)
+        result = quantitative_analyzer.optimize_portfolio(
+            symbols,
+            estimator=data.get('estimator', 'rolling'),  # rolling or ewma
+            shrinkage=data.get('shrinkage', 'ledoit_wolf'),  # null, 0-1 or ledoit_wolf
+            max_weight=float(data.get('max_weight', 1.0))
+        )
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -560,7 +780,11 @@ def correlation_analysis():
         if not symbols or len(symbols) < 2:
             return jsonify({'error': 'Need at least 2 symbols'}), 400
 
-        result = quantitative_analyzer.calculate_correlation_matrix(symbols)
+        result = quantitative_analyzer.calculate_correlation_matrix(
+            symbols,
+            estimator=data.get('estimator', 'rolling'),
+            shrinkage=data.get('shrinkage')
+        )
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -574,11 +798,51 @@ def options_pricing(symbol):
         strike = float(request.args.get('strike', 0))
         days = int(request.args.get('days', 30))
         option_type = request.args.get('type', 'call')
+        volatility = request.args.get('volatility', type=float)  # Default: historical
 
         if strike == 0:
             return jsonify({'error': 'Strike price required'}), 400
 
-        result = quantitative_analyzer.black_scholes_options(symbol, strike, days, option_type)
+        result = quantitative_analyzer.black_scholes_options(symbol, strike, days, option_type, volatility)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/quant/options/<symbol>/chain', methods=['GET'])
+def option_chain(symbol):
+    """Implied volatility and Greeks for the listed option chain"""
+    try:
+        symbol = symbol.upper()
+        expirations = int(request.args.get('expirations', 4))
+        option_type = request.args.get('type', 'both')
+
+        result = quantitative_analyzer.option_chain_analysis(symbol, expirations, option_type)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/quant/options/<symbol>/price', methods=['POST'])
+def options_grid_pricing(symbol):
+    """Price every strike x expiry combination in one request"""
+    try:
+        symbol = symbol.upper()
+        data = request.get_json()
+        strikes = data.get('strikes', [])
+        days = data.get('days', [30])
+
+        if not strikes or not days:
+            return jsonify({'error': 'strikes and days required'}), 400
+        if len(strikes) * len(days) > 20000:
+            return jsonify({'error': 'Too many contracts (max 20,000 strike x expiry pairs)'}), 400
+
+        result = quantitative_analyzer.price_options(
+            symbol, strikes, days,
+            option_type=data.get('type', 'both'),
+            volatility=data.get('volatility'),
+            dividend_yield=float(data.get('dividend_yield', 0.0))
+        )
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -693,6 +957,29 @@ def get_social_alerts():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/social/trending', methods=['GET'])
+def get_social_trending():
+    """
+    Get tickers whose mention rate is spiking against their own baseline
+    Example: GET /api/social/trending?limit=20
+    """
+    if not social_intelligence:
+        return jsonify({'error': 'Social Intelligence module not available'}), 503
+
+    try:
+        limit = int(request.args.get('limit', 20))
+        velocity = social_intelligence.mention_velocity
+
+        return jsonify({
+            'trending': velocity.top_trending(limit),
+            'recent_spikes': velocity.recent_spikes(limit),
+            'stats': velocity.get_stats(),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 if __name__ == '__main__':
     port = int(os.getenv('FLASK_PORT', 5000))
     debug = os.getenv('DEBUG', 'True').lower() == 'true'
@@ -734,6 +1021,7 @@ if __name__ == '__main__':
     • GET /api/social/scan?symbols=TSLA,NVDA - Scan multiple stocks
     • GET /api/social/opportunities - Top trading opportunities
     • GET /api/social/alerts?positions=TSLA,AAPL - Risk alerts for positions
+    • GET /api/social/trending - Tickers with mention-velocity spikes
     """)
 
     app.run(host='0.0.0.0', port=port, debug=debug)
@@ -1,10 +1,21 @@
 // Main Application JavaScript
 
+// Above this many cards only the rows in (and near) the viewport are in the DOM
+const VIRTUALIZE_THRESHOLD = 60;
+const VIRTUAL_OVERSCAN_ROWS = 2;
+const ESTIMATED_CARD_HEIGHT = 260;
+// Refresh interval for the open chart; new bars are appended to the plot
+const CHART_REFRESH_MS = 60000;
+
 class MomentumTraderApp {
     constructor() {
         this.selectedAgent = 'chatgpt';
         this.currentStocks = [];
         this.usdIlsRate = 3.6;
+        this.cards = new Map();     // symbol -> rendered card (element, cells, last values)
+        this.virtual = null;        // virtual window state for long scans
+        this.chartSymbol = null;
+        this.chartTimer = null;
 
         this.init();
     }
@@ -18,25 +29,89 @@ class MomentumTraderApp {
         });
 
         // Modal close
-        document.querySelector('.close').addEventListener('click', () => {
-            document.getElementById('analysis-modal').style.display = 'none';
-        });
+        document.querySelector('.close').addEventListener('click', () => this.closeModal());
 
         // Close modal on outside click
         window.addEventListener('click', (e) => {
             const modal = document.getElementById('analysis-modal');
             if (e.target === modal) {
-                modal.style.display = 'none';
+                this.closeModal();
             }
         });
 
+        this.registerServiceWorker();
+
         // Load exchange rate on start
         this.loadExchangeRate();
 
+        // ?bench=render measures rendering against the recorded large scan instead
+        if (new URLSearchParams(window.location.search).get('bench') === 'render') {
+            setTimeout(() => this.runRenderBenchmark(), 500);
+            return;
+        }
+
         // Auto-scan on load
         setTimeout(() => this.scanStocks(), 500);
     }
 
+    closeModal() {
+        document.getElementById('analysis-modal').style.display = 'none';
+        this.stopChartRefresh();
+    }
+
+    registerServiceWorker() {
+        if (!('serviceWorker' in navigator)) {
+            return;
+        }
+        const version = document.querySelector('meta[name="asset-version"]')?.content || 'dev';
+        navigator.serviceWorker.register(`/sw.js?v=${version}`, { scope: '/' })
+            .catch(error => console.error('Service worker registration failed:', error));
+
+        // Cached responses are shown immediately; the worker posts the refreshed data here
+        navigator.serviceWorker.addEventListener('message', (event) => {
+            const message = event.data || {};
+            if (message.type === 'api-updated') {
+                this.applyRefreshedData(message.route, message.body);
+            } else if (message.type === 'write-synced') {
+                console.log(`✅ Queued ${message.method} ${message.url} sent (${message.status})`);
+            }
+        });
+
+        // Browsers without Background Sync replay queued writes when back online
+        window.addEventListener('online', () => {
+            navigator.serviceWorker.controller?.postMessage({ type: 'replay-outbox' });
+        });
+    }
+
+    applyRefreshedData(route, data) {
+        if (!data || !data.success) {
+            return;
+        }
+        if (route === 'scan') {
+            this.currentStocks = data.stocks;
+            this.usdIlsRate = data.usd_ils_rate;
+            this.renderStocks();
+        } else if (route === 'exchange-rate') {
+            this.usdIlsRate = data.rate_info.rate;
+            document.getElementById('usd-ils-rate').textContent = this.usdIlsRate.toFixed(2);
+        } else if (route === 'chart' && data.symbol === this.chartSymbol) {
+            this.updateChart(data.symbol, data.data);
+        }
+    }
+
+    getCacheStats() {
+        // Hit rates per route, e.g. app.getCacheStats().then(console.table)
+        const worker = navigator.serviceWorker && navigator.serviceWorker.controller;
+        if (!worker) {
+            return Promise.resolve(null);
+        }
+        return new Promise((resolve) => {
+            const channel = new MessageChannel();
+            channel.port1.onmessage = (event) => resolve(event.data);
+            worker.postMessage({ type: 'get-cache-stats' }, [channel.port2]);
+        });
+    }
+
     async loadExchangeRate() {
         try {
             const response = await fetch('/api/exchange-rate');
@@ -75,11 +150,11 @@ class MomentumTraderApp {
 
     renderStocks() {
         const container = document.getElementById('results-container');
-        container.innerHTML = '';
 
         if (this.currentStocks.length === 0) {
+            this.resetResults(container);
             container.innerHTML = `
-                <div style="grid-column: 1 / -1; text-align: center; padding: 40px; background: white; border-radius: 15px;">
+                <div class="results-message" style="grid-column: 1 / -1; text-align: center; padding: 40px; background: white; border-radius: 15px;">
                     <h2>😔 לא נמצאו מניות מומנטום</h2>
                     <p>נסה שוב מאוחר יותר או שנה את קריטריוני הסינון</p>
                 </div>
@@ -87,10 +162,52 @@ class MomentumTraderApp {
             return;
         }
 
-        this.currentStocks.forEach(stock => {
-            const card = this.createStockCard(stock);
-            container.appendChild(card);
-        });
+        // Clear a previous empty/error message; cards are kept and diffed
+        const message = container.querySelector('.results-message');
+        if (message) {
+            message.remove();
+        }
+
+        if (this.currentStocks.length > VIRTUALIZE_THRESHOLD) {
+            this.renderVirtualWindow(true);
+        } else {
+            this.stopVirtualList();
+            this.reconcileCards(container, this.currentStocks, null);
+        }
+    }
+
+    resetResults(container) {
+        this.stopVirtualList();
+        this.cards.clear();
+        container.innerHTML = '';
+    }
+
+    reconcileCards(container, stocks, startNode) {
+        // Keyed by symbol: existing cards are patched in place, only cards
+        // that left the list are removed and only out-of-place ones are moved
+        const wanted = new Set(stocks.map(stock => stock.symbol));
+        for (const [symbol, card] of this.cards) {
+            if (!wanted.has(symbol)) {
+                card.element.remove();
+                this.cards.delete(symbol);
+            }
+        }
+
+        let cursor = startNode ? startNode.nextSibling : container.firstChild;
+        for (const stock of stocks) {
+            let card = this.cards.get(stock.symbol);
+            if (!card) {
+                card = this.createStockCard(stock);
+                this.cards.set(stock.symbol, card);
+            }
+            this.updateStockCard(card, stock);
+
+            if (card.element === cursor) {
+                cursor = cursor.nextSibling;
+            } else {
+                container.insertBefore(card.element, cursor);
+            }
+        }
     }
 
     createStockCard(stock) {
@@ -98,27 +215,11 @@ class MomentumTraderApp {
         card.className = 'stock-card';
         card.onclick = () => this.analyzeStock(stock.symbol);
 
-        const priceChangeClass = stock.change_percent >= 0 ? 'positive' : 'negative';
-        const priceChangeSign = stock.change_percent >= 0 ? '+' : '';
-
         // Display price in both currencies
-        let priceDisplay = '';
-        if (stock.market === 'US') {
-            priceDisplay = `
-                <div class="stock-price">
-                    $${stock.current_price.toFixed(2)}
-                    <span style="font-size: 0.6em; color: #666;">
-                        (₪${stock.current_price_ils.toFixed(2)})
-                    </span>
-                </div>
-            `;
-        } else {
-            priceDisplay = `
-                <div class="stock-price">
-                    ₪${stock.current_price.toFixed(2)}
-                </div>
-            `;
-        }
+        const ilsPrice = stock.market === 'US' ? `
+                <span style="font-size: 0.6em; color: #666;">
+                    (₪<span data-cell="price_ils"></span>)
+                </span>` : '';
 
         card.innerHTML = `
             <div class="stock-header">
@@ -126,31 +227,28 @@ class MomentumTraderApp {
                 <div class="market-badge ${stock.market}">${stock.market}</div>
             </div>
 
-            ${priceDisplay}
-
-            <div class="price-change ${priceChangeClass}">
-                ${priceChangeSign}${stock.change_percent.toFixed(2)}%
-                (${priceChangeSign}${stock.change.toFixed(2)})
+            <div class="stock-price">
+                ${stock.market === 'US' ? '$' : '₪'}<span data-cell="price"></span>${ilsPrice}
             </div>
 
+            <div class="price-change" data-cell="change"></div>
+
             <div class="stock-metrics">
                 <div class="metric">
                     <div class="metric-label">RVOL</div>
-                    <div class="metric-value highlight">${stock.rvol.toFixed(2)}x</div>
+                    <div class="metric-value highlight" data-cell="rvol"></div>
                 </div>
                 <div class="metric">
                     <div class="metric-label">גאפ</div>
-                    <div class="metric-value ${Math.abs(stock.gap_percent) > 5 ? 'highlight' : ''}">
-                        ${stock.gap_percent.toFixed(2)}%
-                    </div>
+                    <div class="metric-value" data-cell="gap"></div>
                 </div>
                 <div class="metric">
                     <div class="metric-label">נפח</div>
-                    <div class="metric-value">${this.formatVolume(stock.volume)}</div>
+                    <div class="metric-value" data-cell="volume"></div>
                 </div>
                 <div class="metric">
                     <div class="metric-label">טווח יומי</div>
-                    <div class="metric-value">${stock.day_range.toFixed(2)}</div>
+                    <div class="metric-value" data-cell="range"></div>
                 </div>
             </div>
 
@@ -159,7 +257,128 @@ class MomentumTraderApp {
             </div>
         `;
 
-        return card;
+        const cells = {};
+        card.querySelectorAll('[data-cell]').forEach(cell => {
+            cells[cell.dataset.cell] = cell;
+        });
+        return { element: card, cells, values: {} };
+    }
+
+    updateStockCard(card, stock) {
+        const priceChangeSign = stock.change_percent >= 0 ? '+' : '';
+
+        this.setCell(card, 'price', stock.current_price.toFixed(2));
+        if (card.cells.price_ils) {
+            this.setCell(card, 'price_ils', stock.current_price_ils.toFixed(2));
+        }
+        this.setCell(card, 'change',
+            `${priceChangeSign}${stock.change_percent.toFixed(2)}% (${priceChangeSign}${stock.change.toFixed(2)})`,
+            `price-change ${stock.change_percent >= 0 ? 'positive' : 'negative'}`);
+        this.setCell(card, 'rvol', `${stock.rvol.toFixed(2)}x`);
+        this.setCell(card, 'gap', `${stock.gap_percent.toFixed(2)}%`,
+            `metric-value ${Math.abs(stock.gap_percent) > 5 ? 'highlight' : ''}`);
+        this.setCell(card, 'volume', this.formatVolume(stock.volume));
+        this.setCell(card, 'range', stock.day_range.toFixed(2));
+    }
+
+    setCell(card, name, text, className) {
+        // Touch the DOM only when the rendered value changed
+        const key = className === undefined ? text : `${text}|${className}`;
+        if (card.values[name] === key) {
+            return;
+        }
+        card.values[name] = key;
+        const cell = card.cells[name];
+        cell.textContent = text;
+        if (className !== undefined) {
+            cell.className = className;
+        }
+    }
+
+    renderVirtualWindow(dataChanged) {
+        const container = document.getElementById('results-container');
+        let virtual = this.virtual;
+
+        if (!virtual) {
+            // Spacers stand in for the rows above and below the window
+            const makeSpacer = () => {
+                const spacer = document.createElement('div');
+                spacer.style.gridColumn = '1 / -1';
+                spacer.style.display = 'none';
+                return spacer;
+            };
+            virtual = this.virtual = {
+                top: makeSpacer(),
+                bottom: makeSpacer(),
+                rowHeight: ESTIMATED_CARD_HEIGHT,
+                start: -1,
+                end: -1,
+                frame: null,
+                onScroll: () => {
+                    if (virtual.frame === null) {
+                        virtual.frame = requestAnimationFrame(() => {
+                            virtual.frame = null;
+                            this.renderVirtualWindow(false);
+                        });
+                    }
+                }
+            };
+            container.prepend(virtual.top);
+            container.append(virtual.bottom);
+            window.addEventListener('scroll', virtual.onScroll, { passive: true });
+            window.addEventListener('resize', virtual.onScroll);
+        }
+
+        const style = getComputedStyle(container);
+        const columns = Math.max(1, style.gridTemplateColumns.split(' ').length);
+        const gap = parseFloat(style.rowGap) || 0;
+        const pitch = virtual.rowHeight + gap;
+        const total = this.currentStocks.length;
+        const rows = Math.ceil(total / columns);
+
+        const top = container.getBoundingClientRect().top;
+        const firstRow = Math.min(rows, Math.max(0, Math.floor(-top / pitch) - VIRTUAL_OVERSCAN_ROWS));
+        const lastRow = Math.min(rows - 1, Math.ceil((window.innerHeight - top) / pitch) + VIRTUAL_OVERSCAN_ROWS);
+        const start = Math.min(firstRow * columns, total);
+        const end = Math.min(Math.max(lastRow + 1, firstRow) * columns, total);
+
+        if (!dataChanged && start === virtual.start && end === virtual.end) {
+            return;
+        }
+        virtual.start = start;
+        virtual.end = end;
+
+        this.setSpacer(virtual.top, firstRow, pitch, gap);
+        this.setSpacer(virtual.bottom, rows - Math.ceil(end / columns), pitch, gap);
+        this.reconcileCards(container, this.currentStocks.slice(start, end), virtual.top);
+
+        // Cards share one layout, so a single measurement fixes the estimate
+        const first = this.cards.values().next().value;
+        if (first && first.element.offsetHeight && first.element.offsetHeight !== virtual.rowHeight) {
+            virtual.rowHeight = first.element.offsetHeight;
+            this.renderVirtualWindow(true);
+        }
+    }
+
+    setSpacer(spacer, rowCount, pitch, gap) {
+        // A grid item adds a gap after itself, so it covers rowCount rows minus one gap
+        spacer.style.display = rowCount > 0 ? 'block' : 'none';
+        spacer.style.height = rowCount > 0 ? `${rowCount * pitch - gap}px` : '0';
+    }
+
+    stopVirtualList() {
+        const virtual = this.virtual;
+        if (!virtual) {
+            return;
+        }
+        window.removeEventListener('scroll', virtual.onScroll);
+        window.removeEventListener('resize', virtual.onScroll);
+        if (virtual.frame !== null) {
+            cancelAnimationFrame(virtual.frame);
+        }
+        virtual.top.remove();
+        virtual.bottom.remove();
+        this.virtual = null;
     }
 
     async analyzeStock(symbol) {
@@ -180,6 +399,7 @@ class MomentumTraderApp {
 
             if (data.success) {
                 this.showAnalysisModal(data);
+                this.startChartRefresh(symbol);
                 this.loadChart(symbol);
             } else {
                 this.showError('שגיאה בניתוח: ' + data.error);
@@ -363,16 +583,79 @@ class MomentumTraderApp {
             const data = await response.json();
 
             if (data.success) {
-                this.renderChart(data.data);
+                this.updateChart(symbol, data.data);
             }
         } catch (error) {
             console.error('Error loading chart:', error);
         }
     }
 
-    renderChart(chartData) {
+    startChartRefresh(symbol) {
+        this.stopChartRefresh();
+        this.chartTimer = setInterval(() => this.loadChart(symbol), CHART_REFRESH_MS);
+    }
+
+    stopChartRefresh() {
+        if (this.chartTimer) {
+            clearInterval(this.chartTimer);
+            this.chartTimer = null;
+        }
+        this.chartSymbol = null;
+    }
+
+    updateChart(symbol, chartData) {
         const container = document.getElementById('chart-container');
+        if (!container) {
+            return;
+        }
+
+        const plotted = this.chartSymbol === symbol && container.data ? container.data[0].x : null;
+        if (!plotted || plotted.length === 0) {
+            this.chartSymbol = symbol;
+            this.renderChart(chartData);
+            return;
+        }
+
+        // Same window start and our last bar still in place: patch that bar
+        // (it may still be forming) and append only the new ones
+        const last = plotted.length - 1;
+        if (chartData.timestamps[0] !== plotted[0] || chartData.timestamps[last] !== plotted[last]) {
+            // The window slid (new day): let Plotly diff against the full data
+            Plotly.react(container, this.chartTraces(chartData), container.layout);
+            return;
+        }
+
+        const traces = container.data;
+        traces[0].open[last] = chartData.open[last];
+        traces[0].high[last] = chartData.high[last];
+        traces[0].low[last] = chartData.low[last];
+        traces[0].close[last] = chartData.close[last];
+        ['vwap', 'ema_9', 'ema_20', 'volume'].forEach((field, i) => {
+            traces[i + 1].y[last] = chartData[field][last];
+        });
+
+        const from = plotted.length;
+        if (chartData.timestamps.length === from) {
+            Plotly.redraw(container);
+            return;
+        }
 
+        const x = chartData.timestamps.slice(from);
+        const maxPoints = chartData.timestamps.length;
+        Plotly.extendTraces(container, {
+            x: [x],
+            open: [chartData.open.slice(from)],
+            high: [chartData.high.slice(from)],
+            low: [chartData.low.slice(from)],
+            close: [chartData.close.slice(from)]
+        }, [0], maxPoints);
+        Plotly.extendTraces(container, {
+            x: [x, x, x, x],
+            y: ['vwap', 'ema_9', 'ema_20', 'volume'].map(field => chartData[field].slice(from))
+        }, [1, 2, 3, 4], maxPoints);
+    }
+
+    chartTraces(chartData) {
         // Candlestick trace
         const candlestick = {
             x: chartData.timestamps,
@@ -428,6 +711,21 @@ class MomentumTraderApp {
             marker: { color: 'rgba(102, 126, 234, 0.3)' }
         };
 
+        // Copies, so appending to the plot never mutates the response data
+        return [candlestick, vwap, ema9, ema20, volume].map(trace => {
+            const copy = { ...trace };
+            ['x', 'y', 'open', 'high', 'low', 'close'].forEach(key => {
+                if (copy[key]) {
+                    copy[key] = copy[key].slice();
+                }
+            });
+            return copy;
+        });
+    }
+
+    renderChart(chartData) {
+        const container = document.getElementById('chart-container');
+
         const layout = {
             title: '',
             xaxis: { rangeslider: { visible: false } },
@@ -442,7 +740,7 @@ class MomentumTraderApp {
             margin: { r: 60, l: 60 }
         };
 
-        Plotly.newPlot(container, [candlestick, vwap, ema9, ema20, volume], layout);
+        Plotly.newPlot(container, this.chartTraces(chartData), layout);
     }
 
     translateConfidence(confidence) {
@@ -464,14 +762,138 @@ class MomentumTraderApp {
         return volume.toString();
     }
 
+    async runRenderBenchmark(options = {}) {
+        // Frame timing of scan refreshes and scrolling against a recorded
+        // large scan (open /?bench=render, or call from the console)
+        const {
+            fixture = '/static/fixtures/scan_large.json',
+            refreshes = 30,
+            changedFraction = 0.1,
+            scrollSteps = 60
+        } = options;
+
+        const response = await fetch(fixture);
+        const data = await response.json();
+        const nextFrame = () => new Promise(resolve => requestAnimationFrame(resolve));
+
+        // Deterministic price moves on a slice of the symbols per refresh
+        let seed = 42;
+        const random = () => {
+            seed = (seed * 1664525 + 1013904223) % 4294967296;
+            return seed / 4294967296;
+        };
+        let stocks = data.stocks;
+
+        const renderMs = [];
+        const frames = this.monitorFrames();
+        for (let i = 0; i < refreshes; i++) {
+            stocks = stocks.map(stock => {
+                if (random() >= changedFraction) {
+                    return stock;
+                }
+                const move = 1 + (random() - 0.5) * 0.01;
+                return {
+                    ...stock,
+                    current_price: stock.current_price * move,
+                    current_price_ils: stock.current_price_ils * move,
+                    change_percent: stock.change_percent + (move - 1) * 100,
+                    volume: stock.volume + Math.round(random() * 10000)
+                };
+            });
+            this.currentStocks = stocks;
+            this.usdIlsRate = data.usd_ils_rate;
+
+            const started = performance.now();
+            this.renderStocks();
+            renderMs.push(performance.now() - started);
+            await nextFrame();
+        }
+        const refreshFrames = frames.stop();
+
+        const scrollFrames = this.monitorFrames();
+        const maxScroll = document.documentElement.scrollHeight - window.innerHeight;
+        for (let step = 1; step <= scrollSteps; step++) {
+            window.scrollTo(0, maxScroll * step / scrollSteps);
+            await nextFrame();
+        }
+        const scrolled = scrollFrames.stop();
+        window.scrollTo(0, 0);
+
+        const report = {
+            fixture,
+            stocks: data.stocks.length,
+            virtualized: this.virtual !== null,
+            cards_in_dom: this.cards.size,
+            render_ms: this.summarizeTimings(renderMs),
+            refresh_frame_ms: this.summarizeTimings(refreshFrames.frames),
+            scroll_frame_ms: this.summarizeTimings(scrolled.frames),
+            long_tasks: refreshFrames.longTasks + scrolled.longTasks
+        };
+        console.log('⏱️ Render benchmark', JSON.stringify(report, null, 2));
+        return report;
+    }
+
+    monitorFrames() {
+        // Intervals between animation frames (16.7ms at 60Hz), plus long tasks where supported
+        const frames = [];
+        let running = true;
+        let last = performance.now();
+        const tick = (now) => {
+            frames.push(now - last);
+            last = now;
+            if (running) {
+                requestAnimationFrame(tick);
+            }
+        };
+        requestAnimationFrame(tick);
+
+        let longTasks = 0;
+        let observer = null;
+        if (window.PerformanceObserver && (PerformanceObserver.supportedEntryTypes || []).includes('longtask')) {
+            observer = new PerformanceObserver(list => {
+                longTasks += list.getEntries().length;
+            });
+            observer.observe({ entryTypes: ['longtask'] });
+        }
+
+        return {
+            stop: () => {
+                running = false;
+                if (observer) {
+                    observer.disconnect();
+                }
+                return { frames, longTasks };
+            }
+        };
+    }
+
+    summarizeTimings(values) {
+        if (values.length === 0) {
+            return null;
+        }
+        const sorted = values.slice().sort((a, b) => a - b);
+        const percentile = p => sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))];
+        const round = value => Math.round(value * 100) / 100;
+        return {
+            count: values.length,
+            mean: round(values.reduce((sum, v) => sum + v, 0) / values.length),
+            p50: round(percentile(0.5)),
+            p95: round(percentile(0.95)),
+            max: round(sorted[sorted.length - 1]),
+            // Intervals of more than 1.5 frames at 60Hz, i.e. at least one missed frame
+            slow: values.filter(v => v > 1.5 * 1000 / 60).length
+        };
+    }
+
     showLoading(show) {
         document.getElementById('loading').style.display = show ? 'block' : 'none';
     }
 
     showError(message) {
         const container = document.getElementById('results-container');
+        this.resetResults(container);
         container.innerHTML = `
-            <div style="grid-column: 1 / -1; background: #f8d7da; color: #721c24; padding: 20px; border-radius: 10px; text-align: center;">
+            <div class="results-message" style="grid-column: 1 / -1; background: #f8d7da; color: #721c24; padding: 20px; border-radius: 10px; text-align: center;">
                 <h3>❌ שגיאה</h3>
                 <p>${message}</p>
             </div>
@@ -481,5 +903,5 @@ class MomentumTraderApp {
 
 // Initialize app when DOM is ready
 document.addEventListener('DOMContentLoaded', () => {
-    new MomentumTraderApp();
+    window.momentumTrader = new MomentumTraderApp();
 });
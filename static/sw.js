@@ -1,26 +1,410 @@
 // Service Worker for PWA
-const CACHE_NAME = 'momentum-trader-v1';
-const urlsToCache = [
+//
+// Served from /sw.js?v=<asset version> (see app.py) so it controls the whole
+// site. The version is a hash of the static files: any change registers a new
+// worker, which precaches the new assets and deletes the old caches.
+//
+// Strategies:
+// - static assets: cache-first (URLs carry the version)
+// - pages: network-first, cached page when offline
+// - scan / exchange rate / charts / news / sectors: stale-while-revalidate -
+//   answered from cache instantly, refreshed in the background (at most once
+//   per refreshAfter), and the fresh JSON is posted to open pages
+// - other API reads: network-first with the cached copy as fallback
+// - trade and alert writes: sent directly; queued in IndexedDB when offline
+//   and replayed by Background Sync (or on the next online event)
+
+const VERSION = new URL(self.location).searchParams.get('v') || 'dev';
+const STATIC_CACHE = `momentum-trader-static-${VERSION}`;
+const API_CACHE = `momentum-trader-api-${VERSION}`;
+const PAGE_CACHE = `momentum-trader-pages-${VERSION}`;
+const CACHE_PREFIX = 'momentum-trader-';
+
+const PRECACHE_URLS = [
   '/',
-  '/static/css/style.css',
-  '/static/js/main.js',
+  `/static/css/style.css?v=${VERSION}`,
+  `/static/js/app.js?v=${VERSION}`,
   '/manifest.json'
 ];
 
-// Install event
+const API_ROUTES = [
+  { name: 'scan', pattern: /^\/api\/scan$/, strategy: 'stale-while-revalidate', refreshAfter: 30 },
+  { name: 'exchange-rate', pattern: /^\/api\/exchange-rate$/, strategy: 'stale-while-revalidate', refreshAfter: 600 },
+  { name: 'chart', pattern: /^\/api\/chart\//, strategy: 'stale-while-revalidate', refreshAfter: 60 },
+  { name: 'news', pattern: /^\/api\/news\//, strategy: 'stale-while-revalidate', refreshAfter: 120 },
+  { name: 'sectors', pattern: /^\/api\/research\/sectors?(\/|$)/, strategy: 'stale-while-revalidate', refreshAfter: 300 },
+  { name: 'metrics', pattern: /^\/api\/metrics$/, strategy: 'network-only' }
+];
+const DEFAULT_API_ROUTE = { name: 'api', strategy: 'network-first' };
+
+// Cached responses older than this are not served by stale-while-revalidate
+const MAX_STALE_SECONDS = 24 * 3600;
+const MAX_API_ENTRIES = 200;
+const NETWORK_TIMEOUT_MS = 4000;
+
+// Writes replayed by Background Sync, and the cached reads each one makes stale
+const SYNC_ROUTES = [
+  { method: 'POST', pattern: /^\/api\/trades$/, invalidates: /^\/api\/trades/ },
+  { method: 'PUT', pattern: /^\/api\/trades\/\d+\/close$/, invalidates: /^\/api\/trades/ },
+  { method: 'POST', pattern: /^\/api\/alerts$/, invalidates: /^\/api\/alerts/ },
+  { method: 'DELETE', pattern: /^\/api\/alerts\/\d+$/, invalidates: /^\/api\/alerts/ }
+];
+const SYNC_TAG = 'momentum-trader-outbox';
+
+const CACHED_AT_HEADER = 'sw-cached-at';
+
+// ========== IndexedDB (outbox + stats) ==========
+
+const DB_NAME = 'momentum-trader-sw';
+let dbPromise = null;
+
+function openDb() {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      const request = indexedDB.open(DB_NAME, 1);
+      request.onupgradeneeded = () => {
+        request.result.createObjectStore('outbox', { keyPath: 'id', autoIncrement: true });
+        request.result.createObjectStore('stats');
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    });
+  }
+  return dbPromise;
+}
+
+async function dbRequest(store, mode, operation) {
+  const db = await openDb();
+  return new Promise((resolve, reject) => {
+    const request = operation(db.transaction(store, mode).objectStore(store));
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+// ========== Cache statistics ==========
+
+let stats = null;
+let statsSaveTimer = null;
+
+async function loadStats() {
+  if (!stats) {
+    try {
+      stats = (await dbRequest('stats', 'readonly', store => store.get(VERSION))) || {};
+    } catch (error) {
+      stats = {};
+    }
+  }
+  return stats;
+}
+
+async function count(route, field) {
+  const current = await loadStats();
+  const entry = current[route] || (current[route] = {
+    hits: 0, misses: 0, revalidations: 0, offline_fallbacks: 0, network_errors: 0, queued_writes: 0
+  });
+  entry[field] += 1;
+
+  // Persist at most every 2 seconds
+  if (!statsSaveTimer) {
+    statsSaveTimer = setTimeout(() => {
+      statsSaveTimer = null;
+      dbRequest('stats', 'readwrite', store => store.put(stats, VERSION)).catch(() => {});
+    }, 2000);
+  }
+}
+
+async function statsReport() {
+  const current = await loadStats();
+  const routes = {};
+  let hits = 0;
+  let lookups = 0;
+  for (const [route, entry] of Object.entries(current)) {
+    const routeLookups = entry.hits + entry.misses;
+    routes[route] = { ...entry, hit_rate: routeLookups ? entry.hits / routeLookups : null };
+    hits += entry.hits;
+    lookups += routeLookups;
+  }
+  const outbox = await dbRequest('outbox', 'readonly', store => store.count()).catch(() => null);
+  return { version: VERSION, hit_rate: lookups ? hits / lookups : null, routes, outbox };
+}
+
+// ========== Lifecycle ==========
+
 self.addEventListener('install', event => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then(cache => cache.addAll(urlsToCache))
+    caches.open(STATIC_CACHE)
+      .then(cache => cache.addAll(PRECACHE_URLS))
+      .then(() => self.skipWaiting())
   );
 });
 
-// Fetch event
+self.addEventListener('activate', event => {
+  event.waitUntil((async () => {
+    // Versioned cache busting: drop every cache from older versions
+    const names = await caches.keys();
+    await Promise.all(names
+      .filter(name => name.startsWith(CACHE_PREFIX) && !name.endsWith(`-${VERSION}`))
+      .map(name => caches.delete(name)));
+    await self.clients.claim();
+    await replayOutbox().catch(() => {});
+  })());
+});
+
+// ========== Fetch routing ==========
+
 self.addEventListener('fetch', event => {
-  event.respondWith(
-    caches.match(event.request)
-      .then(response => response || fetch(event.request))
-  );
+  const request = event.request;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) {
+    return;
+  }
+
+  if (request.method !== 'GET') {
+    const syncRoute = SYNC_ROUTES.find(route => route.method === request.method && route.pattern.test(url.pathname));
+    if (syncRoute) {
+      event.respondWith(sendOrQueue(request, syncRoute));
+    }
+    return;
+  }
+
+  if (url.pathname.startsWith('/api/')) {
+    const route = API_ROUTES.find(r => r.pattern.test(url.pathname)) || DEFAULT_API_ROUTE;
+    if (route.strategy === 'stale-while-revalidate') {
+      event.respondWith(staleWhileRevalidate(event, request, route));
+    } else if (route.strategy === 'network-first') {
+      event.respondWith(networkFirst(request, API_CACHE, route.name));
+    }
+    return;
+  }
+
+  if (request.mode === 'navigate') {
+    event.respondWith(networkFirst(request, PAGE_CACHE, 'pages'));
+    return;
+  }
+
+  if (url.pathname.startsWith('/static/') || url.pathname === '/manifest.json') {
+    event.respondWith(cacheFirst(request));
+  }
+});
+
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  if (cached) {
+    count('static', 'hits');
+    return cached;
+  }
+  count('static', 'misses');
+  const response = await fetch(request);
+  if (response.ok) {
+    const cache = await caches.open(STATIC_CACHE);
+    cache.put(request, response.clone());
+  }
+  return response;
+}
+
+async function networkFirst(request, cacheName, routeName) {
+  try {
+    const response = await fetchWithTimeout(request, NETWORK_TIMEOUT_MS);
+    if (response.ok) {
+      await putWithTimestamp(cacheName, request, response.clone());
+    }
+    count(routeName, 'misses');
+    return response;
+  } catch (error) {
+    const cached = await caches.match(request, { cacheName });
+    if (cached) {
+      count(routeName, 'offline_fallbacks');
+      count(routeName, 'hits');
+      return cached;
+    }
+    count(routeName, 'network_errors');
+    if (request.mode === 'navigate') {
+      const home = await caches.match('/');
+      if (home) {
+        return home;
+      }
+    }
+    return jsonResponse({ success: false, offline: true, error: 'Offline and not cached' }, 503);
+  }
+}
+
+async function staleWhileRevalidate(event, request, route) {
+  const cache = await caches.open(API_CACHE);
+  const cached = await cache.match(request);
+  const age = cached ? (Date.now() - Number(cached.headers.get(CACHED_AT_HEADER) || 0)) / 1000 : Infinity;
+
+  if (cached && age <= MAX_STALE_SECONDS) {
+    count(route.name, 'hits');
+    if (age >= route.refreshAfter) {
+      event.waitUntil(revalidate(request, route));
+    }
+    return cached;
+  }
+
+  count(route.name, 'misses');
+  try {
+    const response = await fetch(request);
+    if (response.ok) {
+      await putWithTimestamp(API_CACHE, request, response.clone());
+    }
+    return response;
+  } catch (error) {
+    count(route.name, 'network_errors');
+    if (cached) {
+      count(route.name, 'offline_fallbacks');
+      return cached;
+    }
+    return jsonResponse({ success: false, offline: true, error: 'Offline and not cached' }, 503);
+  }
+}
+
+// Refreshes in flight, so several tabs opening at once trigger one request
+const revalidating = new Map();
+
+function revalidate(request, route) {
+  if (revalidating.has(request.url)) {
+    return revalidating.get(request.url);
+  }
+  const task = (async () => {
+    try {
+      const response = await fetch(request);
+      if (!response.ok) {
+        return;
+      }
+      await putWithTimestamp(API_CACHE, request, response.clone());
+      count(route.name, 'revalidations');
+      await broadcast({ type: 'api-updated', route: route.name, url: request.url, body: await response.json() });
+    } catch (error) {
+      count(route.name, 'network_errors');
+    } finally {
+      revalidating.delete(request.url);
+    }
+  })();
+  revalidating.set(request.url, task);
+  return task;
+}
+
+async function putWithTimestamp(cacheName, request, response) {
+  const headers = new Headers(response.headers);
+  headers.set(CACHED_AT_HEADER, String(Date.now()));
+  const body = await response.blob();
+  const cache = await caches.open(cacheName);
+  await cache.put(request, new Response(body, { status: response.status, statusText: response.statusText, headers }));
+  if (cacheName === API_CACHE) {
+    await trimCache(cache, MAX_API_ENTRIES);
+  }
+}
+
+async function trimCache(cache, maxEntries) {
+  const keys = await cache.keys();
+  // Keys come back in insertion order: drop the oldest
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - maxEntries)).map(key => cache.delete(key)));
+}
+
+function fetchWithTimeout(request, timeoutMs) {
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => reject(new Error('Network timeout')), timeoutMs);
+    fetch(request).then(
+      response => { clearTimeout(timer); resolve(response); },
+      error => { clearTimeout(timer); reject(error); }
+    );
+  });
+}
+
+function jsonResponse(body, status) {
+  return new Response(JSON.stringify(body), { status, headers: { 'Content-Type': 'application/json' } });
+}
+
+async function broadcast(message) {
+  const windows = await self.clients.matchAll({ type: 'window' });
+  windows.forEach(client => client.postMessage(message));
+}
+
+// ========== Queued writes (Background Sync) ==========
+
+async function sendOrQueue(request, route) {
+  const body = await request.clone().text();
+  try {
+    const response = await fetch(request);
+    if (response.ok) {
+      await invalidate(route.invalidates);
+    }
+    return response;
+  } catch (error) {
+    await dbRequest('outbox', 'readwrite', store => store.add({
+      url: request.url,
+      method: request.method,
+      headers: [...request.headers.entries()],
+      body,
+      queued_at: Date.now()
+    }));
+    count('writes', 'queued_writes');
+    if (self.registration.sync) {
+      await self.registration.sync.register(SYNC_TAG).catch(() => {});
+    }
+    return jsonResponse({ success: true, queued: true, message: 'Offline - will be sent when back online' }, 202);
+  }
+}
+
+async function invalidate(pattern) {
+  const cache = await caches.open(API_CACHE);
+  const keys = await cache.keys();
+  await Promise.all(keys.filter(key => pattern.test(new URL(key.url).pathname)).map(key => cache.delete(key)));
+}
+
+let replaying = null;
+
+function replayOutbox() {
+  if (!replaying) {
+    replaying = (async () => {
+      const entries = await dbRequest('outbox', 'readonly', store => store.getAll()).catch(() => []);
+      let sent = 0;
+      for (const entry of entries) {
+        // A network error rejects and leaves this entry and everything after
+        // it queued, in order; Background Sync retries later
+        const response = await fetch(entry.url, {
+          method: entry.method,
+          headers: entry.headers,
+          body: entry.body
+        });
+        // 2xx is done; a 4xx will never succeed, so it is dropped too
+        if (response.ok || (response.status >= 400 && response.status < 500)) {
+          await dbRequest('outbox', 'readwrite', store => store.delete(entry.id));
+          const route = SYNC_ROUTES.find(r => r.method === entry.method && r.pattern.test(new URL(entry.url).pathname));
+          if (route) {
+            await invalidate(route.invalidates);
+          }
+          sent += 1;
+          await broadcast({ type: 'write-synced', url: entry.url, method: entry.method, status: response.status });
+        } else {
+          throw new Error(`Replay failed with ${response.status}`);
+        }
+      }
+      return sent;
+    })().finally(() => { replaying = null; });
+  }
+  return replaying;
+}
+
+self.addEventListener('sync', event => {
+  if (event.tag === SYNC_TAG) {
+    event.waitUntil(replayOutbox());
+  }
+});
+
+// ========== Messages from pages ==========
+
+self.addEventListener('message', event => {
+  const message = event.data || {};
+  const port = event.ports && event.ports[0];
+
+  if (message.type === 'get-cache-stats' && port) {
+    event.waitUntil(statsReport().then(report => port.postMessage(report)));
+  } else if (message.type === 'replay-outbox') {
+    // Browsers without Background Sync: the page asks on 'online'
+    event.waitUntil(replayOutbox().catch(() => {}));
+  }
 });
 
 // Push notification event
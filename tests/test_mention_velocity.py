@@ -0,0 +1,109 @@
+"""
+Tests for the mention velocity engine with late and batched input
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analysis.mention_velocity import MentionVelocityEngine
+
+NOW = 1714572000.0  # 2024-05-01 14:00 UTC
+HOUR = 3600
+
+
+def batch(hours: float, count: int, end: float = NOW, seed: int = 1):
+    """Scraper-style batch: mentions spread over the last `hours`, newest first"""
+    rng = random.Random(seed)
+    created = sorted((end - rng.uniform(0, hours * HOUR) for _ in range(count)), reverse=True)
+    return [{'title': f'$ABC post {i}', 'text': '', 'created': ts, 'url': f'https://example.com/{seed}/{i}'}
+            for i, ts in enumerate(created)]
+
+
+def test_historical_batch_is_bucketed_not_dropped():
+    engine = MentionVelocityEngine()
+    engine.ingest_mentions('ABC', batch(24, 299))
+
+    stats = engine.get_stats()
+    assert stats['late'] == 0
+    assert stats['mentions'] == 299
+    assert stats['backfilled'] == 298
+
+
+def test_batches_in_any_order_give_the_same_counts():
+    newest_first = MentionVelocityEngine()
+    newest_first.ingest_mentions('ABC', batch(24, 200))
+    newest_first.ingest_mentions('ABC', batch(24, 200, seed=2))
+
+    oldest_first = MentionVelocityEngine()
+    for seed in (1, 2):
+        oldest_first.ingest_mentions('ABC', list(reversed(batch(24, 200, seed=seed))))
+
+    assert newest_first.get_velocity('ABC', NOW) == oldest_first.get_velocity('ABC', NOW)
+
+
+def test_batch_builds_a_real_baseline():
+    engine = MentionVelocityEngine()
+    engine.ingest_mentions('ABC', batch(24, 1500))
+
+    velocity = engine.get_velocity('ABC', NOW + 60)
+    assert velocity['baseline_ready']
+    assert velocity['active_windows'] >= engine.min_active_windows
+    assert velocity['baseline_mean'] > 0
+    assert abs(velocity['z_score']) < engine.z_threshold
+
+
+def test_zero_filled_windows_do_not_make_a_baseline():
+    engine = MentionVelocityEngine()
+    engine.record('ABC', 1, NOW)
+
+    # Two quiet days fill every bucket with zeros - still no real observations
+    velocity = engine.get_velocity('ABC', NOW + 2 * 24 * HOUR)
+    assert velocity['baseline_windows'] >= engine.min_samples
+    assert not velocity['baseline_ready']
+    assert velocity['z_score'] == 0.0
+
+
+def test_mentions_older_than_a_day_are_late():
+    engine = MentionVelocityEngine()
+    engine.record('ABC', 1, NOW)
+    assert engine.record('ABC', 1, NOW - 25 * HOUR) is None
+    assert engine.get_stats()['late'] == 1
+
+
+def test_duplicate_batches_are_ignored():
+    engine = MentionVelocityEngine()
+    mentions = batch(6, 50)
+    engine.ingest_mentions('ABC', mentions)
+    engine.ingest_mentions('ABC', mentions)
+
+    stats = engine.get_stats()
+    assert stats['mentions'] == 50
+    assert stats['duplicates'] == 50
+
+
+def test_live_spike_after_backfilled_baseline():
+    spikes = []
+    engine = MentionVelocityEngine(on_spike=spikes.append)
+    engine.ingest_mentions('ABC', batch(24, 1500))
+
+    for i in range(40):
+        engine.record('ABC', 1, NOW + 65 + i)
+
+    assert len(spikes) == 1
+    assert spikes[0]['ticker'] == 'ABC'
+    assert engine.get_velocity('ABC', NOW + 110)['spiking']
+
+
+def test_backfill_never_raises_a_spike():
+    spikes = []
+    engine = MentionVelocityEngine(on_spike=spikes.append)
+    engine.ingest_mentions('ABC', batch(24, 1500))
+    engine.record('ABC', 1, NOW + 3600)
+
+    # A burst inside an old window is history, not a live spike
+    for _ in range(40):
+        engine.record('ABC', 1, NOW - 60)
+    assert spikes == []
@@ -0,0 +1,66 @@
+"""
+Tests for near-duplicate headline detection
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.news.minhash import MinHashIndex, _stem, jaccard, shingles
+
+NEAR_DUPLICATES = [
+    ("Nvidia shares surge after earnings beat",
+     "Nvidia shares surged after earnings beat"),
+    ("Tesla stock drops 5% as deliveries miss estimates",
+     "Tesla stock dropping 5% as deliveries miss estimates"),
+    ("Apple cuts iPhone production amid weak demand - Reuters",
+     "Apple cutting iPhone production amid weak demand | Bloomberg"),
+    ("Oil prices rally as OPEC+ extends output cuts",
+     "Oil prices rallied as OPEC+ extended output cuts"),
+    ("Microsoft plans $10 billion investment in OpenAI",
+     "Microsoft planning $10 billion investment in OpenAI, sources say"),
+    ("Boeing shares fall after FAA grounds 737 MAX 9 jets",
+     "Boeing shares falling after FAA grounded 737 MAX 9 jets"),
+]
+
+DISTINCT = [
+    ("Nvidia shares surge after earnings beat",
+     "AMD shares surge after earnings beat"),
+    ("Fed holds interest rates steady",
+     "Fed cuts interest rates by 25 basis points"),
+    ("Tesla recalls 2 million vehicles over Autopilot",
+     "Tesla deliveries top estimates in fourth quarter"),
+    ("Amazon to acquire iRobot for $1.7 billion",
+     "Amazon abandons iRobot acquisition after EU pushback"),
+]
+
+
+@pytest.mark.parametrize('words', [
+    ('surge', 'surges', 'surged', 'surging'),
+    ('drop', 'drops', 'dropped', 'dropping'),
+    ('fall', 'falls', 'falling'),
+    ('rally', 'rallies', 'rallied'),
+    ('price', 'prices', 'priced', 'pricing'),
+    ('cut', 'cuts', 'cutting'),
+])
+def test_inflections_share_a_stem(words):
+    assert len({_stem(word) for word in words}) == 1
+
+
+@pytest.mark.parametrize('first,second', NEAR_DUPLICATES)
+def test_near_duplicates_match(first, second):
+    index = MinHashIndex()
+    index.add(1, shingles(first), 0.0)
+    match = index.find(shingles(second))
+    assert match is not None, jaccard(shingles(first), shingles(second))
+    assert match[0] == 1
+
+
+@pytest.mark.parametrize('first,second', DISTINCT)
+def test_distinct_stories_do_not_match(first, second):
+    index = MinHashIndex()
+    index.add(1, shingles(first), 0.0)
+    assert index.find(shingles(second)) is None
@@ -0,0 +1,54 @@
+"""
+Tests for Monte Carlo chunking with moment matching
+"""
+
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analysis.monte_carlo import MonteCarloEngine
+
+
+def assert_finite(result):
+    summary = result.summary()
+    assert all(value is None or math.isfinite(value) for value in summary.values()), summary
+    assert all(np.isfinite(values).all() for values in result.bands.values())
+    assert np.isfinite(result.final_prices).all()
+    # The API serializes this - NaN would produce invalid JSON
+    json.dumps(result.to_dict(), allow_nan=False)
+
+
+def test_odd_simulation_count_with_one_row_remainder():
+    engine = MonteCarloEngine()
+    rows = int(engine.max_memory_mb * 1024 * 1024 / (252 * 8 * 3))
+    assert 11097 % rows == 1
+
+    result = engine.simulate_gbm(100, 0.1, 0.3, days=252, simulations=11097, seed=1, moment_matching=True)
+    assert result.simulations == 11097
+    assert len(result.final_prices) == 11097
+    assert_finite(result)
+
+
+@pytest.mark.parametrize('simulations', [1, 2, 3, 7, 10001])
+def test_moment_matching_small_and_odd_counts(simulations):
+    engine = MonteCarloEngine(max_memory_mb=0.5)
+    result = engine.simulate_gbm(50, 0.05, 0.4, days=30, simulations=simulations, seed=7,
+                                 moment_matching=True, antithetic=True)
+    assert len(result.final_prices) == simulations
+    assert_finite(result)
+
+
+def test_moment_matching_still_matches_moments():
+    engine = MonteCarloEngine()
+    result = engine.simulate_gbm(100, 0.0, 0.2, days=1, simulations=5001, seed=3, moment_matching=True,
+                                 return_paths=True)
+    log_returns = np.log(result.paths[:, 0] / 100)
+    vol = 0.2 * math.sqrt(1 / 252)
+    assert log_returns.mean() == pytest.approx(-0.5 * 0.2 ** 2 / 252, abs=1e-9)
+    assert log_returns.std() == pytest.approx(vol, rel=1e-6)
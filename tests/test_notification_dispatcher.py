@@ -0,0 +1,70 @@
+"""
+Tests for digest length limits in the notification dispatcher
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.alerts.notification_dispatcher import NotificationDispatcher, TelegramChannel
+
+
+class RecordingTelegram(TelegramChannel):
+    def __init__(self):
+        super().__init__('token', ['chat'])
+        self.sent = []
+
+    def send(self, recipient, title, body, alerts):
+        assert self.fits(body), len(body)
+        self.sent.append((body, alerts))
+
+
+def make_alert(i: int):
+    alert = {'type': 'MOMENTUM_SPIKE', 'symbol': f'SYM{i}'}
+    message = f"🚀 ${alert['symbol']} momentum spike\n" + 'Price up 12.5% on 4.2x relative volume. ' * 7
+    return alert, message
+
+
+def run(dispatcher, count):
+    channel = RecordingTelegram()
+    dispatcher.add_channel(channel)
+    dispatcher.start()
+    try:
+        for i in range(count):
+            dispatcher.dispatch(*make_alert(i))
+        assert dispatcher.flush(timeout=10)
+    finally:
+        dispatcher.stop()
+    return channel
+
+
+def test_large_digest_is_split_under_the_limit():
+    dispatcher = NotificationDispatcher(workers=2, coalesce_seconds=60)
+    channel = run(dispatcher, 20)
+
+    assert len(channel.sent) > 1
+    delivered = [alert['symbol'] for _, alerts in channel.sent for alert in alerts]
+    assert sorted(delivered) == sorted(f'SYM{i}' for i in range(20))
+
+    stats = dispatcher.get_stats()
+    assert stats['delivered_alerts'] == 20
+    assert stats['failed'] == 0
+    assert stats['split_digests'] == 1
+
+
+def test_small_digest_stays_one_message():
+    dispatcher = NotificationDispatcher(workers=1, coalesce_seconds=60)
+    channel = run(dispatcher, 3)
+
+    assert len(channel.sent) == 1
+    assert len(channel.sent[0][1]) == 3
+
+
+def test_oversized_single_message_is_truncated():
+    channel = TelegramChannel('token', ['chat'])
+    body = '🔔' * 3000
+    text = channel.truncate(body)
+    assert channel.fits(text)
+    assert text.endswith('…')
+    assert channel.truncate('short') == 'short'